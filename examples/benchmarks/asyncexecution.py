@@ -0,0 +1,201 @@
+"""
+Compares the thread pool BetfairExecution against the
+asyncio AsyncBetfairExecution placing orders against a
+local mock Betfair endpoint with a fixed response delay.
+
+python examples/benchmarks/asyncexecution.py
+"""
+
+import time
+import json
+import uuid
+import threading
+import multiprocessing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import betfairlightweight
+
+from flumine.latency import Latency
+from flumine.order.orderpackage import OrderPackageType
+from flumine.execution.betfairexecution import BetfairExecution
+from flumine.execution.asyncexecution import AsyncBetfairExecution
+
+DELAY = 0.02  # seconds, mock exchange response time
+PACKAGES = 500
+MAX_WORKERS = (8, 32)
+ORDERS = 2  # per package
+
+
+class MockBetfairHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(DELAY)
+        body = json.dumps(
+            {
+                "jsonrpc": "2.0",
+                "result": {
+                    "status": "SUCCESS",
+                    "marketId": request["params"]["marketId"],
+                    "instructionReports": [
+                        {
+                            "status": "SUCCESS",
+                            "orderStatus": "EXECUTABLE",
+                            "betId": str(i),
+                            "instruction": instruction,
+                        }
+                        for i, instruction in enumerate(
+                            request["params"]["instructions"]
+                        )
+                    ],
+                },
+                "id": 1,
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Responses:
+    def placed(self, instruction_report, dt: bool = False) -> None:
+        pass
+
+
+class Order:
+    EXCHANGE = None
+
+    def __init__(self):
+        self.id = uuid.uuid1()
+        self.trade = threading.RLock()
+        self.responses = Responses()
+        self.async_ = False
+        self.simulated = False
+        self.bet_id = None
+        self.complete = False
+
+    def executable(self) -> None:
+        self.complete = True
+
+    def execution_complete(self) -> None:
+        self.complete = True
+
+
+class OrderPackage:
+    package_type = OrderPackageType.PLACE
+    market_id = "1.23"
+    market_version = None
+    customer_strategy_ref = "benchmark"
+    async_ = False
+    retry_count = 0
+    elapsed_seconds = 0
+    info = {}
+
+    def __init__(self, client):
+        self.client = client
+        self.id = uuid.uuid1()
+        self.orders = [Order() for _ in range(ORDERS)]
+        self.place_instructions = [
+            {
+                "selectionId": 123,
+                "side": "BACK",
+                "orderType": "LIMIT",
+                "limitOrder": {"size": 2, "price": 3, "persistenceType": "LAPSE"},
+            }
+            for _ in self.orders
+        ]
+        self._monotonic_created = time.monotonic()
+        self.monotonic_submitted = None
+
+    def __iter__(self):
+        return iter(self.orders)
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+
+class Client:
+    def __init__(self, betting_client, complete: threading.Semaphore):
+        self.betting_client = betting_client
+        self.complete = complete
+
+    def reserve_transactions(self, count: int) -> float:
+        return 0.0
+
+    def add_transaction(self, count: int, failed: bool = False) -> None:
+        self.complete.release()
+
+
+class Flumine:
+    def __init__(self):
+        self.latency = Latency()
+
+    def log_control(self, event) -> None:
+        pass
+
+
+def run(execution_cls, max_workers: int, url: str) -> tuple:
+    complete = threading.Semaphore(0)
+    flumine = Flumine()
+    execution = execution_cls(flumine, max_workers=max_workers)
+    betting_client = betfairlightweight.APIClient("username", "password", "app_key")
+    betting_client.api_uri = url
+    client = Client(betting_client, complete)
+    packages = [OrderPackage(client) for _ in range(PACKAGES)]
+    start = time.perf_counter()
+    for order_package in packages:
+        execution.handler(order_package)
+    for _ in packages:
+        complete.acquire()
+    elapsed = time.perf_counter() - start
+    execution.shutdown()
+    request = flumine.latency.get("request").info
+    return elapsed, request["p50"], request["p99"]
+
+
+def serve(port) -> None:
+    # separate process so the mock exchange does not share the GIL
+    ThreadingHTTPServer.request_queue_size = 128
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockBetfairHandler)
+    server.daemon_threads = True
+    port.value = server.server_port
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    port = multiprocessing.Value("i", 0)
+    process = multiprocessing.Process(target=serve, args=(port,), daemon=True)
+    process.start()
+    while not port.value:
+        time.sleep(0.01)
+    url = "http://127.0.0.1:%s/" % port.value
+
+    print(
+        "packages={0} delay={1}ms orders/package={2}".format(
+            PACKAGES, DELAY * 1e3, ORDERS
+        )
+    )
+    print(
+        "execution               max_workers  elapsed  packages/s  p50 (ms)  p99 (ms)"
+    )
+    for max_workers in MAX_WORKERS:
+        for execution_cls in (BetfairExecution, AsyncBetfairExecution):
+            elapsed, p50, p99 = run(execution_cls, max_workers, url)
+            print(
+                "{0:<22}  {1:>11}  {2:>6.2f}s  {3:>10.0f}  {4:>8.1f}  {5:>8.1f}".format(
+                    execution_cls.__name__,
+                    max_workers,
+                    elapsed,
+                    PACKAGES / elapsed,
+                    p50 * 1e3,
+                    p99 * 1e3,
+                )
+            )
+    process.terminate()
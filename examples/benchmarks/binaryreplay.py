@@ -0,0 +1,113 @@
+"""
+Compares decode, cache (decode + cache updates) and full
+generator (decode + cache + MarketBook creation) times for
+raw stream files against the binary replay format.
+
+python examples/benchmarks/binaryreplay.py tests/resources/1.200806927
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+
+from betfairlightweight.compat import json as compat_json
+
+from flumine.streams.historicalbinary import BinaryReader, convert
+from flumine.streams.historicalstream import (
+    HistoricListener,
+    FlumineHistoricalGeneratorStream,
+    FlumineBinaryGeneratorStream,
+)
+
+REPEAT = 5
+
+
+def timeit(func) -> float:
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def decode_json(file_path: str, loads) -> None:
+    with open(file_path, "rb") as f:
+        for line in f:
+            data = loads(line)
+            data["pt"], data["mc"]
+
+
+def decode_binary(file_path: str) -> None:
+    reader = BinaryReader(file_path)
+    for _ in reader:
+        pass
+    reader.close()
+
+
+def no_output(stream_cls):
+    # stream without MarketBook creation
+    return type(stream_cls.__name__, (stream_cls,), {"_output_caches": lambda s: {}})
+
+
+def generator(stream_cls, file_path: str) -> None:
+    listener = HistoricListener(max_latency=None)
+    listener.update_clk = False
+    stream = stream_cls(
+        file_path=file_path,
+        listener=listener,
+        operation="marketSubscription",
+        unique_id=0,
+    )
+    for _ in stream.get_generator()():
+        pass
+
+
+if __name__ == "__main__":
+    file_paths = sys.argv[1:] or [
+        "tests/resources/1.197931750",
+        "tests/resources/1.200806927",
+        "tests/resources/SELF-1.181223995",
+    ]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for file_path in file_paths:
+            binary_path = convert(
+                file_path, os.path.join(tmp_dir, os.path.basename(file_path) + ".flb")
+            )
+            print(
+                "{0}: {1} bytes (raw) {2} bytes (binary)".format(
+                    file_path,
+                    os.path.getsize(file_path),
+                    os.path.getsize(binary_path),
+                )
+            )
+            results = {
+                "decode json (stdlib)": timeit(
+                    lambda: decode_json(file_path, json.loads)
+                ),
+                "decode json (%s)"
+                % compat_json.__name__: timeit(
+                    lambda: decode_json(file_path, compat_json.loads)
+                ),
+                "decode binary": timeit(lambda: decode_binary(binary_path)),
+                "cache json": timeit(
+                    lambda: generator(
+                        no_output(FlumineHistoricalGeneratorStream), file_path
+                    )
+                ),
+                "cache binary": timeit(
+                    lambda: generator(
+                        no_output(FlumineBinaryGeneratorStream), binary_path
+                    )
+                ),
+                "generator json": timeit(
+                    lambda: generator(FlumineHistoricalGeneratorStream, file_path)
+                ),
+                "generator binary": timeit(
+                    lambda: generator(FlumineBinaryGeneratorStream, binary_path)
+                ),
+            }
+            for name, seconds in results.items():
+                print("    {0:<24} {1:.4f}s".format(name, seconds))
@@ -0,0 +1,91 @@
+"""
+Compares the previous sort/pop(0) cycle against the
+heap based k-way merge used when event_processing
+for events with many markets.
+
+python examples/benchmarks/eventmerge.py
+"""
+
+import time
+import random
+
+from flumine.simulation.utils import merge_generators
+
+REPEAT = 3
+UPDATES = 2000  # per market
+MARKETS = (2, 10, 50, 100, 200)
+
+
+class MarketBook:
+    __slots__ = ["publish_time_epoch"]
+
+    def __init__(self, publish_time_epoch: int):
+        self.publish_time_epoch = publish_time_epoch
+
+
+def create_markets(market_count: int) -> list:
+    random.seed(market_count)
+    markets = []
+    for _ in range(market_count):
+        pt = random.randint(0, 1000)
+        market = []
+        for _ in range(UPDATES):
+            pt += random.randint(1, 500)
+            market.append([MarketBook(pt)])
+        markets.append(market)
+    return markets
+
+
+def sort_cycles(markets: list) -> int:
+    count = 0
+    cycles = []
+    for market in markets:
+        stream_gen = iter(market)
+        market_book = next(stream_gen)
+        cycles.append([market_book[0].publish_time_epoch, market_book, stream_gen])
+    while cycles:
+        cycles.sort(key=lambda x: x[0])
+        _, market_book, stream_gen = cycles.pop(0)
+        count += 1
+        try:
+            market_book = next(stream_gen)
+        except StopIteration:
+            continue
+        cycles.append([market_book[0].publish_time_epoch, market_book, stream_gen])
+    return count
+
+
+def heap_merge(markets: list) -> int:
+    count = 0
+    for _ in merge_generators(
+        [iter(m) for m in markets], key=lambda x: x[0].publish_time_epoch
+    ):
+        count += 1
+    return count
+
+
+def timeit(func, markets: list) -> float:
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func(markets)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+if __name__ == "__main__":
+    print("markets  updates  sort/pop(0)  heap merge  speedup")
+    for market_count in MARKETS:
+        markets = create_markets(market_count)
+        assert sort_cycles(markets) == heap_merge(markets)
+        sort_time = timeit(sort_cycles, markets)
+        heap_time = timeit(heap_merge, markets)
+        print(
+            "{0:>7}  {1:>7}  {2:>10.3f}s  {3:>9.3f}s  {4:>6.1f}x".format(
+                market_count,
+                market_count * UPDATES,
+                sort_time,
+                heap_time,
+                sort_time / heap_time,
+            )
+        )
@@ -0,0 +1,78 @@
+"""
+Compares reading historical files into memory
+(readlines) against streaming them through the
+bounded read-ahead buffer (config.simulation_read_ahead),
+each line is json decoded to include the parsing cost.
+
+python examples/benchmarks/readahead.py [files..]
+"""
+
+import sys
+import time
+import tracemalloc
+
+from betfairlightweight.compat import json
+
+from flumine import config
+from flumine.streams.historicalstream import FlumineHistoricalGeneratorStream
+
+REPEAT = 3
+READ_AHEAD = 16
+FILES = [
+    "tests/resources/BASIC-1.132153978",
+    "tests/resources/BASIC-1.132153978.gz",
+    "tests/resources/1.197931750",
+    "tests/resources/1.197931751",
+    "tests/resources/1.200806927",
+    "tests/resources/SELF-1.181223995",
+]
+
+
+def process(file_path: str, read_ahead) -> int:
+    config.simulation_read_ahead = read_ahead
+    count = 0
+    for lines in FlumineHistoricalGeneratorStream._read_chunks(file_path):
+        for line in lines:
+            json.loads(line)
+            count += 1
+    return count
+
+
+def timeit(file_path: str, read_ahead) -> float:
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        process(file_path, read_ahead)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def peak_memory(file_path: str, read_ahead) -> float:
+    tracemalloc.start()
+    process(file_path, read_ahead)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024**2
+
+
+if __name__ == "__main__":
+    files = sys.argv[1:] or FILES
+    print(
+        "{0:<40}  {1:>7}  {2:>9}  {3:>10}  {4:>9}  {5:>10}".format(
+            "file", "lines", "readlines", "read-ahead", "mem (MB)", "ahead (MB)"
+        )
+    )
+    for file_path in files:
+        lines = process(file_path, None)
+        assert lines == process(file_path, READ_AHEAD)
+        print(
+            "{0:<40}  {1:>7}  {2:>8.3f}s  {3:>9.3f}s  {4:>9.2f}  {5:>10.2f}".format(
+                file_path[-40:],
+                lines,
+                timeit(file_path, None),
+                timeit(file_path, READ_AHEAD),
+                peak_memory(file_path, None),
+                peak_memory(file_path, READ_AHEAD),
+            )
+        )
+    config.simulation_read_ahead = None
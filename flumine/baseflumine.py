@@ -1,5 +1,6 @@
 import time
 import queue
+import collections
 import logging
 import threading
 from typing import Type
@@ -25,6 +26,7 @@ from .controls.tradingcontrols import (
 )
 from .controls.loggingcontrols import LoggingControl
 from .exceptions import FlumineException, ClientError
+from .latency import Latency
 from . import config, utils
 
 logger = logging.getLogger(__name__)
@@ -47,6 +49,15 @@ class BaseFlumine:
 
         # FIFO queue
         self.handler_queue = queue.Queue()
+        self._handler_queue_buffer = collections.deque()  # coalesced events
+        self.handler_queue_stats = {
+            "batches": 0,
+            "events": 0,
+            "market_books_skipped": 0,
+        }
+
+        # latency histograms (live)
+        self.latency = Latency()
 
         # markets
         self.markets = Markets()
@@ -165,8 +176,11 @@ class BaseFlumine:
             for middleware in self._market_middleware:
                 utils.call_middleware_error_handling(middleware, market)
 
-            for strategy in self.strategies:
-                if market_book.streaming_unique_id in strategy.stream_ids:
+            with market.coalesce_transactions(config.coalesce_transactions):
+                for strategy in self.strategies.stream_strategies(
+                    market_book.streaming_unique_id
+                ):
+                    start = time.monotonic()
                     if market_is_new:
                         utils.call_strategy_error_handling(
                             strategy.process_new_market, market, market_book
@@ -177,6 +191,7 @@ class BaseFlumine:
                         utils.call_strategy_error_handling(
                             strategy.process_market_book, market, market_book
                         )
+                    self.latency.record_since("strategy", start)
 
     def _process_sports_data(self, event: events.SportsDataEvent) -> None:
         for sports_data in event.event:
@@ -195,16 +210,18 @@ class BaseFlumine:
                     )
                     continue
                 markets = [market]
+            strategies = self.strategies.stream_strategies(
+                sports_data.streaming_unique_id
+            )
             # loop markets
             for market in markets:
-                for strategy in self.strategies:
-                    if sports_data.streaming_unique_id in strategy.stream_ids:
-                        if utils.call_strategy_error_handling(
-                            strategy.check_sports_data, market, sports_data
-                        ):
-                            utils.call_strategy_error_handling(
-                                strategy.process_sports_data, market, sports_data
-                            )
+                for strategy in strategies:
+                    if utils.call_strategy_error_handling(
+                        strategy.check_sports_data, market, sports_data
+                    ):
+                        utils.call_strategy_error_handling(
+                            strategy.process_sports_data, market, sports_data
+                        )
 
     def process_order_package(self, order_package) -> None:
         """Execute through client."""
@@ -244,9 +261,8 @@ class BaseFlumine:
                         datum["_stream_id"] = stream_id
                         self.handler_queue.put(events.CloseMarketEvent(datum))
 
-            for strategy in self.strategies:
-                if stream_id in strategy.stream_ids:
-                    utils.call_process_raw_data(strategy, clk, publish_time, datum)
+            for strategy in self.strategies.stream_strategies(stream_id):
+                utils.call_process_raw_data(strategy, clk, publish_time, datum)
 
     def _process_market_catalogues(self, event: events.MarketCatalogueEvent) -> None:
         for market_catalogue in event.event:
@@ -269,12 +285,16 @@ class BaseFlumine:
                     )
                 market.update_market_catalogue = False
 
+                if market.market_book:
+                    stream_strategies = self.strategies.stream_strategies(
+                        market.market_book.streaming_unique_id
+                    )
+                else:
+                    stream_strategies = []
                 for strategy in self.strategies:
-                    if (
-                        market.market_book
-                        and market.market_book.streaming_unique_id
-                        in strategy.stream_ids
-                    ) or strategy.market_cached(market.market_id):
+                    if strategy in stream_strategies or strategy.market_cached(
+                        market.market_id
+                    ):
                         utils.call_strategy_error_handling(
                             strategy.process_market_catalogue, market, market_catalogue
                         )
@@ -300,12 +320,21 @@ class BaseFlumine:
                 )
         for market in self.markets:
             if market.closed is False and market.blotter.active:
-                for strategy in self.strategies:
-                    strategy_orders = market.blotter.strategy_orders(strategy)
-                    if strategy_orders:
-                        utils.call_process_orders_error_handling(
-                            strategy, market, strategy_orders
-                        )
+                dirty_strategies = market.blotter.pop_dirty_strategies()
+                if config.process_orders_dirty_only and not dirty_strategies:
+                    continue
+                with market.coalesce_transactions(config.coalesce_transactions):
+                    for strategy in self.strategies:
+                        if (
+                            config.process_orders_dirty_only
+                            and strategy not in dirty_strategies
+                        ):
+                            continue
+                        strategy_orders = market.blotter.strategy_orders(strategy)
+                        if strategy_orders:
+                            utils.call_process_orders_error_handling(
+                                strategy, market, strategy_orders
+                            )
 
     def _process_custom_event(self, event: events.CustomEvent) -> None:
         try:
@@ -352,8 +381,9 @@ class BaseFlumine:
             market(market_book)
             market.blotter.process_closed_market(market, event.event)
 
+        stream_strategies = self.strategies.stream_strategies(stream_id)
         for strategy in self.strategies:
-            if stream_id in strategy.stream_ids or strategy.market_filter == {}:
+            if strategy in stream_strategies or strategy.market_filter == {}:
                 strategy.process_closed_market(market, event.event)
 
         if recorder is False and self.clients.simulated:
@@ -502,6 +532,9 @@ class BaseFlumine:
         self.simulated_execution.shutdown()
         self.betfair_execution.shutdown()
         self.betdaq_execution.shutdown()
+        for client in self.clients:
+            if client._execution_cls:
+                client.execution.shutdown()
         # shutdown logging controls
         self.log_control(events.TerminationEvent(self))
         for c in self._logging_controls:
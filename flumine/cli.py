@@ -0,0 +1,100 @@
+import os
+import json
+import argparse
+import logging
+import importlib
+from typing import Callable, Optional
+
+from .streams.historicalbinary import BINARY_SUFFIX, convert
+
+logger = logging.getLogger(__name__)
+
+
+def _convert(args: argparse.Namespace) -> None:
+    for file_path in args.files:
+        output_path = None
+        if args.output_dir:
+            file_name = os.path.basename(file_path)
+            if file_name.endswith(".gz"):
+                file_name = file_name[:-3]
+            output_path = os.path.join(args.output_dir, file_name + BINARY_SUFFIX)
+        print(convert(file_path, output_path))
+
+
+def load_object(path: str) -> Callable:
+    """Import object from 'module:name' path."""
+    module_name, _, name = path.partition(":")
+    if not name:
+        raise ValueError("Object path must be in the form 'module:name'")
+    return getattr(importlib.import_module(module_name), name)
+
+
+def _simulate(args: argparse.Namespace) -> None:
+    from .simulation.simulation import FlumineSimulation
+
+    strategy_factory = load_object(args.strategy)
+    client_kwargs = json.loads(args.client_kwargs) if args.client_kwargs else None
+    framework = FlumineSimulation()
+    results = framework.run_parallel(
+        args.files,
+        strategy_factory,
+        client_kwargs=client_kwargs,
+        processes=args.processes,
+        markets_per_process=args.markets_per_process,
+    )
+    for result in results:
+        print(json.dumps(result.info))
+    print(
+        json.dumps(
+            {
+                "tasks": len(results),
+                "errors": sum(1 for r in results if r.error),
+                "order_count": sum(len(r.orders) for r in results),
+                "profit": round(sum(r.profit for r in results), 2),
+            }
+        )
+    )
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="flumine")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    # convert
+    convert_parser = subparsers.add_parser(
+        "convert", help="Convert historical stream files into binary replay files"
+    )
+    convert_parser.add_argument("files", nargs="+", help="Raw stream file paths")
+    convert_parser.add_argument(
+        "-o", "--output-dir", help="Output directory (defaults to file location)"
+    )
+    convert_parser.set_defaults(func=_convert)
+    # simulate
+    simulate_parser = subparsers.add_parser(
+        "simulate", help="Simulate historical stream files over a process pool"
+    )
+    simulate_parser.add_argument("files", nargs="+", help="Market file paths")
+    simulate_parser.add_argument(
+        "-s",
+        "--strategy",
+        required=True,
+        help="Strategy factory 'module:name' called with a list of markets",
+    )
+    simulate_parser.add_argument(
+        "-p", "--processes", type=int, help="Worker processes (defaults to cpu count)"
+    )
+    simulate_parser.add_argument(
+        "--markets-per-process",
+        type=int,
+        help="Markets processed by a worker before it is replaced",
+    )
+    simulate_parser.add_argument(
+        "--client-kwargs", help="SimulatedClient kwargs as json"
+    )
+    simulate_parser.set_defaults(func=_simulate)
+    return parser
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = create_parser()
+    args = parser.parse_args(argv)
+    args.func(args)
@@ -30,6 +30,8 @@ class BaseClient:
         market_recording_mode: bool = False,
         simulated_full_match: bool = False,
         execution_cls=None,
+        transaction_rate: Optional[float] = None,
+        transaction_burst: Optional[int] = None,
     ):
         if hasattr(betting_client, "lightweight"):
             assert (
@@ -38,6 +40,8 @@ class BaseClient:
         self._username = username or create_short_uuid()
         self.betting_client = betting_client
         self.transaction_limit = transaction_limit
+        self.transaction_rate = transaction_rate  # per second
+        self.transaction_burst = transaction_burst
         self.capital_base = capital_base
         self.commission_base = commission_base  # not implemented
         self.interactive_login = interactive_login
@@ -86,6 +90,14 @@ class BaseClient:
             if hasattr(control, "add_transaction"):
                 control.add_transaction(count, failed)
 
+    def reserve_transactions(self, count: int) -> float:
+        # seconds to delay execution by (rate limit)
+        delay = 0.0
+        for control in self.trading_controls:
+            if hasattr(control, "reserve"):
+                delay = max(delay, control.reserve(count))
+        return delay
+
     @property
     def username(self) -> str:
         if self.betting_client:
@@ -4,6 +4,17 @@ import socket
 simulated = False
 simulated_strategy_isolation = True
 simulation_available_prices = False
+# stream historical files through a reader thread buffering n chunks (None reads whole file)
+simulation_read_ahead = None
+simulation_read_chunk_size = 262144  # approx bytes per chunk
+# use (build if missing) sidecar index files to skip updates outside listener_kwargs
+simulation_index = False
+simulation_index_dir = None  # directory for index files (None stores beside the file)
+# local directory used to cache remote (s3/http etc.) historical files (None disables)
+simulation_file_cache = None
+simulation_file_cache_size = 10 * 1024**3  # max bytes before lru eviction
+# tasks processed by each parallel simulation worker before it is replaced (memory)
+simulation_markets_per_process = 8
 
 instance_id = None  # instance id (e.g. AWS ec2 instanceId)
 
@@ -17,12 +28,46 @@ process_id = os.getpid()  # process id of app
 
 current_time = None  # used for simulation
 
+# only create MarketBooks for markets updated (simulation) and
+# on streaming timeout only for markets with live orders (live)
+changed_market_books_only = False
+
 raise_errors = False  # used for call_check_market / call_process_market_book
 
+# serve prometheus text metrics on http://metrics_host:metrics_port/metrics (live)
+metrics_host = "127.0.0.1"
+metrics_port = None
+
+# record live per stage latency histograms (framework.latency)
+record_latency = True
+
+# record per strategy callback timing (strategy.callback_timing)
+strategy_timing = False
+strategy_timing_slow_call = 0.1  # seconds before a callback is logged as slow
+
 max_execution_workers = 32  # max number of workers in execution thread pool
 
+# execution requests.Session pool
+min_execution_sessions = 2  # kept warm by the refresh_execution_sessions worker
+max_execution_sessions = None  # pooled sessions, defaults to max_execution_workers
+execution_session_refresh = 60  # seconds idle before a pooled session is refreshed
+
 async_place_orders = False  # async place orders
 
+# drain the handler_queue in batches (live) keeping only the latest
+# MarketBook per market between non MarketBook events
+coalesce_market_books = False
+handler_queue_batch_size = 250  # max events drained per batch
+
+# orders placed / cancelled etc. via the market during a strategy
+# dispatch (process_market_book / process_orders) are executed in
+# a single transaction per market (and client) after the dispatch
+coalesce_transactions = False
+
+# only call strategy.process_orders for strategies with orders
+# updated (status / matched) in the market since the last call
+process_orders_dirty_only = False
+
 # latencies used for simulation
 place_latency = 0.120
 cancel_latency = 0.170
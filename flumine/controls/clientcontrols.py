@@ -1,3 +1,4 @@
+import time
 import datetime
 import logging
 import threading
@@ -10,6 +11,41 @@ from ..clients import BaseClient
 logger = logging.getLogger(__name__)
 
 
+class TokenBucket:
+    """
+    Token bucket rate limiter, tokens refill at rate
+    per second up to capacity. Tokens are reserved
+    rather than refused (the bucket can go negative)
+    and the seconds until they are available is
+    returned so that callers can delay.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def reserve(self, tokens: float = 1) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+
 class MaxTransactionCount(BaseControl):
     """
     Counts and limits orders based on max
@@ -19,6 +55,9 @@ class MaxTransactionCount(BaseControl):
         - `A ‘transaction’ shall include all bets placed and all failed transactions`
     Counts are updated after an execution,
     thread safe due to the execution pool.
+    If the client transaction_rate is set
+    transactions are also rate limited (token
+    bucket) by delaying execution.
     """
 
     NAME = "MAX_TRANSACTION_COUNT"
@@ -33,6 +72,15 @@ class MaxTransactionCount(BaseControl):
         # total since start
         self.transaction_count = 0
         self.failed_transaction_count = 0
+        # rate limit
+        self.token_bucket = None
+        if client.transaction_rate:
+            self.token_bucket = TokenBucket(
+                client.transaction_rate,
+                client.transaction_burst or client.transaction_rate,
+            )
+        self.rate_limited_count = 0
+        self.rate_limited_seconds = 0.0
         # thread lock
         self._lock = threading.Lock()
 
@@ -45,6 +93,28 @@ class MaxTransactionCount(BaseControl):
                 self.transaction_count += count
                 self.current_transaction_count += count
 
+    def reserve(self, count: int) -> float:
+        """Reserve count transactions, returns
+        seconds to delay execution by.
+        """
+        if self.token_bucket is None:
+            return 0.0
+        delay = self.token_bucket.reserve(count)
+        if delay:
+            with self._lock:
+                self.rate_limited_count += count
+                self.rate_limited_seconds += delay
+            logger.info(
+                "Transaction rate limited",
+                extra={
+                    "count": count,
+                    "delay": round(delay, 3),
+                    "transaction_rate": self.token_bucket.rate,
+                    "client": self.client.info,
+                },
+            )
+        return delay
+
     def _validate(self, order: BaseOrder, package_type: OrderPackageType) -> None:
         self._check_hour()
         if not self.safe:
@@ -75,6 +75,12 @@ class LoggingControl(Thread):
         elif event.EVENT_TYPE == EventType.CUSTOM_EVENT:
             self._process_custom_event(event)
 
+        elif event.EVENT_TYPE == EventType.SIMULATION_RESULT:
+            self._process_simulation_result(event)
+
+        elif event.EVENT_TYPE == EventType.LATENCY:
+            self._process_latency(event)
+
         elif event.EVENT_TYPE == EventType.TERMINATOR:
             self._process_end_flumine(event)
             self.logging_queue.put(None)
@@ -150,6 +156,18 @@ class LoggingControl(Thread):
         """
         logger.debug("process_custom_event: %s" % event)
 
+    def _process_simulation_result(self, event: events.SimulationResultEvent) -> None:
+        """
+        :param event.event: SimulationResult (parallel simulation)
+        """
+        logger.debug("process_simulation_result: %s" % event)
+
+    def _process_latency(self, event: events.LatencyEvent) -> None:
+        """
+        :param event.event: Latency info {stage: {count, mean, p50, p99, max}}
+        """
+        logger.debug("process_latency: %s" % event)
+
     def _process_end_flumine(self, event: events.TerminationEvent) -> None:
         """
         :param event.event: Termination Event
@@ -63,18 +63,18 @@ class OrderValidation(BaseControl):
         if order.order_type.price is None:
             self._on_error(order, "Order price is None")
         if order.order_type.price_ladder_definition == "CLASSIC":
-            if utils.as_dec(order.order_type.price) not in utils.PRICES:
+            if not utils.CLASSIC_LADDER.is_valid(order.order_type.price):
                 self._on_error(order, "Order price is not valid for CLASSIC ladder")
         elif order.order_type.price_ladder_definition == "FINEST":
-            if utils.as_dec(order.order_type.price) not in utils.FINEST_PRICES:
+            if not utils.get_finest_ladder().is_valid(order.order_type.price):
                 self._on_error(order, "Order price is not valid for FINEST ladder")
         elif order.order_type.price_ladder_definition == "LINE_RANGE":
-            prices = utils.make_line_prices(
+            ladder = utils.get_line_ladder(
                 order.order_type.line_range_info.min_unit_value,
                 order.order_type.line_range_info.max_unit_value,
                 order.order_type.line_range_info.interval,
             )
-            if utils.as_dec(order.order_type.price) not in prices:
+            if not ladder.is_valid(order.order_type.price):
                 self._on_error(order, "Order price is not valid for LINE_RANGE ladder")
 
     def _validate_betfair_liability(self, order):
@@ -127,7 +127,7 @@ class OrderValidation(BaseControl):
         if order.order_type.price is None:
             self._on_error(order, "Order price is None")
         # check ladder
-        if utils.as_dec(order.order_type.price) not in utils.BETDAQ_PRICES:
+        if not utils.BETDAQ_LADDER.is_valid(order.order_type.price):
             self._on_error(order, "Order price is not valid for BETDAQ ladder")
 
     def _validate_betdaq_min_size(self, order, order_type):
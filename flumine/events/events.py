@@ -1,3 +1,4 @@
+import time
 import datetime
 from enum import Enum
 
@@ -25,6 +26,8 @@ class EventType(Enum):
     ORDER_PACKAGE = "Order package"
     CLOSE_MARKET = "Closed market"
     CUSTOM_EVENT = "Custom event"
+    SIMULATION_RESULT = "Simulation result"
+    LATENCY = "Latency"
 
 
 class QueueType(Enum):
@@ -36,10 +39,11 @@ class BaseEvent:
     EVENT_TYPE = None
     QUEUE_TYPE = None
 
-    __slots__ = ["_time_created", "event", "exchange", "callback"]
+    __slots__ = ["_time_created", "_monotonic_created", "event", "exchange", "callback"]
 
     def __init__(self, event, exchange: ExchangeType = ExchangeType.BETFAIR):
         self._time_created = datetime.datetime.utcnow()
+        self._monotonic_created = time.monotonic()  # latency
         self.event = event
         self.exchange = exchange
 
@@ -141,6 +145,16 @@ class OrderEvent(BaseEvent):
     QUEUE_TYPE = QueueType.LOGGING
 
 
+class SimulationResultEvent(BaseEvent):
+    EVENT_TYPE = EventType.SIMULATION_RESULT
+    QUEUE_TYPE = QueueType.LOGGING
+
+
+class LatencyEvent(BaseEvent):
+    EVENT_TYPE = EventType.LATENCY
+    QUEUE_TYPE = QueueType.LOGGING
+
+
 # both
 
 
@@ -0,0 +1,350 @@
+import time
+import asyncio
+import logging
+import threading
+from typing import Optional
+from betfairlightweight import BetfairError, resources
+from betfairlightweight.compat import json
+from betfairlightweight.exceptions import APIError, InvalidResponse, StatusCodeError
+from betfairlightweight.utils import clean_locals
+
+from .. import config
+from .baseexecution import MAX_SESSION_AGE, SESSION_REFRESH_TIMEOUT
+from .betfairexecution import BetfairExecution
+from ..order.orderpackage import BaseOrderPackage, OrderPackageType
+from ..exceptions import OrderExecutionError
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBetfairExecution(BetfairExecution):
+    """
+    Betfair execution driven by an asyncio event loop
+    (own thread) using an aiohttp session, a request
+    no longer occupies a thread whilst waiting on the
+    exchange so concurrency is limited by max_workers
+    (connections) rather than threads.
+    Order status/logging is as per BetfairExecution.
+
+    Requires aiohttp (pip install flumine[async]),
+    selected per client:
+        BetfairClient(trading, execution_cls=AsyncBetfairExecution)
+    """
+
+    def __init__(self, flumine, max_workers: int = config.max_execution_workers):
+        super().__init__(flumine, max_workers)
+        try:
+            import aiohttp
+        except ImportError as e:
+            raise ImportError(
+                "AsyncBetfairExecution requires aiohttp, "
+                "install with 'pip install flumine[async]'"
+            ) from e
+        self._aiohttp = aiohttp
+        self._session = None  # created in loop
+        self._loop = None
+        self._loop_thread = None
+        self._loop_lock = threading.Lock()
+        self._semaphore = None  # created in loop
+        self._pending = 0  # order packages submitted but not complete
+        self._pending_lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            with self._loop_lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    self._loop_thread = threading.Thread(
+                        name="AsyncBetfairExecution",
+                        target=loop.run_forever,
+                        daemon=True,
+                    )
+                    self._loop_thread.start()
+                    self._loop = loop
+        return self._loop
+
+    def handler(self, order_package: BaseOrderPackage):
+        """Handles order_package, capable of place, cancel,
+        replace and update.
+        """
+        if order_package.package_type not in self._requests:
+            raise NotImplementedError()
+        if order_package.retry_count == 0:
+            self.flumine.latency.record(
+                "transaction", time.monotonic() - order_package._monotonic_created
+            )
+        with self._pending_lock:
+            self._pending += 1
+        delay = self._get_rate_limit_delay(order_package)
+        if delay > 0:
+            self.flumine.latency.record("rate_limit", delay)
+        self.schedule(delay, self._submit_loop, order_package)
+        logger.info(
+            "Event loop submit",
+            extra={
+                "package_type": order_package.package_type.value,
+                "latency": round(order_package.elapsed_seconds, 4),
+                "order_package": order_package.info,
+                "pending": self._pending,
+            },
+        )
+
+    def _submit_loop(self, order_package: BaseOrderPackage) -> None:
+        order_package.monotonic_submitted = time.monotonic()
+        asyncio.run_coroutine_threadsafe(self._execute(order_package), self.loop)
+
+    async def _execute(self, order_package: BaseOrderPackage) -> None:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_workers)
+        try:
+            trading_function, process_function = self._requests[
+                order_package.package_type
+            ]
+            # max_workers requests in flight, as per the thread pool
+            async with self._semaphore:
+                response = await self._async_execution_helper(
+                    trading_function, order_package
+                )
+            if response:
+                getattr(self, process_function)(order_package, response)
+        except Exception as e:
+            logger.critical(
+                "Execution unknown error",
+                extra={"exception": e, "order_package": order_package.info},
+                exc_info=True,
+            )
+        finally:
+            with self._pending_lock:
+                self._pending -= 1
+
+    async def _async_execution_helper(
+        self, trading_function: str, order_package: BaseOrderPackage
+    ):
+        self._record_execution_start(order_package)
+        if order_package.elapsed_seconds > 0.1 and order_package.retry_count == 0:
+            logger.warning(
+                "High latency between current time and OrderPackage creation time, it is likely that the event loop is currently blocked",
+                extra={
+                    "trading_function": trading_function,
+                    "latency": round(order_package.elapsed_seconds, 3),
+                    "order_package": order_package.info,
+                    "pending": self._pending,
+                },
+            )
+        if order_package.orders:
+            try:
+                method, params, resource = getattr(
+                    self, "_%s_request" % trading_function
+                )(order_package)
+                start = time.monotonic()
+                response = await self._request(order_package, method, params, resource)
+                self.flumine.latency.record_since("request", start)
+            except BetfairError as e:
+                logger.error(
+                    "Execution error",
+                    extra={
+                        "trading_function": trading_function,
+                        "response": e,
+                        "order_package": order_package.info,
+                    },
+                    exc_info=True,
+                )
+                back_off = order_package.retry_count
+                if order_package.retry(back_off=False):
+                    # back-off without blocking the loop
+                    self.loop.call_later(back_off, self.handler, order_package)
+                else:
+                    # reset orders
+                    if order_package.package_type == OrderPackageType.PLACE:
+                        order_package.reset_orders(complete=True)
+                    else:
+                        order_package.reset_orders()
+                return
+            except Exception as e:
+                logger.critical(
+                    "Execution unknown error",
+                    extra={
+                        "trading_function": trading_function,
+                        "exception": e,
+                        "order_package": order_package.info,
+                    },
+                    exc_info=True,
+                )
+                return
+            logger.info(
+                "execute_%s" % trading_function,
+                extra={
+                    "trading_function": trading_function,
+                    "elapsed_time": response.elapsed_time,
+                    "response": response._data,
+                    "order_package": order_package.info,
+                },
+            )
+            return response
+        else:
+            logger.warning("Empty package, not executing", extra=order_package.info)
+
+    def _get_session(self):
+        # aiohttp.ClientSession, created in the loop
+        if self._session is None:
+            self._session = self._aiohttp.ClientSession(
+                connector=self._aiohttp.TCPConnector(
+                    limit=self._max_workers, keepalive_timeout=MAX_SESSION_AGE
+                )
+            )
+        return self._session
+
+    async def _request(
+        self, order_package: BaseOrderPackage, method: str, params: dict, resource
+    ):
+        """As per betfairlightweight Betting.request
+        but using the aiohttp session.
+        """
+        betting_client = order_package.client.betting_client
+        betting = betting_client.betting
+        method = "%s%s" % (betting.URI, method)
+        # None values removed as per requests (e.g. session token)
+        headers = {
+            k: v for k, v in betting_client.request_headers.items() if v is not None
+        }
+        session = self._get_session()
+        time_sent = time.monotonic()
+        try:
+            async with session.post(
+                betting.url,
+                data=betting.create_req(method, params),
+                headers=headers,
+                timeout=self._aiohttp.ClientTimeout(
+                    sock_connect=betting.connect_timeout,
+                    sock_read=betting.read_timeout,
+                ),
+            ) as response:
+                status_code = response.status
+                content = await response.read()
+        except Exception as e:
+            raise APIError(None, method, params, e)
+        elapsed_time = time.monotonic() - time_sent
+        if status_code != 200:
+            raise StatusCodeError(status_code)
+        try:
+            response_json = json.loads(content.decode("utf-8"))
+        except ValueError:
+            raise InvalidResponse(content.decode("utf-8", errors="replace"))
+        if not response_json.get("result") and response_json.get("error"):
+            raise APIError(response_json, method, params)
+        return betting.process_response(response_json, resource, elapsed_time, None)
+
+    def refresh_http_sessions(self) -> None:
+        """requests.Sessions are not used, instead top up
+        the pooled connections to min_execution_sessions.
+        """
+        url = self._session_refresh_url
+        if url is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._refresh_connections(url), self.loop)
+
+    async def _refresh_connections(self, url: str) -> None:
+        # concurrent requests so that each opens/uses its own connection
+        results = await asyncio.gather(
+            *(
+                self._refresh_connection(url)
+                for _ in range(min(config.min_execution_sessions, self._max_workers))
+            ),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(
+                    "Async connection refresh error",
+                    extra={"url": url, "exception": result},
+                )
+                break
+
+    async def _refresh_connection(self, url: str) -> None:
+        connect_timeout, read_timeout = SESSION_REFRESH_TIMEOUT
+        async with self._get_session().head(
+            url,
+            timeout=self._aiohttp.ClientTimeout(
+                sock_connect=connect_timeout, sock_read=read_timeout
+            ),
+        ):
+            pass
+
+    # requests: (method, params, resource)
+    def _place_request(self, order_package: BaseOrderPackage) -> tuple:
+        params = clean_locals(
+            dict(
+                market_id=order_package.market_id,
+                instructions=order_package.place_instructions,
+                customer_ref=order_package.id.hex,
+                market_version=order_package.market_version,
+                customer_strategy_ref=order_package.customer_strategy_ref,
+                async_=order_package.async_,
+            )
+        )
+        return "placeOrders", params, resources.PlaceOrders
+
+    def _cancel_request(self, order_package: BaseOrderPackage) -> tuple:
+        # temp copy to prevent an empty list of instructions sent
+        # this can occur if order is matched during the execution
+        # cycle, resulting in all orders being cancelled!
+        cancel_instructions = list(order_package.cancel_instructions)
+        if not cancel_instructions:
+            logger.warning("Empty cancel_instructions", extra=order_package.info)
+            raise OrderExecutionError()
+        params = clean_locals(
+            dict(
+                market_id=order_package.market_id,
+                instructions=cancel_instructions,
+                customer_ref=order_package.id.hex,
+            )
+        )
+        return "cancelOrders", params, resources.CancelOrders
+
+    def _update_request(self, order_package: BaseOrderPackage) -> tuple:
+        params = clean_locals(
+            dict(
+                market_id=order_package.market_id,
+                instructions=order_package.update_instructions,
+                customer_ref=order_package.id.hex,
+            )
+        )
+        return "updateOrders", params, resources.UpdateOrders
+
+    def _replace_request(self, order_package: BaseOrderPackage) -> tuple:
+        params = clean_locals(
+            dict(
+                market_id=order_package.market_id,
+                instructions=order_package.replace_instructions,
+                customer_ref=order_package.id.hex,
+                market_version=order_package.market_version,
+                async_=order_package.async_,
+            )
+        )
+        return "replaceOrders", params, resources.ReplaceOrders
+
+    _requests = {
+        OrderPackageType.PLACE: ("place", "_process_place_response"),
+        OrderPackageType.CANCEL: ("cancel", "_process_cancel_response"),
+        OrderPackageType.UPDATE: ("update", "_process_update_response"),
+        OrderPackageType.REPLACE: ("replace", "_process_replace_response"),
+    }
+
+    def shutdown(self, timeout: Optional[float] = 10):
+        super().shutdown()
+        if self._loop is None:
+            return
+        # wait for in flight order packages
+        start = time.monotonic()
+        while self._pending and time.monotonic() - start < timeout:
+            time.sleep(0.01)
+        if self._session is not None:
+            session, self._session = self._session, None
+            future = asyncio.run_coroutine_threadsafe(session.close(), self._loop)
+            try:
+                future.result(timeout)
+            except Exception as e:
+                logger.warning("Async session close error", extra={"exception": e})
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join(timeout)
@@ -1,16 +1,28 @@
 import time
 import logging
 import requests
+import threading
+import collections
+from typing import Callable, Optional
 from concurrent.futures import ThreadPoolExecutor
 
 from .. import config
 from ..order.orderpackage import BaseOrderPackage, OrderPackageType, BaseOrder
 from ..events.events import OrderEvent
+from .scheduler import Scheduler
 
 logger = logging.getLogger(__name__)
 
 MAX_SESSION_AGE = 200  # seconds since last request
+SESSION_REFRESH_TIMEOUT = (3.05, 5)  # connect / read
 BET_ID_START = 100000000000  # simulated start betId->
+# thread pool lanes in priority order, risk reducing first
+LANES = (
+    OrderPackageType.CANCEL,
+    OrderPackageType.REPLACE,
+    OrderPackageType.UPDATE,
+    OrderPackageType.PLACE,
+)
 
 
 class BaseExecution:
@@ -20,15 +32,24 @@ class BaseExecution:
         self.flumine = flumine
         self._max_workers = max_workers
         self._thread_pool = ThreadPoolExecutor(max_workers=self._max_workers)
+        self._thread_pool_lock = threading.Lock()
+        self.thread_pool_stats = {
+            "submitted": 0,
+            "completed": 0,
+            "active": 0,
+            "max_active": 0,
+            "busy_seconds": 0.0,
+        }
+        self._lanes = {package_type: collections.deque() for package_type in LANES}
+        self._scheduler = Scheduler(name="%sScheduler" % self.__class__.__name__)
         self._bet_id = BET_ID_START
-        self._sessions = []
+        self._sessions = collections.deque()  # oldest returned first
         self._sessions_created = 0
 
     def handler(self, order_package: BaseOrderPackage):
         """Handles order_package, capable of place, cancel,
         replace and update.
         """
-        http_session = self._get_http_session()
         if order_package.package_type == OrderPackageType.PLACE:
             func = self.execute_place
         elif order_package.package_type == OrderPackageType.CANCEL:
@@ -39,12 +60,25 @@ class BaseExecution:
             func = self.execute_replace
         else:
             raise NotImplementedError()
-        self._thread_pool.submit(func, order_package, http_session)
+        if order_package.retry_count == 0:
+            self.flumine.latency.record(
+                "transaction", time.monotonic() - order_package._monotonic_created
+            )
+        delay = self._get_rate_limit_delay(order_package)
+        if delay > 0:
+            self.flumine.latency.record("rate_limit", delay)
+        self.schedule(
+            delay,
+            self._submit,
+            self._execute_with_session,
+            order_package,
+            func,
+        )
         logger.info(
             "Thread pool submit",
             extra={
                 "trading_function": func.__name__,
-                "session": http_session,
+                "rate_limit_delay": delay,
                 "latency": round(order_package.elapsed_seconds, 4),
                 "order_package": order_package.info,
                 "thread_pool": {
@@ -74,23 +108,112 @@ class BaseExecution:
     ) -> None:
         raise NotImplementedError
 
+    def _execute_with_session(
+        self, order_package: BaseOrderPackage, func: Callable
+    ) -> None:
+        # session taken when the package runs, not
+        # whilst rate limited or waiting in a lane
+        func(order_package, self._get_http_session())
+
+    def _submit(self, func: Callable, order_package: BaseOrderPackage, *args) -> None:
+        lane = self._lanes[order_package.package_type]
+        order_package.monotonic_submitted = queued = time.monotonic()
+        with self._thread_pool_lock:
+            self.thread_pool_stats["submitted"] += 1
+            lane.append((queued, func, order_package, args))
+        self._thread_pool.submit(self._run_next)
+
+    def _run_next(self) -> None:
+        # one call per _submit, runs the oldest package
+        # from the highest priority lane with work
+        with self._thread_pool_lock:
+            for package_type, lane in self._lanes.items():
+                if lane:
+                    queued, func, order_package, args = lane.popleft()
+                    break
+            else:
+                return
+        self.flumine.latency.record_since(
+            "queue_%s" % package_type.value.lower(), queued
+        )
+        self._run(func, order_package, *args)
+
+    def _run(self, func: Callable, *args) -> None:
+        stats = self.thread_pool_stats
+        with self._thread_pool_lock:
+            stats["active"] += 1
+            if stats["active"] > stats["max_active"]:
+                stats["max_active"] = stats["active"]
+        start = time.monotonic()
+        try:
+            func(*args)
+        finally:
+            with self._thread_pool_lock:
+                stats["active"] -= 1
+                stats["completed"] += 1
+                stats["busy_seconds"] += time.monotonic() - start
+
+    def schedule(self, delay: float, func: Callable, *args) -> None:
+        """Call func after delay (seconds) without
+        occupying a thread pool worker.
+        """
+        if delay > 0:
+            self._scheduler.schedule(delay, func, *args)
+        else:
+            func(*args)
+
+    @staticmethod
+    def _get_rate_limit_delay(order_package: BaseOrderPackage) -> float:
+        # only place/replace are transactions, retries have been counted
+        if (
+            order_package.package_type
+            in (OrderPackageType.PLACE, OrderPackageType.REPLACE)
+            and order_package.retry_count == 0
+        ):
+            return order_package.client.reserve_transactions(len(order_package))
+        return 0
+
+    @property
+    def thread_pool_info(self) -> dict:
+        return {
+            "max_workers": self._max_workers,
+            "num_threads": len(self._thread_pool._threads),
+            "work_queue_size": self._thread_pool._work_queue.qsize(),
+            "scheduled": len(self._scheduler),
+            "lanes": {
+                package_type.value: len(lane)
+                for package_type, lane in self._lanes.items()
+            },
+            **self.thread_pool_stats,
+        }
+
+    def _record_execution_start(self, order_package: BaseOrderPackage) -> None:
+        if order_package.monotonic_submitted:
+            self.flumine.latency.record_since(
+                "thread_pool", order_package.monotonic_submitted
+            )
+
     def _get_http_session(self) -> requests.Session:
         while self._sessions:
             try:
-                _session = self._sessions.pop(0)
-                if (time.time() - _session.time_returned) > MAX_SESSION_AGE:
-                    self._return_http_session(_session, err=True)
-                    continue
-                else:
-                    return _session
+                # most recently returned, connection most likely open
+                _session = self._sessions.pop()
             except IndexError:
+                break
+            if (time.time() - _session.time_returned) > MAX_SESSION_AGE:
+                self._return_http_session(_session, err=True)
                 continue
+            else:
+                return _session
         return self._create_new_session()
 
     def _create_new_session(self) -> requests.Session:
         session = requests.Session()
         session.time_created = time.time()
         session.time_returned = time.time()
+        session.request_count = 0
+        session.request_seconds = 0.0
+        session.refresh_count = 0
         self._sessions_created += 1
         logger.info(
             "New requests.Session created",
@@ -107,7 +230,9 @@ class BaseExecution:
     def _return_http_session(
         self, http_session: requests.Session, err: bool = False
     ) -> None:
-        if err or len(self._sessions) >= self._max_workers:
+        if err or len(self._sessions) >= (
+            config.max_execution_sessions or self._max_workers
+        ):
             logger.info(
                 "Deleting requests.Session",
                 extra={
@@ -115,15 +240,84 @@ class BaseExecution:
                     "session": http_session,
                     "session_time_created": http_session.time_created,
                     "session_time_returned": http_session.time_returned,
+                    "session_request_count": getattr(http_session, "request_count", 0),
+                    "session_request_seconds": getattr(
+                        http_session, "request_seconds", 0
+                    ),
                     "live_sessions_count": len(self._sessions),
                     "err": err,
                 },
             )
-            del http_session
+            http_session.close()
         else:
             http_session.time_returned = time.time()
             self._sessions.append(http_session)
 
+    @staticmethod
+    def _record_session_request(http_session: requests.Session, seconds: float) -> None:
+        http_session.request_count += 1
+        http_session.request_seconds += seconds
+
+    @property
+    def _session_refresh_url(self) -> Optional[str]:
+        # url requested to open/refresh a session connection
+        return None
+
+    def refresh_http_sessions(self) -> None:
+        """Refresh pooled sessions idle for longer than
+        execution_session_refresh (before MAX_SESSION_AGE)
+        and top up the pool to min_execution_sessions so
+        that requests after a quiet period do not pay
+        connection setup, called by a worker.
+        """
+        url = self._session_refresh_url
+        if url is None:
+            return
+        now = time.time()
+        for _ in range(len(self._sessions)):
+            try:
+                session = self._sessions.popleft()  # oldest returned
+            except IndexError:
+                break
+            if now - session.time_returned < config.execution_session_refresh:
+                self._sessions.appendleft(session)
+                break
+            self._refresh_http_session(session, url)
+        for _ in range(config.min_execution_sessions - len(self._sessions)):
+            if not self._refresh_http_session(self._create_new_session(), url):
+                break
+
+    def _refresh_http_session(self, http_session: requests.Session, url: str) -> bool:
+        try:
+            http_session.head(url, timeout=SESSION_REFRESH_TIMEOUT)
+        except Exception as e:
+            logger.warning(
+                "requests.Session refresh error",
+                extra={"session": http_session, "url": url, "exception": e},
+            )
+            self._return_http_session(http_session, err=True)
+            return False
+        http_session.refresh_count += 1
+        self._return_http_session(http_session)
+        return True
+
+    @property
+    def session_info(self) -> dict:
+        sessions = list(self._sessions)
+        request_count = sum(s.request_count for s in sessions)
+        request_seconds = sum(s.request_seconds for s in sessions)
+        return {
+            "sessions": len(sessions),
+            "sessions_created": self._sessions_created,
+            "request_count": request_count,
+            "mean_request_seconds": (
+                request_seconds / request_count if request_count else None
+            ),
+            "oldest_returned": (
+                time.time() - sessions[0].time_returned if sessions else None
+            ),
+        }
+
     def _order_logger(
         self, order: BaseOrder, instruction_report, package_type: OrderPackageType
     ):
@@ -155,4 +349,5 @@ class BaseExecution:
 
     def shutdown(self):
         logger.info("Shutting down Execution (%s)" % self.__class__.__name__)
+        self._scheduler.shutdown()
         self._thread_pool.shutdown(wait=True)
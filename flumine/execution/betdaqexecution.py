@@ -1,3 +1,4 @@
+import time
 import logging
 import requests
 from typing import Callable
@@ -132,8 +133,11 @@ class BetdaqExecution(BaseExecution):
         trading_function: Callable,
         order_package: BaseOrderPackage,
     ):
+        self._record_execution_start(order_package)
         try:
+            start = time.monotonic()
             response = trading_function(order_package)
+            self.flumine.latency.record_since("request", start)
         except BetdaqError as e:
             logger.error(
                 "Execution error",
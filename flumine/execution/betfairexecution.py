@@ -1,6 +1,7 @@
+import time
 import logging
 import requests
-from typing import Callable
+from typing import Callable, Optional
 from betfairlightweight import BetfairError
 
 from .baseexecution import BaseExecution
@@ -19,29 +20,32 @@ class BetfairExecution(BaseExecution):
     ) -> None:
         response = self._execution_helper(self.place, order_package, http_session)
         if response:
-            for order, instruction_report in zip(
-                order_package, response.place_instruction_reports
-            ):
-                with order.trade:
-                    self._order_logger(
-                        order, instruction_report, OrderPackageType.PLACE
-                    )
-                    if instruction_report.status == "SUCCESS":
-                        if instruction_report.order_status == "PENDING":
-                            pass  # async request pending processing
-                        elif instruction_report.order_status == "EXPIRED":
-                            # avoids setting FOK orders to executable after process.py set them as complete
-                            order.execution_complete()
-                        else:
-                            order.executable()  # let process.py pick it up
-                    elif instruction_report.status == "FAILURE":
+            self._process_place_response(order_package, response)
+
+    def _process_place_response(
+        self, order_package: BaseOrderPackage, response
+    ) -> None:
+        for order, instruction_report in zip(
+            order_package, response.place_instruction_reports
+        ):
+            with order.trade:
+                self._order_logger(order, instruction_report, OrderPackageType.PLACE)
+                if instruction_report.status == "SUCCESS":
+                    if instruction_report.order_status == "PENDING":
+                        pass  # async request pending processing
+                    elif instruction_report.order_status == "EXPIRED":
+                        # avoids setting FOK orders to executable after process.py set them as complete
                         order.execution_complete()
-                    elif instruction_report.status == "TIMEOUT":
-                        # https://docs.developer.betfair.com/display/1smk3cen4v3lu3yomq5qye0ni/Betting+Enums#BettingEnums-ExecutionReportStatus
-                        pass
+                    else:
+                        order.executable()  # let process.py pick it up
+                elif instruction_report.status == "FAILURE":
+                    order.execution_complete()
+                elif instruction_report.status == "TIMEOUT":
+                    # https://docs.developer.betfair.com/display/1smk3cen4v3lu3yomq5qye0ni/Betting+Enums#BettingEnums-ExecutionReportStatus
+                    pass
 
-            # update transaction counts
-            order_package.client.add_transaction(len(order_package))
+        # update transaction counts
+        order_package.client.add_transaction(len(order_package))
 
     def place(self, order_package: BaseOrderPackage, session: requests.Session):
         return order_package.client.betting_client.betting.place_orders(
@@ -59,43 +63,44 @@ class BetfairExecution(BaseExecution):
     ) -> None:
         response = self._execution_helper(self.cancel, order_package, http_session)
         if response:
-            failed_transaction_count = 0
-            order_lookup = {o.bet_id: o for o in order_package}
-            for instruction_report in response.cancel_instruction_reports:
-                # get order (can't rely on the order they are returned)
-                order = order_lookup.pop(instruction_report.instruction.bet_id)
-                with order.trade:
-                    self._order_logger(
-                        order, instruction_report, OrderPackageType.CANCEL
-                    )
-                    if instruction_report.status == "SUCCESS":
-                        if (
-                            instruction_report.size_cancelled == order.size_remaining
-                            or order.size_remaining
-                            == 0  # handle orders stream update / race condition
-                        ):
-                            order.execution_complete()
-                        else:
-                            order.executable()
-                    elif instruction_report.status == "FAILURE":
-                        if instruction_report.error_code == "BET_TAKEN_OR_LAPSED":
-                            order.execution_complete()
-                        else:
-                            order.executable()
-                        failed_transaction_count += 1
-                    elif instruction_report.status == "TIMEOUT":
-                        order.executable()
+            self._process_cancel_response(order_package, response)
 
-            # reset any not returned so that they can be picked back up
-            for order in order_lookup.values():
-                with order.trade:
+    def _process_cancel_response(
+        self, order_package: BaseOrderPackage, response
+    ) -> None:
+        failed_transaction_count = 0
+        order_lookup = {o.bet_id: o for o in order_package}
+        for instruction_report in response.cancel_instruction_reports:
+            # get order (can't rely on the order they are returned)
+            order = order_lookup.pop(instruction_report.instruction.bet_id)
+            with order.trade:
+                self._order_logger(order, instruction_report, OrderPackageType.CANCEL)
+                if instruction_report.status == "SUCCESS":
+                    if (
+                        instruction_report.size_cancelled == order.size_remaining
+                        or order.size_remaining
+                        == 0  # handle orders stream update / race condition
+                    ):
+                        order.execution_complete()
+                    else:
+                        order.executable()
+                elif instruction_report.status == "FAILURE":
+                    if instruction_report.error_code == "BET_TAKEN_OR_LAPSED":
+                        order.execution_complete()
+                    else:
+                        order.executable()
+                    failed_transaction_count += 1
+                elif instruction_report.status == "TIMEOUT":
                     order.executable()
 
-            # update transaction counts
-            if failed_transaction_count:
-                order_package.client.add_transaction(
-                    failed_transaction_count, failed=True
-                )
+        # reset any not returned so that they can be picked back up
+        for order in order_lookup.values():
+            with order.trade:
+                order.executable()
+
+        # update transaction counts
+        if failed_transaction_count:
+            order_package.client.add_transaction(failed_transaction_count, failed=True)
 
     def cancel(self, order_package: BaseOrderPackage, session: requests.Session):
         # temp copy to prevent an empty list of instructions sent
@@ -117,27 +122,28 @@ class BetfairExecution(BaseExecution):
     ) -> None:
         response = self._execution_helper(self.update, order_package, http_session)
         if response:
-            failed_transaction_count = 0
-            for order, instruction_report in zip(
-                order_package, response.update_instruction_reports
-            ):
-                with order.trade:
-                    self._order_logger(
-                        order, instruction_report, OrderPackageType.UPDATE
-                    )
-                    if instruction_report.status == "SUCCESS":
-                        order.executable()
-                    elif instruction_report.status == "FAILURE":
-                        order.executable()
-                        failed_transaction_count += 1
-                    elif instruction_report.status == "TIMEOUT":
-                        order.executable()
+            self._process_update_response(order_package, response)
 
-            # update transaction counts
-            if failed_transaction_count:
-                order_package.client.add_transaction(
-                    failed_transaction_count, failed=True
-                )
+    def _process_update_response(
+        self, order_package: BaseOrderPackage, response
+    ) -> None:
+        failed_transaction_count = 0
+        for order, instruction_report in zip(
+            order_package, response.update_instruction_reports
+        ):
+            with order.trade:
+                self._order_logger(order, instruction_report, OrderPackageType.UPDATE)
+                if instruction_report.status == "SUCCESS":
+                    order.executable()
+                elif instruction_report.status == "FAILURE":
+                    order.executable()
+                    failed_transaction_count += 1
+                elif instruction_report.status == "TIMEOUT":
+                    order.executable()
+
+        # update transaction counts
+        if failed_transaction_count:
+            order_package.client.add_transaction(failed_transaction_count, failed=True)
 
     def update(self, order_package: BaseOrderPackage, session: requests.Session):
         return order_package.client.betting_client.betting.update_orders(
@@ -152,69 +158,59 @@ class BetfairExecution(BaseExecution):
     ) -> None:
         response = self._execution_helper(self.replace, order_package, http_session)
         if response:
-            failed_transaction_count = 0
-            market = self.flumine.markets.markets[order_package.market_id]
-            for order, instruction_report in zip(
-                order_package, response.replace_instruction_reports
-            ):
-                with order.trade:
-                    # process cancel response
-                    if (
-                        instruction_report.cancel_instruction_reports.status
-                        == "SUCCESS"
-                    ):
-                        self._order_logger(
-                            order,
-                            instruction_report.cancel_instruction_reports,
-                            OrderPackageType.CANCEL,
-                        )
-                        order.execution_complete()
-                    elif (
-                        instruction_report.cancel_instruction_reports.status
-                        == "FAILURE"
-                    ):
-                        order.executable()
-                        failed_transaction_count += 1
-                    elif (
-                        instruction_report.cancel_instruction_reports.status
-                        == "TIMEOUT"
-                    ):
-                        order.executable()
+            self._process_replace_response(order_package, response)
 
-                    # process place response
-                    if instruction_report.place_instruction_reports.status == "SUCCESS":
-                        # create new order
-                        replacement_order = order.trade.create_order_replacement(
-                            order,
-                            instruction_report.place_instruction_reports.instruction.limit_order.price,
-                            instruction_report.place_instruction_reports.instruction.limit_order.size,
-                            order_package.date_time_created,
-                        )
-                        self._order_logger(
-                            replacement_order,
-                            instruction_report.place_instruction_reports,
-                            OrderPackageType.REPLACE,
-                        )
-                        # add to blotter
-                        market.place_order(
-                            replacement_order, execute=False, client=order.client
-                        )
-                        replacement_order.executable()
-                    elif (
-                        instruction_report.place_instruction_reports.status == "FAILURE"
-                    ):
-                        pass  # todo
-                    elif (
-                        instruction_report.place_instruction_reports.status == "TIMEOUT"
-                    ):
-                        pass  # todo
+    def _process_replace_response(
+        self, order_package: BaseOrderPackage, response
+    ) -> None:
+        failed_transaction_count = 0
+        market = self.flumine.markets.markets[order_package.market_id]
+        for order, instruction_report in zip(
+            order_package, response.replace_instruction_reports
+        ):
+            with order.trade:
+                # process cancel response
+                if instruction_report.cancel_instruction_reports.status == "SUCCESS":
+                    self._order_logger(
+                        order,
+                        instruction_report.cancel_instruction_reports,
+                        OrderPackageType.CANCEL,
+                    )
+                    order.execution_complete()
+                elif instruction_report.cancel_instruction_reports.status == "FAILURE":
+                    order.executable()
+                    failed_transaction_count += 1
+                elif instruction_report.cancel_instruction_reports.status == "TIMEOUT":
+                    order.executable()
 
-            # update transaction counts
-            order_package.client.add_transaction(len(order_package))
-            if failed_transaction_count:
-                order_package.client.add_transaction(
-                    failed_transaction_count, failed=True
-                )
+                # process place response
+                if instruction_report.place_instruction_reports.status == "SUCCESS":
+                    # create new order
+                    replacement_order = order.trade.create_order_replacement(
+                        order,
+                        instruction_report.place_instruction_reports.instruction.limit_order.price,
+                        instruction_report.place_instruction_reports.instruction.limit_order.size,
+                        order_package.date_time_created,
+                    )
+                    self._order_logger(
+                        replacement_order,
+                        instruction_report.place_instruction_reports,
+                        OrderPackageType.REPLACE,
+                    )
+                    # add to blotter
+                    market.place_order(
+                        replacement_order, execute=False, client=order.client
+                    )
+                    replacement_order.executable()
+                elif instruction_report.place_instruction_reports.status == "FAILURE":
+                    pass  # todo
+                elif instruction_report.place_instruction_reports.status == "TIMEOUT":
+                    pass  # todo
+
+        # update transaction counts
+        order_package.client.add_transaction(len(order_package))
+        if failed_transaction_count:
+            order_package.client.add_transaction(failed_transaction_count, failed=True)
 
     def replace(self, order_package: BaseOrderPackage, session: requests.Session):
         return order_package.client.betting_client.betting.replace_orders(
@@ -226,12 +222,19 @@ class BetfairExecution(BaseExecution):
             session=session,
         )
 
+    @property
+    def _session_refresh_url(self) -> Optional[str]:
+        client = self.flumine.clients.get_betfair_default()
+        if client and client.betting_client:
+            return client.betting_client.betting.url
+
     def _execution_helper(
         self,
         trading_function: Callable,
         order_package: BaseOrderPackage,
         http_session: requests.Session,
     ):
+        self._record_execution_start(order_package)
         if order_package.elapsed_seconds > 0.1 and order_package.retry_count == 0:
             logger.warning(
                 "High latency between current time and OrderPackage creation time, it is likely that the thread pool is currently exhausted",
@@ -248,7 +251,11 @@ class BetfairExecution(BaseExecution):
             )
         if order_package.orders:
             try:
+                start = time.monotonic()
                 response = trading_function(order_package, http_session)
+                elapsed = time.monotonic() - start
+                self.flumine.latency.record("request", elapsed)
+                self._record_session_request(http_session, elapsed)
             except BetfairError as e:
                 logger.error(
                     "Execution error",
@@ -259,8 +266,9 @@ class BetfairExecution(BaseExecution):
                     },
                     exc_info=True,
                 )
-                if order_package.retry():
-                    self.handler(order_package)
+                back_off = order_package.retry_count
+                if order_package.retry(back_off=False):
+                    self.schedule(back_off, self.handler, order_package)
                 else:
                     # reset orders
                     if order_package.package_type == OrderPackageType.PLACE:
@@ -0,0 +1,83 @@
+"""
+Single thread timer used by the execution classes to
+run delayed work (retry back-off, paper trade bet
+delay / latency) at its due time rather than sleeping
+in an execution thread.
+"""
+
+import time
+import heapq
+import logging
+import itertools
+import threading
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class Scheduler:
+    """
+    Calls are held in a heap ordered by due time
+    (time.monotonic) and run in the scheduler thread,
+    they should be quick (e.g. submit to a thread
+    pool). The thread is started on first schedule.
+    """
+
+    def __init__(self, name: str = "Scheduler"):
+        self.name = name
+        self.scheduled = 0
+        self.executed = 0
+        self._queue = []  # heap [(due, count, func, args)..]
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._running = True
+
+    def schedule(self, delay: float, func: Callable, *args) -> None:
+        due = time.monotonic() + delay
+        with self._condition:
+            if not self._running:
+                raise RuntimeError("Scheduler has been shutdown")
+            heapq.heappush(self._queue, (due, next(self._counter), func, args))
+            self.scheduled += 1
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    name=self.name, target=self._run, daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while True:
+                    if not self._queue:
+                        if not self._running:
+                            return
+                        self._condition.wait()
+                        continue
+                    timeout = self._queue[0][0] - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    self._condition.wait(timeout)
+                _, _, func, args = heapq.heappop(self._queue)
+            try:
+                func(*args)
+            except Exception as e:
+                logger.error(
+                    "Scheduler error",
+                    extra={"scheduler": self.name, "function": func, "exception": e},
+                    exc_info=True,
+                )
+            self.executed += 1
+
+    def shutdown(self) -> None:
+        """Waits for scheduled calls to be run."""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        if self._thread:
+            self._thread.join()
+
+    def __len__(self) -> int:
+        return len(self._queue)
@@ -1,4 +1,3 @@
-import time
 import requests
 from typing import Optional
 
@@ -25,15 +24,32 @@ class SimulatedExecution(BaseExecution):
             raise NotImplementedError()
 
         if order_package.client.paper_trade:
-            self._thread_pool.submit(func, order_package, None)
+            # bet delay / latency applied by the scheduler
+            self.schedule(
+                self._get_delay(order_package)
+                + self._get_rate_limit_delay(order_package),
+                self._submit,
+                func,
+                order_package,
+                None,
+            )
         else:
             func(order_package, http_session=None)
 
+    @staticmethod
+    def _get_delay(order_package: BaseOrderPackage) -> float:
+        if order_package.package_type == OrderPackageType.PLACE:
+            return order_package.bet_delay + config.place_latency
+        elif order_package.package_type == OrderPackageType.CANCEL:
+            return config.cancel_latency
+        elif order_package.package_type == OrderPackageType.UPDATE:
+            return config.update_latency
+        else:  # todo should the cancel happen without a delay?
+            return order_package.bet_delay + config.replace_latency
+
     def execute_place(
         self, order_package, http_session: Optional[requests.Session]
     ) -> None:
-        if order_package.client.paper_trade:
-            time.sleep(order_package.bet_delay + config.place_latency)
         market = self.flumine.markets.markets[order_package.market_id]
         for order, instruction in zip(order_package, order_package.place_instructions):
             with order.trade:
@@ -55,8 +71,6 @@ class SimulatedExecution(BaseExecution):
     def execute_cancel(
         self, order_package, http_session: Optional[requests.Session]
     ) -> None:
-        if order_package.client.paper_trade:
-            time.sleep(config.cancel_latency)
         market = self.flumine.markets.markets[order_package.market_id]
         failed_transaction_count = 0
         for order in order_package:
@@ -81,8 +95,6 @@ class SimulatedExecution(BaseExecution):
     def execute_update(
         self, order_package, http_session: Optional[requests.Session]
     ) -> None:
-        if order_package.client.paper_trade:
-            time.sleep(config.update_latency)
         market = self.flumine.markets.markets[order_package.market_id]
         failed_transaction_count = 0
         for order, instruction in zip(order_package, order_package.update_instructions):
@@ -106,10 +118,6 @@ class SimulatedExecution(BaseExecution):
     def execute_replace(
         self, order_package, http_session: Optional[requests.Session]
     ) -> None:
-        if (
-            order_package.client.paper_trade
-        ):  # todo should the cancel happen without a delay?
-            time.sleep(order_package.bet_delay + config.replace_latency)
         market = self.flumine.markets.markets[order_package.market_id]
         failed_transaction_count = 0
         for order, instruction in zip(
@@ -218,6 +218,27 @@ class Transaction:
             self._pending_orders = False
         return len(packages)
 
+    def reset(self) -> None:
+        """Reset orders pending execution, place orders
+        are completed and cancel / update / replace
+        orders returned to executable (as per a failed
+        order package).
+        """
+        for pending, complete in (
+            (self._pending_place, True),
+            (self._pending_cancel, False),
+            (self._pending_update, False),
+            (self._pending_replace, False),
+        ):
+            for order, _ in pending:
+                with order.trade:
+                    if complete:
+                        order.execution_complete()
+                    else:
+                        order.executable()
+            pending.clear()
+        self._pending_orders = False
+
     def _validate_controls(self, order, package_type: OrderPackageType) -> bool:
         # return False on violation
         try:
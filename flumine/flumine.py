@@ -1,9 +1,12 @@
+import time
+import queue
 import logging
+from typing import List, Tuple
 
 from .baseflumine import BaseFlumine
 from .clients import BetdaqClient
-from .events.events import EventType
-from . import worker
+from .events.events import BaseEvent, EventType, MarketBookEvent
+from . import config, worker
 
 logger = logging.getLogger(__name__)
 
@@ -24,11 +27,18 @@ class Flumine(BaseFlumine):
         """
         Main run thread
         """
-        handler_queue_get = self.handler_queue.get
+        if config.coalesce_market_books:
+            handler_queue_get = self._get_coalesced_event
+        else:
+            handler_queue_get = self.handler_queue.get
+        latency_record = self.latency.record
         with self:
             while True:
                 event = handler_queue_get()
                 event_type = event.EVENT_TYPE
+                latency_record(
+                    "handler_queue", time.monotonic() - event._monotonic_created
+                )
 
                 if event_type == MARKET_BOOK_EVENT:
                     self._process_market_books(event)
@@ -65,6 +75,27 @@ class Flumine(BaseFlumine):
 
                 del event
 
+    def _get_coalesced_event(self) -> BaseEvent:
+        if not self._handler_queue_buffer:
+            events = self._drain_handler_queue()
+            coalesced, skipped = coalesce_market_book_events(events)
+            self._handler_queue_buffer.extend(coalesced)
+            self.handler_queue_stats["batches"] += 1
+            self.handler_queue_stats["events"] += len(events)
+            self.handler_queue_stats["market_books_skipped"] += skipped
+        return self._handler_queue_buffer.popleft()
+
+    def _drain_handler_queue(self) -> List[BaseEvent]:
+        # block until an event is available then take what is waiting
+        events = [self.handler_queue.get()]
+        handler_queue_get_nowait = self.handler_queue.get_nowait
+        while len(events) < config.handler_queue_batch_size:
+            try:
+                events.append(handler_queue_get_nowait())
+            except queue.Empty:
+                break
+        return events
+
     def _add_default_workers(self):
         client_timeouts = [
             client.betting_client.session_timeout
@@ -85,6 +116,22 @@ class Flumine(BaseFlumine):
                 start_delay=10,  # wait for streams to populate
             )
         )
+        self.add_worker(
+            worker.BackgroundWorker(self, function=worker.log_latency, interval=60)
+        )
+        if config.metrics_port:
+            self.add_worker(
+                worker.BackgroundWorker(
+                    self,
+                    function=worker.serve_metrics,
+                    interval=0,
+                    shutdown_function=worker.close_metrics,
+                    func_kwargs={
+                        "host": config.metrics_host,
+                        "port": config.metrics_port,
+                    },
+                )
+            )
         if not all([client.market_recording_mode for client in self.clients]):
             self.add_worker(
                 worker.BackgroundWorker(
@@ -102,6 +149,14 @@ class Flumine(BaseFlumine):
                     start_delay=10,  # wait for login
                 )
             )
+            self.add_worker(
+                worker.BackgroundWorker(
+                    self,
+                    function=worker.refresh_execution_sessions,
+                    interval=30,
+                    start_delay=10,  # wait for login
+                )
+            )
         if any(isinstance(client, BetdaqClient) for client in self.clients):
             self.add_worker(
                 worker.BackgroundWorker(
@@ -117,3 +172,44 @@ class Flumine(BaseFlumine):
 
     def __str__(self) -> str:
         return "<Flumine>"
+
+
+def coalesce_market_book_events(events: List[BaseEvent]) -> Tuple[list, int]:
+    """Merge consecutive MarketBookEvents (same exchange)
+    keeping the latest MarketBook per stream/market, all
+    other events are returned untouched and in order.
+    Returns the events and number of MarketBooks skipped.
+    """
+    coalesced, run, skipped = [], [], 0
+    for event in events:
+        if event.EVENT_TYPE == MARKET_BOOK_EVENT:
+            if run and event.exchange != run[0].exchange:
+                skipped += _merge_market_book_events(run, coalesced)
+                run = []
+            run.append(event)
+        else:
+            if run:
+                skipped += _merge_market_book_events(run, coalesced)
+                run = []
+            coalesced.append(event)
+    if run:
+        skipped += _merge_market_book_events(run, coalesced)
+    return coalesced, skipped
+
+
+def _merge_market_book_events(run: List[MarketBookEvent], coalesced: list) -> int:
+    if len(run) == 1:
+        coalesced.append(run[0])
+        return 0
+    market_books, count = {}, 0
+    for event in run:
+        for market_book in event.event:
+            key = (market_book.streaming_unique_id, market_book.market_id)
+            market_books.pop(key, None)  # order by latest update
+            market_books[key] = market_book
+            count += 1
+    event = MarketBookEvent(list(market_books.values()), run[0].exchange)
+    event._time_created = run[0]._time_created  # retain time queued
+    event._monotonic_created = run[0]._monotonic_created
+    coalesced.append(event)
+    return count - len(market_books)
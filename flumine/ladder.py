@@ -0,0 +1,133 @@
+"""
+Precomputed tick ladders, prices are held as floats with
+a {price: index} table so that validity, tick index and
+ticks away lookups are O(1) rather than a Decimal
+construction and list scan per call.
+"""
+
+import math
+import bisect
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Iterable, List, Optional, Sequence
+
+TIE_TOLERANCE = 1e-6  # distance from a half tick before Decimal is used
+
+
+def _as_float(price) -> float:
+    if type(price) is float or type(price) is int:
+        return price
+    return float(Decimal(str(price)))
+
+
+def nearest_price(
+    price, cutoffs: Sequence, min_price: float, max_price: float
+) -> float:
+    """Round price to the nearest tick (half up) using
+    float arithmetic, prices close to a half tick fall
+    back to Decimal so results match `as_dec` rounding.
+    """
+    if price <= min_price:
+        return min_price
+    if price > max_price:
+        return max_price
+    for cutoff, step in cutoffs:
+        if price < cutoff:
+            break
+    if type(price) is float or type(price) is int:
+        scaled = price * step
+        if abs(scaled - math.floor(scaled) - 0.5) > TIE_TOLERANCE:
+            ticks = math.floor(scaled + 0.5)
+            if step >= 1 and step == int(step):
+                return ticks / step
+            multiplier = 1 / step
+            if multiplier == int(multiplier):
+                return float(ticks * int(multiplier))
+    step = Decimal(str(step))
+    price = Decimal(str(price))
+    return float((price * step).quantize(2, ROUND_HALF_UP) / step)
+
+
+class PriceLadder:
+    """
+    Immutable tick ladder (ascending prices), cutoffs
+    ((cutoff, 1 / tick size)..) are used for nearest
+    tick rounding if provided.
+    """
+
+    def __init__(self, prices: Iterable[float], cutoffs: Optional[Sequence] = None):
+        self.prices = tuple(prices)
+        self.cutoffs = cutoffs
+        self._index = {price: i for i, price in enumerate(self.prices)}
+
+    @property
+    def min_price(self) -> float:
+        return self.prices[0]
+
+    @property
+    def max_price(self) -> float:
+        return self.prices[-1]
+
+    def is_valid(self, price) -> bool:
+        return _as_float(price) in self._index
+
+    def index(self, price) -> int:
+        try:
+            return self._index[price]
+        except KeyError:
+            raise ValueError("%s is not in ladder" % price)
+
+    def ticks_away(self, price, n_ticks: int) -> float:
+        """Price n ticks away (capped at min/max price),
+        raises ValueError if price is not on the ladder.
+        """
+        new_index = self.index(price) + n_ticks
+        if new_index < 0:
+            return self.prices[0]
+        try:
+            return self.prices[new_index]
+        except IndexError:
+            return self.prices[-1]
+
+    def ticks_between(self, price_one, price_two) -> int:
+        return self.index(price_two) - self.index(price_one)
+
+    def tick_range(self, price, ticks_below: int, ticks_above: int) -> List[float]:
+        """Prices from ticks_below to ticks_above around
+        price (inclusive, capped at min/max price).
+        """
+        index = self.index(price)
+        return list(self.prices[max(index - ticks_below, 0) : index + ticks_above + 1])
+
+    def nearest(self, price) -> float:
+        if self.cutoffs:
+            return nearest_price(price, self.cutoffs, self.min_price, self.max_price)
+        price = _as_float(price)
+        i = bisect.bisect_left(self.prices, price)
+        if i == 0:
+            return self.prices[0]
+        elif i == len(self.prices):
+            return self.prices[-1]
+        lower, upper = self.prices[i - 1], self.prices[i]
+        return upper if upper - price <= price - lower else lower
+
+    # batch
+    def is_valid_many(self, prices: Iterable) -> List[bool]:
+        index = self._index
+        return [_as_float(price) in index for price in prices]
+
+    def ticks_away_many(self, prices: Iterable, n_ticks: int) -> List[float]:
+        ticks_away = self.ticks_away
+        return [ticks_away(price, n_ticks) for price in prices]
+
+    def nearest_many(self, prices: Iterable) -> List[float]:
+        nearest = self.nearest
+        return [nearest(price) for price in prices]
+
+    def __contains__(self, price) -> bool:
+        return self.is_valid(price)
+
+    def __iter__(self):
+        return iter(self.prices)
+
+    def __len__(self) -> int:
+        return len(self.prices)
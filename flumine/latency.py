@@ -0,0 +1,142 @@
+"""
+Lightweight latency histograms for the live pipeline,
+durations (seconds, time.monotonic deltas) are counted
+into log spaced buckets so p50/p99 can be reported
+(~5% precision) without storing samples.
+"""
+
+import math
+import time
+import threading
+from typing import Dict, Optional
+
+from . import config
+
+MIN_LATENCY = 1e-6  # upper bound of the first bucket
+BUCKET_GROWTH = 1.05
+BUCKET_COUNT = 400  # ~300s upper bound
+_LOG_GROWTH = math.log(BUCKET_GROWTH)
+
+# stage: measured between
+STAGES = {
+    "stream": "listener output put -> handler_queue put",
+    "handler_queue": "handler_queue put -> handler dequeue",
+    "strategy": "strategy callback start -> end",
+    "transaction": "transaction execute -> thread pool submit",
+    "rate_limit": "transaction rate limit delay (place/replace)",
+    "thread_pool": "thread pool submit (after any rate limit delay) -> execution start",
+    "queue_<lane>": "thread pool lane (cancel/replace/update/place) wait",
+    "request": "api request -> api response",
+}
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        if seconds <= MIN_LATENCY:
+            index = 0
+        else:
+            index = min(
+                int(math.log(seconds / MIN_LATENCY) / _LOG_GROWTH) + 1,
+                BUCKET_COUNT - 1,
+            )
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """Upper bound of the bucket containing the
+        percentile (0-1), capped at the max recorded.
+        """
+        if not self.count:
+            return None
+        rank = max(math.ceil(percentile * self.count), 1)
+        cumulative = 0
+        for index, count in enumerate(self._counts):
+            cumulative += count
+            if cumulative >= rank:
+                return min(MIN_LATENCY * BUCKET_GROWTH**index, self.max)
+        return self.max
+
+    @property
+    def info(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.percentile(0.5),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+        }
+
+
+class CallbackTiming:
+    """
+    Call count and total/max duration (seconds) of
+    a strategy callback.
+    """
+
+    __slots__ = ["calls", "total", "max"]
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.calls += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def info(self) -> dict:
+        return {
+            "calls": self.calls,
+            "total": self.total,
+            "mean": self.total / self.calls if self.calls else None,
+            "max": self.max,
+        }
+
+
+class Latency:
+    """
+    Per stage latency histograms, stages are
+    created on first record (config.record_latency).
+    """
+
+    def __init__(self):
+        self._histograms: Dict[str, LatencyHistogram] = {}
+
+    def record(self, stage: str, seconds: float) -> None:
+        if not config.record_latency:
+            return
+        try:
+            histogram = self._histograms[stage]
+        except KeyError:
+            histogram = self._histograms.setdefault(stage, LatencyHistogram())
+        histogram.record(seconds)
+
+    def record_since(self, stage: str, start: float) -> None:
+        """Record time since start (time.monotonic)."""
+        self.record(stage, time.monotonic() - start)
+
+    def get(self, stage: str) -> Optional[LatencyHistogram]:
+        return self._histograms.get(stage)
+
+    def reset(self) -> None:
+        self._histograms = {}
+
+    @property
+    def info(self) -> dict:
+        return {
+            stage: histogram.info for stage, histogram in list(self._histograms.items())
+        }
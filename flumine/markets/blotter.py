@@ -1,13 +1,10 @@
 import logging
+import threading
 from typing import Iterable, Optional, List
 from collections import defaultdict
 
 from ..order.ordertype import OrderTypes
-from ..utils import (
-    calculate_unmatched_exposure,
-    calculate_matched_exposure,
-    STRATEGY_NAME_HASH_LENGTH,
-)
+from ..utils import STRATEGY_NAME_HASH_LENGTH
 from ..order.order import BaseOrder, OrderStatus
 
 logger = logging.getLogger(__name__)
@@ -21,6 +18,10 @@ PENDING_STATUS = [
 ]
 ORDER_TYPE_LIMIT = OrderTypes.LIMIT
 ORDER_TYPES_SP = (OrderTypes.LIMIT_ON_CLOSE, OrderTypes.MARKET_ON_CLOSE)
+# status partition indexes
+STRATEGY, STRATEGY_SELECTION, CLIENT, CLIENT_STRATEGY = range(4)
+# exposure contribution (matched back/lay, unmatched back/lay, sp win/lose)
+NO_EXPOSURE = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
 
 
 class Blotter:
@@ -44,11 +45,26 @@ class Blotter:
         # cached lists/dicts for faster lookup
         self._trades = defaultdict(list)  # {Trade.id: [Order,]}
         self._bet_id_lookup = {}  # {Order.bet_id: Order, }
-        self._live_orders = []
+        self._live_orders = {}  # {Order.id: Order}
         self._strategy_orders = defaultdict(list)
         self._strategy_selection_orders = defaultdict(list)
         self._client_orders = defaultdict(list)
         self._client_strategy_orders = defaultdict(list)
+        # status partitions of the above
+        self._order_sequence = {}  # {Order.id: insertion count}
+        self._order_status = {}  # {Order.id: OrderStatus}
+        self._status_orders = {}  # {(index, key, OrderStatus): {Order.id: Order}}
+        # order_status_changed called by execution threads
+        self._status_lock = threading.Lock()
+        # exposure cache
+        self._exposures = defaultdict(lambda: list(NO_EXPOSURE))
+        self._order_exposures = {}  # {Order.id: exposure contribution}
+        self._dirty_orders = defaultdict(
+            dict
+        )  # {(strategy, selectionId, handicap): {Order.id: Order}}
+        # strategies with orders updated since last process_orders dispatch
+        self._dirty_strategies = set()
+        self._dirty_lock = threading.Lock()  # order_updated called by execution threads
 
     def get_order_bet_id(self, bet_id: str) -> Optional[BaseOrder]:
         try:
@@ -63,9 +79,10 @@ class Blotter:
         matched_only: Optional[bool] = None,
     ) -> list:
         """Returns all orders related to a strategy."""
-        orders = self._strategy_orders[strategy]
         if order_status:
-            orders = [o for o in orders if o.status in order_status]
+            orders = self._get_status_orders(STRATEGY, strategy, order_status)
+        else:
+            orders = self._strategy_orders[strategy]
         if matched_only:
             orders = [o for o in orders if o.size_matched > 0]
         return orders
@@ -79,9 +96,11 @@ class Blotter:
         matched_only: Optional[bool] = None,
     ) -> list:
         """Returns all orders related to a strategy selection."""
-        orders = self._strategy_selection_orders[(strategy, selection_id, handicap)]
+        key = (strategy, selection_id, handicap)
         if order_status:
-            orders = [o for o in orders if o.status in order_status]
+            orders = self._get_status_orders(STRATEGY_SELECTION, key, order_status)
+        else:
+            orders = self._strategy_selection_orders[key]
         if matched_only:
             orders = [o for o in orders if o.size_matched > 0]
         return orders
@@ -92,9 +111,10 @@ class Blotter:
         order_status: Optional[List[OrderStatus]] = None,
         matched_only: Optional[bool] = None,
     ) -> list:
-        orders = self._client_orders[client]
         if order_status:
-            orders = [o for o in orders if o.status in order_status]
+            orders = self._get_status_orders(CLIENT, client, order_status)
+        else:
+            orders = self._client_orders[client]
         if matched_only:
             orders = [o for o in orders if o.size_matched > 0]
         return orders
@@ -106,21 +126,69 @@ class Blotter:
         order_status: Optional[List[OrderStatus]] = None,
         matched_only: Optional[bool] = None,
     ) -> list:
-        orders = self._client_strategy_orders[(client, strategy)]
+        key = (client, strategy)
         if order_status:
-            orders = [o for o in orders if o.status in order_status]
+            orders = self._get_status_orders(CLIENT_STRATEGY, key, order_status)
+        else:
+            orders = self._client_strategy_orders[key]
         if matched_only:
             orders = [o for o in orders if o.size_matched > 0]
         return orders
 
+    def _get_status_orders(self, index: int, key, order_status: list) -> list:
+        # orders in insertion order
+        orders = []
+        with self._status_lock:
+            for status in set(order_status):
+                status_orders = self._status_orders.get((index, key, status))
+                if status_orders:
+                    orders.extend(status_orders.values())
+        order_sequence = self._order_sequence
+        orders.sort(key=lambda o: order_sequence[o.id])
+        return orders
+
+    def order_status_changed(self, order) -> None:
+        """Move order between status partitions,
+        called on order status update.
+        """
+        with self._status_lock:
+            old_status = self._order_status.get(order.id)
+            if order.id in self._order_status and old_status != order.status:
+                self._order_status[order.id] = order.status
+                for index, key in self._index_keys(order):
+                    self._status_orders[(index, key, old_status)].pop(order.id, None)
+                    self._add_status_order(index, key, order)
+        self.order_changed(order)
+        self.order_updated(order)
+
+    def _add_status_order(self, index: int, key, order) -> None:
+        try:
+            self._status_orders[(index, key, order.status)][order.id] = order
+        except KeyError:
+            self._status_orders[(index, key, order.status)] = {order.id: order}
+
+    @staticmethod
+    def _index_keys(order) -> tuple:
+        strategy = order.trade.strategy
+        return (
+            (STRATEGY, strategy),
+            (STRATEGY_SELECTION, (strategy, order.selection_id, order.handicap)),
+            (CLIENT, order.client),
+            (CLIENT_STRATEGY, (order.client, strategy)),
+        )
+
     @property
     def live_orders(self) -> Iterable:
-        return iter(list(self._live_orders))
+        return iter(list(self._live_orders.values()))
 
     @property
     def has_live_orders(self) -> bool:
         return bool(self._live_orders)
 
+    @property
+    def live_order_count(self) -> int:
+        return len(self._live_orders)
+
     def process_closed_market(self, market, market_book) -> None:
         number_of_winners = len(
             [runner for runner in market_book.runners if runner.status == "WINNER"]
@@ -196,49 +264,41 @@ class Blotter:
 
     def get_exposures(self, strategy, lookup: tuple, exclusion=None) -> dict:
         """Returns strategy/selection exposures as a dict."""
-        mb, ml = [], []  # matched bets, (price, size)
-        ub, ul = [], []  # unmatched bets, (price, size)
-        moc_win_liability = 0.0
-        moc_lose_liability = 0.0
-        for order in self.strategy_selection_orders(strategy, *lookup[1:]):
-            if order == exclusion:
-                continue
-            if order.status in PENDING_STATUS:
-                continue
-            if order.order_type.ORDER_TYPE == ORDER_TYPE_LIMIT:
-                _size_matched = order.size_matched  # cache
-                _order_side = order.side
-                if _size_matched:
-                    if order.order_type.price_ladder_definition == "LINE_RANGE":
-                        average_price_matched = 2.0
-                    else:
-                        average_price_matched = order.average_price_matched
-                    if _order_side == "BACK":
-                        mb.append((average_price_matched, _size_matched))
-                    else:
-                        ml.append((average_price_matched, _size_matched))
-                if not order.complete:
-                    _size_remaining = order.size_remaining  # cache
-                    if order.order_type.price_ladder_definition == "LINE_RANGE":
-                        order_type_price = 2.0
-                    else:
-                        order_type_price = order.order_type.price
-                    if order_type_price and _size_remaining:
-                        if _order_side == "BACK":
-                            ub.append((order_type_price, _size_remaining))
-                        else:
-                            ul.append((order_type_price, _size_remaining))
-            elif order.order_type.ORDER_TYPE in ORDER_TYPES_SP:
-                if order.side == "BACK":
-                    moc_lose_liability -= order.order_type.liability
-                else:
-                    moc_win_liability -= order.order_type.liability
-            else:
-                raise ValueError(
-                    "Unexpected order type: %s" % order.order_type.ORDER_TYPE
-                )
-        matched_exposure = calculate_matched_exposure(mb, ml)
-        unmatched_exposure = calculate_unmatched_exposure(ub, ul)
+        key = (strategy, *lookup[1:])
+        self._update_exposures(key)
+        (
+            back_exp,
+            back_profit,
+            lay_exp,
+            lay_profit,
+            unmatched_back_exp,
+            unmatched_lay_exp,
+            moc_win_liability,
+            moc_lose_liability,
+        ) = self._exposures[key]
+        if (
+            exclusion is not None
+            and exclusion.id in self._order_exposures
+            and (exclusion.trade.strategy, exclusion.selection_id, exclusion.handicap)
+            == key
+        ):
+            excluded = self._order_exposures[exclusion.id]
+            back_exp -= excluded[0]
+            back_profit -= excluded[1]
+            lay_exp -= excluded[2]
+            lay_profit -= excluded[3]
+            unmatched_back_exp -= excluded[4]
+            unmatched_lay_exp -= excluded[5]
+            moc_win_liability -= excluded[6]
+            moc_lose_liability -= excluded[7]
+        matched_exposure = (
+            round(back_profit + lay_exp, 2),
+            round(lay_profit + back_exp, 2),
+        )
+        unmatched_exposure = (
+            round(unmatched_lay_exp, 2),
+            round(unmatched_back_exp, 2),
+        )
 
         worst_possible_profit_on_win = (
             matched_exposure[0] + unmatched_exposure[0] + moc_win_liability
@@ -256,10 +316,111 @@ class Blotter:
             "worst_possible_profit_on_lose": worst_possible_profit_on_lose,
         }
 
+    def order_changed(self, order) -> None:
+        """Flag order for exposure recalculation,
+        called on status/matched/remaining changes.
+        """
+        self._dirty_orders[(order.trade.strategy, order.selection_id, order.handicap)][
+            order.id
+        ] = order
+
+    def order_updated(self, order) -> None:
+        """Flag order strategy as dirty, called on
+        status/matched changes.
+        """
+        with self._dirty_lock:
+            self._dirty_strategies.add(order.trade.strategy)
+
+    def pop_dirty_strategies(self) -> set:
+        """Returns strategies with orders updated
+        since the last call.
+        """
+        with self._dirty_lock:
+            dirty_strategies, self._dirty_strategies = self._dirty_strategies, set()
+        return dirty_strategies
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._dirty_strategies)
+
+    def _update_exposures(self, key: tuple) -> None:
+        # apply changed orders to the cached aggregates
+        dirty_orders = self._dirty_orders.get(key)
+        if dirty_orders:
+            exposures = self._exposures[key]
+            order_exposures = self._order_exposures
+            for order_id in list(dirty_orders):
+                # unflag before calculating so a change flagged by an
+                # execution thread during the calculation is kept
+                order = dirty_orders.pop(order_id, None)
+                if order is None:
+                    continue
+                old = order_exposures.get(order_id, NO_EXPOSURE)
+                new = order_exposures[order_id] = self._calculate_order_exposure(order)
+                if old != new:
+                    for i in range(8):
+                        exposures[i] += new[i] - old[i]
+
+    @staticmethod
+    def _calculate_order_exposure(order) -> tuple:
+        """Returns order contribution to the selection
+        exposure, see utils.calculate_matched_exposure
+        and utils.calculate_unmatched_exposure.
+        """
+        if order.status in PENDING_STATUS:
+            return NO_EXPOSURE
+        back_exp, back_profit, lay_exp, lay_profit = 0.0, 0.0, 0.0, 0.0
+        unmatched_back_exp, unmatched_lay_exp = 0.0, 0.0
+        if order.order_type.ORDER_TYPE == ORDER_TYPE_LIMIT:
+            _size_matched = order.size_matched  # cache
+            _order_side = order.side
+            if _size_matched:
+                if order.order_type.price_ladder_definition == "LINE_RANGE":
+                    average_price_matched = 2.0
+                else:
+                    average_price_matched = order.average_price_matched
+                if _order_side == "BACK":
+                    back_exp = -_size_matched
+                    back_profit = (average_price_matched - 1) * _size_matched
+                else:
+                    lay_exp = (average_price_matched - 1) * -_size_matched
+                    lay_profit = _size_matched
+            if not order.complete:
+                _size_remaining = order.size_remaining  # cache
+                if order.order_type.price_ladder_definition == "LINE_RANGE":
+                    order_type_price = 2.0
+                else:
+                    order_type_price = order.order_type.price
+                if order_type_price and _size_remaining:
+                    if _order_side == "BACK":
+                        unmatched_back_exp = -_size_remaining
+                    else:
+                        unmatched_lay_exp = (order_type_price - 1) * -_size_remaining
+            return (
+                back_exp,
+                back_profit,
+                lay_exp,
+                lay_profit,
+                unmatched_back_exp,
+                unmatched_lay_exp,
+                0.0,
+                0.0,
+            )
+        elif order.order_type.ORDER_TYPE in ORDER_TYPES_SP:
+            if order.side == "BACK":
+                return NO_EXPOSURE[:7] + (-order.order_type.liability,)
+            else:
+                return NO_EXPOSURE[:6] + (-order.order_type.liability, 0.0)
+        else:
+            raise ValueError("Unexpected order type: %s" % order.order_type.ORDER_TYPE)
+
     """ getters / setters """
 
     def complete_order(self, order) -> None:
-        self._live_orders.remove(order)
+        del self._live_orders[order.id]
+
+    def has_live_order(self, order) -> bool:
+        return order.id in self._live_orders
 
     def has_order(self, customer_order_ref: str) -> bool:
         return customer_order_ref in self._orders
@@ -273,7 +434,7 @@ class Blotter:
         self.active = True
         self._orders[customer_order_ref] = order
         self._bet_id_lookup[order.bet_id] = order
-        self._live_orders.append(order)
+        self._live_orders[order.id] = order
         strategy = order.trade.strategy
         self._trades[order.trade.id].append(order)
         self._strategy_orders[strategy].append(order)
@@ -283,6 +444,14 @@ class Blotter:
         client = order.client
         self._client_orders[client].append(order)
         self._client_strategy_orders[(client, strategy)].append(order)
+        with self._status_lock:
+            self._order_sequence[order.id] = len(self._order_sequence)
+            self._order_status[order.id] = order.status
+            for index, key in self._index_keys(order):
+                self._add_status_order(index, key, order)
+        order.blotter = self
+        self.order_changed(order)
+        self.order_updated(order)
 
     def __getitem__(self, customer_order_ref: str):
         return self._orders[customer_order_ref]
@@ -1,12 +1,15 @@
 import datetime
 import logging
+import threading
 from typing import Optional
 from collections import defaultdict
+from contextlib import contextmanager
 from pathlib import Path
 from betfairlightweight.resources.bettingresources import MarketBook, MarketCatalogue
 
 from .. import config
 from .blotter import Blotter
+from ..exceptions import FlumineException
 from ..execution.transaction import Transaction
 
 logger = logging.getLogger(__name__)
@@ -40,6 +43,8 @@ class Market:
         self.context = {"simulated": {}}  # data store (raceCard / scores etc)
         self.blotter = Blotter(market_id)
         self._transaction_id = 0
+        # (thread ident, {client: Transaction}) when coalescing
+        self._coalesced_transactions = None
 
     def __call__(self, market_book: MarketBook):
         if self.market_book and market_book.version != self.market_book.version:
@@ -78,6 +83,75 @@ class Market:
             client=client,
         )
 
+    @contextmanager
+    def coalesce_transactions(self, coalesce: bool = True):
+        """Orders placed / cancelled / updated / replaced
+        via the market (market.place_order etc.) by this
+        thread whilst in the context are added to a single
+        transaction per client which is executed on exit,
+        used by flumine around each market dispatch (all
+        strategies) when config.coalesce_transactions is
+        set. If the context raises the pending orders are
+        reset rather than executed.
+        """
+        if not coalesce or self._coalesced_transactions is not None:
+            yield
+            return
+        transactions = {}
+        self._coalesced_transactions = (threading.get_ident(), transactions)
+        try:
+            yield
+        except BaseException:
+            self._coalesced_transactions = None
+            for transaction in transactions.values():
+                transaction.reset()
+            raise
+        self._coalesced_transactions = None
+        self._execute_coalesced_transactions(transactions)
+
+    def _execute_coalesced_transactions(self, transactions: dict) -> None:
+        # each client transaction executed independently
+        error = None
+        for transaction in transactions.values():
+            if not transaction._pending_orders:
+                continue
+            try:
+                transaction.execute()
+            except FlumineException as e:
+                logger.error(
+                    "FlumineException %s in coalesced transaction (%s)",
+                    e,
+                    self.market_id,
+                    exc_info=True,
+                )
+                transaction.reset()
+            except Exception as e:
+                logger.critical(
+                    "Unknown error %s in coalesced transaction (%s)",
+                    e,
+                    self.market_id,
+                    exc_info=True,
+                )
+                transaction.reset()
+                error = e
+        if error is not None and config.raise_errors:
+            raise error
+
+    def _get_coalesced_transactions(self) -> Optional[dict]:
+        # only the thread coalescing, orders placed by execution
+        # threads (e.g. replace responses) are executed as normal
+        coalesced = self._coalesced_transactions
+        if coalesced is not None and coalesced[0] == threading.get_ident():
+            return coalesced[1]
+
+    def _get_coalesced_transaction(self, transactions: dict, client) -> Transaction:
+        if client is None:
+            client = self.flumine.clients.get_default()
+        transaction = transactions.get(client)
+        if transaction is None:
+            transaction = transactions[client] = self.transaction(client=client)
+        return transaction
+
     # order
     def place_order(
         self,
@@ -87,12 +161,22 @@ class Market:
         force: bool = False,
         client=None,
     ) -> bool:
+        transactions = self._get_coalesced_transactions()
+        if transactions is not None:
+            return self._get_coalesced_transaction(transactions, client).place_order(
+                order, market_version, execute, force
+            )
         with self.transaction(client=client) as t:
             return t.place_order(order, market_version, execute, force)
 
     def cancel_order(
         self, order, size_reduction: float = None, force: bool = False
     ) -> bool:
+        transactions = self._get_coalesced_transactions()
+        if transactions is not None:
+            return self._get_coalesced_transaction(
+                transactions, order.client
+            ).cancel_order(order, size_reduction, force)
         with self.transaction(client=order.client) as t:
             return t.cancel_order(order, size_reduction, force)
 
@@ -111,6 +195,22 @@ class Market:
         set_to_be_sp_if_unmatched: bool = None,
         force: bool = False,
     ) -> bool:
+        transactions = self._get_coalesced_transactions()
+        if transactions is not None:
+            return self._get_coalesced_transaction(
+                transactions, order.client
+            ).update_order(
+                order,
+                new_persistence_type,
+                size_delta,
+                new_price,
+                expected_selection_reset_count,
+                expected_withdrawal_sequence_number,
+                cancel_on_in_running,
+                cancel_if_selection_reset,
+                set_to_be_sp_if_unmatched,
+                force,
+            )
         with self.transaction(client=order.client) as t:
             return t.update_order(
                 order,
@@ -128,6 +228,11 @@ class Market:
     def replace_order(
         self, order, new_price: float, market_version: int = None, force: bool = False
     ) -> bool:
+        transactions = self._get_coalesced_transactions()
+        if transactions is not None:
+            return self._get_coalesced_transaction(
+                transactions, order.client
+            ).replace_order(order, new_price, market_version, force)
         with self.transaction(client=order.client) as t:
             return t.replace_order(order, new_price, market_version, force)
 
@@ -5,6 +5,7 @@ from betfairlightweight.resources.bettingresources import RunnerBook
 
 from ..order.order import OrderStatus, OrderTypes
 from ..utils import wap, call_strategy_error_handling
+from ..simulation.utils import get_runner_index
 from ..streams.historicalstream import (
     HistoricListener,
     FlumineHistoricalGeneratorStream,
@@ -92,6 +93,8 @@ class SimulatedMiddleware(Middleware):
     ) -> None:
         for order in market.blotter:
             if order.simulated:
+                market.blotter.order_changed(order)
+                market.blotter.order_updated(order)
                 if order.lookup == (
                     market.market_id,
                     removal_selection_id,
@@ -116,12 +119,9 @@ class SimulatedMiddleware(Middleware):
                         order.order_type.ORDER_TYPE == OrderTypes.MARKET_ON_CLOSE
                     ) and order.side == "LAY":
                         if market.market_type == "WIN":
-                            runner = [
-                                x
-                                for x in market.market_book.runners
-                                if x.selection_id == order.selection_id
-                                and x.handicap == order.handicap
-                            ][0]
+                            runner = get_runner_index(market.market_book)[
+                                (order.selection_id, order.handicap)
+                            ]
                             runner_adjustment_factor = runner.adjustment_factor
                             # See https://github.com/betcode-org/flumine/issues/454
                             multiplier = 1 - (
@@ -161,10 +161,16 @@ class SimulatedMiddleware(Middleware):
                         and removal_adjustment_factor >= WIN_MINIMUM_ADJUSTMENT_FACTOR
                     ):
                         # todo place market
-                        for match in order.simulated.matched:
-                            match[1] = self._calculate_reduction_factor(
-                                match[1], removal_adjustment_factor
-                            )
+                        order.simulated.matched = [
+                            [
+                                publish_time,
+                                self._calculate_reduction_factor(
+                                    price, removal_adjustment_factor
+                                ),
+                                size,
+                            ]
+                            for publish_time, price, size in order.simulated.matched
+                        ]
                         _, order.simulated.average_price_matched = wap(
                             order.simulated.matched
                         )
@@ -196,25 +202,46 @@ class SimulatedMiddleware(Middleware):
                     o for o in orders if o.status in LIVE_STATUS and o.simulated
                 ]
                 if live_orders:
-                    _lookup = {
-                        k: (v.runner, v.traded.copy())
-                        for k, v in market_analytics.items()
-                    }
-                    live_orders_sorted = self._sort_orders(live_orders)
-                    for order in live_orders_sorted:
-                        runner_traded = _lookup[(order.selection_id, order.handicap)]
-                        order.simulated(market.market_book, runner_traded)
+                    self._match_orders(market, market_analytics, live_orders)
         else:  # isolation per instance
-            live_orders = list(market.blotter.live_orders)
+            live_orders = [
+                o
+                for o in market.blotter.live_orders
+                if o.status in LIVE_STATUS and o.simulated
+            ]
             if live_orders:
-                _lookup = {
-                    k: (v.runner, v.traded.copy()) for k, v in market_analytics.items()
-                }
-                live_orders_sorted = self._sort_orders(live_orders)
-                for order in live_orders_sorted:
-                    if order.status in LIVE_STATUS and order.simulated:
-                        runner_traded = _lookup[(order.selection_id, order.handicap)]
-                        order.simulated(market.market_book, runner_traded)
+                self._match_orders(market, market_analytics, live_orders)
+
+    def _match_orders(self, market, market_analytics: dict, live_orders: list) -> None:
+        # traded is copied on first use (matching consumes it) and
+        # only for runners with live orders and volume traded
+        market_book, blotter = market.market_book, market.blotter
+        _lookup = {}
+        for order in self._sort_orders(live_orders):
+            key = (order.selection_id, order.handicap)
+            try:
+                runner_traded = _lookup[key]
+            except KeyError:
+                runner_analytics = market_analytics[key]
+                traded = runner_analytics.traded
+                runner_traded = _lookup[key] = (
+                    runner_analytics.runner,
+                    traded.copy() if traded else traded,
+                )
+            simulated = order.simulated
+            sizes = (
+                simulated.size_matched,
+                simulated.size_lapsed,
+                simulated.size_cancelled,
+            )
+            simulated(market_book, runner_traded)
+            blotter.order_changed(order)
+            if sizes != (
+                simulated.size_matched,
+                simulated.size_lapsed,
+                simulated.size_cancelled,
+            ):
+                blotter.order_updated(order)
 
     @staticmethod
     def _sort_orders(orders: list) -> list:
@@ -312,17 +339,15 @@ class SimulatedSportsDataMiddleware(Middleware):
                 if update.market_id != market.market_id:
                     continue
                 if pt > update.publish_time_epoch:
-                    for strategy in market.flumine.strategies:
-                        if (
-                            market.market_book.streaming_unique_id
-                            in strategy.stream_ids
+                    for strategy in market.flumine.strategies.stream_strategies(
+                        market.market_book.streaming_unique_id
+                    ):
+                        if call_strategy_error_handling(
+                            strategy.check_sports_data, market, update
                         ):
-                            if call_strategy_error_handling(
-                                strategy.check_sports_data, market, update
-                            ):
-                                call_strategy_error_handling(
-                                    strategy.process_sports_data, market, update
-                                )
+                            call_strategy_error_handling(
+                                strategy.process_sports_data, market, update
+                            )
                 else:
                     return
             try:
@@ -0,0 +1,247 @@
+"""
+Prometheus text format metrics for live instances,
+served on a local HTTP endpoint (/metrics) by the
+`serve_metrics` worker.
+"""
+
+import logging
+from typing import List, Optional
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .controls.clientcontrols import MaxTransactionCount
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+SERVER_TIMEOUT = 0.5  # seconds handle_request waits before the worker loops
+
+
+class Metric:
+    def __init__(self, name: str, metric_type: str, documentation: str):
+        self.name = name
+        self.metric_type = metric_type
+        self.documentation = documentation
+        self.samples = []  # [(labels, value)..]
+
+    def add(self, value, **labels) -> None:
+        self.samples.append((labels, value))
+
+    def __str__(self):
+        lines = [
+            "# HELP {0} {1}".format(self.name, self.documentation),
+            "# TYPE {0} {1}".format(self.name, self.metric_type),
+        ]
+        for labels, value in self.samples:
+            lines.append(
+                "{0}{1} {2}".format(self.name, _format_labels(labels), float(value))
+            )
+        return "\n".join(lines)
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{%s}" % ",".join(
+        '{0}="{1}"'.format(
+            key,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for key, value in labels.items()
+    )
+
+
+def collect_metrics(flumine) -> List[Metric]:
+    # handler queue
+    handler_queue = Metric(
+        "flumine_handler_queue_size", "gauge", "Events waiting in the handler_queue"
+    )
+    handler_queue.add(flumine.handler_queue.qsize())
+    handler_queue_events = Metric(
+        "flumine_handler_queue_stats_total",
+        "counter",
+        "Coalesced handler_queue batches, events and skipped MarketBooks",
+    )
+    for stat, value in flumine.handler_queue_stats.items():
+        handler_queue_events.add(value, stat=stat)
+    # streams
+    output_queue = Metric(
+        "flumine_stream_output_queue_size",
+        "gauge",
+        "Updates waiting in the stream output queue",
+    )
+    updates = Metric(
+        "flumine_stream_updates_processed_total",
+        "counter",
+        "Streaming updates processed",
+    )
+    for stream in list(flumine.streams):
+        labels = {"stream_id": stream.stream_id, "stream": stream.__class__.__name__}
+        if stream._output_queue is not None:
+            output_queue.add(stream._output_queue.qsize(), **labels)
+        updates_processed = _get_updates_processed(stream)
+        if updates_processed is not None:
+            updates.add(updates_processed, **labels)
+    # execution
+    threads = Metric(
+        "flumine_execution_threads", "gauge", "Execution thread pool threads"
+    )
+    max_workers = Metric(
+        "flumine_execution_max_workers", "gauge", "Execution thread pool max workers"
+    )
+    work_queue = Metric(
+        "flumine_execution_work_queue_size",
+        "gauge",
+        "Order packages waiting for an execution thread",
+    )
+    active = Metric(
+        "flumine_execution_active_workers",
+        "gauge",
+        "Execution threads currently executing",
+    )
+    busy = Metric(
+        "flumine_execution_busy_seconds_total",
+        "counter",
+        "Time execution threads have spent executing",
+    )
+    lanes = Metric(
+        "flumine_execution_lane_queue_size",
+        "gauge",
+        "Order packages waiting for an execution thread per priority lane",
+    )
+    scheduled = Metric(
+        "flumine_execution_scheduled",
+        "gauge",
+        "Delayed executions (retry / paper trade) waiting on the scheduler",
+    )
+    sessions = Metric(
+        "flumine_execution_sessions",
+        "gauge",
+        "Pooled execution requests.Sessions",
+    )
+    sessions_created = Metric(
+        "flumine_execution_sessions_created_total",
+        "counter",
+        "Execution requests.Sessions created",
+    )
+    for execution in (
+        flumine.betfair_execution,
+        flumine.betdaq_execution,
+        flumine.simulated_execution,
+    ):
+        labels = {"execution": execution.__class__.__name__}
+        thread_pool = execution._thread_pool
+        threads.add(len(thread_pool._threads), **labels)
+        max_workers.add(execution._max_workers, **labels)
+        work_queue.add(thread_pool._work_queue.qsize(), **labels)
+        active.add(execution.thread_pool_stats["active"], **labels)
+        busy.add(execution.thread_pool_stats["busy_seconds"], **labels)
+        for package_type, lane in execution._lanes.items():
+            lanes.add(len(lane), lane=package_type.value, **labels)
+        scheduled.add(len(execution._scheduler), **labels)
+        sessions.add(len(execution._sessions), **labels)
+        sessions_created.add(execution._sessions_created, **labels)
+    # transactions
+    transactions = Metric(
+        "flumine_transactions", "gauge", "Transactions in the current hour"
+    )
+    transactions_total = Metric(
+        "flumine_transactions_total", "counter", "Transactions since start"
+    )
+    rate_limited = Metric(
+        "flumine_transactions_rate_limited_total",
+        "counter",
+        "Transactions delayed by the transaction_rate limit",
+    )
+    for client in list(flumine.clients):
+        for control in client.trading_controls:
+            if isinstance(control, MaxTransactionCount):
+                labels = {
+                    "username": client.username,
+                    "exchange": client.EXCHANGE.value if client.EXCHANGE else None,
+                }
+                transactions.add(control.current_transaction_count, **labels)
+                transactions.add(
+                    control.current_failed_transaction_count, failed=True, **labels
+                )
+                transactions_total.add(control.transaction_count, **labels)
+                transactions_total.add(
+                    control.failed_transaction_count, failed=True, **labels
+                )
+                rate_limited.add(control.rate_limited_count, **labels)
+    # markets
+    live_orders = Metric(
+        "flumine_market_live_orders", "gauge", "Live orders per open market"
+    )
+    for market in flumine.markets:
+        if not market.closed:
+            live_orders.add(market.blotter.live_order_count, market_id=market.market_id)
+    # logging controls
+    logging_queue = Metric(
+        "flumine_logging_queue_size",
+        "gauge",
+        "Events waiting in the logging control queue",
+    )
+    for logging_control in list(flumine._logging_controls):
+        logging_queue.add(
+            logging_control.logging_queue.qsize(), logging_control=logging_control.NAME
+        )
+    return [
+        handler_queue,
+        handler_queue_events,
+        output_queue,
+        updates,
+        threads,
+        max_workers,
+        work_queue,
+        active,
+        busy,
+        lanes,
+        scheduled,
+        sessions,
+        sessions_created,
+        transactions,
+        transactions_total,
+        rate_limited,
+        live_orders,
+        logging_queue,
+    ]
+
+
+def _get_updates_processed(stream) -> Optional[int]:
+    # betfairlightweight stream created on connection
+    try:
+        return stream._listener.stream._updates_processed
+    except AttributeError:
+        return None
+
+
+def format_metrics(metrics: List[Metric]) -> str:
+    return "\n".join(str(metric) for metric in metrics) + "\n"
+
+
+def create_metrics_server(flumine, host: str, port: int) -> ThreadingHTTPServer:
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            try:
+                body = format_metrics(collect_metrics(flumine)).encode()
+            except Exception as e:
+                logger.error("Metrics collection error: %s", e, exc_info=True)
+                self.send_error(500)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug("Metrics request: " + format, *args)
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    server.timeout = SERVER_TIMEOUT
+    logger.info("Serving metrics on http://%s:%s/metrics", host, server.server_port)
+    return server
@@ -103,6 +103,7 @@ class BaseOrder:
         self.date_time_status_update = datetime.datetime.utcnow()
 
         self.cleared_order = None
+        self.blotter = None  # set when added to market blotter
 
         self._sep = config.order_sep
         self.sep = sep
@@ -113,6 +114,8 @@ class BaseOrder:
         self.status = status
         self.date_time_status_update = datetime.datetime.utcnow()
         self.complete = self._is_complete()
+        if self.blotter is not None:
+            self.blotter.order_status_changed(self)
         if logger.isEnabledFor(logging.INFO):
             logger.info("Order status update: %s" % self.status.value, extra=self.info)
         if self.complete and self.trade.complete and status != OrderStatus.VIOLATION:
@@ -173,6 +176,13 @@ class BaseOrder:
     # currentOrder
     def update_current_order(self, current_order: CurrentOrder) -> None:
         self.responses.current_order = current_order
+        self._exposure_changed()
+        if self.blotter is not None:
+            self.blotter.order_updated(self)
+
+    def _exposure_changed(self) -> None:
+        if self.blotter is not None:
+            self.blotter.order_changed(self)
 
     def update_client(self, client) -> None:
         self.client = client
@@ -50,14 +50,16 @@ class BaseOrderPackage(BaseEvent):
         self._retry = True
         self._max_retries = 3  # will retry 3 times
         self._retry_count = 0
+        self.monotonic_submitted = None  # thread pool submit (latency)
         # following used for simulated execution
         self.processed = False
         self.bet_delay = bet_delay
         self.simulated_delay = self.calc_simulated_delay()
 
-    def retry(self):
+    def retry(self, back_off: bool = True):
         if self._retry and self._retry_count < self._max_retries:
-            time.sleep(self._retry_count)  # back-off
+            if back_off:
+                time.sleep(self._retry_count)
             self._retry_count += 1
             return True
         return False
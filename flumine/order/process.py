@@ -72,7 +72,7 @@ def process_current_orders(
             # complete order if required
             if order.complete:
                 market = markets.markets[order.market_id]
-                if order in market.blotter.live_orders:
+                if market.blotter.has_live_order(order):
                     market.blotter.complete_order(order)
 
 
@@ -171,7 +171,7 @@ def process_betdaq_current_orders(
         # complete order if required
         if order.complete:
             for market in markets:
-                if order in market.blotter.live_orders:
+                if market.blotter.has_live_order(order):
                     market.blotter.complete_order(order)
                     break
 
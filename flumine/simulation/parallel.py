@@ -0,0 +1,200 @@
+import os
+import time
+import logging
+import multiprocessing
+from typing import Callable, Iterator, List, Optional
+
+from betfairlightweight import resources
+
+from .. import config
+from ..clients import SimulatedClient
+from ..controls.loggingcontrols import LoggingControl
+
+logger = logging.getLogger(__name__)
+
+
+class SimulationResult:
+    """
+    Serialisable result of simulating a single
+    task (market or list of markets) in a worker
+    process, orders are stored as `order.info`
+    with the order profit added and logging control
+    events as (event name, info, exchange) tuples.
+    """
+
+    def __init__(
+        self,
+        markets: List[str],
+        cleared_markets: list = None,
+        orders: list = None,
+        elapsed_seconds: float = None,
+        error: str = None,
+        events: list = None,
+    ):
+        self.markets = markets
+        self.cleared_markets = cleared_markets or []
+        self.orders = orders or []
+        self.events = events or []
+        self.elapsed_seconds = elapsed_seconds
+        self.error = error
+
+    @property
+    def profit(self) -> float:
+        return round(sum(c["profit"] for c in self.cleared_markets), 2)
+
+    @property
+    def info(self) -> dict:
+        return {
+            "markets": self.markets,
+            "market_count": len(self.cleared_markets),
+            "order_count": len(self.orders),
+            "profit": self.profit,
+            "elapsed_seconds": self.elapsed_seconds,
+            "error": self.error,
+        }
+
+
+class EventCollector(LoggingControl):
+    """
+    Logging control added to the worker framework,
+    stores the info of market/trade/order events so
+    that they can be replayed through the parent
+    frameworks logging controls.
+    """
+
+    NAME = "EVENT_COLLECTOR"
+
+    def __init__(self):
+        super(EventCollector, self).__init__()
+        self.events = []
+
+    def _add(self, event, info) -> None:
+        self.events.append((event.__class__.__name__, info, event.exchange))
+
+    def _process_market(self, event) -> None:
+        self._add(event, event.event.info)
+
+    def _process_trade(self, event) -> None:
+        self._add(event, event.event.info)
+
+    def _process_order(self, event) -> None:
+        self._add(event, event.event.info)
+
+    def _process_cleared_orders_meta(self, event) -> None:
+        self._add(event, [order.info for order in event.event])
+
+
+def get_file_size(file_path: str) -> int:
+    try:
+        return os.path.getsize(file_path)
+    except (OSError, TypeError):
+        return 0  # remote / unknown
+
+
+def create_tasks(markets: list) -> List[List[str]]:
+    """Create tasks ordered by file size (largest first)
+    so that long running markets are not left to the end,
+    a market can be a list of files to be processed in the
+    same framework (e.g. event_processing).
+    """
+    tasks = [[m] if isinstance(m, str) else list(m) for m in markets]
+    return sorted(tasks, key=lambda t: sum(get_file_size(m) for m in t), reverse=True)
+
+
+def run_task(
+    markets: List[str],
+    strategy_factory: Callable,
+    client_kwargs: Optional[dict] = None,
+) -> SimulationResult:
+    """Simulate markets in a fresh framework, called
+    in the worker process, logging control events are
+    collected and returned in the result.
+    """
+    from .simulation import FlumineSimulation
+
+    start = time.time()
+    try:
+        client = SimulatedClient(**(client_kwargs or {}))
+        framework = FlumineSimulation(client=client)
+        collector = EventCollector()
+        framework.add_logging_control(collector)
+        strategies = strategy_factory(markets)
+        if not isinstance(strategies, (list, tuple)):
+            strategies = [strategies]
+        for strategy in strategies:
+            framework.add_strategy(strategy)
+        framework.run()
+        cleared_markets, orders = [], []
+        for market in framework.markets:
+            cleared_markets.append(market.cleared(client))
+            for order in market.blotter:
+                orders.append(dict(order.info, profit=order.profit))
+    except Exception as e:
+        logger.error(
+            "run_task error: %s" % e,
+            exc_info=True,
+            extra={"markets": markets},
+        )
+        return SimulationResult(
+            markets, elapsed_seconds=time.time() - start, error=repr(e)
+        )
+    return SimulationResult(
+        markets,
+        cleared_markets,
+        orders,
+        elapsed_seconds=time.time() - start,
+        events=collector.events,
+    )
+
+
+def _run_task(args: tuple) -> SimulationResult:
+    return run_task(*args)
+
+
+def run_parallel(
+    markets: list,
+    strategy_factory: Callable,
+    client_kwargs: Optional[dict] = None,
+    processes: Optional[int] = None,
+    markets_per_process: Optional[int] = None,
+) -> Iterator[SimulationResult]:
+    """Shard markets over a process pool yielding
+    results as each task completes, tasks are
+    dispatched one at a time (largest first) so idle
+    workers pick up the next market, workers are
+    replaced after `markets_per_process` tasks to
+    limit memory growth.
+
+    :param markets: list of market file paths (or lists of paths)
+    :param strategy_factory: picklable callable taking a list of
+        markets and returning a strategy (or list of strategies)
+    :param client_kwargs: SimulatedClient kwargs
+    :param processes: number of worker processes (defaults to cpu count)
+    :param markets_per_process: tasks per worker before it is replaced
+        (defaults to config.simulation_markets_per_process)
+    """
+    if markets_per_process is None:
+        markets_per_process = config.simulation_markets_per_process
+    tasks = create_tasks(markets)
+    if not tasks:
+        return
+    processes = min(processes or os.cpu_count() or 1, len(tasks))
+    logger.info(
+        "Starting parallel simulation",
+        extra={"tasks": len(tasks), "processes": processes},
+    )
+    with multiprocessing.Pool(
+        processes=processes, maxtasksperchild=markets_per_process
+    ) as pool:
+        for result in pool.imap_unordered(
+            _run_task,
+            [(task, strategy_factory, client_kwargs) for task in tasks],
+            chunksize=1,
+        ):
+            yield result
+
+
+def create_cleared_markets(result: SimulationResult) -> resources.ClearedOrders:
+    return resources.ClearedOrders(
+        moreAvailable=False, clearedOrders=result.cleared_markets
+    )
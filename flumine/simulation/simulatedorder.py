@@ -7,6 +7,7 @@ from .utils import (
     SimulatedPlaceResponse,
     SimulatedCancelResponse,
     SimulatedUpdateResponse,
+    get_runner_index,
 )
 from ..utils import get_price, get_size, wap, get_sp
 from ..order.ordertype import OrderTypes
@@ -25,7 +26,9 @@ class SimulatedOrder:
         self.order = order
         self.size_matched = 0
         self.average_price_matched = 0
-        self.matched = []  # [[publishTime, price, size]..]
+        self._matched = []  # [[publishTime, price, size]..]
+        self._matched_value = 0  # running sum(price * size)
+        self._matched_size = 0  # running sum(size)
         self.size_cancelled = 0.0
         self.size_lapsed = 0.0
         self.size_voided = 0.0
@@ -234,10 +237,9 @@ class SimulatedOrder:
     ) -> SimulatedPlaceResponse:
         if self.order.client.simulated_full_match:
             if status == "SUCCESS" and self.size_remaining:
-                self.matched.append(
+                self._update_matched(
                     [0, self.order.order_type.price, self.size_remaining]
                 )
-                self.size_matched, self.average_price_matched = wap(self.matched)
         if order_status is None:
             if self.size_remaining == 0:
                 order_status = "EXECUTION_COMPLETE"
@@ -309,11 +311,9 @@ class SimulatedOrder:
             )
 
     def _get_runner(self, market_book: MarketBook) -> RunnerBook:
-        runner_dict = {
-            (runner.selection_id, runner.handicap): runner
-            for runner in market_book.runners
-        }
-        return runner_dict.get((self.order.selection_id, self.order.handicap))
+        return get_runner_index(market_book).get(
+            (self.order.selection_id, self.order.handicap)
+        )
 
     def _process_price_matched(
         self, publish_time: int, price: float, size: float, available: list
@@ -350,8 +350,6 @@ class SimulatedOrder:
         for avail in available:
             if size_remaining == 0:
                 break
-            # create copy of current matched
-            _all_matched = self.matched.copy()
             # get current match
             _size_remaining = size_remaining
             size_remaining = max(size_remaining - avail["size"], 0)
@@ -360,9 +358,11 @@ class SimulatedOrder:
             else:
                 _size_matched = avail["size"]
             _matched = [publish_time, avail["price"], round(_size_matched, 2)]
-            _all_matched.append(_matched)
             # get potential vwap
-            _, _average_price_matched = wap(_all_matched)
+            _, _average_price_matched = self._wap(
+                self._matched_value + _matched[1] * _matched[2],
+                self._matched_size + _matched[2],
+            )
             # check
             if self.side == "BACK" and _average_price_matched >= price:
                 self._update_matched(_matched)
@@ -510,10 +510,35 @@ class SimulatedOrder:
     def side(self) -> str:
         return self.order.side
 
+    @property
+    def matched(self) -> list:
+        return self._matched
+
+    @matched.setter
+    def matched(self, value: list) -> None:
+        # recalculate running totals
+        self._matched = value
+        self._matched_value, self._matched_size = 0, 0
+        for _, price, size in value:
+            self._matched_value += price * size
+            self._matched_size += size
+
     def _update_matched(self, data: List) -> None:
         logger.debug("Simulated order %s matched: %s", self.order.id, data)
-        self.matched.append(data)
-        self.size_matched, self.average_price_matched = wap(self.matched)
+        self._matched.append(data)
+        self._matched_value += data[1] * data[2]
+        self._matched_size += data[2]
+        self.size_matched, self.average_price_matched = self._wap(
+            self._matched_value, self._matched_size
+        )
+
+    @staticmethod
+    def _wap(value: float, size: float) -> tuple:
+        # utils.wap using running totals
+        if size == 0 or value == 0:
+            return 0, 0
+        else:
+            return round(size, 2), round(value / size, 2)
 
     @property
     def size_remaining(self) -> float:
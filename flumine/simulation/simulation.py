@@ -1,11 +1,13 @@
 import logging
 from collections import defaultdict
+from typing import Callable, List, Optional
 
-from .utils import SimulatedDateTime
+from .utils import SimulatedDateTime, PendingPackages, merge_generators
+from .parallel import SimulationResult, run_parallel, create_cleared_markets
 from ..baseflumine import BaseFlumine
 from ..clients import BaseClient
 from ..events import events
-from .. import utils
+from .. import config, utils
 from ..exceptions import RunError
 from ..order.order import OrderTypes
 
@@ -24,7 +26,7 @@ class FlumineSimulation(BaseFlumine):
     def __init__(self, client: BaseClient = None):
         super(FlumineSimulation, self).__init__(client)
         self.simulated_datetime = SimulatedDateTime()
-        self.handler_queue = []
+        self.handler_queue = PendingPackages()
 
     def run(self) -> None:
         if not self.clients.simulated:
@@ -57,31 +59,16 @@ class FlumineSimulation(BaseFlumine):
                             },
                         )
                         self.simulated_datetime.reset_real_datetime()
-                        # create cycles
-                        cycles = []  # [[epoch, [MarketBook], gen], ..]
-                        for stream in streams:
-                            stream_gen = stream.create_generator()()
-                            market_book = next(stream_gen)
-                            publish_time_epoch = market_book[0].publish_time_epoch
-                            cycles.append([publish_time_epoch, market_book, stream_gen])
-                        # process cycles
-                        while cycles:
-                            # order by epoch
-                            cycles.sort(key=lambda x: x[0])
-                            # get current
-                            _, market_book, stream_gen = cycles.pop(0)
-                            # process current
+                        # merge chronologically (heap based k-way merge)
+                        stream_gens = [
+                            stream.create_generator()() for stream in streams
+                        ]
+                        for market_book in merge_generators(
+                            stream_gens, key=lambda x: x[0].publish_time_epoch
+                        ):
                             self._process_market_books(
                                 events.MarketBookEvent(market_book)
                             )
-                            # gen next
-                            try:
-                                market_book = next(stream_gen)
-                            except StopIteration:
-                                continue
-                            publish_time_epoch = market_book[0].publish_time_epoch
-                            # add back
-                            cycles.append([publish_time_epoch, market_book, stream_gen])
                         self.handler_queue.clear()
                         logger.info("Completed historical event '%s'", event_id)
                     else:
@@ -103,6 +90,56 @@ class FlumineSimulation(BaseFlumine):
                             )
         logger.info("Simulation complete")  # Call this after self.__exit__
 
+    def run_parallel(
+        self,
+        markets: list,
+        strategy_factory: Callable,
+        client_kwargs: Optional[dict] = None,
+        processes: Optional[int] = None,
+        markets_per_process: Optional[int] = None,
+    ) -> List[SimulationResult]:
+        """Simulate markets over a process pool (see
+        `parallel.run_parallel`), results are streamed back
+        as each market completes and processed through this
+        frameworks logging controls, the Market/Trade/Order/
+        ClearedOrdersMeta events created in the worker are
+        replayed with the info dict as `event.event` followed
+        by a SimulationResultEvent and ClearedMarketsEvent.
+        """
+        results = []
+        for c in self._logging_controls:
+            c.start()
+        try:
+            for result in run_parallel(
+                markets,
+                strategy_factory,
+                client_kwargs,
+                processes,
+                markets_per_process,
+            ):
+                if result.error:
+                    logger.error(
+                        "Parallel simulation task failed",
+                        extra=result.info,
+                    )
+                else:
+                    logger.info("Parallel simulation task complete", extra=result.info)
+                for name, info, exchange in result.events:
+                    self.log_control(getattr(events, name)(info, exchange=exchange))
+                self.log_control(events.SimulationResultEvent(result))
+                if result.cleared_markets:
+                    self.log_control(
+                        events.ClearedMarketsEvent(create_cleared_markets(result))
+                    )
+                results.append(result)
+        finally:
+            self.log_control(events.TerminationEvent(self))
+            for c in self._logging_controls:
+                if c.is_alive():
+                    c.join()
+        logger.info("Parallel simulation complete", extra={"tasks": len(results)})
+        return results
+
     def _process_market_books(self, event: events.MarketBookEvent) -> None:
         # todo DRY!
         for market_book in event.event:
@@ -133,12 +170,14 @@ class FlumineSimulation(BaseFlumine):
             for middleware in self._market_middleware:
                 utils.call_middleware_error_handling(middleware, market)
 
-            # process current orders
-            if market.blotter.active:
-                self._process_simulated_orders(market)
+            with market.coalesce_transactions(config.coalesce_transactions):
+                # process current orders
+                if market.blotter.active:
+                    self._process_simulated_orders(market)
 
-            for strategy in self.strategies:
-                if market_book.streaming_unique_id in strategy.stream_ids:
+                for strategy in self.strategies.stream_strategies(
+                    market_book.streaming_unique_id
+                ):
                     if market_is_new:
                         utils.call_strategy_error_handling(
                             strategy.process_new_market, market, market_book
@@ -175,7 +214,12 @@ class FlumineSimulation(BaseFlumine):
                     if order.current_order.status == "EXECUTION_COMPLETE":
                         order.execution_complete()
                         blotter.complete_order(order)
+        dirty_strategies = blotter.pop_dirty_strategies()
+        if config.process_orders_dirty_only and not dirty_strategies:
+            return
         for strategy in self.strategies:
+            if config.process_orders_dirty_only and strategy not in dirty_strategies:
+                continue
             strategy_orders = blotter.strategy_orders(strategy)
             if strategy_orders:
                 utils.call_process_orders_error_handling(
@@ -183,16 +227,8 @@ class FlumineSimulation(BaseFlumine):
                 )
 
     def _check_pending_packages(self, market_id: str) -> None:
-        processed = []
-        for order_package in self.handler_queue:
-            if (
-                order_package.market_id == market_id
-                and order_package.elapsed_seconds > order_package.simulated_delay
-            ):
-                order_package.client.execution.handler(order_package)
-                processed.append(order_package)
-        for p in processed:
-            self.handler_queue.remove(p)
+        for order_package in self.handler_queue.pop_due(market_id):
+            order_package.client.execution.handler(order_package)
 
     def __repr__(self) -> str:
         return "<FlumineSimulation>"
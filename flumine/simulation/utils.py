@@ -1,5 +1,8 @@
+import heapq
 import datetime
+import itertools
 from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator
 
 from .. import config
 
@@ -38,6 +41,105 @@ class SimulatedDateTime:
         datetime.datetime = self._real_datetime
 
 
+def merge_generators(generators: Iterable[Iterator], key: Callable) -> Iterator:
+    """k-way merge of generators (each sorted by key)
+    using a heap, ties are yielded in the order the
+    items were added (generator order then FIFO) to
+    match a stable sort. The next item from a generator
+    is only requested once its previous item has been
+    processed by the caller.
+    """
+    counter = itertools.count()
+    heap = []
+    for gen in generators:
+        for item in gen:
+            heap.append((key(item), next(counter), item, gen))
+            break
+    heapq.heapify(heap)
+    while heap:
+        _, _, item, gen = heap[0]
+        yield item
+        try:
+            item = next(gen)
+        except StopIteration:
+            heapq.heappop(heap)
+        else:
+            heapq.heapreplace(heap, (key(item), next(counter), item, gen))
+
+
+def get_runner_index(market_book) -> dict:
+    """Returns {(selectionId, handicap): RunnerBook} for
+    the MarketBook, built once and stored on the resource
+    so that it is shared by the middleware and every
+    simulated order processed against the same update.
+    """
+    try:
+        return market_book.__dict__["_runner_index"]
+    except KeyError:
+        runner_index = market_book.__dict__["_runner_index"] = {
+            (runner.selection_id, runner.handicap): runner
+            for runner in market_book.runners
+        }
+        return runner_index
+
+
+class PendingPackages:
+    """
+    Simulated order packages waiting on latency /
+    bet delay, held per market in a min-heap keyed
+    by due time (created + simulated_delay) so that
+    only due packages are popped on each update.
+    """
+
+    def __init__(self):
+        self._markets = {}  # marketId: [(due, seq, OrderPackage), ..]
+        self._seq = itertools.count()
+        self._count = 0
+
+    def append(self, order_package) -> None:
+        due = order_package._time_created + datetime.timedelta(
+            seconds=order_package.simulated_delay
+        )
+        heap = self._markets.get(order_package.market_id)
+        if heap is None:
+            heap = self._markets[order_package.market_id] = []
+        heapq.heappush(heap, (due, next(self._seq), order_package))
+        self._count += 1
+
+    def pop_due(self, market_id: str) -> list:
+        """Remove and return due packages for the
+        market in the order they were added.
+        """
+        heap = self._markets.get(market_id)
+        if not heap:
+            return []
+        due = []
+        while heap:
+            order_package = heap[0][2]
+            if order_package.elapsed_seconds > order_package.simulated_delay:
+                due.append(heapq.heappop(heap))
+            else:
+                break
+        if len(due) > 1:
+            due.sort(key=lambda x: x[1])
+        self._count -= len(due)
+        return [d[2] for d in due]
+
+    def clear(self) -> None:
+        self._markets.clear()
+        self._count = 0
+
+    def __iter__(self) -> Iterator:
+        for _, _, order_package in sorted(
+            (p for heap in self._markets.values() for p in heap),
+            key=lambda x: x[1],
+        ):
+            yield order_package
+
+    def __len__(self) -> int:
+        return self._count
+
+
 class SimulatedPlaceResponse:
     def __init__(
         self,
@@ -85,6 +85,7 @@ class BaseStrategy:
         self._invested = {}  # {(marketId, selectionId, handicap): RunnerContext}
         self.streams = []  # list of streams strategy is subscribed
         self.historic_stream_ids = set()
+        self.callback_timing = {}  # {callback: CallbackTiming} (config.strategy_timing)
         # cache
         self.name_hash = create_cheap_hash(self.name, STRATEGY_NAME_HASH_LENGTH)
 
@@ -255,6 +256,10 @@ class BaseStrategy:
             "name_hash": self.name_hash,
         }
 
+    @property
+    def callback_timing_info(self) -> dict:
+        return {name: timing.info for name, timing in self.callback_timing.items()}
+
     @property
     def name(self) -> str:
         return self._name or self.__class__.__name__
@@ -266,6 +271,7 @@ class BaseStrategy:
 class Strategies:
     def __init__(self):
         self._strategies = []
+        self._stream_strategies = {}  # {stream_id: [strategies..]}
 
     def __call__(self, strategy: BaseStrategy, clients, flumine) -> None:
         if strategy.name in [s.name for s in self]:
@@ -273,6 +279,28 @@ class Strategies:
         strategy.clients = clients
         self._strategies.append(strategy)
         strategy.add(flumine)
+        self.update_stream_strategies()
+
+    def remove(self, strategy: BaseStrategy) -> None:
+        self._strategies.remove(strategy)
+        self.update_stream_strategies()
+
+    def update_stream_strategies(self) -> None:
+        """Rebuild the stream_id -> strategies routing
+        table, called when strategies or their streams
+        are added/removed.
+        """
+        stream_strategies = {}
+        for strategy in self:
+            for stream_id in strategy.stream_ids:
+                stream_strategies.setdefault(stream_id, []).append(strategy)
+        self._stream_strategies = stream_strategies
+
+    def stream_strategies(self, stream_id: int) -> List[BaseStrategy]:
+        """Strategies subscribed to stream_id in the
+        order they were added.
+        """
+        return self._stream_strategies.get(stream_id, [])
 
     def start(self, flumine) -> None:
         for s in self:
@@ -1,3 +1,4 @@
+import time
 import threading
 import queue
 import logging
@@ -8,6 +9,26 @@ from tenacity import wait_exponential
 logger = logging.getLogger(__name__)
 
 
+class OutputQueue(queue.Queue):
+    """
+    Listener output queue, stamps the time
+    (time.monotonic) each item is put so that the
+    (single) consumer can read time_put of the
+    item last got.
+    """
+
+    def _init(self, maxsize: int) -> None:
+        queue.Queue._init(self, maxsize)
+        self.time_put = None
+
+    def _put(self, item) -> None:
+        self.queue.append((time.monotonic(), item))
+
+    def _get(self):
+        self.time_put, item = self.queue.popleft()
+        return item
+
+
 class BaseStream(threading.Thread):
     LISTENER = StreamListener
     MAX_LATENCY = 0.5
@@ -41,7 +62,7 @@ class BaseStream(threading.Thread):
         self._client = client
         self.custom = custom
         self._stream = None
-        self._output_queue = queue.Queue() if output_queue else None
+        self._output_queue = OutputQueue() if output_queue else None
         self.event_processing = event_processing
         self.event_id = event_id
         self.operation = operation
@@ -0,0 +1,126 @@
+import os
+import hashlib
+import logging
+import tempfile
+from typing import Optional
+from urllib.parse import urlsplit
+
+import smart_open
+
+from .. import config
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def is_remote(file_path: str) -> bool:
+    if not isinstance(file_path, str):
+        return False
+    scheme = urlsplit(file_path).scheme
+    return len(scheme) > 1 and scheme != "file"  # ignore windows drive letters
+
+
+class FileCache:
+    """
+    Size bounded local disk cache for remote
+    (s3/http etc.) historical files opened via
+    smart_open, files are stored under the sha1
+    of the uri (suffix retained for compression
+    and binary file detection) and evicted least
+    recently used first.
+
+    Safe across processes as files are downloaded
+    to a temporary file before being renamed into
+    place and access is tracked via mtime.
+    """
+
+    def __init__(self, directory: str, max_size: int):
+        self.directory = directory
+        self.max_size = max_size
+
+    def get(self, file_path: str) -> str:
+        """Returns local path, downloading if missing."""
+        local_path = self.local_path(file_path)
+        try:
+            os.utime(local_path)  # mark as recently used
+        except FileNotFoundError:
+            self._download(file_path, local_path)
+            self.evict(keep=local_path)
+        return local_path
+
+    def local_path(self, file_path: str) -> str:
+        file_name = os.path.basename(urlsplit(file_path).path)
+        _, suffix = os.path.splitext(file_name)
+        key = hashlib.sha1(file_path.encode()).hexdigest()
+        return os.path.join(self.directory, key + suffix)
+
+    def _download(self, file_path: str, local_path: str) -> None:
+        logger.info("Downloading %s to file cache", file_path)
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with smart_open.open(
+                file_path, "rb", compression="disable"
+            ) as f_in, os.fdopen(fd, "wb") as f_out:
+                while True:
+                    chunk = f_in.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    f_out.write(chunk)
+            os.replace(tmp_path, local_path)  # atomic
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """Remove least recently used files until
+        the cache is below max_size.
+        """
+        files = []
+        for entry in os.scandir(self.directory):
+            if not entry.is_file() or entry.name.endswith(".tmp"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue  # removed by another process
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(f[1] for f in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_size:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                logger.info("Evicted %s from file cache", path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    @property
+    def size(self) -> int:
+        if not os.path.isdir(self.directory):
+            return 0
+        return sum(
+            entry.stat().st_size
+            for entry in os.scandir(self.directory)
+            if entry.is_file()
+        )
+
+
+def get_local_path(file_path: str) -> str:
+    """Returns cached local path for remote files
+    if `config.simulation_file_cache` is set, else
+    the original path.
+    """
+    if config.simulation_file_cache and is_remote(file_path):
+        file_cache = FileCache(
+            config.simulation_file_cache, config.simulation_file_cache_size
+        )
+        return file_cache.get(file_path)
+    return file_path
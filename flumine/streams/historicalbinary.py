@@ -0,0 +1,495 @@
+"""
+Compact binary replay format for historical market files,
+removes the need to json decode every update when simulating
+and applies ladder changes to the cache without sorting.
+
+FILE: MAGIC, UPDATE.., FOOTER (json), TRAILER
+UPDATE: <publish_time, market change count> CHANGE..
+CHANGE: <market idx, flags, tv, blob length, group count, groups length>
+    blob GROUP..
+    blob is json encoded market level data (e.g. marketDefinition)
+GROUP: <runner idx, field code, count> count * fixed width records
+    ladders (atb/atl/trd/spb/spl/batb/batl/bdatb/bdatl):
+        <op, index, price * 100, size * 100> where index is the
+        position in the sorted ladder, ops are pre calculated
+        by the writer so that no lookups or sorting are required
+    scalars (ltp/tv/spn/spf): <value> (string idx if STRING_FLAG)
+    ladders are stored as doubles if DOUBLE_FLAG (values not 2dp)
+    runner changes with no fields are stored as a NOOP group
+"""
+
+import json as std_json
+import mmap
+import struct
+import logging
+from bisect import bisect_left
+from typing import Iterator, List, Optional, Tuple, Union
+
+import smart_open
+from betfairlightweight.compat import json
+from betfairlightweight.resources import MarketDefinition
+from betfairlightweight.streaming.cache import (
+    Available,
+    MarketBookCache,
+    RunnerBookCache,
+)
+
+from .. import utils
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"FLMNBIN2"
+BINARY_SUFFIX = ".flb"
+UPDATE = struct.Struct("<qH")
+CHANGE = struct.Struct("<HBdIHI")
+GROUP = struct.Struct("<IBH")
+TRAILER = struct.Struct("<Q8s")
+OP = struct.Struct("<BHII")
+DOUBLE_OP = struct.Struct("<BHdd")
+SCALAR = struct.Struct("<d")
+MAX_VALUE = 0xFFFFFFFF / 100
+# market change flags
+IMG_FLAG = 1
+TV_FLAG = 2
+BLOB_FLAG = 4
+# field codes
+FIELDS = (
+    "atb",
+    "atl",
+    "trd",
+    "spb",
+    "spl",
+    "batb",
+    "batl",
+    "bdatb",
+    "bdatl",
+    "ltp",
+    "tv",
+    "spn",
+    "spf",
+)
+FIELD_CODES = {field: code for code, field in enumerate(FIELDS)}
+LADDER_CODES = frozenset(range(0, 5))
+DEPTH_LADDER_CODES = frozenset(range(5, 9))
+REVERSE_CODES = frozenset((FIELD_CODES["atb"], FIELD_CODES["spb"]))
+LADDER_COUNT = 9
+TRD_CODE = FIELD_CODES["trd"]
+LTP_CODE = FIELD_CODES["ltp"]
+TV_CODE = FIELD_CODES["tv"]
+SPN_CODE = FIELD_CODES["spn"]
+NOOP_CODE = 63  # runner change without any fields
+STRING_FLAG = 128  # scalar stored as a string e.g. "NaN"
+DOUBLE_FLAG = 64  # ladder stored as doubles
+# ladder ops
+DELETE, REPLACE, INSERT, CLEAR = range(4)
+# RunnerBookCache attribute per ladder code
+LADDER_ATTRS = (
+    "available_to_back",
+    "available_to_lay",
+    "traded",
+    "starting_price_back",
+    "starting_price_lay",
+    "best_available_to_back",
+    "best_available_to_lay",
+    "best_display_available_to_back",
+    "best_display_available_to_lay",
+)
+CHANGE_KEYS = ("id", "img", "tv", "rc")
+RUNNER_CHANGES = "_rc"  # market change key holding the undecoded runner changes
+
+
+def is_binary_file(file_path: str) -> bool:
+    return isinstance(file_path, str) and file_path.endswith(BINARY_SUFFIX)
+
+
+def _fixed(value: float) -> bool:
+    # value can be stored as an integer (x100) and decoded exactly
+    return 0 <= value <= MAX_VALUE and round(value * 100) / 100 == value
+
+
+class BinaryWriter:
+    """Converts raw streaming updates into the binary format,
+    the sorted ladders are tracked per market to calculate
+    the index of each ladder op.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.markets = {}  # marketId: idx
+        self.runners = {}  # (marketId, selectionId, handicap): idx
+        self.strings = {}  # string: idx
+        self.definitions = {}  # marketId: first marketDefinition
+        self.ladders = {}  # marketId: {(runner idx, code): sorted keys}
+        self.updates = 0
+        self.f.write(MAGIC)
+
+    def write(self, data: dict) -> None:
+        market_changes = data.get("mc")
+        if market_changes is None:
+            return
+        buffer = [UPDATE.pack(data["pt"], len(market_changes))]
+        for market_change in market_changes:
+            buffer.extend(self._pack_market_change(market_change))
+        self.f.write(b"".join(buffer))
+        self.updates += 1
+
+    def _pack_market_change(self, market_change: dict) -> List[bytes]:
+        market_id = market_change["id"]
+        market_idx = self.markets.setdefault(market_id, len(self.markets))
+        if "marketDefinition" in market_change:
+            self.definitions.setdefault(market_id, market_change["marketDefinition"])
+        flags = 0
+        if market_change.get("img") or market_id not in self.ladders:
+            # replay creates a new cache
+            self.ladders[market_id] = {}
+        if market_change.get("img"):
+            flags |= IMG_FLAG
+        if "tv" in market_change:
+            flags |= TV_FLAG
+        extra = {k: v for k, v in market_change.items() if k not in CHANGE_KEYS}
+        blob = std_json.dumps(extra).encode() if extra else b""
+        if blob:
+            flags |= BLOB_FLAG
+        ladders = self.ladders[market_id]
+        groups, group_count = [], 0
+        for runner_change in market_change.get("rc", []):
+            key = (market_id, runner_change["id"], runner_change.get("hc", 0))
+            runner_idx = self.runners.setdefault(key, len(self.runners))
+            runner_group_count = group_count
+            for field, value in runner_change.items():
+                code = FIELD_CODES.get(field)
+                if code is None:
+                    continue
+                if code in LADDER_CODES or code in DEPTH_LADDER_CODES:
+                    ops = self._ladder_ops(
+                        ladders.setdefault((runner_idx, code), []), code, value
+                    )
+                    if all(_fixed(op[2]) and _fixed(op[3]) for op in ops):
+                        records = [
+                            OP.pack(op, idx, round(p * 100), round(s * 100))
+                            for op, idx, p, s in ops
+                        ]
+                    else:
+                        code |= DOUBLE_FLAG
+                        records = [DOUBLE_OP.pack(*op) for op in ops]
+                elif isinstance(value, str):
+                    code |= STRING_FLAG
+                    records = [
+                        SCALAR.pack(self.strings.setdefault(value, len(self.strings)))
+                    ]
+                else:
+                    records = [SCALAR.pack(value)]
+                groups.append(GROUP.pack(runner_idx, code, len(records)))
+                groups.extend(records)
+                group_count += 1
+            if group_count == runner_group_count:
+                groups.append(GROUP.pack(runner_idx, NOOP_CODE, 0))
+                group_count += 1
+        groups = b"".join(groups)
+        header = CHANGE.pack(
+            market_idx,
+            flags,
+            market_change.get("tv", 0),
+            len(blob),
+            group_count,
+            len(groups),
+        )
+        return [header, blob, groups]
+
+    @staticmethod
+    def _ladder_ops(keys: list, code: int, value: list) -> list:
+        # mirrors `Available.update` against the sorted ladder keys
+        if code == TRD_CODE and not value:
+            keys.clear()
+            return [(CLEAR, 0, 0, 0)]
+        depth = code in DEPTH_LADDER_CODES
+        reverse = code in REVERSE_CODES
+        ops = []
+        for book in value:
+            if depth:
+                key, price, size = book
+            else:
+                key = price = book[0]
+                size = book[1]
+            sort_key = -key if reverse else key
+            idx = bisect_left(keys, sort_key)
+            exists = idx < len(keys) and keys[idx] == sort_key
+            if size == 0:
+                if exists:
+                    del keys[idx]
+                    ops.append((DELETE, idx, 0, 0))
+            elif exists:
+                ops.append((REPLACE, idx, price, size))
+            else:
+                keys.insert(idx, sort_key)
+                ops.append((INSERT, idx, price, size))
+        return ops
+
+    def close(self) -> None:
+        footer = std_json.dumps(
+            {
+                "markets": list(self.markets),
+                "runners": [[k[1], k[2]] for k in self.runners],
+                "strings": list(self.strings),
+                "definitions": self.definitions,
+                "updates": self.updates,
+            }
+        ).encode()
+        offset = self.f.tell()
+        self.f.write(footer)
+        self.f.write(TRAILER.pack(offset, MAGIC))
+
+
+def convert(file_path: str, output_path: Optional[str] = None) -> str:
+    """Convert raw streaming file (market or event)
+    into the binary format, returns output path.
+    """
+    if output_path is None:
+        output_path = file_path + BINARY_SUFFIX
+    with smart_open.open(file_path, "rb") as f_in, open(output_path, "wb") as f_out:
+        writer = BinaryWriter(f_out)
+        for line in f_in:
+            writer.write(json.loads(line))
+        writer.close()
+    logger.info(
+        "Converted %s to %s (%s updates)", file_path, output_path, writer.updates
+    )
+    return output_path
+
+
+class BinaryReader:
+    """Reads binary file (memory mapped when local)
+    yielding (publish_time, market changes), runner
+    changes are left encoded under `RUNNER_CHANGES`
+    for `BinaryMarketBookCache` to apply.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._file = None
+        self._buffer = self._open()
+        if bytes(self._buffer[: len(MAGIC)]) != MAGIC:
+            raise ValueError("%s is not a binary market file" % file_path)
+        self.view = memoryview(self._buffer)
+        self.footer_offset, _ = TRAILER.unpack_from(
+            self._buffer, len(self._buffer) - TRAILER.size
+        )
+        footer = json.loads(
+            bytes(self._buffer[self.footer_offset : len(self._buffer) - TRAILER.size])
+        )
+        self.markets = footer["markets"]
+        self.runners = [tuple(runner) for runner in footer["runners"]]
+        self.strings = footer["strings"]
+        self.definitions = footer["definitions"]
+        self.updates = footer["updates"]
+
+    def _open(self):
+        try:
+            self._file = open(self.file_path, "rb")
+            return mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            if self._file:
+                self._file.close()
+                self._file = None
+            with smart_open.open(self.file_path, "rb") as f:
+                return f.read()
+
+    def __iter__(self) -> Iterator[Tuple[int, list]]:
+        buffer, markets = self.view, self.markets
+        update_unpack, change_unpack = UPDATE.unpack_from, CHANGE.unpack_from
+        update_size, change_size = UPDATE.size, CHANGE.size
+        pos, end = len(MAGIC), self.footer_offset
+        while pos < end:
+            publish_time, change_count = update_unpack(buffer, pos)
+            pos += update_size
+            market_changes = []
+            for _ in range(change_count):
+                (
+                    market_idx,
+                    flags,
+                    tv,
+                    blob_length,
+                    group_count,
+                    groups_length,
+                ) = change_unpack(buffer, pos)
+                pos += change_size
+                if blob_length:
+                    market_change = json.loads(bytes(buffer[pos : pos + blob_length]))
+                    pos += blob_length
+                else:
+                    market_change = {}
+                market_change["id"] = markets[market_idx]
+                if flags & IMG_FLAG:
+                    market_change["img"] = True
+                if flags & TV_FLAG:
+                    market_change["tv"] = tv
+                if group_count:
+                    market_change[RUNNER_CHANGES] = (self, pos, group_count)
+                pos += groups_length
+                market_changes.append(market_change)
+            yield publish_time, market_changes
+
+    def close(self) -> None:
+        self.view.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        if self._file:
+            self._file.close()
+
+
+class _LadderCache(Available):
+    """`Available` replacement holding the sorted
+    serialised ladder (`levels`), ops are applied
+    by index so the order book is not required.
+    """
+
+    __slots__ = ("levels",)
+
+    def __init__(self):
+        self.deletion_select = 1
+        self.reverse = False
+        self.levels = []
+        self.serialised = []
+
+    @property
+    def order_book(self) -> list:
+        return self.levels
+
+    def update(self, ops: Iterator[tuple], scale: int, active: bool) -> None:
+        # copy as the previous list is referenced by created MarketBooks
+        levels = self.levels[:]
+        for op, idx, price, size in ops:
+            if op == REPLACE:
+                levels[idx] = {"price": price / scale, "size": size / scale}
+            elif op == INSERT:
+                levels.insert(idx, {"price": price / scale, "size": size / scale})
+            else:
+                del levels[idx]
+        self.levels = levels
+        if active:
+            self.serialised = levels
+
+    def clear(self) -> None:
+        self.levels = []
+        self.serialised = []
+
+    def refresh(self) -> None:
+        self.serialised = self.levels
+
+
+class BinaryMarketBookCache(MarketBookCache):
+    """`MarketBookCache` that applies the binary
+    runner changes, matches `update_cache` on the
+    raw json (excluding `streaming_update` rc).
+    """
+
+    def update_cache(
+        self, market_change: dict, publish_time: int, active: bool
+    ) -> None:
+        self.streaming_update = market_change
+        self.publish_time = publish_time
+
+        if "marketDefinition" in market_change:
+            self._process_market_definition(market_change["marketDefinition"])
+
+        if "tv" in market_change and not self.calculate_market_tv:
+            self.total_matched = market_change["tv"]
+
+        runner_changes = market_change.get(RUNNER_CHANGES)
+        if runner_changes:
+            self._process_runner_changes(*runner_changes, active)
+        self.active = active
+
+    def _process_runner_changes(
+        self, reader: BinaryReader, pos: int, group_count: int, active: bool
+    ) -> None:
+        buffer, runners = reader.view, reader.runners
+        group_unpack, scalar_unpack = GROUP.unpack_from, SCALAR.unpack_from
+        calculate_tv = False
+        runner, new_runner, last_runner_idx = None, False, None
+        for _ in range(group_count):
+            runner_idx, code, count = group_unpack(buffer, pos)
+            pos += 7  # GROUP.size
+            if runner_idx != last_runner_idx:
+                if runner is not None and active:
+                    runner.serialise()
+                last_runner_idx = runner_idx
+                runner = self.runner_dict.get(runners[runner_idx])
+                new_runner = runner is None
+                if new_runner:
+                    selection_id, handicap = runners[runner_idx]
+                    runner = self._add_new_runner(id=selection_id, hc=handicap)
+            if code < LADDER_COUNT or DOUBLE_FLAG <= code < STRING_FLAG:
+                if code & DOUBLE_FLAG:
+                    code ^= DOUBLE_FLAG
+                    record, scale = DOUBLE_OP, 1
+                else:
+                    record, scale = OP, 100
+                ladder = getattr(runner, LADDER_ATTRS[code])
+                if count == 1 and buffer[pos] == CLEAR:
+                    ladder.clear()
+                    pos += record.size
+                else:
+                    end = pos + count * record.size
+                    # new runners are created active (`Available.__init__`)
+                    ladder.update(
+                        record.iter_unpack(buffer[pos:end]),
+                        scale,
+                        active or new_runner,
+                    )
+                    pos = end
+                if code == TRD_CODE and not new_runner:
+                    if self.cumulative_runner_tv:
+                        runner.total_matched = round(
+                            sum([vol["size"] for vol in runner.traded.serialised]),
+                            2,
+                        )
+                    calculate_tv = True
+            elif code != NOOP_CODE:
+                (value,) = scalar_unpack(buffer, pos)
+                pos += 8  # SCALAR.size
+                if code & STRING_FLAG:
+                    code ^= STRING_FLAG
+                    value = reader.strings[int(value)]
+                if code == LTP_CODE:
+                    runner.last_price_traded = value
+                elif code == TV_CODE:
+                    if new_runner or not self.cumulative_runner_tv:
+                        runner.total_matched = value
+                elif code == SPN_CODE:
+                    runner.starting_price_near = value
+                else:
+                    runner.starting_price_far = value
+        if runner is not None and active:
+            runner.serialise()
+        if self.calculate_market_tv and calculate_tv:
+            self.total_matched = round(
+                sum(vol["size"] for r in self.runners for vol in r.traded.serialised),
+                2,
+            )
+
+    def _add_new_runner(self, **kwargs) -> RunnerBookCache:
+        runner = super(BinaryMarketBookCache, self)._add_new_runner(**kwargs)
+        for attr in LADDER_ATTRS:
+            setattr(runner, attr, _LadderCache())
+        return runner
+
+
+def get_file_md(file_dir: Union[str, tuple]) -> Optional[MarketDefinition]:
+    # `utils.get_file_md` handling binary files
+    md = get_file_raw_md(file_dir)
+    if md is None:
+        return None
+    return MarketDefinition(**md)
+
+
+def get_file_raw_md(file_dir: Union[str, tuple]) -> Optional[dict]:
+    # `utils.get_file_raw_md` handling binary files
+    file_path = file_dir[0] if isinstance(file_dir, tuple) else file_dir
+    if is_binary_file(file_path):
+        reader = BinaryReader(file_path)
+        reader.close()
+        if not reader.definitions:
+            return None
+        return next(iter(reader.definitions.values()))
+    return utils.get_file_raw_md(file_dir)
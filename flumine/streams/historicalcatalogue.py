@@ -0,0 +1,258 @@
+import os
+import json as std_json
+import sqlite3
+import logging
+import datetime
+from typing import Dict, List, Optional
+
+from betfairlightweight.compat import json
+from betfairlightweight.resources import MarketDefinition
+from betfairlightweight.resources.baseresource import BaseResource
+
+from .filecache import get_local_path
+from .historicalbinary import get_file_raw_md
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime.datetime(1970, 1, 1)
+CATALOGUE_VERSION = 1
+COMMIT_INTERVAL = 1000  # files indexed between commits
+
+
+class MarketRecord:
+    """
+    Market level metadata taken from the first
+    marketDefinition of a historical file, uses
+    the same attribute names as MarketDefinition
+    so it can be filtered in the same way.
+    """
+
+    __slots__ = [
+        "event_id",
+        "event_type_id",
+        "market_type",
+        "country_code",
+        "venue",
+        "market_time",
+        "number_of_active_runners",
+        "definition",
+    ]
+
+    def __init__(
+        self,
+        event_id: Optional[str],
+        event_type_id: Optional[str],
+        market_type: Optional[str],
+        country_code: Optional[str],
+        venue: Optional[str],
+        market_time: Optional[int],
+        number_of_active_runners: Optional[int],
+        definition: Optional[str],
+    ):
+        self.event_id = event_id
+        self.event_type_id = event_type_id
+        self.market_type = market_type
+        self.country_code = country_code
+        self.venue = venue
+        self.market_time = (
+            EPOCH + datetime.timedelta(milliseconds=market_time)
+            if market_time is not None
+            else None
+        )
+        self.number_of_active_runners = number_of_active_runners
+        self.definition = definition
+
+    @property
+    def market_definition(self) -> Optional[MarketDefinition]:
+        if self.definition:
+            return MarketDefinition(**json.loads(self.definition))
+
+    @staticmethod
+    def create_row(
+        file_path: str, mtime: Optional[float], size: Optional[int], md: dict
+    ) -> tuple:
+        market_time = None
+        if md.get("marketTime"):
+            market_time = int(
+                (BaseResource.strip_datetime(md["marketTime"]) - EPOCH).total_seconds()
+                * 1e3
+            )
+        return (
+            file_path,
+            mtime,
+            size,
+            md.get("eventId"),
+            md.get("eventTypeId"),
+            md.get("marketType"),
+            md.get("countryCode"),
+            md.get("venue"),
+            market_time,
+            md.get("numberOfActiveRunners"),
+            std_json.dumps(md) if md else None,
+        )
+
+
+class MarketFileCatalogue:
+    """
+    Persistent sqlite catalogue of historical
+    market files keyed by path, mtime and size.
+    Files are only read (first marketDefinition)
+    when missing or modified allowing large
+    directories to be filtered without opening
+    every file on each run.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._connection = sqlite3.connect(db_path, timeout=30)
+        self._create_table()
+
+    def _create_table(self) -> None:
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            row = self._connection.execute(
+                "SELECT value FROM meta WHERE key = 'version'"
+            ).fetchone()
+            if row and int(row[0]) != CATALOGUE_VERSION:
+                self._connection.execute("DROP TABLE IF EXISTS markets")
+            self._connection.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('version', ?)",
+                (str(CATALOGUE_VERSION),),
+            )
+            self._connection.execute(
+                """CREATE TABLE IF NOT EXISTS markets (
+                    path TEXT PRIMARY KEY,
+                    mtime REAL,
+                    size INTEGER,
+                    event_id TEXT,
+                    event_type_id TEXT,
+                    market_type TEXT,
+                    country_code TEXT,
+                    venue TEXT,
+                    market_time INTEGER,
+                    number_of_active_runners INTEGER,
+                    definition TEXT
+                )"""
+            )
+
+    def update(self, markets: List[str]) -> int:
+        """Add missing or modified files to the
+        catalogue, returns number of files read.
+        """
+        existing = {
+            path: (mtime, size)
+            for path, mtime, size in self._connection.execute(
+                "SELECT path, mtime, size FROM markets"
+            )
+        }
+        rows = []
+        count = 0
+        for file_path in markets:
+            mtime, size = self._stat(file_path)
+            cached = existing.get(file_path)
+            if cached and (mtime is None or cached == (mtime, size)):
+                continue
+            try:
+                # remote files are read from the local file cache (if enabled)
+                md = get_file_raw_md(get_local_path(file_path))
+            except Exception as e:
+                logger.error(
+                    "Unable to add %s to catalogue: %s" % (file_path, e),
+                    extra={"file_path": file_path},
+                )
+                continue
+            rows.append(MarketRecord.create_row(file_path, mtime, size, md or {}))
+            count += 1
+            if len(rows) >= COMMIT_INTERVAL:
+                self._insert(rows)
+                rows = []
+        if rows:
+            self._insert(rows)
+        if count:
+            logger.info("Catalogue %s updated with %s files", self.db_path, count)
+        return count
+
+    def _insert(self, rows: List[tuple]) -> None:
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO markets VALUES (?,?,?,?,?,?,?,?,?,?,?)",
+                rows,
+            )
+
+    @staticmethod
+    def _stat(file_path: str) -> tuple:
+        try:
+            stat = os.stat(file_path)
+        except (OSError, TypeError, ValueError):
+            return None, None  # remote, indexed once
+        return stat.st_mtime, stat.st_size
+
+    def get(self, markets: List[str]) -> Dict[str, MarketRecord]:
+        """Returns {path: MarketRecord} for the markets,
+        updating the catalogue first.
+        """
+        self.update(markets)
+        markets = set(markets)
+        return {
+            row[0]: MarketRecord(*row[3:])
+            for row in self._connection.execute("SELECT * FROM markets ORDER BY path")
+            if row[0] in markets
+        }
+
+    def filter(self, markets: List[str], market_filter: dict) -> List[str]:
+        """Returns the markets matching the market_filter."""
+        records = self.get(markets)
+        return [
+            market
+            for market, record in records.items()
+            if filter_market(record, market_filter) is None
+        ]
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def filter_market(market_definition, market_filter: dict) -> Optional[str]:
+    """Returns the name of the market_filter key which
+    excludes the market (None if not excluded), as per
+    live filters are only applied if the value is known.
+
+    market_filter keys:
+        market_types, country_codes, event_type_ids, venues: list
+        market_time_from, market_time_to: datetime (utc)
+        min_runners, max_runners: int (numberOfActiveRunners)
+    """
+    for key, attr in (
+        ("market_types", "market_type"),
+        ("country_codes", "country_code"),
+        ("event_type_ids", "event_type_id"),
+        ("venues", "venue"),
+    ):
+        values = market_filter.get(key)
+        value = getattr(market_definition, attr, None)
+        if values and value and value not in values:
+            return key
+    market_time = getattr(market_definition, "market_time", None)
+    if market_time:
+        market_time_from = market_filter.get("market_time_from")
+        if market_time_from and market_time < market_time_from:
+            return "market_time_from"
+        market_time_to = market_filter.get("market_time_to")
+        if market_time_to and market_time > market_time_to:
+            return "market_time_to"
+    runners = getattr(market_definition, "number_of_active_runners", None)
+    if runners is not None:
+        min_runners = market_filter.get("min_runners")
+        if min_runners is not None and runners < min_runners:
+            return "min_runners"
+        max_runners = market_filter.get("max_runners")
+        if max_runners is not None and runners > max_runners:
+            return "max_runners"
@@ -0,0 +1,295 @@
+import os
+import json as std_json
+import hashlib
+import logging
+import datetime
+from typing import Iterator, List, Optional
+
+import smart_open
+from betfairlightweight.compat import json
+from betfairlightweight.resources.baseresource import BaseResource
+from betfairlightweight.streaming.cache import MarketBookCache
+
+from .. import config
+from .filecache import is_remote
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime.datetime(1970, 1, 1)
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".idx"
+# runner Available attributes stored in checkpoint images
+RUNNER_LADDERS = (
+    ("trd", "traded"),
+    ("atb", "available_to_back"),
+    ("atl", "available_to_lay"),
+    ("batb", "best_available_to_back"),
+    ("batl", "best_available_to_lay"),
+    ("bdatb", "best_display_available_to_back"),
+    ("bdatl", "best_display_available_to_lay"),
+    ("spb", "starting_price_back"),
+    ("spl", "starting_price_lay"),
+)
+
+
+class MarketFileIndex:
+    """
+    Sidecar index for a single market historical
+    file, stores the byte offset, publish time and
+    market definition state (status/inPlay/marketTime)
+    of every update along with checkpoints (full
+    images) allowing the file to be read from the
+    latest state before the listener_kwargs window
+    rather than from market creation.
+
+    updates: [[offset, pt, status, inPlay, marketTime epoch ms], ..]
+    checkpoints: [[line, image], ..] where image is None if
+        the line is itself a full image, else the raw update
+        that recreates the cache state prior to the line.
+    """
+
+    def __init__(self, market_id: str, updates: list, checkpoints: list):
+        self.market_id = market_id
+        self.updates = updates
+        self.checkpoints = checkpoints
+
+    @classmethod
+    def build(
+        cls, file_path: str, checkpoint_interval: int = 1000
+    ) -> Optional["MarketFileIndex"]:
+        """Build index by reading the file once, a
+        checkpoint image is created every `checkpoint_interval`
+        updates and prior to the market turning inplay.
+        """
+        market_id, cache = None, None
+        updates, checkpoints = [], [[0, None]]
+        status, in_play, market_time = None, None, None
+        last_checkpoint = 0
+        offset = 0
+        with smart_open.open(file_path, "rb") as f:
+            for line in f:
+                data = json.loads(line)
+                publish_time = data["pt"]
+                market_changes = data.get("mc") or []
+                for market_change in market_changes:
+                    if market_id is None:
+                        market_id = market_change["id"]
+                        cache = MarketBookCache(
+                            market_id, publish_time, True, False, False
+                        )
+                    elif market_change["id"] != market_id:
+                        logger.warning(
+                            "Unable to index %s, file contains multiple markets",
+                            file_path,
+                        )
+                        return
+                # checkpoint
+                if updates and market_changes:
+                    image = None
+                    for market_change in market_changes:
+                        if market_change.get("img"):
+                            checkpoints.append([len(updates), None])
+                            last_checkpoint = len(updates)
+                            break
+                        elif "marketDefinition" in market_change:
+                            _in_play = market_change["marketDefinition"].get("inPlay")
+                            if _in_play and not in_play:
+                                image = cls.create_image(cache)
+                    else:
+                        if len(updates) - last_checkpoint >= checkpoint_interval:
+                            image = cls.create_image(cache)
+                        if image:
+                            checkpoints.append([len(updates), image])
+                            last_checkpoint = len(updates)
+                # update state
+                for market_change in market_changes:
+                    cache.update_cache(market_change, publish_time, active=False)
+                    if "marketDefinition" in market_change:
+                        market_definition = market_change["marketDefinition"]
+                        status = market_definition.get("status")
+                        in_play = market_definition.get("inPlay")
+                        market_time = int(
+                            (
+                                BaseResource.strip_datetime(
+                                    market_definition["marketTime"]
+                                )
+                                - EPOCH
+                            ).total_seconds()
+                            * 1e3
+                        )
+                updates.append([offset, publish_time, status, in_play, market_time])
+                offset += len(line)
+        if market_id is None:
+            return
+        return cls(market_id, updates, checkpoints)
+
+    @staticmethod
+    def create_image(cache: Optional[MarketBookCache]) -> Optional[str]:
+        """Serialise cache into a raw full image
+        update (img) published at the cache publish
+        time.
+        """
+        if cache is None or not cache.market_definition:
+            return
+        runner_changes = []
+        for runner in cache.runners:
+            runner_change = {
+                "id": runner.selection_id,
+                "hc": runner.handicap,
+                "tv": runner.total_matched,
+            }
+            if runner.last_price_traded is not None:
+                runner_change["ltp"] = runner.last_price_traded
+            if runner.starting_price_near is not None:
+                runner_change["spn"] = runner.starting_price_near
+            if runner.starting_price_far is not None:
+                runner_change["spf"] = runner.starting_price_far
+            for key, attr in RUNNER_LADDERS:
+                available = getattr(runner, attr)
+                if available.order_book:
+                    runner_change[key] = [
+                        book[:-1]
+                        for book in sorted(
+                            available.order_book.values(),
+                            key=lambda x: x[0],
+                            reverse=available.reverse,
+                        )
+                    ]
+            runner_changes.append(runner_change)
+        # runners are added to the cache in definition order so
+        # reorder to match the cache and then apply the original
+        # definition if required
+        market_definition = dict(
+            cache.market_definition,
+            runners=[r.definition for r in cache.runners if r.definition],
+        )
+        market_changes = [
+            {
+                "id": cache.market_id,
+                "img": True,
+                "marketDefinition": market_definition,
+                "tv": cache.total_matched,
+                "rc": runner_changes,
+            }
+        ]
+        if market_definition != cache.market_definition:
+            market_changes.append(
+                {"id": cache.market_id, "marketDefinition": cache.market_definition}
+            )
+        return std_json.dumps(
+            {"op": "mcm", "pt": cache.publish_time, "mc": market_changes}
+        )
+
+    def get_segments(self, listener) -> List[list]:
+        """Returns the segments of the file to process
+        based on the listener filtering as a list of
+        [image, start line, end line] where the checkpoint
+        image (if any) is processed before the lines,
+        inactive updates between segments are skipped.
+        """
+        if listener.max_inplay_seconds is None:
+            max_checkpoint = len(self.updates)
+        else:
+            # inplay publish time is captured on the transition
+            max_checkpoint = next(
+                (i for i, update in enumerate(self.updates) if update[3]),
+                len(self.updates),
+            )
+        checkpoints = self.checkpoints
+        checkpoint_idx = 0
+        segments = []
+        last_active = -1
+        for i in self.active_lines(listener):
+            # find latest checkpoint which skips at least one inactive update
+            checkpoint, limit = None, min(i, max_checkpoint)
+            while (
+                checkpoint_idx < len(checkpoints)
+                and checkpoints[checkpoint_idx][0] <= limit
+            ):
+                checkpoint = checkpoints[checkpoint_idx]
+                checkpoint_idx += 1
+            if not segments:
+                segments.append([checkpoint[1], checkpoint[0], i + 1])
+            elif checkpoint and checkpoint[0] > last_active + 1:
+                segments.append([checkpoint[1], checkpoint[0], i + 1])
+            else:
+                segments[-1][2] = i + 1
+            last_active = i
+        return segments
+
+    def active_lines(self, listener) -> Iterator[int]:
+        """Replicates `FlumineMarketStream._process`
+        filtering to yield the updates that can be
+        active (max_inplay_seconds excluded).
+        """
+        inplay = listener.inplay
+        seconds_to_start = listener.seconds_to_start
+        for i, (_, pt, status, in_play, market_time) in enumerate(self.updates):
+            # if market is not open (closed/suspended) process regardless
+            if status == "OPEN":
+                if inplay:
+                    if not in_play:
+                        continue
+                elif seconds_to_start:
+                    if (market_time - pt) / 1e3 > seconds_to_start:
+                        continue
+                if inplay is False and in_play:
+                    continue
+            yield i
+
+    @staticmethod
+    def index_path(file_path: str) -> str:
+        # sidecar file unless `config.simulation_index_dir` is set
+        if config.simulation_index_dir:
+            if not is_remote(file_path):
+                file_path = os.path.abspath(file_path)
+            key = hashlib.sha1(file_path.encode()).hexdigest()
+            return os.path.join(config.simulation_index_dir, key + INDEX_SUFFIX)
+        return file_path + INDEX_SUFFIX
+
+    @classmethod
+    def load(cls, file_path: str) -> Optional["MarketFileIndex"]:
+        index_path = cls.index_path(file_path)
+        try:
+            with smart_open.open(index_path, "r") as f:
+                data = json.loads(f.read())
+        except (OSError, ValueError):
+            return
+        if data.get("version") != INDEX_VERSION:
+            return
+        return cls(data["market_id"], data["updates"], data["checkpoints"])
+
+    def save(self, file_path: str) -> None:
+        index_path = self.index_path(file_path)
+        if config.simulation_index_dir:
+            os.makedirs(config.simulation_index_dir, exist_ok=True)
+        with smart_open.open(index_path, "w") as f:
+            f.write(std_json.dumps(self.serialise))
+
+    @classmethod
+    def get(cls, file_path: str) -> Optional["MarketFileIndex"]:
+        """Load index or build and save if missing."""
+        index = cls.load(file_path)
+        if index is None:
+            logger.info("Building index for %s", file_path)
+            index = cls.build(file_path)
+            if index:
+                try:
+                    index.save(file_path)
+                except OSError as e:
+                    # use the index regardless (e.g. read only data directory)
+                    logger.warning(
+                        "Unable to save index for %s: %s",
+                        file_path,
+                        e,
+                    )
+        return index
+
+    @property
+    def serialise(self) -> dict:
+        return {
+            "version": INDEX_VERSION,
+            "market_id": self.market_id,
+            "updates": self.updates,
+            "checkpoints": self.checkpoints,
+        }
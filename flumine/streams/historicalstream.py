@@ -1,5 +1,7 @@
+import queue
 import logging
 import datetime
+import threading
 import smart_open
 from typing import Optional
 from betfairlightweight.streaming import StreamListener, HistoricalGeneratorStream
@@ -13,8 +15,12 @@ from betfairlightweight.resources.baseresource import BaseResource
 from betfairlightweight.compat import json
 
 from .basestream import BaseStream
+from .historicalindex import MarketFileIndex
+from .historicalbinary import BinaryReader, BinaryMarketBookCache, is_binary_file
+from .filecache import get_local_path
 from ..exceptions import ListenerError
 from ..utils import create_time
+from .. import config
 
 logger = logging.getLogger(__name__)
 
@@ -31,9 +37,11 @@ class FlumineMarketStream(MarketStream):
     def __init__(self, *args, **kwargs):
         super(FlumineMarketStream, self).__init__(*args, **kwargs)
         self.inplay_publish_times = {}
+        self.updated_caches = {}  # marketId: cache (active caches in last update)
 
     def _process(self, data: list, publish_time: int) -> bool:
         active = False
+        self.updated_caches.clear()
         for market_book in data:
             if "id" not in market_book:
                 continue
@@ -53,13 +61,7 @@ class FlumineMarketStream(MarketStream):
                         self.unique_id,
                         market_id,
                     )
-                market_book_cache = MarketBookCache(
-                    market_id,
-                    publish_time,
-                    self._lightweight,
-                    self._calculate_market_tv,
-                    self._cumulative_runner_tv,
-                )
+                market_book_cache = self._create_cache(market_id, publish_time)
                 self._caches[market_id] = market_book_cache
                 logger.info(
                     "[%s: %s]: %s added, %s markets in cache",
@@ -119,9 +121,36 @@ class FlumineMarketStream(MarketStream):
                 market_book_cache.refresh_cache()
 
             market_book_cache.update_cache(market_book, publish_time, active=active)
+            if active:
+                self.updated_caches[market_id] = market_book_cache
             self._updates_processed += 1
         return active
 
+    def _create_cache(self, market_id: str, publish_time: int) -> MarketBookCache:
+        return MarketBookCache(
+            market_id,
+            publish_time,
+            self._lightweight,
+            self._calculate_market_tv,
+            self._cumulative_runner_tv,
+        )
+
+
+class FlumineBinaryMarketStream(FlumineMarketStream):
+    """
+    `FlumineMarketStream` for binary market files,
+    caches apply the encoded runner changes directly.
+    """
+
+    def _create_cache(self, market_id: str, publish_time: int) -> MarketBookCache:
+        return BinaryMarketBookCache(
+            market_id,
+            publish_time,
+            self._lightweight,
+            self._calculate_market_tv,
+            self._cumulative_runner_tv,
+        )
+
 
 class FlumineRaceStream(RaceStream):
     """
@@ -252,6 +281,64 @@ class HistoricListener(StreamListener):
         return self.stream._process(data[self.stream._lookup], publish_time)
 
 
+class FileReader(threading.Thread):
+    """
+    Reads (and decompresses) a historical file
+    in a background thread, buffering at most
+    `read_ahead` chunks of lines so that memory
+    is bounded regardless of file size, lines are
+    read as bytes so that `offset` is a byte offset
+    (see `MarketFileIndex`).
+    """
+
+    def __init__(
+        self, file_path: str, read_ahead: int, chunk_size: int, offset: int = 0
+    ):
+        threading.Thread.__init__(self, daemon=True, name=self.__class__.__name__)
+        self.file_path = file_path
+        self.offset = offset
+        self.chunk_size = chunk_size
+        self._queue = queue.Queue(maxsize=read_ahead)
+        self._stopped = threading.Event()
+        self._error = None
+
+    def run(self) -> None:
+        try:
+            with smart_open.open(self.file_path, "rb") as f:
+                if self.offset:
+                    f.seek(self.offset)
+                while not self._stopped.is_set():
+                    lines = f.readlines(self.chunk_size)
+                    if not lines:
+                        break
+                    self._put(lines)
+        except Exception as e:
+            self._error = e
+        self._put(None)  # sentinel
+
+    def _put(self, item) -> None:
+        # timeout so that the thread exits if the consumer stops early
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def __iter__(self):
+        queue_get = self._queue.get
+        while True:
+            lines = queue_get()
+            if lines is None:
+                if self._error:
+                    raise self._error
+                return
+            yield lines
+
+
 class FlumineHistoricalGeneratorStream(HistoricalGeneratorStream):
     """Super fast historical stream"""
 
@@ -259,10 +346,9 @@ class FlumineHistoricalGeneratorStream(HistoricalGeneratorStream):
         unique_id = self.unique_id
         self.listener.register_stream(unique_id, self.operation)
         listener_on_data = self.listener.on_data  # cache functions
-        caches = self.listener.stream._caches
-        with smart_open.open(self.file_path, "r") as f:
-            file = f.readlines()  # read entire file into memory (faster)
-            for update in file:
+        caches = self._output_caches()
+        for lines in self._read_lines():
+            for update in lines:
                 if listener_on_data(update):
                     yield [
                         cache.create_resource(unique_id, snap=True)
@@ -270,6 +356,104 @@ class FlumineHistoricalGeneratorStream(HistoricalGeneratorStream):
                         if cache.active
                     ]
 
+    def _output_caches(self) -> dict:
+        # only create MarketBooks for markets updated if changed only
+        stream = self.listener.stream
+        if config.changed_market_books_only and self.operation == "marketSubscription":
+            return stream.updated_caches
+        return stream._caches
+
+    def _read_lines(self):
+        # remote files are read from the local file cache (if enabled)
+        file_path = get_local_path(self.file_path)
+        segments = None
+        if config.simulation_index and self.operation == "marketSubscription":
+            index = MarketFileIndex.get(file_path)
+            if index:
+                segments = index.get_segments(self.listener)
+        if segments is None:
+            yield from self._read_chunks(file_path)
+        elif segments:
+            # seek to the latest state before the listener_kwargs window
+            start = segments[0][1]
+            chunks = self._read_chunks(file_path, index.updates[start][0])
+            try:
+                yield from self._filter_segments(chunks, start, segments)
+            finally:
+                chunks.close()
+
+    @staticmethod
+    def _read_chunks(file_path: str, offset: int = 0):
+        if config.simulation_read_ahead:
+            # stream file through a bounded buffer
+            reader = FileReader(
+                file_path,
+                config.simulation_read_ahead,
+                config.simulation_read_chunk_size,
+                offset,
+            )
+            reader.start()
+            try:
+                yield from reader
+            finally:
+                reader.stop()
+        else:
+            # bytes as the index offsets are byte offsets and json.loads
+            # accepts bytes (no decode per line)
+            with smart_open.open(file_path, "rb") as f:
+                if offset:
+                    f.seek(offset)
+                yield f.readlines()  # read entire file into memory (faster)
+
+    @staticmethod
+    def _filter_segments(chunks, line_no: int, segments: list):
+        segments = iter(segments)
+        image, start, end = next(segments)
+        if image:
+            yield [image]
+        for lines in chunks:
+            chunk_start, line_no = line_no, line_no + len(lines)
+            while True:
+                lo, hi = max(start, chunk_start), min(end, line_no)
+                if lo < hi:
+                    yield lines[lo - chunk_start : hi - chunk_start]
+                if end > line_no:
+                    break
+                try:
+                    image, start, end = next(segments)
+                except StopIteration:
+                    return
+                if image:
+                    yield [image]
+
+
+class FlumineBinaryGeneratorStream(FlumineHistoricalGeneratorStream):
+    """
+    Replays binary market files (see `historicalbinary`)
+    directly into the stream caches, removing the
+    json decoding of every update.
+    """
+
+    def _read_loop(self) -> dict:
+        unique_id = self.unique_id
+        self.listener.register_stream(unique_id, self.operation)
+        self.listener.stream = FlumineBinaryMarketStream(self.listener, unique_id)
+        stream_process = self.listener.stream._process  # cache functions
+        caches = self._output_caches()
+        reader = BinaryReader(get_local_path(self.file_path))
+        updates = iter(reader)
+        try:
+            for publish_time, market_changes in updates:
+                if stream_process(market_changes, publish_time):
+                    yield [
+                        cache.create_resource(unique_id, snap=True)
+                        for cache in caches.values()
+                        if cache.active
+                    ]
+        finally:
+            updates.close()
+            reader.close()
+
 
 class HistoricalStream(BaseStream):
     LISTENER = HistoricListener
@@ -285,7 +469,11 @@ class HistoricalStream(BaseStream):
         self._listener.update_clk = (
             False  # do not update clk on updates (not required when simulating)
         )
-        stream = FlumineHistoricalGeneratorStream(
+        if is_binary_file(self.market_filter):
+            generator_stream = FlumineBinaryGeneratorStream
+        else:
+            generator_stream = FlumineHistoricalGeneratorStream
+        stream = generator_stream(
             file_path=self.market_filter,
             listener=self._listener,
             operation=self.operation,
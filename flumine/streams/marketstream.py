@@ -5,6 +5,7 @@ from tenacity import retry
 
 from .basestream import BaseStream
 from ..events.events import MarketBookEvent
+from .. import config
 
 logger = logging.getLogger(__name__)
 
@@ -56,11 +57,27 @@ class MarketStream(BaseStream):
                 market_books = self._output_queue.get(
                     block=True, timeout=self.streaming_timeout
                 )
+                received = self._output_queue.time_put
             except queue.Empty:
-                market_books = self._listener.snap(
-                    market_ids=self.flumine.markets.open_market_ids
-                )
+                if config.changed_market_books_only:
+                    # nothing has changed so limit to markets with live orders
+                    market_ids = [
+                        m.market_id
+                        for m in self.flumine.markets
+                        if m.status == "OPEN" and m.blotter.has_live_orders
+                    ]
+                    if not market_ids:
+                        continue
+                else:
+                    market_ids = self.flumine.markets.open_market_ids
+                market_books = self._listener.snap(market_ids=market_ids)
+                received = None
             if market_books:
-                self.flumine.handler_queue.put(MarketBookEvent(market_books))
+                event = MarketBookEvent(market_books)
+                if received:
+                    self.flumine.latency.record(
+                        "stream", event._monotonic_created - received
+                    )
+                self.flumine.handler_queue.put(event)
 
         logger.info("Stopped output_thread (MarketStream %s)", self.stream_id)
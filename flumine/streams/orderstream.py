@@ -69,6 +69,7 @@ class OrderStream(BaseStream):
                 order_books = self._output_queue.get(
                     block=True, timeout=self.streaming_timeout
                 )
+                received = self._output_queue.time_put
             except queue.Empty:
                 active_open_markets = [
                     m
@@ -77,12 +78,18 @@ class OrderStream(BaseStream):
                 ]
                 if active_open_markets or (time.time() - last_snap) > SNAP_DELTA:
                     order_books = []
+                    received = None
                 else:
                     continue
             last_snap = time.time()
             if order_books or self.flumine.markets.live_orders:
                 for order_book in order_books:
                     order_book.client = self.client
-                self.flumine.handler_queue.put(CurrentOrdersEvent(order_books))
+                event = CurrentOrdersEvent(order_books)
+                if received:
+                    self.flumine.latency.record(
+                        "stream", event._monotonic_created - received
+                    )
+                self.flumine.handler_queue.put(event)
 
         logger.info("Stopped output_thread (OrderStream %s)", self.stream_id)
@@ -7,11 +7,13 @@ from .marketstream import MarketStream
 from .sportsdatastream import SportsDataStream
 from .datastream import DataStream
 from .historicalstream import HistoricalStream
+from .historicalcatalogue import MarketFileCatalogue, MarketRecord, filter_market
+from .historicalbinary import get_file_md
+from .filecache import get_local_path
 from .orderstream import OrderStream
 from .simulatedorderstream import SimulatedOrderStream
 from .betdaqorderpolling import BetdaqOrderPolling
 from ..clients import ExchangeType, BaseClient
-from ..utils import get_file_md
 from betfairlightweight.resources.streamingresources import MarketDefinition
 
 logger = logging.getLogger(__name__)
@@ -26,8 +28,6 @@ class Streams:
     def __call__(self, strategy: BaseStrategy) -> None:
         if self.flumine.SIMULATED:
             markets = strategy.market_filter.get("markets")
-            market_types = strategy.market_filter.get("market_types")
-            country_codes = strategy.market_filter.get("country_codes")
             event_processing = strategy.market_filter.get("event_processing", False)
             events = strategy.market_filter.get("events")
             listener_kwargs = strategy.market_filter.get("listener_kwargs", {})
@@ -41,25 +41,24 @@ class Streams:
             elif markets:
                 # order markets by name as an attempt to process in chronological order
                 markets.sort()
+                catalogue = strategy.market_filter.get("catalogue")
+                if catalogue:
+                    # resolve metadata from catalogue (files only read if new/modified)
+                    with MarketFileCatalogue(catalogue) as market_catalogue:
+                        records = market_catalogue.get(markets)
                 for market in markets:
-                    market_definition = get_file_md(market)
-                    market_type = getattr(market_definition, "market_type", None)
-                    country_code = getattr(market_definition, "country_code", None)
-                    if market_types and market_type and market_type not in market_types:
+                    if catalogue:
+                        market_definition = records.get(market)
+                    else:
+                        # remote files are read from the local file cache (if enabled)
+                        market_definition = get_file_md(get_local_path(market))
+                    excluded = filter_market(market_definition, strategy.market_filter)
+                    if excluded:
                         logger.warning(
-                            "Skipping market %s (%s) for strategy %s due to marketType filter",
+                            "Skipping market %s for strategy %s due to %s filter",
                             market,
-                            market_type,
                             strategy,
-                        )
-                    elif (
-                        country_codes
-                        and country_code
-                        and country_code not in country_codes
-                    ):
-                        logger.warning(
-                            "Skipping market %s (%s) for strategy %s due to countryCode filter"
-                            % (market, country_code, strategy)
+                            excluded,
                         )
                     else:
                         stream = self.add_historical_stream(
@@ -75,6 +74,8 @@ class Streams:
                 raise NotImplementedError()
         else:
             self.add_stream(strategy)
+        # streams may be added to a strategy that is already routed
+        self.flumine.strategies.update_stream_strategies()
 
     def add_client(self, client: BaseClient) -> None:
         if client.order_stream:
@@ -165,7 +166,7 @@ class Streams:
         self,
         strategy: BaseStrategy,
         market: str,
-        market_definition: Optional[MarketDefinition],
+        market_definition: Optional[Union[MarketDefinition, MarketRecord]],
         event_processing: bool,
         **listener_kwargs,
     ) -> HistoricalStream:
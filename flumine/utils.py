@@ -1,4 +1,5 @@
 import re
+import time
 import uuid
 import logging
 import hashlib
@@ -7,7 +8,7 @@ import functools
 import smart_open
 from pathlib import Path
 from typing import Optional, Tuple, Callable, Union
-from decimal import Decimal, ROUND_HALF_UP
+from decimal import Decimal
 
 from betfairlightweight.compat import json
 from betfairlightweight.resources import (
@@ -21,6 +22,8 @@ from betfairlightweight.resources import (
 
 from . import config
 from .exceptions import FlumineException
+from .ladder import PriceLadder, nearest_price
+from .latency import CallbackTiming
 
 logger = logging.getLogger(__name__)
 
@@ -83,6 +86,14 @@ def file_line_count(file_path: str) -> int:
 
 def get_file_md(file_dir: Union[str, tuple]) -> Optional[MarketDefinition]:
     # get value from raw streaming file marketDefinition
+    md = get_file_raw_md(file_dir)
+    if md is None:
+        return None
+    return MarketDefinition(**md)
+
+
+def get_file_raw_md(file_dir: Union[str, tuple]) -> Optional[dict]:
+    # get first raw marketDefinition from streaming file
     if isinstance(file_dir, tuple):
         file_dir = file_dir[0]
     with smart_open.open(file_dir, "r") as f:
@@ -95,8 +106,7 @@ def get_file_md(file_dir: Union[str, tuple]) -> Optional[MarketDefinition]:
         or "marketDefinition" not in update["mc"][0]
     ):
         return None
-    md = update["mc"][0]["marketDefinition"]
-    return MarketDefinition(**md)
+    return update["mc"][0]["marketDefinition"]
 
 
 def chunks(l: list, n: int) -> list:
@@ -148,19 +158,22 @@ PRICES_FLOAT = [float(price) for price in PRICES]
 FINEST_PRICES = make_prices(MIN_PRICE, ((1000, 100),))
 BETDAQ_PRICES = make_prices(BETDAQ_MIN_PRICE, BETDAQ_CUTOFFS)
 BETDAQ_PRICES_FLOAT = [float(price) for price in BETDAQ_PRICES]
+CLASSIC_LADDER = PriceLadder(PRICES_FLOAT, CUTOFFS)
+BETDAQ_LADDER = PriceLadder(BETDAQ_PRICES_FLOAT, BETDAQ_CUTOFFS)
+
+
+@functools.lru_cache(maxsize=None)
+def get_finest_ladder() -> PriceLadder:
+    return PriceLadder((float(price) for price in FINEST_PRICES), ((1000, 100),))
+
+
+@functools.lru_cache(maxsize=128)
+def get_line_ladder(min_unit: float, max_unit: float, interval: float) -> PriceLadder:
+    return PriceLadder(make_line_prices(min_unit, max_unit, interval))
 
 
 def get_nearest_price(price, cutoffs=CUTOFFS):
-    if price <= MIN_PRICE:
-        return MIN_PRICE
-    if price > MAX_PRICE:
-        return MAX_PRICE
-    price = as_dec(price)
-    for cutoff, step in cutoffs:
-        if price < cutoff:
-            break
-    step = as_dec(step)
-    return float((price * step).quantize(2, ROUND_HALF_UP) / step)
+    return nearest_price(price, cutoffs, MIN_PRICE, MAX_PRICE)
 
 
 def get_price(data: list, level: int) -> Optional[float]:
@@ -199,7 +212,12 @@ def get_sp(runner: RunnerBook) -> Optional[float]:
 
 
 def price_ticks_away(price: float, n_ticks: int, prices=None) -> float:
-    prices = PRICES_FLOAT if not prices else prices
+    if not prices or prices is PRICES_FLOAT:
+        return CLASSIC_LADDER.ticks_away(price, n_ticks)
+    elif prices is BETDAQ_PRICES_FLOAT:
+        return BETDAQ_LADDER.ticks_away(price, n_ticks)
+    elif isinstance(prices, PriceLadder):
+        return prices.ticks_away(price, n_ticks)
     try:
         price_index = prices.index(price)
         new_index = price_index + n_ticks
@@ -266,6 +284,7 @@ def call_strategy_error_handling(
     market,
     update: Union[MarketBook, MarketCatalogue, Race, CricketMatch],
 ) -> Optional[bool]:
+    start = time.perf_counter() if config.strategy_timing else None
     try:
         return func(market, update)
     except FlumineException as e:
@@ -286,6 +305,11 @@ def call_strategy_error_handling(
         )
         if config.raise_errors:
             raise
+    finally:
+        if start is not None:
+            record_strategy_timing(
+                func.__self__, func.__name__, market.market_id, start
+            )
     return False
 
 
@@ -313,6 +337,7 @@ def call_middleware_error_handling(middleware, market) -> None:
 
 
 def call_process_orders_error_handling(strategy, market, strategy_orders: list) -> None:
+    start = time.perf_counter() if config.strategy_timing else None
     try:
         strategy.process_orders(market, strategy_orders)
     except FlumineException as e:
@@ -333,9 +358,13 @@ def call_process_orders_error_handling(strategy, market, strategy_orders: list)
         )
         if config.raise_errors:
             raise
+    finally:
+        if start is not None:
+            record_strategy_timing(strategy, "process_orders", market.market_id, start)
 
 
 def call_process_raw_data(strategy, clk: str, publish_time: int, datum: dict) -> None:
+    start = time.perf_counter() if config.strategy_timing else None
     try:
         strategy.process_raw_data(clk, publish_time, datum)
     except FlumineException as e:
@@ -354,6 +383,34 @@ def call_process_raw_data(strategy, clk: str, publish_time: int, datum: dict) ->
         )
         if config.raise_errors:
             raise
+    finally:
+        if start is not None:
+            record_strategy_timing(strategy, "process_raw_data", datum.get("id"), start)
+
+
+def record_strategy_timing(strategy, callback: str, market_id, start: float) -> None:
+    """Add callback duration (since start, perf_counter)
+    to strategy.callback_timing and log if slow.
+    """
+    seconds = time.perf_counter() - start
+    try:
+        timing = strategy.callback_timing[callback]
+    except KeyError:
+        timing = strategy.callback_timing[callback] = CallbackTiming()
+    timing.record(seconds)
+    if seconds > config.strategy_timing_slow_call:
+        logger.warning(
+            "Slow strategy callback %s in %s (%s)",
+            callback,
+            strategy,
+            market_id,
+            extra={
+                "strategy_name": str(strategy),
+                "callback": callback,
+                "market_id": market_id,
+                "elapsed_seconds": seconds,
+            },
+        )
 
 
 def get_runner_book(
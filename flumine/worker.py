@@ -8,6 +8,7 @@ from betfairlightweight import BetfairError, filters, exceptions
 from . import config
 from .events import events
 from .utils import chunks
+from .metrics import create_metrics_server
 from .clients import ExchangeType
 
 logger = logging.getLogger(__name__)
@@ -24,6 +25,7 @@ class BackgroundWorker(threading.Thread):
         start_delay: int = 0,
         context: dict = None,
         name: str = None,
+        shutdown_function: Callable = None,
         **kwargs,
     ):
         name = name or function.__name__
@@ -35,6 +37,7 @@ class BackgroundWorker(threading.Thread):
         self.func_kwargs = func_kwargs if func_kwargs is not None else {}
         self.start_delay = start_delay
         self.context = context or {}
+        self.shutdown_function = shutdown_function
         self._running = False
 
     def run(self) -> None:
@@ -94,6 +97,21 @@ class BackgroundWorker(threading.Thread):
         )
         self._running = False
         self.join(timeout)
+        if self.shutdown_function:
+            try:
+                self.shutdown_function(self.context, self.flumine)
+            except Exception as e:
+                logger.error(
+                    "Error in BackgroundWorker %s shutdown: %s",
+                    self.name,
+                    e,
+                    extra={
+                        "worker_name": self.name,
+                        "function": self.shutdown_function,
+                        "context": self.context,
+                    },
+                    exc_info=True,
+                )
 
 
 def keep_alive(context: dict, flumine) -> None:
@@ -167,6 +185,38 @@ def poll_account_balance(context: dict, flumine) -> None:
             flumine.log_control(events.BalanceEvent(client, exchange=client.EXCHANGE))
 
 
+def log_latency(context: dict, flumine) -> None:
+    latency = flumine.latency.info
+    if latency:
+        logger.info("Latency", extra={"latency": latency})
+        flumine.log_control(events.LatencyEvent(latency))
+
+
+def refresh_execution_sessions(context: dict, flumine) -> None:
+    executions = {id(client.execution): client.execution for client in flumine.clients}
+    for execution in executions.values():
+        execution.refresh_http_sessions()
+
+
+def serve_metrics(
+    context: dict, flumine, host: str = "127.0.0.1", port: int = 9100
+) -> None:
+    """Handle a single metrics request (waits up to
+    metrics.SERVER_TIMEOUT), run with interval=0.
+    """
+    server = context.get("server")
+    if server is None:
+        server = context["server"] = create_metrics_server(flumine, host, port)
+    server.handle_request()
+
+
+def close_metrics(context: dict, flumine) -> None:
+    """Close the serve_metrics server socket (shutdown_function)."""
+    server = context.pop("server", None)
+    if server is not None:
+        server.server_close()
+
+
 def poll_market_closure(context: dict, flumine) -> None:
     markets = [
         market for market in list(flumine.markets.markets.values()) if market.closed
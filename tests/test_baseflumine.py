@@ -10,6 +10,14 @@ from flumine.baseflumine import (
 )
 from flumine.clients import ExchangeType
 from flumine.exceptions import ClientError
+from flumine.strategy.strategy import Strategies
+
+
+def create_strategies(*strategies) -> Strategies:
+    _strategies = Strategies()
+    for strategy in strategies:
+        _strategies(strategy, mock.Mock(), mock.Mock())
+    return _strategies
 
 
 class BaseFlumineTest(unittest.TestCase):
@@ -24,6 +32,12 @@ class BaseFlumineTest(unittest.TestCase):
         self.assertEqual(self.base_flumine._logging_controls, [])
         self.assertEqual(len(self.base_flumine.trading_controls), 3)
         self.assertEqual(self.base_flumine._workers, [])
+        self.assertEqual(len(self.base_flumine._handler_queue_buffer), 0)
+        self.assertEqual(self.base_flumine.latency.info, {})
+        self.assertEqual(
+            self.base_flumine.handler_queue_stats,
+            {"batches": 0, "events": 0, "market_books_skipped": 0},
+        )
 
     @mock.patch("flumine.baseflumine.SimulatedMiddleware")
     @mock.patch("flumine.baseflumine.BaseFlumine.add_market_middleware")
@@ -205,10 +219,9 @@ class BaseFlumineTest(unittest.TestCase):
         self.base_flumine.markets.events[1234].append(mock_market)
         mock_strategy_one = mock.Mock(stream_ids=[123])
         mock_strategy_two = mock.Mock(stream_ids=[])
-        self.base_flumine.strategies = [
-            mock_strategy_one,
-            mock_strategy_two,
-        ]
+        self.base_flumine.strategies = create_strategies(
+            mock_strategy_one, mock_strategy_two
+        )
         mock_sports_data = mock.Mock(
             spec=["streaming_unique_id", "market_id"],
             streaming_unique_id=123,
@@ -239,10 +252,9 @@ class BaseFlumineTest(unittest.TestCase):
         self.base_flumine.markets.events[1234].append(mock_market)
         mock_strategy_one = mock.Mock(stream_ids=[123])
         mock_strategy_two = mock.Mock(stream_ids=[])
-        self.base_flumine.strategies = [
-            mock_strategy_one,
-            mock_strategy_two,
-        ]
+        self.base_flumine.strategies = create_strategies(
+            mock_strategy_one, mock_strategy_two
+        )
         mock_sports_data = mock.Mock(
             streaming_unique_id=123, market_id="1.1", event_id=1234
         )
@@ -314,7 +326,7 @@ class BaseFlumineTest(unittest.TestCase):
     @mock.patch("flumine.baseflumine.BaseFlumine._add_market")
     def test__process_raw_data(self, mock__add_market, mock_call_process_raw_data):
         mock_strategy = mock.Mock(stream_ids=[12])
-        self.base_flumine.strategies = [mock_strategy]
+        self.base_flumine.strategies = create_strategies(mock_strategy)
         mock_event = mock.Mock()
         mock_event.event = (12, "AAA", 12345, [{"id": "1.23"}])
         self.base_flumine._process_raw_data(mock_event)
@@ -364,11 +376,9 @@ class BaseFlumineTest(unittest.TestCase):
         mock_market = mock.Mock(market_catalogue=None, market_id="1.23")
         mock_market.market_book.streaming_unique_id = 1
 
-        self.base_flumine.strategies = [
-            mock_strategy_1,
-            mock_strategy_2,
-            mock_strategy_3,
-        ]
+        self.base_flumine.strategies = create_strategies(
+            mock_strategy_1, mock_strategy_2, mock_strategy_3
+        )
         self.base_flumine.markets = mock.Mock(markets={"1.23": mock_market})
 
         mock_market_catalogue = mock.Mock(market_id="1.23")
@@ -412,11 +422,9 @@ class BaseFlumineTest(unittest.TestCase):
             market_catalogue=None, market_id="1.23", market_book=None
         )
 
-        self.base_flumine.strategies = [
-            mock_strategy_1,
-            mock_strategy_2,
-            mock_strategy_3,
-        ]
+        self.base_flumine.strategies = create_strategies(
+            mock_strategy_1, mock_strategy_2, mock_strategy_3
+        )
         self.base_flumine.markets = mock.Mock(markets={"1.23": mock_market})
 
         mock_market_catalogue = mock.Mock(market_id="1.23")
@@ -434,7 +442,7 @@ class BaseFlumineTest(unittest.TestCase):
         self, mock_process_current_orders, mock_call_process_orders_error_handling
     ):
         mock_order = mock.Mock(complete=True)
-        mock_market = mock.Mock(closed=False)
+        mock_market = mock.MagicMock(closed=False)
         mock_market.blotter.active = True
         mock_market.blotter.strategy_orders.return_value = [mock_order]
         self.base_flumine.markets = [mock_market]
@@ -456,6 +464,31 @@ class BaseFlumineTest(unittest.TestCase):
         mock_call_process_orders_error_handling.assert_called_with(
             mock_strategy, mock_market, [mock_order]
         )
+        mock_market.coalesce_transactions.assert_called_with(False)
+
+    @mock.patch("flumine.baseflumine.config")
+    @mock.patch("flumine.baseflumine.utils.call_process_orders_error_handling")
+    def test__process_current_orders_dirty_only(
+        self, mock_call_process_orders_error_handling, mock_config
+    ):
+        mock_config.process_orders_dirty_only = True
+        mock_market = mock.MagicMock(closed=False)
+        mock_market.blotter.active = True
+        mock_market_two = mock.MagicMock(closed=False)
+        mock_market_two.blotter.active = True
+        mock_market_two.blotter.pop_dirty_strategies.return_value = set()
+        self.base_flumine.markets = [mock_market, mock_market_two]
+        mock_strategy = mock.Mock()
+        mock_strategy_two = mock.Mock()
+        mock_market.blotter.pop_dirty_strategies.return_value = {mock_strategy_two}
+        self.base_flumine.strategies = [mock_strategy, mock_strategy_two]
+        self.base_flumine._process_current_orders(mock.Mock(event=[]))
+        mock_call_process_orders_error_handling.assert_called_once_with(
+            mock_strategy_two,
+            mock_market,
+            mock_market.blotter.strategy_orders(mock_strategy_two),
+        )
+        mock_market_two.blotter.strategy_orders.assert_not_called()
 
     @mock.patch("flumine.baseflumine.utils.call_process_orders_error_handling")
     @mock.patch("flumine.baseflumine.process_betdaq_current_orders")
@@ -465,7 +498,7 @@ class BaseFlumineTest(unittest.TestCase):
         mock_call_process_orders_error_handling,
     ):
         mock_order = mock.Mock(complete=True)
-        mock_market = mock.Mock(closed=False)
+        mock_market = mock.MagicMock(closed=False)
         mock_market.blotter.active = True
         mock_market.blotter.strategy_orders.return_value = [mock_order]
         self.base_flumine.markets = [mock_market]
@@ -487,6 +520,7 @@ class BaseFlumineTest(unittest.TestCase):
         mock_call_process_orders_error_handling.assert_called_with(
             mock_strategy, mock_market, [mock_order]
         )
+        mock_market.coalesce_transactions.assert_called_with(False)
 
     @mock.patch("flumine.baseflumine.process_current_orders")
     def test__process_current_orders_no_event(self, mock_process_current_orders):
@@ -532,7 +566,7 @@ class BaseFlumineTest(unittest.TestCase):
     def test__process_close_market(self, mock_log_control, mock_info):
         mock_strategy = mock.Mock()
         mock_strategy.stream_ids = [1, 2, 3]
-        self.base_flumine.strategies = [mock_strategy]
+        self.base_flumine.strategies = create_strategies(mock_strategy)
         mock_market = mock.Mock(closed=False, elapsed_seconds_closed=None)
         self.base_flumine.markets._markets = {"1.23": mock_market}
         mock_event = mock.Mock()
@@ -554,7 +588,7 @@ class BaseFlumineTest(unittest.TestCase):
     def test__process_close_market_datum(self, mock_log_control, mock_info):
         mock_strategy = mock.Mock()
         mock_strategy.stream_ids = [1, 2, 3]
-        self.base_flumine.strategies = [mock_strategy]
+        self.base_flumine.strategies = create_strategies(mock_strategy)
         mock_market = mock.Mock(closed=False, elapsed_seconds_closed=None)
         self.base_flumine.markets._markets = {"1.23": mock_market}
         mock_event = mock.Mock()
@@ -585,7 +619,7 @@ class BaseFlumineTest(unittest.TestCase):
     def test__process_close_market_closed(self, mock_log_control, mock_info):
         mock_strategy = mock.Mock()
         mock_strategy.stream_ids = [1, 2, 3]
-        self.base_flumine.strategies = [mock_strategy]
+        self.base_flumine.strategies = create_strategies(mock_strategy)
         mock_market = mock.Mock(
             market_id="1.23", event_id="1", closed=False, elapsed_seconds_closed=None
         )
@@ -630,7 +664,7 @@ class BaseFlumineTest(unittest.TestCase):
         self.mock_client.paper_trade = True
         mock_strategy = mock.Mock()
         mock_strategy.stream_ids = [1, 2, 3]
-        self.base_flumine.strategies = [mock_strategy]
+        self.base_flumine.strategies = create_strategies(mock_strategy)
         mock_market = mock.Mock(closed=False, elapsed_seconds_closed=None)
         mock_market.market_book.streaming_unique_id = 2
         mock_market.cleared.return_value = {}
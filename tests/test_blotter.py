@@ -1,3 +1,5 @@
+import sys
+import threading
 import unittest
 from unittest import mock
 
@@ -15,12 +17,16 @@ class BlotterTest(unittest.TestCase):
         self.assertFalse(self.blotter.active)
         self.assertEqual(self.blotter._orders, {})
         self.assertEqual(self.blotter._bet_id_lookup, {})
-        self.assertEqual(self.blotter._live_orders, [])
+        self.assertEqual(self.blotter._live_orders, {})
         self.assertEqual(self.blotter._trades, {})
         self.assertEqual(self.blotter._strategy_orders, {})
         self.assertEqual(self.blotter._strategy_selection_orders, {})
         self.assertEqual(self.blotter._client_orders, {})
         self.assertEqual(self.blotter._client_strategy_orders, {})
+        self.assertEqual(self.blotter._exposures, {})
+        self.assertEqual(self.blotter._order_exposures, {})
+        self.assertEqual(self.blotter._dirty_orders, {})
+        self.assertEqual(self.blotter._dirty_strategies, set())
         self.assertEqual(
             PENDING_STATUS,
             [
@@ -76,6 +82,141 @@ class BlotterTest(unittest.TestCase):
             [mock_order_three],
         )
 
+    def test_order_status_changed(self):
+        mock_order_one = mock.Mock(
+            id="1", selection_id=2, handicap=3, status=OrderStatus.PENDING
+        )
+        mock_order_one.trade.strategy = 69
+        mock_order_two = mock.Mock(
+            id="2", selection_id=2, handicap=3, status=OrderStatus.PENDING
+        )
+        mock_order_two.trade.strategy = 69
+        mock_order_two.client = mock_order_one.client
+        self.blotter["1"] = mock_order_one
+        self.blotter["2"] = mock_order_two
+        mock_order_two.status = OrderStatus.EXECUTABLE
+        self.blotter.order_status_changed(mock_order_two)
+        mock_order_one.status = OrderStatus.EXECUTABLE
+        self.blotter.order_status_changed(mock_order_one)
+        self.assertEqual(
+            self.blotter.strategy_orders(69, order_status=[OrderStatus.PENDING]), []
+        )
+        # insertion order retained
+        self.assertEqual(
+            self.blotter.strategy_orders(69, order_status=[OrderStatus.EXECUTABLE]),
+            [mock_order_one, mock_order_two],
+        )
+        mock_order_one.status = OrderStatus.EXECUTION_COMPLETE
+        self.blotter.order_status_changed(mock_order_one)
+        self.assertEqual(
+            self.blotter.strategy_selection_orders(
+                69,
+                2,
+                3,
+                order_status=[
+                    OrderStatus.EXECUTABLE,
+                    OrderStatus.EXECUTION_COMPLETE,
+                ],
+            ),
+            [mock_order_one, mock_order_two],
+        )
+        self.assertEqual(
+            self.blotter.client_orders(
+                mock_order_one.client, order_status=[OrderStatus.EXECUTABLE]
+            ),
+            [mock_order_two],
+        )
+        self.assertEqual(
+            self.blotter.client_strategy_orders(
+                mock_order_one.client,
+                69,
+                order_status=[OrderStatus.EXECUTION_COMPLETE],
+            ),
+            [mock_order_one],
+        )
+        self.assertEqual(
+            self.blotter._order_status,
+            {"1": OrderStatus.EXECUTION_COMPLETE, "2": OrderStatus.EXECUTABLE},
+        )
+
+    def test_order_status_changed_dirty(self):
+        mock_order = mock.Mock(
+            id="1", selection_id=2, handicap=3, status=OrderStatus.PENDING
+        )
+        mock_order.trade.strategy = 69
+        self.blotter["1"] = mock_order
+        self.assertEqual(self.blotter.pop_dirty_strategies(), {69})
+        self.assertFalse(self.blotter.dirty)
+        mock_order.status = OrderStatus.EXECUTABLE
+        self.blotter.order_status_changed(mock_order)
+        self.assertTrue(self.blotter.dirty)
+        self.assertEqual(self.blotter.pop_dirty_strategies(), {69})
+
+    def test_order_updated_threads(self):
+        def update(strategies):
+            for strategy in strategies:
+                mock_order = mock.Mock()
+                mock_order.trade.strategy = strategy
+                self.blotter.order_updated(mock_order)
+
+        threads = [
+            threading.Thread(target=update, args=(range(i, 2000, 4),)) for i in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        popped = set()
+        while any(t.is_alive() for t in threads):
+            popped |= self.blotter.pop_dirty_strategies()
+        for thread in threads:
+            thread.join()
+        popped |= self.blotter.pop_dirty_strategies()
+        self.assertEqual(popped, set(range(2000)))
+        self.assertFalse(self.blotter.dirty)
+
+    def test_order_status_changed_threads(self):
+        statuses = [
+            OrderStatus.PENDING,
+            OrderStatus.EXECUTABLE,
+            OrderStatus.EXECUTION_COMPLETE,
+        ]
+        orders = []
+        for i in range(200):
+            mock_order = mock.Mock(
+                id=str(i), selection_id=2, handicap=3, status=OrderStatus.PENDING
+            )
+            mock_order.trade.strategy = 69
+            self.blotter[str(i)] = mock_order
+            orders.append(mock_order)
+
+        def update(orders):
+            for _ in range(20):
+                for status in statuses[1:] + statuses[:1]:
+                    for order in orders:
+                        order.status = status
+                        self.blotter.order_status_changed(order)
+
+        threads = [
+            threading.Thread(target=update, args=(orders[i::4],)) for i in range(4)
+        ]
+        # switch threads often to expose partition updates
+        switch_interval = sys.getswitchinterval()
+        self.addCleanup(sys.setswitchinterval, switch_interval)
+        sys.setswitchinterval(1e-6)
+        for thread in threads:
+            thread.start()
+        counts = set()
+        while any(t.is_alive() for t in threads):
+            counts.add(len(self.blotter.strategy_orders(69, order_status=statuses)))
+        for thread in threads:
+            thread.join()
+        self.assertEqual(counts, {200})
+
+    def test_order_status_changed_unknown(self):
+        mock_order = mock.Mock(id="1", status=OrderStatus.EXECUTABLE)
+        self.blotter.order_status_changed(mock_order)
+        self.assertEqual(self.blotter._order_status, {})
+        self.assertEqual(self.blotter._status_orders, {})
+
     def test_strategy_selection_orders(self):
         mock_order_one = mock.Mock(
             selection_id=2, handicap=3, status=OrderStatus.EXECUTABLE, size_matched=1
@@ -219,14 +360,19 @@ class BlotterTest(unittest.TestCase):
     def test_live_orders(self):
         self.assertEqual(list(self.blotter.live_orders), [])
         mock_order = mock.Mock(complete=False)
-        self.blotter._live_orders = [mock_order]
+        self.blotter._live_orders = {mock_order.id: mock_order}
         self.assertEqual(list(self.blotter.live_orders), [mock_order])
 
     def test_has_live_orders(self):
         self.assertFalse(self.blotter.has_live_orders)
-        self.blotter._live_orders = [mock.Mock()]
+        self.blotter._live_orders = {"123": mock.Mock()}
         self.assertTrue(self.blotter.has_live_orders)
 
+    def test_live_order_count(self):
+        self.assertEqual(self.blotter.live_order_count, 0)
+        self.blotter._live_orders = {"123": mock.Mock()}
+        self.assertEqual(self.blotter.live_order_count, 1)
+
     def test_process_closed_market(self):
         mock_market = mock.Mock()
         mock_market_book = mock.Mock(number_of_winners=1)
@@ -347,6 +493,144 @@ class BlotterTest(unittest.TestCase):
             },
         )
 
+    def test_get_exposures_order_changed(self):
+        mock_strategy = mock.Mock()
+        mock_trade = mock.Mock(strategy=mock_strategy)
+        mock_order = mock.Mock(
+            id="12345",
+            trade=mock_trade,
+            lookup=(self.blotter.market_id, 123, 0),
+            selection_id=123,
+            handicap=0,
+            side="BACK",
+            average_price_matched=0.0,
+            size_matched=0.0,
+            size_remaining=2.0,
+            status=OrderStatus.EXECUTABLE,
+            complete=False,
+            order_type=LimitOrder(price=5.6, size=2.0),
+        )
+        self.blotter["12345"] = mock_order
+        exposures = self.blotter.get_exposures(mock_strategy, mock_order.lookup)
+        self.assertEqual(exposures["worst_possible_profit_on_lose"], -2.0)
+        self.assertEqual(exposures["worst_possible_profit_on_win"], 0.0)
+        self.assertEqual(self.blotter._dirty_orders, {(mock_strategy, 123, 0): {}})
+        # cached until changed
+        mock_order.size_matched = 2.0
+        mock_order.average_price_matched = 5.6
+        mock_order.size_remaining = 0.0
+        exposures = self.blotter.get_exposures(mock_strategy, mock_order.lookup)
+        self.assertEqual(exposures["matched_profit_if_win"], 0.0)
+        self.blotter.order_changed(mock_order)
+        exposures = self.blotter.get_exposures(mock_strategy, mock_order.lookup)
+        self.assertEqual(exposures["matched_profit_if_win"], 9.2)
+        self.assertEqual(exposures["matched_profit_if_lose"], -2.0)
+        self.assertEqual(exposures["worst_potential_unmatched_profit_if_lose"], 0.0)
+        self.assertEqual(
+            self.blotter._order_exposures,
+            {"12345": (-2.0, 9.2, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)},
+        )
+        self.assertEqual(
+            self.blotter._exposures[(mock_strategy, 123, 0)],
+            [-2.0, 9.2, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+        )
+        # violation removes exposure
+        mock_order.status = OrderStatus.VIOLATION
+        self.blotter.order_changed(mock_order)
+        exposures = self.blotter.get_exposures(mock_strategy, mock_order.lookup)
+        self.assertEqual(exposures["worst_possible_profit_on_win"], 0.0)
+        self.assertEqual(exposures["worst_possible_profit_on_lose"], 0.0)
+
+    def test_order_changed(self):
+        mock_order = mock.Mock(id="12345", selection_id=123, handicap=1)
+        self.blotter.order_changed(mock_order)
+        self.blotter.order_changed(mock_order)
+        self.assertEqual(
+            self.blotter._dirty_orders,
+            {(mock_order.trade.strategy, 123, 1): {"12345": mock_order}},
+        )
+
+    def test_order_updated(self):
+        mock_order = mock.Mock()
+        mock_order_two = mock.Mock()
+        self.blotter.order_updated(mock_order)
+        self.blotter.order_updated(mock_order)
+        self.blotter.order_updated(mock_order_two)
+        self.assertTrue(self.blotter.dirty)
+        self.assertEqual(
+            self.blotter.pop_dirty_strategies(),
+            {mock_order.trade.strategy, mock_order_two.trade.strategy},
+        )
+        self.assertFalse(self.blotter.dirty)
+        self.assertEqual(self.blotter.pop_dirty_strategies(), set())
+
+    def test_get_exposures_with_exclusion_other_selection(self):
+        mock_strategy = mock.Mock()
+        mock_trade = mock.Mock(strategy=mock_strategy)
+        mock_order = mock.Mock(
+            trade=mock_trade,
+            lookup=(self.blotter.market_id, 123, 0),
+            selection_id=123,
+            handicap=0,
+            side="BACK",
+            average_price_matched=5.6,
+            size_matched=2.0,
+            size_remaining=0.0,
+            order_type=LimitOrder(price=5.6, size=2.0),
+        )
+        mock_order_excluded = mock.Mock(
+            trade=mock_trade,
+            lookup=(self.blotter.market_id, 456, 0),
+            selection_id=456,
+            handicap=0,
+            side="BACK",
+            average_price_matched=5.6,
+            size_matched=2.0,
+            size_remaining=0.0,
+            order_type=LimitOrder(price=5.6, size=2.0),
+        )
+        self.blotter["12345"] = mock_order
+        self.blotter["67890"] = mock_order_excluded
+        self.blotter.get_exposures(mock_strategy, mock_order_excluded.lookup)
+        # exclusion from another selection / strategy is ignored
+        expected = {
+            "matched_profit_if_lose": -2.0,
+            "matched_profit_if_win": 9.2,
+            "worst_possible_profit_on_lose": -2.0,
+            "worst_possible_profit_on_win": 9.2,
+            "worst_potential_unmatched_profit_if_lose": 0.0,
+            "worst_potential_unmatched_profit_if_win": 0.0,
+        }
+        self.assertEqual(
+            self.blotter.get_exposures(
+                mock_strategy, mock_order.lookup, exclusion=mock_order_excluded
+            ),
+            expected,
+        )
+        self.assertEqual(
+            self.blotter.get_exposures(
+                mock.Mock(), mock_order.lookup, exclusion=mock_order
+            ),
+            {k: 0.0 for k in expected},
+        )
+
+    def test__update_exposures_changed_during_calculation(self):
+        mock_order = mock.Mock(id="12345", selection_id=123, handicap=1)
+        key = (mock_order.trade.strategy, 123, 1)
+        self.blotter.order_changed(mock_order)
+
+        def calculate(order):
+            # execution thread update whilst calculating
+            self.blotter.order_changed(order)
+            return (1.0,) * 8
+
+        with mock.patch.object(
+            self.blotter, "_calculate_order_exposure", side_effect=calculate
+        ):
+            self.blotter._update_exposures(key)
+        self.assertEqual(self.blotter._dirty_orders[key], {"12345": mock_order})
+        self.assertEqual(self.blotter._exposures[key], [1.0] * 8)
+
     def test_get_exposures_line_range(self):
         mock_strategy = mock.Mock()
         mock_trade = mock.Mock(strategy=mock_strategy)
@@ -781,8 +1065,16 @@ class BlotterTest(unittest.TestCase):
         )
 
     def test_complete_order(self):
-        self.blotter._live_orders = ["test"]
-        self.blotter.complete_order("test")
+        mock_order = mock.Mock(id="123")
+        self.blotter._live_orders = {"123": mock_order}
+        self.blotter.complete_order(mock_order)
+        self.assertEqual(self.blotter._live_orders, {})
+
+    def test_has_live_order(self):
+        mock_order = mock.Mock(id="123")
+        self.assertFalse(self.blotter.has_live_order(mock_order))
+        self.blotter._live_orders = {"123": mock_order}
+        self.assertTrue(self.blotter.has_live_order(mock_order))
 
     def test_has_trade(self):
         self.assertFalse(self.blotter.has_trade("123"))
@@ -803,7 +1095,7 @@ class BlotterTest(unittest.TestCase):
         self.assertTrue(self.blotter.active)
         self.assertEqual(self.blotter._orders, {"123": mock_order})
         self.assertEqual(self.blotter._bet_id_lookup, {"456": mock_order})
-        self.assertEqual(self.blotter._live_orders, [mock_order])
+        self.assertEqual(self.blotter._live_orders, {mock_order.id: mock_order})
         self.assertEqual(self.blotter._trades, {mock_order.trade.id: [mock_order]})
         self.assertEqual(
             self.blotter._strategy_orders, {mock_order.trade.strategy: [mock_order]}
@@ -820,6 +1112,11 @@ class BlotterTest(unittest.TestCase):
             self.blotter._client_strategy_orders,
             {(mock_client, mock_order.trade.strategy): [mock_order]},
         )
+        self.assertEqual(mock_order.blotter, self.blotter)
+        self.assertEqual(
+            self.blotter._dirty_orders,
+            {(mock_order.trade.strategy, 2, 3): {mock_order.id: mock_order}},
+        )
 
     def test__getitem(self):
         self.blotter._orders = {"12345": "test", "54321": "test2"}
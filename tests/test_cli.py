@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from flumine import cli
+
+
+class CliTest(unittest.TestCase):
+    def test_create_parser(self):
+        parser = cli.create_parser()
+        args = parser.parse_args(["convert", "1.123", "1.456", "-o", "/tmp"])
+        self.assertEqual(args.files, ["1.123", "1.456"])
+        self.assertEqual(args.output_dir, "/tmp")
+        self.assertEqual(args.func, cli._convert)
+
+    def test_create_parser_simulate(self):
+        parser = cli.create_parser()
+        args = parser.parse_args(
+            ["simulate", "1.123", "1.456", "-s", "strategies:create", "-p", "4"]
+        )
+        self.assertEqual(args.files, ["1.123", "1.456"])
+        self.assertEqual(args.strategy, "strategies:create")
+        self.assertEqual(args.processes, 4)
+        self.assertIsNone(args.markets_per_process)
+        self.assertIsNone(args.client_kwargs)
+        self.assertEqual(args.func, cli._simulate)
+
+    def test_load_object(self):
+        self.assertEqual(cli.load_object("flumine.cli:main"), cli.main)
+        with self.assertRaises(ValueError):
+            cli.load_object("flumine.cli")
+
+    @mock.patch("flumine.simulation.simulation.FlumineSimulation.run_parallel")
+    def test_simulate(self, mock_run_parallel):
+        mock_run_parallel.return_value = []
+        cli.main(
+            [
+                "simulate",
+                "tests/resources/1.197931750",
+                "-s",
+                "flumine.cli:main",
+                "--markets-per-process",
+                "2",
+                "--client-kwargs",
+                '{"username": "test"}',
+            ]
+        )
+        mock_run_parallel.assert_called_with(
+            ["tests/resources/1.197931750"],
+            cli.main,
+            client_kwargs={"username": "test"},
+            processes=None,
+            markets_per_process=2,
+        )
+
+    @mock.patch("flumine.cli.convert")
+    def test_convert(self, mock_convert):
+        cli.main(["convert", "tests/resources/1.197931750"])
+        mock_convert.assert_called_with("tests/resources/1.197931750", None)
+
+    @mock.patch("flumine.cli.convert")
+    def test_convert_output_dir(self, mock_convert):
+        cli.main(["convert", "tests/resources/BASIC-1.132153978.gz", "-o", "/tmp"])
+        mock_convert.assert_called_with(
+            "tests/resources/BASIC-1.132153978.gz", "/tmp/BASIC-1.132153978.flb"
+        )
+
+    def test_convert_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cli.main(["convert", "tests/resources/1.197931750", "-o", tmp_dir])
+            self.assertTrue(os.path.exists(os.path.join(tmp_dir, "1.197931750.flb")))
@@ -6,6 +6,7 @@ from flumine.controls.clientcontrols import (
     BaseControl,
     MaxTransactionCount,
     OrderPackageType,
+    TokenBucket,
 )
 from flumine.exceptions import ControlError
 
@@ -43,6 +44,7 @@ class TestMaxTransactionCount(unittest.TestCase):
         self.mock_client = mock.Mock()
         self.mock_client.transaction_limit = 1000
         self.mock_client.chargeable_transaction_count = 0
+        self.mock_client.transaction_rate = None
         self.mock_flumine = mock.Mock()
         self.trading_control = MaxTransactionCount(self.mock_flumine, self.mock_client)
 
@@ -54,6 +56,31 @@ class TestMaxTransactionCount(unittest.TestCase):
         self.assertEqual(self.trading_control.current_failed_transaction_count, 0)
         self.assertEqual(self.trading_control.transaction_count, 0)
         self.assertEqual(self.trading_control.failed_transaction_count, 0)
+        self.assertIsNone(self.trading_control.token_bucket)
+        self.assertEqual(self.trading_control.rate_limited_count, 0)
+        self.assertEqual(self.trading_control.rate_limited_seconds, 0)
+
+    def test_init_transaction_rate(self):
+        self.mock_client.transaction_rate = 10
+        self.mock_client.transaction_burst = None
+        trading_control = MaxTransactionCount(self.mock_flumine, self.mock_client)
+        self.assertEqual(trading_control.token_bucket.rate, 10)
+        self.assertEqual(trading_control.token_bucket.capacity, 10)
+        self.mock_client.transaction_burst = 50
+        trading_control = MaxTransactionCount(self.mock_flumine, self.mock_client)
+        self.assertEqual(trading_control.token_bucket.capacity, 50)
+
+    def test_reserve(self):
+        self.assertEqual(self.trading_control.reserve(10), 0)
+        self.trading_control.token_bucket = mock.Mock(rate=1)
+        self.trading_control.token_bucket.reserve.return_value = 0
+        self.assertEqual(self.trading_control.reserve(10), 0)
+        self.trading_control.token_bucket.reserve.assert_called_with(10)
+        self.assertEqual(self.trading_control.rate_limited_count, 0)
+        self.trading_control.token_bucket.reserve.return_value = 2.5
+        self.assertEqual(self.trading_control.reserve(10), 2.5)
+        self.assertEqual(self.trading_control.rate_limited_count, 10)
+        self.assertEqual(self.trading_control.rate_limited_seconds, 2.5)
 
     def test_add_transaction(self):
         self.trading_control.add_transaction(123)
@@ -141,3 +168,33 @@ class TestMaxTransactionCount(unittest.TestCase):
         self.assertEqual(
             self.trading_control.transaction_limit, self.mock_client.transaction_limit
         )
+
+
+class TestTokenBucket(unittest.TestCase):
+    @mock.patch("flumine.controls.clientcontrols.time.monotonic", return_value=100)
+    def setUp(self, _):
+        self.token_bucket = TokenBucket(2, 4)
+
+    def test_init(self):
+        self.assertEqual(self.token_bucket.rate, 2)
+        self.assertEqual(self.token_bucket.capacity, 4)
+        self.assertEqual(self.token_bucket._tokens, 4)
+        self.assertEqual(self.token_bucket._last, 100)
+
+    @mock.patch("flumine.controls.clientcontrols.time.monotonic", return_value=100)
+    def test_reserve(self, _):
+        self.assertEqual(self.token_bucket.reserve(3), 0)
+        self.assertEqual(self.token_bucket.reserve(), 0)
+        self.assertEqual(self.token_bucket.reserve(), 0.5)
+        self.assertEqual(self.token_bucket.reserve(3), 2)
+        self.assertEqual(self.token_bucket._tokens, -4)
+
+    @mock.patch("flumine.controls.clientcontrols.time.monotonic")
+    def test_reserve_refill(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        self.assertEqual(self.token_bucket.reserve(6), 1)
+        mock_monotonic.return_value = 101
+        self.assertEqual(self.token_bucket.tokens, 0)
+        mock_monotonic.return_value = 110
+        self.assertEqual(self.token_bucket.tokens, 4)  # capped
+        self.assertEqual(self.token_bucket.reserve(2), 0)
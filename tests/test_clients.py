@@ -144,6 +144,8 @@ class BaseClientTest(unittest.TestCase):
     def test_init(self):
         self.assertEqual(self.base_client.betting_client, self.mock_betting_client)
         self.assertEqual(self.base_client.transaction_limit, 1024)
+        self.assertIsNone(self.base_client.transaction_rate)
+        self.assertIsNone(self.base_client.transaction_burst)
         self.assertEqual(self.base_client.capital_base, 100)
         self.assertEqual(self.base_client.commission_base, 0.02)
         self.assertTrue(self.base_client.interactive_login)
@@ -214,6 +216,16 @@ class BaseClientTest(unittest.TestCase):
         self.base_client.add_transaction(123, True)
         mock_trading_control.add_transaction.assert_called_with(123, True)
 
+    def test_reserve_transactions(self):
+        self.assertEqual(self.base_client.reserve_transactions(2), 0)
+        self.base_client.trading_controls = [
+            mock.Mock(spec=[]),
+            mock.Mock(reserve=mock.Mock(return_value=1.5)),
+            mock.Mock(reserve=mock.Mock(return_value=0.5)),
+        ]
+        self.assertEqual(self.base_client.reserve_transactions(2), 1.5)
+        self.base_client.trading_controls[1].reserve.assert_called_with(2)
+
     def test_current_transaction_count_total(self):
         self.assertIsNone(self.base_client.current_transaction_count_total)
         mock_trading_control = mock.Mock(
@@ -8,12 +8,32 @@ class ConfigTest(unittest.TestCase):
         self.assertFalse(config.simulated)
         self.assertTrue(config.simulated_strategy_isolation)
         self.assertFalse(config.simulation_available_prices)
+        self.assertIsNone(config.simulation_read_ahead)
+        self.assertEqual(config.simulation_read_chunk_size, 262144)
+        self.assertFalse(config.simulation_index)
+        self.assertIsNone(config.simulation_index_dir)
+        self.assertEqual(config.simulation_markets_per_process, 8)
+        self.assertIsNone(config.simulation_file_cache)
+        self.assertEqual(config.simulation_file_cache_size, 10 * 1024**3)
         self.assertIsInstance(config.customer_strategy_ref, str)
         self.assertIsInstance(config.process_id, int)
         self.assertIsNone(config.current_time)
+        self.assertFalse(config.changed_market_books_only)
         self.assertFalse(config.raise_errors)
+        self.assertTrue(config.record_latency)
+        self.assertFalse(config.strategy_timing)
+        self.assertEqual(config.metrics_host, "127.0.0.1")
+        self.assertIsNone(config.metrics_port)
+        self.assertEqual(config.strategy_timing_slow_call, 0.1)
         self.assertEqual(config.max_execution_workers, 32)
+        self.assertEqual(config.min_execution_sessions, 2)
+        self.assertIsNone(config.max_execution_sessions)
+        self.assertEqual(config.execution_session_refresh, 60)
         self.assertFalse(config.async_place_orders)
+        self.assertFalse(config.coalesce_market_books)
+        self.assertEqual(config.handler_queue_batch_size, 250)
+        self.assertFalse(config.coalesce_transactions)
+        self.assertFalse(config.process_orders_dirty_only)
         self.assertEqual(config.place_latency, 0.120)
         self.assertEqual(config.cancel_latency, 0.170)
         self.assertEqual(config.update_latency, 0.150)
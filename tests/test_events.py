@@ -15,6 +15,7 @@ class BaseEventTest(unittest.TestCase):
         self.assertEqual(self.base_event.event, self.mock_event)
         self.assertEqual(self.base_event.exchange, 123)
         self.assertIsNotNone(self.base_event._time_created)
+        self.assertIsNotNone(self.base_event._monotonic_created)
 
     def test_elapsed_seconds(self):
         self.assertGreaterEqual(self.base_event.elapsed_seconds, 0)
@@ -22,3 +23,7 @@ class BaseEventTest(unittest.TestCase):
     def test_str(self):
         self.base_event = events.MarketBookEvent(None)
         self.assertEqual(str(self.base_event), "<MARKET_BOOK [HANDLER]>")
+
+    def test_latency_event(self):
+        self.base_event = events.LatencyEvent({})
+        self.assertEqual(str(self.base_event), "<LATENCY [LOGGING]>")
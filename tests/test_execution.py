@@ -1,20 +1,24 @@
 import time
+import asyncio
 import unittest
 from unittest import mock
 from unittest.mock import call
 
 from betdaq import BetdaqError
-from betfairlightweight import BetfairError
+from betfairlightweight import APIClient, BetfairError, resources
+from betfairlightweight.exceptions import APIError, InvalidResponse, StatusCodeError
 
 from flumine import config
 from flumine.clients.clients import ExchangeType
 from flumine.exceptions import OrderExecutionError
 from flumine.execution.baseexecution import (
     MAX_SESSION_AGE,
+    SESSION_REFRESH_TIMEOUT,
     BET_ID_START,
     BaseExecution,
     OrderPackageType,
 )
+from flumine.execution.asyncexecution import AsyncBetfairExecution
 from flumine.execution.betdaqexecution import BetdaqExecution
 from flumine.execution.betfairexecution import BetfairExecution
 from flumine.execution.simulatedexecution import SimulatedExecution
@@ -33,7 +37,7 @@ class BaseExecutionTest(unittest.TestCase):
         self.assertIsNotNone(self.execution._thread_pool)
         self.assertIsNone(self.execution.EXCHANGE)
         self.assertEqual(self.execution._bet_id, 100000000000)
-        self.assertEqual(self.execution._sessions, [])
+        self.assertEqual(list(self.execution._sessions), [])
         self.assertEqual(self.execution._sessions_created, 0)
 
     @mock.patch("flumine.execution.baseexecution.BaseExecution._get_http_session")
@@ -45,10 +49,192 @@ class BaseExecutionTest(unittest.TestCase):
         mock_thread_pool = mock.Mock(_threads=())
         self.execution._thread_pool = mock_thread_pool
         self.execution.handler(mock_order_package)
-        mock_thread_pool.submit.assert_called_with(
-            mock_execute_place, mock_order_package, mock__get_http_session()
+        mock_thread_pool.submit.assert_called_with(self.execution._run_next)
+        self.assertEqual(
+            self.execution._lanes[OrderPackageType.PLACE][0][1:],
+            (
+                self.execution._execute_with_session,
+                mock_order_package,
+                (mock_execute_place,),
+            ),
+        )
+        mock__get_http_session.assert_not_called()
+
+    @mock.patch("flumine.execution.baseexecution.time.monotonic", return_value=12.5)
+    @mock.patch("flumine.execution.baseexecution.BaseExecution._get_http_session")
+    @mock.patch("flumine.execution.baseexecution.BaseExecution.execute_place")
+    def test_handler_latency(self, mock_execute_place, mock__get_http_session, _):
+        mock_execute_place.__name__ = "execute_place"
+        mock_order_package = mock.MagicMock(
+            elapsed_seconds=1, retry_count=0, _monotonic_created=12
+        )
+        mock_order_package.package_type = OrderPackageType.PLACE
+        mock_order_package.client.reserve_transactions.return_value = 0
+        self.execution._thread_pool = mock.Mock(_threads=())
+        self.execution.handler(mock_order_package)
+        self.assertEqual(mock_order_package.monotonic_submitted, 12.5)
+        self.mock_flumine.latency.record.assert_called_with("transaction", 0.5)
+
+    @mock.patch("flumine.execution.baseexecution.BaseExecution.schedule")
+    @mock.patch("flumine.execution.baseexecution.BaseExecution._get_http_session")
+    @mock.patch("flumine.execution.baseexecution.BaseExecution.execute_place")
+    def test_handler_rate_limit(
+        self, mock_execute_place, mock__get_http_session, mock_schedule
+    ):
+        mock_execute_place.__name__ = "execute_place"
+        mock_order_package = mock.MagicMock(
+            elapsed_seconds=1, retry_count=0, package_type=OrderPackageType.PLACE
+        )
+        mock_order_package.__len__.return_value = 2
+        mock_order_package.client.reserve_transactions.return_value = 1.5
+        self.execution.handler(mock_order_package)
+        mock_order_package.client.reserve_transactions.assert_called_with(2)
+        mock_schedule.assert_called_with(
+            1.5,
+            self.execution._submit,
+            self.execution._execute_with_session,
+            mock_order_package,
+            mock_execute_place,
+        )
+        # session not held whilst rate limited
+        mock__get_http_session.assert_not_called()
+        self.mock_flumine.latency.record.assert_called_with("rate_limit", 1.5)
+
+    @mock.patch("flumine.execution.baseexecution.BaseExecution._get_http_session")
+    def test__execute_with_session(self, mock__get_http_session):
+        mock_func = mock.Mock()
+        mock_order_package = mock.Mock()
+        self.execution._execute_with_session(mock_order_package, mock_func)
+        mock_func.assert_called_with(mock_order_package, mock__get_http_session())
+
+    def test__submit(self):
+        mock_func = mock.Mock()
+        mock_order_package = mock.Mock(package_type=OrderPackageType.PLACE)
+        self.execution._submit(mock_func, mock_order_package, 2)
+        self.execution.shutdown()
+        mock_func.assert_called_with(mock_order_package, 2)
+        self.assertIsNotNone(mock_order_package.monotonic_submitted)
+        self.assertEqual(self.execution.thread_pool_stats["submitted"], 1)
+        self.assertEqual(self.execution.thread_pool_stats["completed"], 1)
+        self.mock_flumine.latency.record_since.assert_called_with(
+            "queue_place", mock.ANY
+        )
+
+    def test__run_next_priority(self):
+        results = []
+        self.execution._thread_pool = mock.Mock()
+        for package_type in (
+            OrderPackageType.PLACE,
+            OrderPackageType.UPDATE,
+            OrderPackageType.PLACE,
+            OrderPackageType.REPLACE,
+            OrderPackageType.CANCEL,
+        ):
+            self.execution._submit(results.append, mock.Mock(package_type=package_type))
+        self.assertEqual(
+            [len(lane) for lane in self.execution._lanes.values()], [1, 1, 1, 2]
+        )
+        for _ in range(5):
+            self.execution._run_next()
+        self.assertEqual(
+            [order_package.package_type for order_package in results],
+            [
+                OrderPackageType.CANCEL,
+                OrderPackageType.REPLACE,
+                OrderPackageType.UPDATE,
+                OrderPackageType.PLACE,
+                OrderPackageType.PLACE,
+            ],
+        )
+        self.execution._run_next()  # empty
+        self.assertEqual(len(results), 5)
+
+    def test__get_rate_limit_delay(self):
+        mock_order_package = mock.MagicMock(
+            package_type=OrderPackageType.PLACE, retry_count=0
+        )
+        mock_order_package.__len__.return_value = 3
+        mock_order_package.client.reserve_transactions.return_value = 0.5
+        self.assertEqual(self.execution._get_rate_limit_delay(mock_order_package), 0.5)
+        mock_order_package.client.reserve_transactions.assert_called_with(3)
+        mock_order_package.package_type = OrderPackageType.REPLACE
+        self.assertEqual(self.execution._get_rate_limit_delay(mock_order_package), 0.5)
+
+    def test__get_rate_limit_delay_cancel(self):
+        mock_order_package = mock.Mock(
+            package_type=OrderPackageType.CANCEL, retry_count=0
         )
-        mock__get_http_session.assert_called_with()
+        self.assertEqual(self.execution._get_rate_limit_delay(mock_order_package), 0)
+        mock_order_package.client.reserve_transactions.assert_not_called()
+
+    def test__get_rate_limit_delay_retry(self):
+        mock_order_package = mock.Mock(
+            package_type=OrderPackageType.PLACE, retry_count=1
+        )
+        self.assertEqual(self.execution._get_rate_limit_delay(mock_order_package), 0)
+        mock_order_package.client.reserve_transactions.assert_not_called()
+
+    def test__run(self):
+        def func():
+            self.assertEqual(self.execution.thread_pool_stats["active"], 1)
+
+        self.execution._run(func)
+        self.assertEqual(
+            self.execution.thread_pool_stats,
+            {
+                "submitted": 0,
+                "completed": 1,
+                "active": 0,
+                "max_active": 1,
+                "busy_seconds": mock.ANY,
+            },
+        )
+
+    def test__run_error(self):
+        with self.assertRaises(ValueError):
+            self.execution._run(mock.Mock(side_effect=ValueError()))
+        self.assertEqual(self.execution.thread_pool_stats["active"], 0)
+        self.assertEqual(self.execution.thread_pool_stats["completed"], 1)
+
+    def test_schedule(self):
+        mock_func = mock.Mock()
+        self.execution._scheduler = mock.Mock()
+        self.execution.schedule(1, mock_func, 1)
+        self.execution._scheduler.schedule.assert_called_with(1, mock_func, 1)
+        mock_func.assert_not_called()
+
+    def test_schedule_no_delay(self):
+        mock_func = mock.Mock()
+        self.execution._scheduler = mock.Mock()
+        self.execution.schedule(0, mock_func, 1)
+        self.execution._scheduler.schedule.assert_not_called()
+        mock_func.assert_called_with(1)
+
+    def test_thread_pool_info(self):
+        self.assertEqual(
+            self.execution.thread_pool_info,
+            {
+                "max_workers": 2,
+                "num_threads": 0,
+                "work_queue_size": 0,
+                "scheduled": 0,
+                "lanes": {"Cancel": 0, "Replace": 0, "Update": 0, "Place": 0},
+                "submitted": 0,
+                "completed": 0,
+                "active": 0,
+                "max_active": 0,
+                "busy_seconds": 0.0,
+            },
+        )
+
+    def test__record_execution_start(self):
+        mock_order_package = mock.Mock(monotonic_submitted=12)
+        self.execution._record_execution_start(mock_order_package)
+        self.mock_flumine.latency.record_since.assert_called_with("thread_pool", 12)
+        self.mock_flumine.latency.record_since.reset_mock()
+        mock_order_package.monotonic_submitted = None
+        self.execution._record_execution_start(mock_order_package)
+        self.mock_flumine.latency.record_since.assert_not_called()
 
     @mock.patch("flumine.execution.baseexecution.BaseExecution._get_http_session")
     @mock.patch("flumine.execution.baseexecution.BaseExecution.execute_cancel")
@@ -59,10 +245,16 @@ class BaseExecutionTest(unittest.TestCase):
         mock_thread_pool = mock.Mock(_threads=())
         self.execution._thread_pool = mock_thread_pool
         self.execution.handler(mock_order_package)
-        mock_thread_pool.submit.assert_called_with(
-            mock_execute_cancel, mock_order_package, mock__get_http_session()
+        mock_thread_pool.submit.assert_called_with(self.execution._run_next)
+        self.assertEqual(
+            self.execution._lanes[OrderPackageType.CANCEL][0][1:],
+            (
+                self.execution._execute_with_session,
+                mock_order_package,
+                (mock_execute_cancel,),
+            ),
         )
-        mock__get_http_session.assert_called_with()
+        mock__get_http_session.assert_not_called()
 
     @mock.patch("flumine.execution.baseexecution.BaseExecution._get_http_session")
     @mock.patch("flumine.execution.baseexecution.BaseExecution.execute_replace")
@@ -73,10 +265,16 @@ class BaseExecutionTest(unittest.TestCase):
         mock_thread_pool = mock.Mock(_threads=())
         self.execution._thread_pool = mock_thread_pool
         self.execution.handler(mock_order_package)
-        mock_thread_pool.submit.assert_called_with(
-            mock_execute_replace, mock_order_package, mock__get_http_session()
+        mock_thread_pool.submit.assert_called_with(self.execution._run_next)
+        self.assertEqual(
+            self.execution._lanes[OrderPackageType.REPLACE][0][1:],
+            (
+                self.execution._execute_with_session,
+                mock_order_package,
+                (mock_execute_replace,),
+            ),
         )
-        mock__get_http_session.assert_called_with()
+        mock__get_http_session.assert_not_called()
 
     @mock.patch("flumine.execution.baseexecution.BaseExecution._get_http_session")
     @mock.patch("flumine.execution.baseexecution.BaseExecution.execute_update")
@@ -87,10 +285,16 @@ class BaseExecutionTest(unittest.TestCase):
         mock_thread_pool = mock.Mock(_threads=())
         self.execution._thread_pool = mock_thread_pool
         self.execution.handler(mock_order_package)
-        mock_thread_pool.submit.assert_called_with(
-            mock_execute_update, mock_order_package, mock__get_http_session()
+        mock_thread_pool.submit.assert_called_with(self.execution._run_next)
+        self.assertEqual(
+            self.execution._lanes[OrderPackageType.UPDATE][0][1:],
+            (
+                self.execution._execute_with_session,
+                mock_order_package,
+                (mock_execute_update,),
+            ),
         )
-        mock__get_http_session.assert_called_with()
+        mock__get_http_session.assert_not_called()
 
     def test_handler_unknown(self):
         mock_order_package = mock.Mock()
@@ -118,9 +322,10 @@ class BaseExecutionTest(unittest.TestCase):
     def test__get_http_session(self, mock__create_new_session):
         mock_session_one = mock.Mock(time_returned=time.time())
         mock_session_two = mock.Mock(time_returned=time.time())
-        self.execution._sessions = [mock_session_one, mock_session_two]
-        self.assertEqual(self.execution._get_http_session(), mock_session_one)
+        self.execution._sessions.extend([mock_session_one, mock_session_two])
+        # most recently returned first
         self.assertEqual(self.execution._get_http_session(), mock_session_two)
+        self.assertEqual(self.execution._get_http_session(), mock_session_one)
         self.assertEqual(self.execution._get_http_session(), mock__create_new_session())
 
     @mock.patch("flumine.execution.baseexecution.BaseExecution._return_http_session")
@@ -129,7 +334,7 @@ class BaseExecutionTest(unittest.TestCase):
         self, mock__create_new_session, mock__return_http_session
     ):
         mock_session = mock.Mock(time_returned=123)
-        self.execution._sessions = [mock_session]
+        self.execution._sessions.append(mock_session)
         self.assertEqual(self.execution._get_http_session(), mock__create_new_session())
         mock__return_http_session.assert_called_with(mock_session, err=True)
 
@@ -137,14 +342,17 @@ class BaseExecutionTest(unittest.TestCase):
         session = self.execution._create_new_session()
         self.assertIsNotNone(session.time_created)
         self.assertIsNotNone(session.time_returned)
+        self.assertEqual(session.request_count, 0)
+        self.assertEqual(session.request_seconds, 0)
+        self.assertEqual(session.refresh_count, 0)
 
     def test__return_http_session(self):
         mock_session = mock.Mock()
         self.execution._return_http_session(mock_session)
-        self.assertEqual(self.execution._sessions, [mock_session])
+        self.assertEqual(list(self.execution._sessions), [mock_session])
         self.execution._return_http_session(mock_session)
         self.execution._return_http_session(mock_session)
-        self.assertEqual(self.execution._sessions, [mock_session, mock_session])
+        self.assertEqual(list(self.execution._sessions), [mock_session, mock_session])
         self.assertGreater(mock_session.time_returned, 0)
 
     def test__return_http_session_returned(self):
@@ -152,9 +360,101 @@ class BaseExecutionTest(unittest.TestCase):
         mock_session = mock.Mock()
         self.execution._return_http_session(mock_session)
 
+    def test__return_http_session_max_execution_sessions(self):
+        mock_session = mock.Mock()
+        with mock.patch("flumine.execution.baseexecution.config") as mock_config:
+            mock_config.max_execution_sessions = 1
+            self.execution._return_http_session(mock_session)
+            self.execution._return_http_session(mock_session)
+        self.assertEqual(list(self.execution._sessions), [mock_session])
+        mock_session.close.assert_called_with()
+
     def test__return_http_session_err_close(self):
         mock_session = mock.Mock()
         self.execution._return_http_session(mock_session, err=True)
+        mock_session.close.assert_called_with()
+        self.assertEqual(len(self.execution._sessions), 0)
+
+    def test__record_session_request(self):
+        session = self.execution._create_new_session()
+        self.execution._record_session_request(session, 0.1)
+        self.execution._record_session_request(session, 0.2)
+        self.assertEqual(session.request_count, 2)
+        self.assertAlmostEqual(session.request_seconds, 0.3)
+
+    def test__session_refresh_url(self):
+        self.assertIsNone(self.execution._session_refresh_url)
+
+    def test_refresh_http_sessions_no_url(self):
+        self.execution.refresh_http_sessions()
+        self.assertEqual(self.execution._sessions_created, 0)
+
+    @mock.patch(
+        "flumine.execution.baseexecution.BaseExecution._session_refresh_url",
+        new_callable=mock.PropertyMock,
+        return_value="https://test",
+    )
+    @mock.patch("flumine.execution.baseexecution.BaseExecution._create_new_session")
+    def test_refresh_http_sessions(self, mock__create_new_session, _):
+        mock_session_idle = mock.Mock(time_returned=time.time() - 120, refresh_count=0)
+        mock_session_fresh = mock.Mock(time_returned=time.time())
+        self.execution._sessions.extend([mock_session_idle, mock_session_fresh])
+        mock_session_new = mock.Mock(refresh_count=0)
+        mock__create_new_session.return_value = mock_session_new
+        with mock.patch("flumine.execution.baseexecution.config") as mock_config:
+            mock_config.execution_session_refresh = 60
+            mock_config.min_execution_sessions = 3
+            mock_config.max_execution_sessions = 3
+            self.execution.refresh_http_sessions()
+        mock_session_idle.head.assert_called_with(
+            "https://test", timeout=SESSION_REFRESH_TIMEOUT
+        )
+        mock_session_fresh.head.assert_not_called()
+        mock_session_new.head.assert_called_with(
+            "https://test", timeout=SESSION_REFRESH_TIMEOUT
+        )
+        self.assertEqual(
+            list(self.execution._sessions),
+            [mock_session_fresh, mock_session_idle, mock_session_new],
+        )
+        self.assertEqual(mock_session_idle.refresh_count, 1)
+
+    @mock.patch(
+        "flumine.execution.baseexecution.BaseExecution._session_refresh_url",
+        new_callable=mock.PropertyMock,
+        return_value="https://test",
+    )
+    @mock.patch("flumine.execution.baseexecution.BaseExecution._create_new_session")
+    def test_refresh_http_sessions_error(self, mock__create_new_session, _):
+        mock_session = mock.Mock()
+        mock_session.head.side_effect = ConnectionError()
+        mock__create_new_session.return_value = mock_session
+        self.execution.refresh_http_sessions()
+        mock__create_new_session.assert_called_once_with()
+        mock_session.close.assert_called_with()
+        self.assertEqual(len(self.execution._sessions), 0)
+
+    def test_session_info(self):
+        self.assertEqual(
+            self.execution.session_info,
+            {
+                "sessions": 0,
+                "sessions_created": 0,
+                "request_count": 0,
+                "mean_request_seconds": None,
+                "oldest_returned": None,
+            },
+        )
+        session = self.execution._create_new_session()
+        self.execution._record_session_request(session, 0.2)
+        self.execution._record_session_request(session, 0.4)
+        self.execution._return_http_session(session)
+        info = self.execution.session_info
+        self.assertEqual(info["sessions"], 1)
+        self.assertEqual(info["sessions_created"], 1)
+        self.assertEqual(info["request_count"], 2)
+        self.assertAlmostEqual(info["mean_request_seconds"], 0.3)
+        self.assertGreaterEqual(info["oldest_returned"], 0)
 
     @mock.patch("flumine.execution.baseexecution.OrderEvent")
     def test__order_logger_place(self, mock_order_event):
@@ -231,6 +531,7 @@ class BaseExecutionTest(unittest.TestCase):
     def test_shutdown(self):
         self.execution.shutdown()
         self.assertTrue(self.execution._thread_pool._shutdown)
+        self.assertFalse(self.execution._scheduler._running)
 
 
 class BetfairExecutionTest(unittest.TestCase):
@@ -241,6 +542,15 @@ class BetfairExecutionTest(unittest.TestCase):
     def test_init(self):
         self.assertEqual(self.execution.EXCHANGE, ExchangeType.BETFAIR)
 
+    def test__session_refresh_url(self):
+        mock_client = self.mock_flumine.clients.get_betfair_default()
+        self.assertEqual(
+            self.execution._session_refresh_url,
+            mock_client.betting_client.betting.url,
+        )
+        self.mock_flumine.clients.get_betfair_default.return_value = None
+        self.assertIsNone(self.execution._session_refresh_url)
+
     @mock.patch("flumine.execution.betfairexecution.BetfairExecution._order_logger")
     @mock.patch("flumine.execution.betfairexecution.BetfairExecution.place")
     @mock.patch("flumine.execution.betfairexecution.BetfairExecution._execution_helper")
@@ -843,7 +1153,7 @@ class BetfairExecutionTest(unittest.TestCase):
     def test__execution_helper(self, mock__return_http_session):
         mock_trading_function = mock.Mock()
         mock_trading_function.__name__ = "test"
-        mock_session = mock.Mock()
+        mock_session = mock.Mock(request_count=0, request_seconds=0)
         mock_order_package = mock.Mock(
             elapsed_seconds=0.001, orders=[mock.Mock(elapsed_seconds_created=1)]
         )
@@ -853,6 +1163,8 @@ class BetfairExecutionTest(unittest.TestCase):
         )
         mock_trading_function.assert_called_with(mock_order_package, mock_session)
         mock__return_http_session.assert_called_with(mock_session)
+        self.mock_flumine.latency.record.assert_called_with("request", mock.ANY)
+        self.assertEqual(mock_session.request_count, 1)
 
     @mock.patch(
         "flumine.execution.betfairexecution.BetfairExecution._return_http_session"
@@ -860,7 +1172,7 @@ class BetfairExecutionTest(unittest.TestCase):
     def test__execution_helper_warning(self, mock__return_http_session):
         mock_trading_function = mock.Mock()
         mock_trading_function.__name__ = "test"
-        mock_session = mock.Mock()
+        mock_session = mock.Mock(request_count=0, request_seconds=0)
         mock_order_package = mock.Mock(
             elapsed_seconds=0.2,
             retry_count=0,
@@ -902,6 +1214,7 @@ class BetfairExecutionTest(unittest.TestCase):
         )
         mock_order_package.info = {}
         mock_order_package.retry.return_value = True
+        mock_order_package.retry_count = 0
         self.assertIsNone(
             self.execution._execution_helper(
                 mock_trading_function, mock_order_package, mock_session
@@ -909,8 +1222,30 @@ class BetfairExecutionTest(unittest.TestCase):
         )
         mock_trading_function.assert_called_with(mock_order_package, mock_session)
         mock__return_http_session.assert_called_with(mock_session, err=True)
+        mock_order_package.retry.assert_called_with(back_off=False)
         mock_handler.assert_called_with(mock_order_package)
 
+    @mock.patch("flumine.execution.betfairexecution.BetfairExecution.schedule")
+    @mock.patch(
+        "flumine.execution.betfairexecution.BetfairExecution._return_http_session"
+    )
+    def test__execution_helper_error_back_off(
+        self, mock__return_http_session, mock_schedule
+    ):
+        mock_trading_function = mock.Mock()
+        mock_trading_function.__name__ = "test"
+        mock_trading_function.side_effect = BetfairError()
+        mock_order_package = mock.Mock(
+            elapsed_seconds=0.001, orders=[mock.Mock(elapsed_seconds_created=1)]
+        )
+        mock_order_package.info = {}
+        mock_order_package.retry.return_value = True
+        mock_order_package.retry_count = 2
+        self.execution._execution_helper(
+            mock_trading_function, mock_order_package, mock.Mock()
+        )
+        mock_schedule.assert_called_with(2, self.execution.handler, mock_order_package)
+
     @mock.patch("flumine.execution.betfairexecution.BetfairExecution.handler")
     @mock.patch(
         "flumine.execution.betfairexecution.BetfairExecution._return_http_session"
@@ -987,6 +1322,398 @@ class BetfairExecutionTest(unittest.TestCase):
         mock__return_http_session.assert_called_with(mock_session, err=True)
 
 
+class AsyncBetfairExecutionTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.mock_flumine = mock.Mock()
+        self.execution = AsyncBetfairExecution(self.mock_flumine, max_workers=4)
+        self.mock_order_package = mock.Mock(
+            market_id="1.23",
+            id=mock.Mock(hex="abc"),
+            market_version=None,
+            customer_strategy_ref="test",
+            async_=False,
+            elapsed_seconds=0.001,
+            retry_count=0,
+            orders=[mock.Mock()],
+            info={},
+            package_type=OrderPackageType.PLACE,
+        )
+
+    def tearDown(self) -> None:
+        self.execution.shutdown()
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.execution.loop).result(
+            1
+        )
+
+    def test_init(self):
+        self.assertEqual(self.execution.EXCHANGE, ExchangeType.BETFAIR)
+        self.assertIsInstance(self.execution, BetfairExecution)
+        self.assertIsNone(self.execution._session)
+        self.assertIsNone(self.execution._loop)
+        self.assertIsNone(self.execution._semaphore)
+        self.assertEqual(self.execution._pending, 0)
+
+    @mock.patch.dict("sys.modules", {"aiohttp": None})
+    def test_init_missing_aiohttp(self):
+        with self.assertRaises(ImportError):
+            AsyncBetfairExecution(self.mock_flumine)
+
+    def test__get_session(self):
+        async def get_session():
+            return self.execution._get_session()
+
+        session = self._run(get_session())
+        self.assertEqual(session.connector.limit, 4)
+        self.assertEqual(self._run(get_session()), session)
+
+    def test_loop(self):
+        loop = self.execution.loop
+        self.assertTrue(loop.is_running())
+        self.assertEqual(self.execution.loop, loop)
+        self.assertTrue(self.execution._loop_thread.daemon)
+
+    @mock.patch(
+        "flumine.execution.asyncexecution.AsyncBetfairExecution._get_rate_limit_delay",
+        return_value=0,
+    )
+    @mock.patch(
+        "flumine.execution.asyncexecution.AsyncBetfairExecution._execute",
+        new_callable=mock.Mock,
+    )
+    @mock.patch("flumine.execution.asyncexecution.asyncio.run_coroutine_threadsafe")
+    def test_handler(self, mock_run_coroutine_threadsafe, mock__execute, _):
+        self.mock_order_package._monotonic_created = time.monotonic()
+        self.execution._loop = mock.Mock()
+        self.execution.handler(self.mock_order_package)
+        mock__execute.assert_called_with(self.mock_order_package)
+        mock_run_coroutine_threadsafe.assert_called_with(
+            mock__execute(), self.execution._loop
+        )
+        self.assertEqual(self.execution._pending, 1)
+        self.mock_flumine.latency.record.assert_called_with("transaction", mock.ANY)
+        self.execution._loop = None
+
+    @mock.patch("flumine.execution.asyncexecution.AsyncBetfairExecution.schedule")
+    @mock.patch(
+        "flumine.execution.asyncexecution.AsyncBetfairExecution._get_rate_limit_delay",
+        return_value=2,
+    )
+    def test_handler_rate_limit(self, mock__get_rate_limit_delay, mock_schedule):
+        self.mock_order_package._monotonic_created = time.monotonic()
+        self.execution.handler(self.mock_order_package)
+        mock__get_rate_limit_delay.assert_called_with(self.mock_order_package)
+        mock_schedule.assert_called_with(
+            2, self.execution._submit_loop, self.mock_order_package
+        )
+        self.mock_flumine.latency.record.assert_called_with("rate_limit", 2)
+
+    @mock.patch(
+        "flumine.execution.asyncexecution.AsyncBetfairExecution._execute",
+        new_callable=mock.Mock,
+    )
+    @mock.patch("flumine.execution.asyncexecution.asyncio.run_coroutine_threadsafe")
+    @mock.patch("flumine.execution.asyncexecution.time.monotonic", return_value=12)
+    def test__submit_loop(self, _, mock_run_coroutine_threadsafe, mock__execute):
+        self.execution._loop = mock.Mock()
+        self.execution._submit_loop(self.mock_order_package)
+        self.assertEqual(self.mock_order_package.monotonic_submitted, 12)
+        mock_run_coroutine_threadsafe.assert_called_with(
+            mock__execute(), self.execution._loop
+        )
+        self.execution._loop = None
+
+    def test_handler_unknown(self):
+        self.mock_order_package.package_type = None
+        with self.assertRaises(NotImplementedError):
+            self.execution.handler(self.mock_order_package)
+
+    @mock.patch(
+        "flumine.execution.asyncexecution.AsyncBetfairExecution._process_place_response"
+    )
+    @mock.patch(
+        "flumine.execution.asyncexecution.AsyncBetfairExecution._async_execution_helper",
+        new_callable=mock.AsyncMock,
+    )
+    def test__execute(self, mock__async_execution_helper, mock__process_place_response):
+        self.execution._pending = 1
+        self._run(self.execution._execute(self.mock_order_package))
+        mock__async_execution_helper.assert_awaited_with(
+            "place", self.mock_order_package
+        )
+        mock__process_place_response.assert_called_with(
+            self.mock_order_package, mock__async_execution_helper.return_value
+        )
+        self.assertEqual(self.execution._pending, 0)
+        self.assertEqual(self.execution._semaphore._value, 4)
+
+    @mock.patch(
+        "flumine.execution.asyncexecution.AsyncBetfairExecution._process_cancel_response"
+    )
+    @mock.patch(
+        "flumine.execution.asyncexecution.AsyncBetfairExecution._async_execution_helper",
+        new_callable=mock.AsyncMock,
+    )
+    def test__execute_no_response(
+        self, mock__async_execution_helper, mock__process_cancel_response
+    ):
+        self.mock_order_package.package_type = OrderPackageType.CANCEL
+        mock__async_execution_helper.return_value = None
+        self.execution._pending = 1
+        self._run(self.execution._execute(self.mock_order_package))
+        mock__async_execution_helper.assert_awaited_with(
+            "cancel", self.mock_order_package
+        )
+        mock__process_cancel_response.assert_not_called()
+        self.assertEqual(self.execution._pending, 0)
+
+    @mock.patch(
+        "flumine.execution.asyncexecution.AsyncBetfairExecution._request",
+        new_callable=mock.AsyncMock,
+    )
+    def test__async_execution_helper(self, mock__request):
+        response = self._run(
+            self.execution._async_execution_helper("place", self.mock_order_package)
+        )
+        self.assertEqual(response, mock__request.return_value)
+        mock__request.assert_awaited_with(
+            self.mock_order_package,
+            "placeOrders",
+            {
+                "marketId": "1.23",
+                "instructions": self.mock_order_package.place_instructions,
+                "customerRef": "abc",
+                "customerStrategyRef": "test",
+                "async": False,
+            },
+            resources.PlaceOrders,
+        )
+        self.mock_flumine.latency.record_since.assert_called_with("request", mock.ANY)
+
+    @mock.patch(
+        "flumine.execution.asyncexecution.AsyncBetfairExecution._request",
+        new_callable=mock.AsyncMock,
+    )
+    def test__async_execution_helper_empty(self, mock__request):
+        self.mock_order_package.orders = []
+        self.assertIsNone(
+            self._run(
+                self.execution._async_execution_helper("place", self.mock_order_package)
+            )
+        )
+        mock__request.assert_not_awaited()
+
+    @mock.patch("flumine.execution.asyncexecution.AsyncBetfairExecution.handler")
+    @mock.patch(
+        "flumine.execution.asyncexecution.AsyncBetfairExecution._request",
+        new_callable=mock.AsyncMock,
+    )
+    def test__async_execution_helper_error(self, mock__request, mock_handler):
+        mock__request.side_effect = BetfairError()
+        self.assertIsNone(
+            self._run(
+                self.execution._async_execution_helper("place", self.mock_order_package)
+            )
+        )
+        self.mock_order_package.retry.assert_called_with(back_off=False)
+        self._run(asyncio.sleep(0.01))  # retry scheduled, no back-off
+        mock_handler.assert_called_with(self.mock_order_package)
+        self.mock_order_package.reset_orders.assert_not_called()
+
+    @mock.patch(
+        "flumine.execution.asyncexecution.AsyncBetfairExecution._request",
+        new_callable=mock.AsyncMock,
+    )
+    def test__async_execution_helper_error_no_retry(self, mock__request):
+        mock__request.side_effect = BetfairError()
+        self.mock_order_package.retry.return_value = False
+        self._run(
+            self.execution._async_execution_helper("place", self.mock_order_package)
+        )
+        self.mock_order_package.reset_orders.assert_called_with(complete=True)
+
+    @mock.patch(
+        "flumine.execution.asyncexecution.AsyncBetfairExecution._request",
+        new_callable=mock.AsyncMock,
+    )
+    def test__async_execution_helper_unknown_error(self, mock__request):
+        mock__request.side_effect = ValueError()
+        self.assertIsNone(
+            self._run(
+                self.execution._async_execution_helper("place", self.mock_order_package)
+            )
+        )
+        self.mock_order_package.retry.assert_not_called()
+        self.mock_order_package.reset_orders.assert_not_called()
+
+    def _mock_session(self, status: int = 200, content: bytes = b"") -> mock.Mock:
+        response = mock.MagicMock(status=status)
+        response.__aenter__.return_value = response
+        response.read = mock.AsyncMock(return_value=content)
+        self.execution._session = mock.Mock()
+        self.execution._session.post.return_value = response
+        self.execution._session.head.return_value = response
+        return self.execution._session
+
+    def test__request(self):
+        betting_client = APIClient("username", "password", app_key="app_key")
+        self.mock_order_package.client.betting_client = betting_client
+        session = self._mock_session(
+            200,
+            b'{"jsonrpc": "2.0", "result": {"status": "SUCCESS", '
+            b'"marketId": "1.23", "instructionReports": []}, "id": 1}',
+        )
+        response = self._run(
+            self.execution._request(
+                self.mock_order_package,
+                "placeOrders",
+                {"marketId": "1.23"},
+                resources.PlaceOrders,
+            )
+        )
+        self.assertIsInstance(response, resources.PlaceOrders)
+        self.assertEqual(response.status, "SUCCESS")
+        session.post.assert_called_with(
+            betting_client.betting.url,
+            data=betting_client.betting.create_req(
+                "SportsAPING/v1.0/placeOrders", {"marketId": "1.23"}
+            ),
+            headers={
+                k: v for k, v in betting_client.request_headers.items() if v is not None
+            },
+            timeout=mock.ANY,
+        )
+        self.execution._session = None
+
+    def test__request_error(self):
+        self.mock_order_package.client.betting_client = APIClient(
+            "username", "password", app_key="app_key"
+        )
+        for status, content, exception in (
+            (503, b"", StatusCodeError),
+            (200, b"<html>", InvalidResponse),
+            (200, b'{"error": {"code": -1}}', APIError),
+        ):
+            self._mock_session(status, content)
+            with self.assertRaises(exception):
+                self._run(
+                    self.execution._request(
+                        self.mock_order_package, "placeOrders", {}, None
+                    )
+                )
+        self.execution._session.post.side_effect = OSError()
+        with self.assertRaises(APIError):
+            self._run(
+                self.execution._request(
+                    self.mock_order_package, "placeOrders", {}, None
+                )
+            )
+        self.execution._session = None
+
+    def test__cancel_request(self):
+        self.mock_order_package.cancel_instructions = [1]
+        self.assertEqual(
+            self.execution._cancel_request(self.mock_order_package),
+            (
+                "cancelOrders",
+                {"marketId": "1.23", "instructions": [1], "customerRef": "abc"},
+                resources.CancelOrders,
+            ),
+        )
+
+    def test__cancel_request_empty(self):
+        self.mock_order_package.cancel_instructions = []
+        with self.assertRaises(OrderExecutionError):
+            self.execution._cancel_request(self.mock_order_package)
+
+    def test__update_request(self):
+        self.assertEqual(
+            self.execution._update_request(self.mock_order_package),
+            (
+                "updateOrders",
+                {
+                    "marketId": "1.23",
+                    "instructions": self.mock_order_package.update_instructions,
+                    "customerRef": "abc",
+                },
+                resources.UpdateOrders,
+            ),
+        )
+
+    def test__replace_request(self):
+        self.mock_order_package.market_version = {"version": 123}
+        self.assertEqual(
+            self.execution._replace_request(self.mock_order_package),
+            (
+                "replaceOrders",
+                {
+                    "marketId": "1.23",
+                    "instructions": self.mock_order_package.replace_instructions,
+                    "customerRef": "abc",
+                    "marketVersion": {"version": 123},
+                    "async": False,
+                },
+                resources.ReplaceOrders,
+            ),
+        )
+
+    @mock.patch(
+        "flumine.execution.asyncexecution.AsyncBetfairExecution._refresh_connections",
+        new_callable=mock.Mock,
+    )
+    @mock.patch("flumine.execution.asyncexecution.asyncio.run_coroutine_threadsafe")
+    @mock.patch(
+        "flumine.execution.asyncexecution.AsyncBetfairExecution._session_refresh_url",
+        new_callable=mock.PropertyMock,
+        return_value="https://test",
+    )
+    def test_refresh_http_sessions(
+        self, _, mock_run_coroutine_threadsafe, mock__refresh_connections
+    ):
+        self.execution.refresh_http_sessions()
+        mock__refresh_connections.assert_called_with("https://test")
+        mock_run_coroutine_threadsafe.assert_called_with(
+            mock__refresh_connections(), self.execution.loop
+        )
+        self.assertEqual(len(self.execution._sessions), 0)
+
+    def test__refresh_connections(self):
+        session = self._mock_session()
+        asyncio.run(self.execution._refresh_connections("https://test"))
+        self.assertEqual(
+            session.head.call_count,
+            min(config.min_execution_sessions, self.execution._max_workers),
+        )
+        session.head.assert_called_with("https://test", timeout=mock.ANY)
+        self.execution._session = None
+
+    def test__refresh_connections_error(self):
+        session = self._mock_session()
+        session.head.side_effect = ConnectionError()
+        asyncio.run(self.execution._refresh_connections("https://test"))
+        self.execution._session = None
+
+    def test_refresh_http_sessions_no_url(self):
+        self.mock_flumine.clients.get_betfair_default.return_value = None
+        self.execution.refresh_http_sessions()
+        self.assertIsNone(self.execution._loop)
+
+    def test_shutdown(self):
+        loop = self.execution.loop
+        self.execution.shutdown()
+        self.assertFalse(loop.is_running())
+        self.assertFalse(self.execution._loop_thread.is_alive())
+
+    def test_shutdown_session(self):
+        session = self._mock_session()
+        session.close = mock.AsyncMock()
+        loop = self.execution.loop
+        self.execution.shutdown()
+        session.close.assert_awaited()
+        self.assertFalse(loop.is_running())
+
+
 class SimulatedExecutionTest(unittest.TestCase):
     def setUp(self) -> None:
         self.mock_market = mock.Mock()
@@ -997,17 +1724,36 @@ class SimulatedExecutionTest(unittest.TestCase):
     def test_init(self):
         self.assertEqual(self.execution.EXCHANGE, ExchangeType.SIMULATED)
 
+    @mock.patch("flumine.execution.simulatedexecution.SimulatedExecution.schedule")
     @mock.patch("flumine.execution.simulatedexecution.SimulatedExecution.execute_place")
-    def test_handler_paper_trade(self, mock_execute_place):
-        mock_thread_pool = mock.Mock()
-        self.execution._thread_pool = mock_thread_pool
-        mock_order_package = mock.Mock()
+    def test_handler_paper_trade(self, mock_execute_place, mock_schedule):
+        mock_order_package = mock.Mock(bet_delay=1)
         mock_order_package.client.paper_trade = True
         mock_order_package.package_type = OrderPackageType.PLACE
         self.execution.handler(mock_order_package)
-        mock_thread_pool.submit.assert_called_with(
-            mock_execute_place, mock_order_package, None
+        mock_schedule.assert_called_with(
+            config.place_latency + 1,
+            self.execution._submit,
+            mock_execute_place,
+            mock_order_package,
+            None,
         )
+        mock_execute_place.assert_not_called()
+
+    @mock.patch("flumine.execution.simulatedexecution.SimulatedExecution.execute_place")
+    def test_handler_paper_trade_delay(self, mock_execute_place):
+        mock_order_package = mock.Mock(bet_delay=0.05)
+        mock_order_package.client.paper_trade = True
+        mock_order_package.package_type = OrderPackageType.PLACE
+        for _ in range(4):
+            self.execution.handler(mock_order_package)
+        # delayed packages are held by the scheduler not the thread pool
+        self.assertEqual(self.execution.thread_pool_info["scheduled"], 4)
+        self.assertEqual(self.execution.thread_pool_stats["submitted"], 0)
+        self.execution.shutdown()
+        self.assertEqual(mock_execute_place.call_count, 4)
+        self.assertEqual(self.execution.thread_pool_stats["completed"], 4)
+        self.assertEqual(self.execution._scheduler.executed, 4)
 
     @mock.patch("flumine.execution.simulatedexecution.SimulatedExecution.execute_place")
     def test_handler_place(self, mock_execute_place):
@@ -1105,17 +1851,11 @@ class SimulatedExecutionTest(unittest.TestCase):
         mock_order.trade.__exit__.assert_called_with(None, None, None)
         mock_order_package.client.add_transaction.assert_called_with(1)
 
-    @mock.patch("flumine.execution.simulatedexecution.time")
-    def test_execute_place_paper_trade(self, mock_time):
-        mock_order_package = mock.MagicMock(
-            market_id="1.23", place_instructions=[], bet_delay=1
+    def test__get_delay_place(self):
+        mock_order_package = mock.Mock(package_type=OrderPackageType.PLACE, bet_delay=1)
+        self.assertEqual(
+            self.execution._get_delay(mock_order_package), config.place_latency + 1
         )
-        mock_order_package.__len__.return_value = 1
-        mock_order_package.__iter__ = mock.Mock(return_value=iter([]))
-        mock_order_package.client.paper_trade = True
-        self.execution.execute_place(mock_order_package, None)
-        mock_time.sleep.assert_called_with(config.place_latency + 1)
-        mock_order_package.client.add_transaction.assert_called_with(1)
 
     @mock.patch("flumine.execution.simulatedexecution.SimulatedExecution._order_logger")
     def test_execute_cancel(self, mock__order_logger):
@@ -1184,13 +1924,13 @@ class SimulatedExecutionTest(unittest.TestCase):
         mock_order.trade.__exit__.assert_called_with(None, None, None)
         mock_order_package.client.add_transaction.assert_called_with(1, failed=True)
 
-    @mock.patch("flumine.execution.simulatedexecution.time")
-    def test_execute_cancel_paper_trade(self, mock_time):
-        mock_order_package = mock.Mock(market_id="1.23", bet_delay=1)
-        mock_order_package.__iter__ = mock.Mock(return_value=iter([]))
-        mock_order_package.client.paper_trade = True
-        self.execution.execute_cancel(mock_order_package, None)
-        mock_time.sleep.assert_called_with(config.cancel_latency)
+    def test__get_delay_cancel(self):
+        mock_order_package = mock.Mock(
+            package_type=OrderPackageType.CANCEL, bet_delay=1
+        )
+        self.assertEqual(
+            self.execution._get_delay(mock_order_package), config.cancel_latency
+        )
 
     @mock.patch("flumine.execution.simulatedexecution.SimulatedExecution._order_logger")
     def test_execute_update(self, mock__order_logger):
@@ -1243,15 +1983,13 @@ class SimulatedExecutionTest(unittest.TestCase):
         mock_order.trade.__exit__.assert_called_with(None, None, None)
         mock_order_package.client.add_transaction.assert_called_with(1, failed=True)
 
-    @mock.patch("flumine.execution.simulatedexecution.time")
-    def test_execute_update_paper_trade(self, mock_time):
+    def test__get_delay_update(self):
         mock_order_package = mock.Mock(
-            market_id="1.23", update_instructions=[], bet_delay=1
+            package_type=OrderPackageType.UPDATE, bet_delay=1
+        )
+        self.assertEqual(
+            self.execution._get_delay(mock_order_package), config.update_latency
         )
-        mock_order_package.__iter__ = mock.Mock(return_value=iter([]))
-        mock_order_package.client.paper_trade = True
-        self.execution.execute_update(mock_order_package, None)
-        mock_time.sleep.assert_called_with(config.update_latency)
 
     @mock.patch("flumine.execution.simulatedexecution.SimulatedExecution._order_logger")
     def test_execute_replace(self, mock__order_logger):
@@ -1331,16 +2069,13 @@ class SimulatedExecutionTest(unittest.TestCase):
         mock_order.trade.__enter__.assert_called_with()
         mock_order.trade.__exit__.assert_called_with(None, None, None)
 
-    @mock.patch("flumine.execution.simulatedexecution.time")
-    def test_execute_replace_paper_trade(self, mock_time):
-        mock_order_package = mock.MagicMock(
-            market_id="1.23", replace_instructions=[], bet_delay=1
+    def test__get_delay_replace(self):
+        mock_order_package = mock.Mock(
+            package_type=OrderPackageType.REPLACE, bet_delay=1
+        )
+        self.assertEqual(
+            self.execution._get_delay(mock_order_package), config.replace_latency + 1
         )
-        mock_order_package.__len__.return_value = 1
-        mock_order_package.__iter__ = mock.Mock(return_value=iter([]))
-        mock_order_package.client.paper_trade = True
-        self.execution.execute_replace(mock_order_package, None)
-        mock_time.sleep.assert_called_with(config.replace_latency + 1)
 
 
 class BetdaqExecutionTest(unittest.TestCase):
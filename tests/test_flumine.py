@@ -1,8 +1,9 @@
 import unittest
 from unittest import mock
 
-from flumine import Flumine, worker
+from flumine import Flumine, worker, config
 from flumine.events import events
+from flumine.flumine import coalesce_market_book_events
 from flumine.clients import ExchangeType, BetdaqClient
 
 
@@ -64,6 +65,58 @@ class FlumineTest(unittest.TestCase):
         mock__process_custom_event.assert_called_with(mock_events[8])
         mock__add_default_workers.assert_called()
 
+    @mock.patch("flumine.flumine.Flumine._add_default_workers")
+    @mock.patch("flumine.flumine.Flumine._process_end_flumine")
+    @mock.patch("flumine.flumine.Flumine._process_custom_event")
+    @mock.patch("flumine.flumine.Flumine._process_market_books")
+    def test_run_coalesce_market_books(
+        self,
+        mock__process_market_books,
+        mock__process_custom_event,
+        mock__process_end_flumine,
+        mock__add_default_workers,
+    ):
+        config.coalesce_market_books = True
+        mock_market_book_one = mock.Mock(streaming_unique_id=1, market_id="1.1")
+        mock_market_book_two = mock.Mock(streaming_unique_id=1, market_id="1.1")
+        mock_events = [
+            events.MarketBookEvent([mock_market_book_one]),
+            events.MarketBookEvent([mock_market_book_two]),
+            events.CustomEvent(None, None),
+            events.TerminationEvent(None),
+        ]
+        for i in mock_events:
+            self.flumine.handler_queue.put(i)
+        try:
+            self.flumine.run()
+        finally:
+            config.coalesce_market_books = False
+        mock__process_market_books.assert_called_once()
+        event = mock__process_market_books.call_args[0][0]
+        self.assertEqual(event.event, [mock_market_book_two])
+        mock__process_custom_event.assert_called_with(mock_events[2])
+        self.assertEqual(
+            self.flumine.handler_queue_stats,
+            {"batches": 1, "events": 4, "market_books_skipped": 1},
+        )
+
+    def test__get_coalesced_event(self):
+        mock_event_one = events.CustomEvent(None, None)
+        mock_event_two = events.CustomEvent(None, None)
+        self.flumine.handler_queue.put(mock_event_one)
+        self.flumine.handler_queue.put(mock_event_two)
+        self.assertEqual(self.flumine._get_coalesced_event(), mock_event_one)
+        self.assertEqual(self.flumine._get_coalesced_event(), mock_event_two)
+        self.assertEqual(self.flumine.handler_queue_stats["batches"], 1)
+        self.assertEqual(self.flumine.handler_queue_stats["events"], 2)
+
+    def test__drain_handler_queue(self):
+        for i in range(5):
+            self.flumine.handler_queue.put(i)
+        with mock.patch("flumine.flumine.config.handler_queue_batch_size", 3):
+            self.assertEqual(self.flumine._drain_handler_queue(), [0, 1, 2])
+        self.assertEqual(self.flumine._drain_handler_queue(), [3, 4])
+
     @mock.patch("flumine.worker.BackgroundWorker")
     @mock.patch("flumine.Flumine.add_worker")
     def test__add_default_workers(self, mock_add_worker, mock_worker):
@@ -86,6 +139,7 @@ class FlumineTest(unittest.TestCase):
                     interval=60,
                     start_delay=10,
                 ),
+                mock.call(self.flumine, function=worker.log_latency, interval=60),
                 mock.call(
                     self.flumine,
                     function=worker.poll_account_balance,
@@ -98,9 +152,34 @@ class FlumineTest(unittest.TestCase):
                     interval=60,
                     start_delay=10,
                 ),
+                mock.call(
+                    self.flumine,
+                    function=worker.refresh_execution_sessions,
+                    interval=30,
+                    start_delay=10,
+                ),
             ],
         )
 
+    @mock.patch("flumine.worker.BackgroundWorker")
+    @mock.patch("flumine.Flumine.add_worker")
+    def test__add_default_workers_metrics(self, mock_add_worker, mock_worker):
+        mock_client = mock.Mock(market_recording_mode=True)
+        mock_client.betting_client.session_timeout = 1200
+        self.flumine.clients = [mock_client]
+        with mock.patch("flumine.flumine.config.metrics_port", 9100):
+            self.flumine._add_default_workers()
+        self.assertEqual(
+            mock_worker.call_args_list[-1],
+            mock.call(
+                self.flumine,
+                function=worker.serve_metrics,
+                interval=0,
+                shutdown_function=worker.close_metrics,
+                func_kwargs={"host": "127.0.0.1", "port": 9100},
+            ),
+        )
+
     @mock.patch("flumine.worker.BackgroundWorker")
     @mock.patch("flumine.Flumine.add_worker")
     def test__add_default_workers_market_record(self, mock_add_worker, mock_worker):
@@ -123,6 +202,7 @@ class FlumineTest(unittest.TestCase):
                     interval=60,
                     start_delay=10,
                 ),
+                mock.call(self.flumine, function=worker.log_latency, interval=60),
             ],
         )
 
@@ -148,6 +228,7 @@ class FlumineTest(unittest.TestCase):
                     interval=60,
                     start_delay=10,
                 ),
+                mock.call(self.flumine, function=worker.log_latency, interval=60),
                 mock.call(
                     self.flumine,
                     function=worker.poll_account_balance,
@@ -160,6 +241,12 @@ class FlumineTest(unittest.TestCase):
                     interval=60,
                     start_delay=10,
                 ),
+                mock.call(
+                    self.flumine,
+                    function=worker.refresh_execution_sessions,
+                    interval=30,
+                    start_delay=10,
+                ),
                 mock.call(
                     self.flumine,
                     function=worker.betdaq_settled_orders,
@@ -174,3 +261,43 @@ class FlumineTest(unittest.TestCase):
 
     def test_repr(self):
         assert repr(self.flumine) == "<Flumine>"
+
+
+class CoalesceMarketBookEventsTest(unittest.TestCase):
+    def test_coalesce_market_book_events(self):
+        mock_market_book_one = mock.Mock(streaming_unique_id=1, market_id="1.1")
+        mock_market_book_two = mock.Mock(streaming_unique_id=1, market_id="1.2")
+        mock_market_book_three = mock.Mock(streaming_unique_id=1, market_id="1.1")
+        mock_market_book_four = mock.Mock(streaming_unique_id=2, market_id="1.1")
+        mock_market_book_five = mock.Mock(streaming_unique_id=1, market_id="1.1")
+        event_one = events.MarketBookEvent([mock_market_book_one, mock_market_book_two])
+        event_two = events.MarketBookEvent([mock_market_book_three])
+        event_three = events.MarketBookEvent([mock_market_book_four])
+        event_four = events.CurrentOrdersEvent(None)
+        event_five = events.MarketBookEvent([mock_market_book_five])
+        coalesced, skipped = coalesce_market_book_events(
+            [event_one, event_two, event_three, event_four, event_five]
+        )
+        self.assertEqual(skipped, 1)
+        self.assertEqual(len(coalesced), 3)
+        self.assertEqual(
+            coalesced[0].event,
+            [mock_market_book_two, mock_market_book_three, mock_market_book_four],
+        )
+        self.assertEqual(coalesced[0]._time_created, event_one._time_created)
+        self.assertIs(coalesced[1], event_four)
+        self.assertIs(coalesced[2], event_five)
+
+    def test_coalesce_market_book_events_exchange(self):
+        mock_market_book_one = mock.Mock(streaming_unique_id=1, market_id="1.1")
+        mock_market_book_two = mock.Mock(streaming_unique_id=1, market_id="1.1")
+        event_one = events.MarketBookEvent([mock_market_book_one])
+        event_two = events.MarketBookEvent(
+            [mock_market_book_two], exchange=ExchangeType.BETDAQ
+        )
+        coalesced, skipped = coalesce_market_book_events([event_one, event_two])
+        self.assertEqual(skipped, 0)
+        self.assertEqual(coalesced, [event_one, event_two])
+
+    def test_coalesce_market_book_events_empty(self):
+        self.assertEqual(coalesce_market_book_events([]), ([], 0))
@@ -1,3 +1,5 @@
+import os
+import datetime
 import unittest
 from unittest import mock
 
@@ -10,6 +12,16 @@ from flumine.order.trade import TradeStatus
 from flumine.markets.blotter import Blotter
 from flumine.order.order import OrderTypes
 from flumine.markets.market import Market
+from flumine.simulation import parallel
+from flumine.events import events
+from flumine.strategy.strategy import Strategies
+
+
+def create_strategies(*strategies) -> Strategies:
+    _strategies = Strategies()
+    for strategy in strategies:
+        _strategies(strategy, mock.Mock(), mock.Mock())
+    return _strategies
 
 
 class FlumineSimulationTest(unittest.TestCase):
@@ -19,7 +31,7 @@ class FlumineSimulationTest(unittest.TestCase):
 
     def test_init(self):
         self.assertTrue(self.flumine.SIMULATED)
-        self.assertEqual(self.flumine.handler_queue, [])
+        self.assertEqual(list(self.flumine.handler_queue), [])
 
     def test_run_error(self):
         self.flumine.clients._clients.clear()
@@ -81,17 +93,43 @@ class FlumineSimulationTest(unittest.TestCase):
         mock__check_pending_packages,
         mock__process_simulated_orders,
     ):
-        self.flumine.handler_queue.append(mock.Mock())
+        self.flumine.handler_queue.append(
+            mock.Mock(
+                market_id="1.23",
+                _time_created=datetime.datetime.utcnow(),
+                simulated_delay=0.1,
+            )
+        )
         mock_event = mock.Mock()
         mock_market_book = mock.Mock(market_id="1.23")
         mock_market_book.runners = []
-        mock_market = mock.Mock(market_book=mock_market_book, context={})
+        mock_market = mock.MagicMock(market_book=mock_market_book, context={})
         mock_market.blotter.live_orders = []
         self.flumine.markets._markets = {"1.23": mock_market}
         mock_event.event = [mock_market_book]
         self.flumine._process_market_books(mock_event)
         mock__check_pending_packages.assert_called_with("1.23")
         mock__process_simulated_orders.assert_called_with(mock_market)
+        mock_market.coalesce_transactions.assert_called_with(False)
+
+    @mock.patch(
+        "flumine.simulation.simulation.FlumineSimulation._process_simulated_orders"
+    )
+    def test__process_market_books_coalesce_transactions(
+        self, mock__process_simulated_orders
+    ):
+        mock_market_book = mock.Mock(market_id="1.23", runners=[])
+        mock_market = mock.MagicMock(market_book=mock_market_book, context={})
+        self.flumine.markets._markets = {"1.23": mock_market}
+        with mock.patch("flumine.simulation.simulation.config") as mock_config:
+            mock_config.coalesce_transactions = True
+            self.flumine._process_market_books(mock.Mock(event=[mock_market_book]))
+        mock_market.coalesce_transactions.assert_called_with(True)
+        mock_market.coalesce_transactions().__enter__.assert_called_with()
+        mock_market.coalesce_transactions().__exit__.assert_called_with(
+            None, None, None
+        )
+        mock__process_simulated_orders.assert_called_with(mock_market)
 
     def test__process_market_books_new_market(self):
         mock_strategy = mock.Mock(stream_ids=[1])
@@ -154,20 +192,24 @@ class FlumineSimulationTest(unittest.TestCase):
             )
 
     def test_process_order_package(self):
-        mock_order_package = mock.Mock()
+        mock_order_package = mock.Mock(
+            market_id="1.23",
+            _time_created=datetime.datetime.utcnow(),
+            simulated_delay=0.1,
+        )
         self.flumine.process_order_package(mock_order_package)
-        self.assertEqual(self.flumine.handler_queue, [mock_order_package])
+        self.assertEqual(list(self.flumine.handler_queue), [mock_order_package])
 
     def test__process_simulated_orders(self):
         mock_market = mock.Mock(context={})
         mock_market.blotter = Blotter("1.23")
-        mock_order = mock.Mock(size_remaining=0, complete=False)
+        mock_order = mock.Mock(id="1", size_remaining=0, complete=False)
         mock_order.order_type.ORDER_TYPE = OrderTypes.LIMIT
         mock_order.trade.status = TradeStatus.COMPLETE
-        mock_order_two = mock.Mock(size_remaining=1, complete=False)
+        mock_order_two = mock.Mock(id="2", size_remaining=1, complete=False)
         mock_order_two.order_type.ORDER_TYPE = OrderTypes.LIMIT
         mock_order_two.trade.status = TradeStatus.COMPLETE
-        mock_market.blotter._live_orders = [mock_order, mock_order_two]
+        mock_market.blotter._live_orders = {"1": mock_order, "2": mock_order_two}
         self.flumine._process_simulated_orders(mock_market)
         mock_order.execution_complete.assert_called()
         mock_order_two.execution_complete.assert_not_called()
@@ -182,9 +224,28 @@ class FlumineSimulationTest(unittest.TestCase):
             mock_market, mock_market.blotter.strategy_orders(mock_strategy)
         )
 
+    @mock.patch("flumine.simulation.simulation.config")
+    def test__process_simulated_orders_dirty_only(self, mock_config):
+        mock_config.process_orders_dirty_only = True
+        mock_market = mock.Mock(context={})
+        mock_market.blotter.live_orders = []
+        mock_strategy = mock.Mock()
+        mock_strategy_two = mock.Mock()
+        self.flumine.strategies = [mock_strategy, mock_strategy_two]
+        mock_market.blotter.pop_dirty_strategies.return_value = set()
+        self.flumine._process_simulated_orders(mock_market)
+        mock_strategy.process_orders.assert_not_called()
+        mock_market.blotter.pop_dirty_strategies.return_value = {mock_strategy_two}
+        self.flumine._process_simulated_orders(mock_market)
+        mock_strategy.process_orders.assert_not_called()
+        mock_strategy_two.process_orders.assert_called_with(
+            mock_market, mock_market.blotter.strategy_orders(mock_strategy_two)
+        )
+
     def test__check_pending_packages_place(self):
         mock_client = mock.Mock()
         mock_order_package = mock.Mock(
+            _time_created=datetime.datetime.utcnow(),
             market_id="1.23",
             package_type=OrderPackageType.PLACE,
             elapsed_seconds=5,
@@ -192,13 +253,14 @@ class FlumineSimulationTest(unittest.TestCase):
             client=mock_client,
             simulated_delay=1.2,
         )
-        self.flumine.handler_queue = [mock_order_package]
+        self.flumine.handler_queue.append(mock_order_package)
         self.flumine._check_pending_packages("1.23")
         mock_client.execution.handler.assert_called_with(mock_order_package)
 
     def test__check_pending_packages_place_pending(self):
         mock_client = mock.Mock()
         mock_order_package = mock.Mock(
+            _time_created=datetime.datetime.utcnow(),
             market_id="1.23",
             package_type=OrderPackageType.PLACE,
             elapsed_seconds=0.2,
@@ -206,13 +268,14 @@ class FlumineSimulationTest(unittest.TestCase):
             client=mock_client,
             simulated_delay=1.2,
         )
-        self.flumine.handler_queue = [mock_order_package]
+        self.flumine.handler_queue.append(mock_order_package)
         self.flumine._check_pending_packages("1.23")
         mock_client.execution.handler.assert_not_called()
 
     def test__check_pending_packages_place_diff_market_id(self):
         mock_client = mock.Mock()
         mock_order_package = mock.Mock(
+            _time_created=datetime.datetime.utcnow(),
             market_id="1.23",
             package_type=OrderPackageType.PLACE,
             elapsed_seconds=2,
@@ -220,49 +283,66 @@ class FlumineSimulationTest(unittest.TestCase):
             client=mock_client,
             simulated_delay=1.2,
         )
-        self.flumine.handler_queue = [mock_order_package]
+        self.flumine.handler_queue.append(mock_order_package)
         self.flumine._check_pending_packages("1.24")
         mock_client.execution.handler.assert_not_called()
 
     def test__check_pending_packages_cancel(self):
         mock_client = mock.Mock()
         mock_order_package = mock.Mock(
-            market_id="1.23", elapsed_seconds=3, client=mock_client, simulated_delay=0.2
+            _time_created=datetime.datetime.utcnow(),
+            market_id="1.23",
+            elapsed_seconds=3,
+            client=mock_client,
+            simulated_delay=0.2,
         )
-        self.flumine.handler_queue = [mock_order_package]
+        self.flumine.handler_queue.append(mock_order_package)
         self.flumine._check_pending_packages("1.23")
         mock_client.execution.handler.assert_called_with(mock_order_package)
 
     def test__check_pending_packages_cancel_pending(self):
         mock_client = mock.Mock()
         mock_order_package = mock.Mock(
-            market_id="1.23", elapsed_seconds=2, client=mock_client, simulated_delay=0.2
+            _time_created=datetime.datetime.utcnow(),
+            market_id="1.23",
+            elapsed_seconds=2,
+            client=mock_client,
+            simulated_delay=0.2,
         )
-        self.flumine.handler_queue = [mock_order_package]
+        self.flumine.handler_queue.append(mock_order_package)
         self.flumine._check_pending_packages("1.23")
         mock_client.execution.handler.assert_called_with(mock_order_package)
 
     def test__check_pending_packages_update(self):
         mock_client = mock.Mock()
         mock_order_package = mock.Mock(
-            market_id="1.23", elapsed_seconds=3, client=mock_client, simulated_delay=0.2
+            _time_created=datetime.datetime.utcnow(),
+            market_id="1.23",
+            elapsed_seconds=3,
+            client=mock_client,
+            simulated_delay=0.2,
         )
-        self.flumine.handler_queue = [mock_order_package]
+        self.flumine.handler_queue.append(mock_order_package)
         self.flumine._check_pending_packages("1.23")
         mock_client.execution.handler.assert_called_with(mock_order_package)
 
     def test__check_pending_packages_update_pending(self):
         mock_client = mock.Mock()
         mock_order_package = mock.Mock(
-            market_id="1.23", elapsed_seconds=2, client=mock_client, simulated_delay=0.2
+            _time_created=datetime.datetime.utcnow(),
+            market_id="1.23",
+            elapsed_seconds=2,
+            client=mock_client,
+            simulated_delay=0.2,
         )
-        self.flumine.handler_queue = [mock_order_package]
+        self.flumine.handler_queue.append(mock_order_package)
         self.flumine._check_pending_packages("1.23")
         mock_client.execution.handler.assert_called_with(mock_order_package)
 
     def test__check_pending_packages_replace(self):
         mock_client = mock.Mock()
         mock_order_package = mock.Mock(
+            _time_created=datetime.datetime.utcnow(),
             market_id="1.23",
             package_type=OrderPackageType.REPLACE,
             elapsed_seconds=5,
@@ -270,13 +350,14 @@ class FlumineSimulationTest(unittest.TestCase):
             client=mock_client,
             simulated_delay=1.2,
         )
-        self.flumine.handler_queue = [mock_order_package]
+        self.flumine.handler_queue.append(mock_order_package)
         self.flumine._check_pending_packages("1.23")
         mock_client.execution.handler.assert_called_with(mock_order_package)
 
     def test__check_pending_packages_replace_pending(self):
         mock_client = mock.Mock()
         mock_order_package = mock.Mock(
+            _time_created=datetime.datetime.utcnow(),
             market_id="1.23",
             package_type=OrderPackageType.REPLACE,
             elapsed_seconds=2,
@@ -293,7 +374,7 @@ class FlumineSimulationTest(unittest.TestCase):
     def test__process_close_market_closed(self, mock_log_control, mock_info):
         mock_strategy = mock.Mock()
         mock_strategy.stream_ids = [1, 2, 3]
-        self.flumine.strategies = [mock_strategy]
+        self.flumine.strategies = create_strategies(mock_strategy)
         mock_market = mock.Mock(closed=False, elapsed_seconds_closed=None)
         mock_market.market_book.streaming_unique_id = 2
         mock_market.blotter.process_cleared_orders.return_value = []
@@ -317,6 +398,58 @@ class FlumineSimulationTest(unittest.TestCase):
     def test_str(self):
         assert str(self.flumine) == "<FlumineSimulation>"
 
+    @mock.patch("flumine.simulation.simulation.logger")
+    @mock.patch("flumine.simulation.simulation.run_parallel")
+    def test_run_parallel(self, mock_run_parallel, mock_logger):
+        control = mock.Mock(NAME="TEST")
+        control.is_alive.return_value = True
+        self.flumine._logging_controls = [control]
+        result = parallel.SimulationResult(
+            ["1.123"],
+            [{"marketId": "1.123", "profit": 1.2}],
+            [{"id": 1}],
+            events=[
+                ("MarketEvent", {"market_id": "1.123"}, ExchangeType.SIMULATED),
+                ("OrderEvent", {"id": 1}, ExchangeType.SIMULATED),
+            ],
+        )
+        error_result = parallel.SimulationResult(["1.456"], error="ValueError()")
+        mock_run_parallel.return_value = iter([result, error_result])
+        mock_factory = mock.Mock()
+        self.assertEqual(
+            self.flumine.run_parallel(["1.123", "1.456"], mock_factory, processes=2),
+            [result, error_result],
+        )
+        mock_run_parallel.assert_called_with(
+            ["1.123", "1.456"], mock_factory, None, 2, None
+        )
+        control.start.assert_called_with()
+        control.join.assert_called_with()
+        events = [c[0][0] for c in control.logging_queue.put.call_args_list]
+        self.assertEqual(
+            [e.EVENT_TYPE.value for e in events],
+            [
+                "Market",
+                "Order",
+                "Simulation result",
+                "ClearedMarkets",
+                "Simulation result",
+                "Terminator",
+            ],
+        )
+        self.assertEqual(events[0].event, {"market_id": "1.123"})
+        self.assertEqual(events[0].exchange, ExchangeType.SIMULATED)
+        self.assertEqual(events[1].event, {"id": 1})
+        self.assertEqual(events[2].event, result)
+        self.assertEqual(events[3].event.orders[0].profit, 1.2)
+        mock_logger.error.assert_called_with(
+            "Parallel simulation task failed", extra=error_result.info
+        )
+
+    @mock.patch("flumine.simulation.simulation.run_parallel", return_value=iter([]))
+    def test_run_parallel_no_logging_controls(self, _):
+        self.assertEqual(self.flumine.run_parallel(["1.123"], mock.Mock()), [])
+
     def test_repr(self):
         assert repr(self.flumine) == "<FlumineSimulation>"
 
@@ -337,3 +470,100 @@ class FlumineSimulationTest(unittest.TestCase):
 
     def tearDown(self) -> None:
         config.simulated = False
+
+
+class ParallelTest(unittest.TestCase):
+    def test_simulation_result(self):
+        result = parallel.SimulationResult(
+            ["1.123"],
+            [{"profit": 1.234}, {"profit": -0.5}],
+            [{"id": 1}],
+            elapsed_seconds=1.2,
+        )
+        self.assertEqual(result.profit, 0.73)
+        self.assertEqual(
+            result.info,
+            {
+                "markets": ["1.123"],
+                "market_count": 2,
+                "order_count": 1,
+                "profit": 0.73,
+                "elapsed_seconds": 1.2,
+                "error": None,
+            },
+        )
+
+    def test_get_file_size(self):
+        self.assertEqual(
+            parallel.get_file_size("tests/resources/1.197931750"),
+            os.path.getsize("tests/resources/1.197931750"),
+        )
+        self.assertEqual(parallel.get_file_size("s3://bucket/1.123"), 0)
+
+    def test_create_tasks(self):
+        self.assertEqual(
+            parallel.create_tasks(
+                [
+                    "tests/resources/BASIC-1.132153978",
+                    "tests/resources/SELF-1.181223995",
+                    ["tests/resources/1.197931750", "tests/resources/1.197931751"],
+                ]
+            ),
+            [
+                ["tests/resources/SELF-1.181223995"],
+                ["tests/resources/1.197931750", "tests/resources/1.197931751"],
+                ["tests/resources/BASIC-1.132153978"],
+            ],
+        )
+
+    @mock.patch("flumine.simulation.simulation.FlumineSimulation")
+    def test_run_task(self, mock_framework_cls):
+        mock_framework = mock_framework_cls()
+        mock_order = mock.Mock(info={"id": 1}, profit=2.0)
+        mock_market = mock.Mock(blotter=[mock_order])
+        mock_market.cleared.return_value = {"profit": 2.0}
+        mock_framework.markets = [mock_market]
+        mock_strategy = mock.Mock()
+        mock_factory = mock.Mock(return_value=mock_strategy)
+        result = parallel.run_task(["1.123"], mock_factory, {"username": "test"})
+        mock_factory.assert_called_with(["1.123"])
+        mock_framework.add_strategy.assert_called_with(mock_strategy)
+        mock_framework.run.assert_called_with()
+        self.assertEqual(result.markets, ["1.123"])
+        self.assertEqual(result.cleared_markets, [{"profit": 2.0}])
+        self.assertEqual(result.orders, [{"id": 1, "profit": 2.0}])
+        self.assertIsNone(result.error)
+        collector = mock_framework.add_logging_control.call_args[0][0]
+        self.assertIsInstance(collector, parallel.EventCollector)
+        self.assertEqual(result.events, collector.events)
+
+    def test_run_task_error(self):
+        mock_factory = mock.Mock(side_effect=ValueError("bad"))
+        result = parallel.run_task(["1.123"], mock_factory)
+        self.assertEqual(result.error, "ValueError('bad')")
+        self.assertEqual(result.orders, [])
+
+    def test_event_collector(self):
+        collector = parallel.EventCollector()
+        market = mock.Mock(info={"market_id": "1.123"})
+        order = mock.Mock(info={"id": 1})
+        trade = mock.Mock(info={"id": 2})
+        collector.process_event(events.MarketEvent(market))
+        collector.process_event(events.TradeEvent(trade))
+        collector.process_event(
+            events.OrderEvent(order, exchange=ExchangeType.SIMULATED)
+        )
+        collector.process_event(events.ClearedOrdersMetaEvent([order]))
+        collector.process_event(events.ConfigEvent(mock.Mock()))
+        self.assertEqual(
+            collector.events,
+            [
+                ("MarketEvent", {"market_id": "1.123"}, ExchangeType.BETFAIR),
+                ("TradeEvent", {"id": 2}, ExchangeType.BETFAIR),
+                ("OrderEvent", {"id": 1}, ExchangeType.SIMULATED),
+                ("ClearedOrdersMetaEvent", [{"id": 1}], ExchangeType.BETFAIR),
+            ],
+        )
+
+    def test_run_parallel_empty(self):
+        self.assertEqual(list(parallel.run_parallel([], mock.Mock())), [])
@@ -8,6 +8,42 @@ from flumine.utils import get_price, get_nearest_price
 from examples.middleware.marketcatalogue import MarketCatalogueMiddleware
 
 
+class LimitOrdersInplay(BaseStrategy):
+    def check_market_book(self, market, market_book):
+        if market_book.inplay:
+            return True
+
+    def process_market_book(self, market, market_book):
+        for runner in market_book.runners:
+            if runner.status == "ACTIVE" and runner.last_price_traded < 2:
+                lay = get_price(runner.ex.available_to_lay, 0)
+                trade = Trade(
+                    market_book.market_id,
+                    runner.selection_id,
+                    runner.handicap,
+                    self,
+                )
+                order = trade.create_order(
+                    side="LAY",
+                    order_type=LimitOrder(lay, 2.00),
+                )
+                market.place_order(order)
+
+    def process_orders(self, market, orders):
+        for order in orders:
+            if order.status == OrderStatus.EXECUTABLE:
+                if order.elapsed_seconds and order.elapsed_seconds > 2:
+                    market.cancel_order(order)
+
+
+def create_limit_orders_inplay(markets):
+    return LimitOrdersInplay(
+        market_filter={"markets": markets},
+        max_order_exposure=1000,
+        max_selection_exposure=105,
+    )
+
+
 class IntegrationTest(unittest.TestCase):
     def setUp(self) -> None:
         # change config to raise errors
@@ -442,6 +478,35 @@ class IntegrationTest(unittest.TestCase):
         self.assertEqual(len(limit_inplay_orders), 200)
         self.assertEqual(place_market._transaction_id, 2436)
 
+    def test_run_parallel(self):
+        markets = [
+            "tests/resources/BASIC-1.132153978",
+            "tests/resources/SELF-1.181223995",
+        ]
+        framework = FlumineSimulation()
+        results = framework.run_parallel(
+            markets, create_limit_orders_inplay, processes=2
+        )
+        self.assertEqual(len(results), 2)
+        results = {r.markets[0]: r for r in results}
+        for market in markets:
+            self.assertIsNone(results[market].error)
+        # compare against single process
+        client = clients.SimulatedClient()
+        framework = FlumineSimulation(client=client)
+        framework.add_strategy(create_limit_orders_inplay(markets))
+        framework.run()
+        for market, market_id in zip(markets, ["1.132153978", "1.181223995"]):
+            orders = list(framework.markets.markets[market_id].blotter)
+            result = results[market]
+            self.assertEqual(len(result.orders), len(orders))
+            self.assertEqual(result.profit, round(sum([o.profit for o in orders]), 2))
+            self.assertEqual(result.cleared_markets[0]["marketId"], market_id)
+            event_names = [e[0] for e in result.events]
+            self.assertEqual(event_names[0], "MarketEvent")
+            self.assertEqual(event_names.count("TradeEvent"), len(orders))
+            self.assertEqual("ClearedOrdersMetaEvent" in event_names, bool(orders))
+
     def tearDown(self) -> None:
         config.simulated = False
         config.raise_errors = False
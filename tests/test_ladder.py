@@ -0,0 +1,113 @@
+import unittest
+from decimal import Decimal
+
+from flumine import ladder, utils
+
+
+class NearestPriceTest(unittest.TestCase):
+    def test_nearest_price(self):
+        for price, expected in (
+            (0, 1.01),
+            (1.011, 1.01),
+            (1.015, 1.02),
+            (2.0099, 2.00),
+            (2.01, 2.02),
+            (4.05, 4.1),
+            (99.9, 100),
+            (105, 110),
+            (999, 1000),
+            (1001, 1000),
+        ):
+            self.assertEqual(
+                ladder.nearest_price(price, utils.CUTOFFS, 1.01, 1000), expected
+            )
+
+    def test_nearest_price_decimal(self):
+        self.assertEqual(
+            ladder.nearest_price(Decimal("1.015"), utils.CUTOFFS, 1.01, 1000), 1.02
+        )
+
+    def test_nearest_price_betdaq(self):
+        self.assertEqual(
+            ladder.nearest_price(2.99, utils.BETDAQ_CUTOFFS, 1.01, 1000), 2.99
+        )
+        self.assertEqual(
+            ladder.nearest_price(3.01, utils.BETDAQ_CUTOFFS, 1.01, 1000), 3.0
+        )
+        self.assertEqual(
+            ladder.nearest_price(3.03, utils.BETDAQ_CUTOFFS, 1.01, 1000), 3.05
+        )
+
+
+class PriceLadderTest(unittest.TestCase):
+    def setUp(self):
+        self.ladder = ladder.PriceLadder(utils.PRICES_FLOAT, utils.CUTOFFS)
+
+    def test_init(self):
+        self.assertEqual(len(self.ladder), 350)
+        self.assertEqual(self.ladder.prices, tuple(utils.PRICES_FLOAT))
+        self.assertEqual(self.ladder.cutoffs, utils.CUTOFFS)
+        self.assertEqual(self.ladder.min_price, 1.01)
+        self.assertEqual(self.ladder.max_price, 1000)
+        self.assertEqual(list(self.ladder), utils.PRICES_FLOAT)
+
+    def test_is_valid(self):
+        self.assertTrue(self.ladder.is_valid(1.01))
+        self.assertTrue(self.ladder.is_valid(2))
+        self.assertTrue(self.ladder.is_valid(Decimal("2.02")))
+        self.assertTrue(self.ladder.is_valid("3.05"))
+        self.assertFalse(self.ladder.is_valid(2.01))
+        self.assertFalse(self.ladder.is_valid(-1))
+        self.assertFalse(self.ladder.is_valid(1001))
+        self.assertIn(1.5, self.ladder)
+        self.assertNotIn(1.505, self.ladder)
+
+    def test_index(self):
+        self.assertEqual(self.ladder.index(1.01), 0)
+        self.assertEqual(self.ladder.index(2.02), 100)
+        self.assertEqual(self.ladder.index(1000), 349)
+        with self.assertRaises(ValueError):
+            self.ladder.index(2.01)
+
+    def test_ticks_away(self):
+        self.assertEqual(self.ladder.ticks_away(1.01, 1), 1.02)
+        self.assertEqual(self.ladder.ticks_away(2.0, 1), 2.02)
+        self.assertEqual(self.ladder.ticks_away(2.0, -1), 1.99)
+        self.assertEqual(self.ladder.ticks_away(1.01, -1), 1.01)
+        self.assertEqual(self.ladder.ticks_away(1000, 5), 1000)
+        with self.assertRaises(ValueError):
+            self.ladder.ticks_away(999, -1)
+
+    def test_ticks_between(self):
+        self.assertEqual(self.ladder.ticks_between(1.98, 2.02), 3)
+        self.assertEqual(self.ladder.ticks_between(2.02, 1.98), -3)
+
+    def test_tick_range(self):
+        self.assertEqual(self.ladder.tick_range(2, 2, 2), [1.98, 1.99, 2, 2.02, 2.04])
+        self.assertEqual(self.ladder.tick_range(1.02, 2, 1), [1.01, 1.02, 1.03])
+        self.assertEqual(self.ladder.tick_range(990, 1, 3), [980, 990, 1000])
+
+    def test_nearest(self):
+        self.assertEqual(self.ladder.nearest(2.01), 2.02)
+        self.assertEqual(self.ladder.nearest(0), 1.01)
+
+    def test_nearest_no_cutoffs(self):
+        line_ladder = ladder.PriceLadder([0.5, 1.5, 2.5])
+        self.assertEqual(line_ladder.nearest(0), 0.5)
+        self.assertEqual(line_ladder.nearest(1.4), 1.5)
+        self.assertEqual(line_ladder.nearest(2.0), 2.5)
+        self.assertEqual(line_ladder.nearest(1.9), 1.5)
+        self.assertEqual(line_ladder.nearest(3), 2.5)
+
+    def test_is_valid_many(self):
+        self.assertEqual(
+            self.ladder.is_valid_many([1.01, 2.01, 1000]), [True, False, True]
+        )
+
+    def test_ticks_away_many(self):
+        self.assertEqual(
+            self.ladder.ticks_away_many([1.01, 2, 1000], 1), [1.02, 2.02, 1000]
+        )
+
+    def test_nearest_many(self):
+        self.assertEqual(self.ladder.nearest_many([1.011, 2.01]), [1.01, 2.02])
@@ -0,0 +1,99 @@
+import unittest
+from unittest import mock
+
+from flumine import latency
+
+
+class LatencyHistogramTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.histogram = latency.LatencyHistogram()
+
+    def test_init(self):
+        self.assertEqual(len(self.histogram._counts), latency.BUCKET_COUNT)
+        self.assertEqual(self.histogram.count, 0)
+        self.assertEqual(self.histogram.total, 0)
+        self.assertEqual(self.histogram.max, 0)
+
+    def test_record(self):
+        self.histogram.record(0)
+        self.histogram.record(0.001)
+        self.histogram.record(1e6)
+        self.assertEqual(self.histogram.count, 3)
+        self.assertEqual(self.histogram.total, 1e6 + 0.001)
+        self.assertEqual(self.histogram.max, 1e6)
+        self.assertEqual(self.histogram._counts[0], 1)
+        self.assertEqual(self.histogram._counts[-1], 1)
+
+    def test_percentile(self):
+        self.assertIsNone(self.histogram.percentile(0.5))
+        for i in range(1, 101):
+            self.histogram.record(i / 1000)
+        self.assertAlmostEqual(self.histogram.percentile(0.5), 0.05, delta=0.0025)
+        self.assertAlmostEqual(self.histogram.percentile(0.99), 0.099, delta=0.005)
+        self.assertEqual(self.histogram.percentile(1), 0.1)
+        self.assertAlmostEqual(self.histogram.percentile(0), 0.001, delta=0.00005)
+
+    def test_info(self):
+        self.assertEqual(
+            self.histogram.info,
+            {"count": 0, "mean": None, "p50": None, "p99": None, "max": 0},
+        )
+        self.histogram.record(0.01)
+        self.assertEqual(
+            self.histogram.info,
+            {"count": 1, "mean": 0.01, "p50": 0.01, "p99": 0.01, "max": 0.01},
+        )
+
+
+class CallbackTimingTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.timing = latency.CallbackTiming()
+
+    def test_record(self):
+        self.timing.record(0.2)
+        self.timing.record(0.1)
+        self.assertEqual(self.timing.calls, 2)
+        self.assertAlmostEqual(self.timing.total, 0.3)
+        self.assertEqual(self.timing.max, 0.2)
+
+    def test_info(self):
+        self.assertEqual(
+            self.timing.info, {"calls": 0, "total": 0, "mean": None, "max": 0}
+        )
+        self.timing.record(0.2)
+        self.assertEqual(
+            self.timing.info, {"calls": 1, "total": 0.2, "mean": 0.2, "max": 0.2}
+        )
+
+
+class LatencyTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.latency = latency.Latency()
+
+    def test_init(self):
+        self.assertEqual(self.latency._histograms, {})
+
+    def test_record(self):
+        self.latency.record("stream", 0.1)
+        self.latency.record("stream", 0.2)
+        self.assertEqual(self.latency.get("stream").count, 2)
+        self.assertIsNone(self.latency.get("request"))
+
+    def test_record_disabled(self):
+        with mock.patch("flumine.latency.config.record_latency", False):
+            self.latency.record("stream", 0.1)
+        self.assertEqual(self.latency.info, {})
+
+    @mock.patch("flumine.latency.time.monotonic", return_value=12.5)
+    def test_record_since(self, _):
+        self.latency.record_since("request", 12)
+        self.assertEqual(self.latency.get("request").max, 0.5)
+
+    def test_reset(self):
+        self.latency.record("stream", 0.1)
+        self.latency.reset()
+        self.assertEqual(self.latency.info, {})
+
+    def test_info(self):
+        self.latency.record("stream", 0.1)
+        self.assertEqual(self.latency.info, {"stream": self.latency.get("stream").info})
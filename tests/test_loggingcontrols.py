@@ -108,6 +108,22 @@ class TestLoggingControl(unittest.TestCase):
         self.logging_control.process_event(mock_event)
         _closed_market.assert_called_with(mock_event)
 
+    @mock.patch(
+        "flumine.controls.loggingcontrols.LoggingControl._process_simulation_result"
+    )
+    def test_process_event_simulation_result(self, _simulation_result):
+        mock_event = mock.Mock()
+        mock_event.EVENT_TYPE = EventType.SIMULATION_RESULT
+        self.logging_control.process_event(mock_event)
+        _simulation_result.assert_called_with(mock_event)
+
+    @mock.patch("flumine.controls.loggingcontrols.LoggingControl._process_latency")
+    def test_process_event_latency(self, _latency):
+        mock_event = mock.Mock()
+        mock_event.EVENT_TYPE = EventType.LATENCY
+        self.logging_control.process_event(mock_event)
+        _latency.assert_called_with(mock_event)
+
     @mock.patch("flumine.controls.loggingcontrols.LoggingControl._process_end_flumine")
     def test_process_event_end(self, _end_flumine):
         mock_event = mock.Mock()
@@ -149,5 +165,11 @@ class TestLoggingControl(unittest.TestCase):
     def test_process_custom_event(self):
         self.logging_control._process_custom_event(None)
 
+    def test_process_simulation_result(self):
+        self.logging_control._process_simulation_result(None)
+
+    def test_process_latency(self):
+        self.logging_control._process_latency(None)
+
     def test_process_end_flumine(self):
         self.logging_control._process_end_flumine(None)
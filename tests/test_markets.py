@@ -1,3 +1,4 @@
+import threading
 import unittest
 import datetime
 from unittest import mock
@@ -6,6 +7,7 @@ from collections import defaultdict
 from flumine.markets.markets import Markets
 from flumine.markets.market import Market
 from flumine import config
+from flumine.exceptions import OrderError
 
 
 class MarketsTest(unittest.TestCase):
@@ -141,6 +143,7 @@ class MarketTest(unittest.TestCase):
         self.assertEqual(self.market.context, {"simulated": {}})
         self.assertIsNotNone(self.market.blotter)
         self.assertEqual(self.market._transaction_id, 0)
+        self.assertIsNone(self.market._coalesced_transactions)
 
     def test_call(self):
         mock_market_book = mock.Mock()
@@ -195,6 +198,27 @@ class MarketTest(unittest.TestCase):
         mock_transaction.assert_called_with(client=1)
         mock_transaction.place_order.assert_called_with(mock_order, 2, False, True)
 
+    @mock.patch("flumine.markets.market.Market.transaction")
+    def test_place_order_coalesced(self, mock_transaction):
+        mock_order_one = mock.Mock()
+        mock_order_two = mock.Mock()
+        with self.market.coalesce_transactions():
+            self.assertTrue(self.market.place_order(mock_order_one))
+            self.assertTrue(self.market.place_order(mock_order_two))
+            mock_transaction().execute.assert_not_called()
+        mock_transaction.assert_any_call(
+            client=self.market.flumine.clients.get_default()
+        )
+        self.assertEqual(
+            mock_transaction().place_order.call_args_list,
+            [
+                mock.call(mock_order_one, None, True, False),
+                mock.call(mock_order_two, None, True, False),
+            ],
+        )
+        mock_transaction().execute.assert_called_once_with()
+        self.assertIsNone(self.market._coalesced_transactions)
+
     @mock.patch("flumine.markets.market.Market.transaction")
     def test_cancel_order(self, mock_transaction):
         mock_transaction.return_value.__enter__.return_value = mock_transaction
@@ -221,6 +245,126 @@ class MarketTest(unittest.TestCase):
         mock_transaction.assert_called_with(client=mock_order.client)
         mock_transaction.replace_order.assert_called_with(mock_order, 2, False, True)
 
+    @mock.patch("flumine.markets.market.Market.transaction")
+    def test_orders_coalesced(self, mock_transaction):
+        mock_order = mock.Mock()
+        with self.market.coalesce_transactions():
+            self.market.cancel_order(mock_order, 2.02)
+            self.market.update_order(mock_order, "test")
+            self.market.replace_order(mock_order, 2)
+        mock_transaction.assert_called_once_with(client=mock_order.client)
+        mock_transaction().cancel_order.assert_called_with(mock_order, 2.02, False)
+        mock_transaction().update_order.assert_called_with(
+            mock_order, "test", 0.0, None, None, None, None, None, None, False
+        )
+        mock_transaction().replace_order.assert_called_with(mock_order, 2, None, False)
+        mock_transaction().execute.assert_called_once_with()
+
+    @mock.patch("flumine.markets.market.Market.transaction")
+    def test_coalesce_transactions_clients(self, mock_transaction):
+        mock_transaction.side_effect = lambda client: mock.Mock(client=client)
+        with self.market.coalesce_transactions():
+            self.market.place_order(mock.Mock(), client=1)
+            self.market.place_order(mock.Mock(), client=2)
+            self.market.place_order(mock.Mock(), client=1)
+            transactions = self.market._coalesced_transactions[1]
+        self.assertEqual(list(transactions), [1, 2])
+        self.assertEqual(transactions[1].place_order.call_count, 2)
+        for transaction in transactions.values():
+            transaction.execute.assert_called_once_with()
+
+    @mock.patch("flumine.markets.market.Market.transaction")
+    def test_coalesce_transactions_no_pending(self, mock_transaction):
+        mock_transaction()._pending_orders = False
+        with self.market.coalesce_transactions():
+            self.market.place_order(mock.Mock())
+        mock_transaction().execute.assert_not_called()
+
+    @mock.patch("flumine.markets.market.Market.transaction")
+    def test_coalesce_transactions_error(self, mock_transaction):
+        with self.assertRaises(ValueError):
+            with self.market.coalesce_transactions():
+                self.market.place_order(mock.Mock())
+                raise ValueError()
+        mock_transaction().execute.assert_not_called()
+        mock_transaction().reset.assert_called_once_with()
+        self.assertIsNone(self.market._coalesced_transactions)
+
+    @mock.patch("flumine.markets.market.Market.transaction")
+    def test_coalesce_transactions_execute_error(self, mock_transaction):
+        mock_transaction_one = mock.Mock()
+        mock_transaction_one.execute.side_effect = OrderError("test")
+        mock_transaction_two = mock.Mock()
+        mock_transaction_two.execute.side_effect = ValueError()
+        mock_transaction_three = mock.Mock()
+        mock_transaction.side_effect = [
+            mock_transaction_one,
+            mock_transaction_two,
+            mock_transaction_three,
+        ]
+        with self.market.coalesce_transactions():
+            self.market.place_order(mock.Mock(), client=1)
+            self.market.place_order(mock.Mock(), client=2)
+            self.market.place_order(mock.Mock(), client=3)
+        mock_transaction_one.reset.assert_called_once_with()
+        mock_transaction_two.reset.assert_called_once_with()
+        mock_transaction_three.execute.assert_called_once_with()
+        mock_transaction_three.reset.assert_not_called()
+
+    @mock.patch("flumine.markets.market.config")
+    @mock.patch("flumine.markets.market.Market.transaction")
+    def test_coalesce_transactions_execute_error_raise(
+        self, mock_transaction, mock_config
+    ):
+        mock_config.raise_errors = True
+        mock_transaction_one = mock.Mock()
+        mock_transaction_one.execute.side_effect = ValueError()
+        mock_transaction_two = mock.Mock()
+        mock_transaction.side_effect = [mock_transaction_one, mock_transaction_two]
+        with self.assertRaises(ValueError):
+            with self.market.coalesce_transactions():
+                self.market.place_order(mock.Mock(), client=1)
+                self.market.place_order(mock.Mock(), client=2)
+        mock_transaction_two.execute.assert_called_once_with()
+
+    @mock.patch("flumine.markets.market.Market.transaction")
+    def test_coalesce_transactions_other_thread(self, mock_transaction):
+        mock_transaction.return_value.__enter__.return_value = mock_transaction
+        mock_order = mock.Mock()
+        results = []
+        with self.market.coalesce_transactions():
+            thread = threading.Thread(
+                target=lambda: results.append(
+                    self.market.place_order(mock_order, execute=False, client=1)
+                )
+            )
+            thread.start()
+            thread.join()
+            # executed immediately in its own transaction
+            mock_transaction.assert_called_once_with(client=1)
+            mock_transaction.place_order.assert_called_once_with(
+                mock_order, None, False, False
+            )
+            self.assertEqual(self.market._coalesced_transactions[1], {})
+        self.assertEqual(results, [mock_transaction.place_order()])
+
+    @mock.patch("flumine.markets.market.Market.transaction")
+    def test_coalesce_transactions_disabled(self, mock_transaction):
+        mock_transaction.return_value.__enter__.return_value = mock_transaction
+        with self.market.coalesce_transactions(False):
+            self.assertIsNone(self.market._coalesced_transactions)
+            self.market.place_order(mock.Mock())
+        mock_transaction.place_order.assert_called_once()
+        mock_transaction().execute.assert_not_called()
+
+    @mock.patch("flumine.markets.market.Market.transaction")
+    def test_coalesce_transactions_nested(self, mock_transaction):
+        with self.market.coalesce_transactions():
+            with self.market.coalesce_transactions():
+                self.market.place_order(mock.Mock())
+            mock_transaction().execute.assert_not_called()
+        mock_transaction().execute.assert_called_once_with()
+
     def test_event(self):
         self.market.market_catalogue.event.id = 12
         self.market.market_catalogue.event_type.id = "7"
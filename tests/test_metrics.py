@@ -0,0 +1,195 @@
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from unittest import mock
+
+from flumine import metrics
+from flumine.baseflumine import BaseFlumine
+from flumine.clients import ExchangeType
+from flumine.controls.clientcontrols import MaxTransactionCount
+from flumine.controls.loggingcontrols import LoggingControl
+from flumine.streams.marketstream import MarketStream
+
+
+class MetricTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.metric = metrics.Metric("flumine_test", "gauge", "Test metric")
+
+    def test_init(self):
+        self.assertEqual(self.metric.name, "flumine_test")
+        self.assertEqual(self.metric.metric_type, "gauge")
+        self.assertEqual(self.metric.documentation, "Test metric")
+        self.assertEqual(self.metric.samples, [])
+
+    def test_add(self):
+        self.metric.add(1, market_id="1.23")
+        self.assertEqual(self.metric.samples, [({"market_id": "1.23"}, 1)])
+
+    def test_str(self):
+        self.metric.add(1)
+        self.metric.add(2, market_id="1.23", name='a"b\\c\nd')
+        self.assertEqual(
+            str(self.metric),
+            "# HELP flumine_test Test metric\n"
+            "# TYPE flumine_test gauge\n"
+            "flumine_test 1.0\n"
+            'flumine_test{market_id="1.23",name="a\\"b\\\\c\\nd"} 2.0',
+        )
+
+    def test_format_metrics(self):
+        self.assertEqual(
+            metrics.format_metrics([self.metric]),
+            "# HELP flumine_test Test metric\n# TYPE flumine_test gauge\n",
+        )
+
+
+class CollectMetricsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.mock_client = mock.Mock(
+            EXCHANGE=ExchangeType.BETFAIR,
+            paper_trade=False,
+            username="test",
+            trading_controls=[],
+        )
+        self.flumine = BaseFlumine(self.mock_client)
+
+    def test_collect_metrics(self):
+        # handler queue
+        self.flumine.handler_queue.put(1)
+        # stream
+        stream = MarketStream(self.flumine, 1, 0.01, 100, {}, {})
+        stream._output_queue.put(1)
+        stream._listener.stream = mock.Mock(_updates_processed=12)
+        self.flumine.streams._streams = [stream]
+        # transactions
+        control = MaxTransactionCount(self.flumine, self.mock_client)
+        control.add_transaction(3)
+        self.mock_client.trading_controls = [control]
+        # markets
+        mock_market = mock.Mock(market_id="1.23", closed=False)
+        mock_market.blotter.live_order_count = 2
+        self.flumine.markets._markets = {
+            "1.23": mock_market,
+            "1.24": mock.Mock(market_id="1.24", closed=True),
+        }
+        # logging
+        self.flumine._logging_controls = [LoggingControl()]
+        self.flumine._logging_controls[0].logging_queue.put(1)
+
+        samples = {
+            metric.name: metric.samples
+            for metric in metrics.collect_metrics(self.flumine)
+        }
+        self.assertEqual(samples["flumine_handler_queue_size"], [({}, 1)])
+        self.assertEqual(
+            samples["flumine_stream_output_queue_size"],
+            [({"stream_id": 1, "stream": "MarketStream"}, 1)],
+        )
+        self.assertEqual(
+            samples["flumine_stream_updates_processed_total"],
+            [({"stream_id": 1, "stream": "MarketStream"}, 12)],
+        )
+        self.assertEqual(
+            samples["flumine_execution_work_queue_size"],
+            [
+                ({"execution": "BetfairExecution"}, 0),
+                ({"execution": "BetdaqExecution"}, 0),
+                ({"execution": "SimulatedExecution"}, 0),
+            ],
+        )
+        self.assertEqual(
+            samples["flumine_execution_active_workers"][0],
+            ({"execution": "BetfairExecution"}, 0),
+        )
+        self.assertEqual(
+            samples["flumine_execution_busy_seconds_total"][0],
+            ({"execution": "BetfairExecution"}, 0.0),
+        )
+        self.assertEqual(
+            samples["flumine_execution_lane_queue_size"][:4],
+            [
+                ({"lane": "Cancel", "execution": "BetfairExecution"}, 0),
+                ({"lane": "Replace", "execution": "BetfairExecution"}, 0),
+                ({"lane": "Update", "execution": "BetfairExecution"}, 0),
+                ({"lane": "Place", "execution": "BetfairExecution"}, 0),
+            ],
+        )
+        self.assertEqual(
+            samples["flumine_execution_scheduled"][0],
+            ({"execution": "BetfairExecution"}, 0),
+        )
+        self.assertEqual(
+            samples["flumine_execution_sessions"][0],
+            ({"execution": "BetfairExecution"}, 0),
+        )
+        self.assertEqual(
+            samples["flumine_execution_sessions_created_total"][0],
+            ({"execution": "BetfairExecution"}, 0),
+        )
+        self.assertEqual(
+            samples["flumine_transactions"],
+            [
+                ({"username": "test", "exchange": "Betfair"}, 3),
+                ({"username": "test", "exchange": "Betfair", "failed": True}, 0),
+            ],
+        )
+        self.assertEqual(
+            samples["flumine_transactions_total"][0],
+            ({"username": "test", "exchange": "Betfair"}, 3),
+        )
+        self.assertEqual(
+            samples["flumine_transactions_rate_limited_total"],
+            [({"username": "test", "exchange": "Betfair"}, 0)],
+        )
+        self.assertEqual(
+            samples["flumine_market_live_orders"], [({"market_id": "1.23"}, 2)]
+        )
+        self.assertEqual(
+            samples["flumine_logging_queue_size"],
+            [({"logging_control": "LOGGING_CONTROL"}, 1)],
+        )
+
+    def test__get_updates_processed(self):
+        stream = MarketStream(self.flumine, 1, 0.01, 100, {}, {})
+        self.assertIsNone(metrics._get_updates_processed(stream))
+
+
+class MetricsServerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.mock_client = mock.Mock(
+            EXCHANGE=ExchangeType.BETFAIR, paper_trade=False, trading_controls=[]
+        )
+        self.flumine = BaseFlumine(self.mock_client)
+        self.server = metrics.create_metrics_server(self.flumine, "127.0.0.1", 0)
+        self.url = "http://127.0.0.1:{0}".format(self.server.server_port)
+
+    def tearDown(self) -> None:
+        self.server.server_close()
+
+    def _get(self, path: str):
+        thread = threading.Thread(target=self.server.handle_request)
+        thread.start()
+        try:
+            with urllib.request.urlopen(self.url + path, timeout=5) as response:
+                return response.status, response.headers, response.read().decode()
+        finally:
+            thread.join()
+
+    def test_scrape(self):
+        status, headers, body = self._get("/metrics")
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["Content-Type"], metrics.CONTENT_TYPE)
+        self.assertIn("# TYPE flumine_handler_queue_size gauge\n", body)
+        self.assertIn("flumine_handler_queue_size 0.0\n", body)
+
+    def test_not_found(self):
+        with self.assertRaises(urllib.error.HTTPError) as e:
+            self._get("/")
+        self.assertEqual(e.exception.code, 404)
+
+    @mock.patch("flumine.metrics.collect_metrics", side_effect=ValueError)
+    def test_error(self, _):
+        with self.assertRaises(urllib.error.HTTPError) as e:
+            self._get("/metrics")
+        self.assertEqual(e.exception.code, 500)
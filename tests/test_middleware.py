@@ -14,6 +14,14 @@ from flumine.markets.middleware import (
     SimulatedSportsDataMiddleware,
 )
 from flumine.order.ordertype import MarketOnCloseOrder
+from flumine.strategy.strategy import Strategies
+
+
+def create_strategies(*strategies) -> Strategies:
+    _strategies = Strategies()
+    for strategy in strategies:
+        _strategies(strategy, mock.Mock(), mock.Mock())
+    return _strategies
 
 
 class MiddlewareTest(unittest.TestCase):
@@ -32,6 +40,12 @@ class MiddlewareTest(unittest.TestCase):
         self.assertIsNone(self.middleware.remove_market(mock_market))
 
 
+def create_blotter(orders: list) -> mock.MagicMock:
+    mock_blotter = mock.MagicMock()
+    mock_blotter.__iter__.side_effect = lambda: iter(orders)
+    return mock_blotter
+
+
 class SimulatedMiddlewareTest(unittest.TestCase):
     def setUp(self) -> None:
         self.middleware = SimulatedMiddleware()
@@ -112,17 +126,18 @@ class SimulatedMiddlewareTest(unittest.TestCase):
         mock_simulated_two = mock.MagicMock(matched=[[123, 8.6, 10]])
         mock_simulated_two.__bool__.return_value = False
         mock_order_two = mock.Mock(simulated=mock_simulated_two, info={})
-        mock_market = mock.Mock(blotter=[mock_order, mock_order_two])
+        mock_market = mock.Mock(blotter=create_blotter([mock_order, mock_order_two]))
         self.middleware._process_runner_removal(mock_market, 12345, 0, 16.2)
         self.assertEqual(mock_order.simulated.matched, [[123, 7.21, 10]])
         self.assertEqual(mock_order.simulated.average_price_matched, 7.21)
         self.assertEqual(mock_order_two.simulated.matched, [[123, 8.6, 10]])
+        mock_market.blotter.order_updated.assert_called_once_with(mock_order)
 
     def test__process_runner_removal_under_limit(self):
         mock_simulated = mock.MagicMock(matched=[[123, 8.6, 10]])
         mock_simulated.__bool__.return_value = True
         mock_order = mock.Mock(simulated=mock_simulated)
-        mock_market = mock.Mock(blotter=[mock_order])
+        mock_market = mock.Mock(blotter=create_blotter([mock_order]))
         self.middleware._process_runner_removal(mock_market, 12345, 0, 2.4)
         self.assertEqual(mock_order.simulated.matched, [[123, 8.6, 10]])
 
@@ -134,18 +149,19 @@ class SimulatedMiddlewareTest(unittest.TestCase):
         )
         mock_order.order_type.size = 10
         mock_order.order_type.ORDER_TYPE = OrderTypes.LIMIT
-        mock_market = mock.Mock(market_id="1.23", blotter=[mock_order])
+        mock_market = mock.Mock(market_id="1.23", blotter=create_blotter([mock_order]))
         self.middleware._process_runner_removal(mock_market, 12345, 0, 16.2)
         self.assertEqual(mock_order.simulated.size_matched, 0)
         self.assertEqual(mock_order.simulated.average_price_matched, 0)
         self.assertEqual(mock_order.simulated.matched, [])
         self.assertEqual(mock_order.simulated.size_voided, 10)
+        mock_market.blotter.order_changed.assert_called_with(mock_order)
 
     def test__process_runner_removal_none(self):
         mock_simulated = mock.MagicMock(matched=[[123, 8.6, 10]])
         mock_simulated.__bool__.return_value = True
         mock_order = mock.Mock(simulated=mock_simulated)
-        mock_market = mock.Mock(blotter=[mock_order])
+        mock_market = mock.Mock(blotter=create_blotter([mock_order]))
         self.middleware._process_runner_removal(mock_market, 12345, 0, None)
         self.assertEqual(mock_order.simulated.matched, [[123, 8.6, 10]])
 
@@ -166,7 +182,9 @@ class SimulatedMiddlewareTest(unittest.TestCase):
             mock.Mock(selection_id=1234, handicap=0, adjustment_factor=20)
         ]
         mock_market = mock.Mock(
-            market_type="WIN", blotter=[mock_order], market_book=mock_market_book
+            market_type="WIN",
+            blotter=create_blotter([mock_order]),
+            market_book=mock_market_book,
         )
         self.middleware._process_runner_removal(mock_market, 12345, 0, 50)
 
@@ -191,7 +209,9 @@ class SimulatedMiddlewareTest(unittest.TestCase):
             mock.Mock(selection_id=1234, handicap=0, adjustment_factor=20)
         ]
         mock_market = mock.Mock(
-            market_type="WIN", blotter=[mock_order], market_book=mock_market_book
+            market_type="WIN",
+            blotter=create_blotter([mock_order]),
+            market_book=mock_market_book,
         )
         self.middleware._process_runner_removal(mock_market, 12345, 0, 50)
 
@@ -218,7 +238,9 @@ class SimulatedMiddlewareTest(unittest.TestCase):
             mock.Mock(selection_id=1234, handicap=0, adjustment_factor=20)
         ]
         mock_market = mock.Mock(
-            market_type="PLACE", blotter=[mock_order], market_book=mock_market_book
+            market_type="PLACE",
+            blotter=create_blotter([mock_order]),
+            market_book=mock_market_book,
         )
         self.middleware._process_runner_removal(mock_market, 12345, 0, 50)
 
@@ -242,7 +264,9 @@ class SimulatedMiddlewareTest(unittest.TestCase):
             mock.Mock(selection_id=1234, handicap=0, adjustment_factor=20)
         ]
         mock_market = mock.Mock(
-            market_type="PLACE", blotter=[mock_order], market_book=mock_market_book
+            market_type="PLACE",
+            blotter=create_blotter([mock_order]),
+            market_book=mock_market_book,
         )
         self.middleware._process_runner_removal(mock_market, 12345, 0, 50)
 
@@ -321,6 +345,68 @@ class SimulatedMiddlewareTest(unittest.TestCase):
         )
         mock_order_two.simulated.assert_not_called()
 
+    def test__match_orders(self):
+        mock_market = mock.Mock()
+        mock_market_book = mock_market.market_book
+        mock_order_one = mock.Mock(selection_id=123, handicap=0, side="BACK")
+        mock_order_one.order_type.price = 2.0
+        mock_order_one.order_type.ORDER_TYPE = OrderTypes.LIMIT
+        mock_order_two = mock.Mock(selection_id=123, handicap=0, side="BACK")
+        mock_order_two.order_type.price = 3.0
+        mock_order_two.order_type.ORDER_TYPE = OrderTypes.LIMIT
+        mock_order_three = mock.Mock(selection_id=456, handicap=0, side="LAY")
+        mock_order_three.order_type.price = 2.0
+        mock_order_three.order_type.ORDER_TYPE = OrderTypes.LIMIT
+        runner_one = mock.Mock(traded={2.0: 10})
+        runner_two = mock.Mock(traded={})
+        runner_three = mock.Mock(traded={5.0: 2})
+        market_analytics = {
+            (123, 0): runner_one,
+            (456, 0): runner_two,
+            (789, 0): runner_three,
+        }
+        self.middleware._match_orders(
+            mock_market,
+            market_analytics,
+            [mock_order_one, mock_order_two, mock_order_three],
+        )
+        # traded copied once per runner and shared by its orders
+        runner_traded = mock_order_one.simulated.call_args[0][1]
+        self.assertEqual(runner_traded, (runner_one.runner, {2.0: 10}))
+        self.assertIsNot(runner_traded[1], runner_one.traded)
+        self.assertIs(mock_order_two.simulated.call_args[0][1], runner_traded)
+        # nothing traded, no copy
+        mock_order_three.simulated.assert_called_with(
+            mock_market_book, (runner_two.runner, runner_two.traded)
+        )
+        self.assertIs(mock_order_three.simulated.call_args[0][1][1], runner_two.traded)
+
+    def test__match_orders_dirty(self):
+        mock_market = mock.Mock()
+        mock_order_one = mock.Mock(selection_id=123, handicap=0, side="BACK")
+        mock_order_one.order_type.price = 2.0
+        mock_order_one.simulated = mock.Mock(
+            size_matched=0, size_lapsed=0, size_cancelled=0
+        )
+
+        def match(market_book, runner_traded):
+            mock_order_one.simulated.size_matched = 2
+
+        mock_order_one.simulated.side_effect = match
+        mock_order_two = mock.Mock(selection_id=123, handicap=0, side="BACK")
+        mock_order_two.order_type.price = 3.0
+        mock_order_two.simulated = mock.Mock(
+            size_matched=0, size_lapsed=0, size_cancelled=0
+        )
+        self.middleware._match_orders(
+            mock_market,
+            {(123, 0): mock.Mock(traded={2.0: 10})},
+            [mock_order_one, mock_order_two],
+        )
+        mock_market.blotter.order_changed.assert_any_call(mock_order_one)
+        mock_market.blotter.order_changed.assert_any_call(mock_order_two)
+        mock_market.blotter.order_updated.assert_called_once_with(mock_order_one)
+
     def test__sort_orders(self):
         order_one = mock.Mock(side="LAY", bet_id=1)
         order_one.order_type.price = 1.01
@@ -457,7 +543,7 @@ class SimulatedSportsDataMiddlewareTest(unittest.TestCase):
         mock_market = mock.Mock(market_id="1.1")
         mock_market.market_book.publish_time_epoch = 123
         mock_market.market_book.streaming_unique_id = 456
-        mock_market.flumine.strategies = [mock_strategy]
+        mock_market.flumine.strategies = create_strategies(mock_strategy)
         self.middleware(mock_market)
         mock_call_strategy_error_handling.call_count = 2
         mock_call_strategy_error_handling.assert_has_calls(
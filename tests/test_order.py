@@ -105,6 +105,12 @@ class BaseOrderTest(unittest.TestCase):
             mock_datetime.datetime.utcnow.return_value,
         )
 
+    @mock.patch("flumine.order.order.BaseOrder.info")
+    def test__update_status_blotter(self, mock_info):
+        self.order.blotter = mock.Mock()
+        self.order._update_status(OrderStatus.EXECUTABLE)
+        self.order.blotter.order_status_changed.assert_called_with(self.order)
+
     @mock.patch("flumine.order.order.BaseOrder._update_status")
     def test_placing(self, mock__update_status):
         self.order.placing()
@@ -182,8 +188,17 @@ class BaseOrderTest(unittest.TestCase):
 
     def test_update_current_order(self):
         mock_current_order = mock.Mock()
+        self.order.blotter = mock.Mock()
         self.order.update_current_order(mock_current_order)
         self.assertEqual(self.order.responses.current_order, mock_current_order)
+        self.order.blotter.order_changed.assert_called_with(self.order)
+        self.order.blotter.order_updated.assert_called_with(self.order)
+
+    def test__exposure_changed(self):
+        self.order._exposure_changed()
+        self.order.blotter = mock.Mock()
+        self.order._exposure_changed()
+        self.order.blotter.order_changed.assert_called_with(self.order)
 
     def test_update_client(self):
         self.order._simulated = False
@@ -62,6 +62,13 @@ class OrderPackageTest(unittest.TestCase):
         self.assertEqual(self.order_package._retry_count, 3)
         mock_time.sleep.assert_called()
 
+    @mock.patch("flumine.order.orderpackage.time")
+    def test_retry_no_back_off(self, mock_time):
+        self.order_package._retry_count = 1
+        self.assertTrue(self.order_package.retry(back_off=False))
+        self.assertEqual(self.order_package._retry_count, 2)
+        mock_time.sleep.assert_not_called()
+
     def test_reset_orders(self):
         mock_order = mock.MagicMock()
         self.order_package._orders = [mock_order]
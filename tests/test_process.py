@@ -49,7 +49,7 @@ class ProcessCurrentOrdersTest(unittest.TestCase):
         mock_process_current_order.assert_called_with(
             betfair_order, current_order, mock_log_control
         )
-        self.assertEqual(market.blotter._live_orders, [])
+        self.assertEqual(market.blotter._live_orders, {})
 
     def test_process_current_order(self):
         mock_order = mock.Mock(status=OrderStatus.EXECUTABLE)
@@ -85,7 +85,7 @@ class ProcessCurrentOrdersTest(unittest.TestCase):
         )
         markets.add_market("market_id", market)
         cheap_hash = create_cheap_hash("strategy_name", 13)
-        strategy = mock.Mock(name_hash=cheap_hash)
+        strategy = mock.Mock(name_hash=cheap_hash, stream_ids=[])
         strategies = Strategies()
         strategies(strategy=strategy, clients=mock.Mock(), flumine=mock_flumine)
         current_order = mock.Mock(
@@ -149,7 +149,7 @@ class ProcessCurrentOrdersTest(unittest.TestCase):
         mock_process_betdaq_current_order.assert_called_with(
             betdaq_order, current_order
         )
-        self.assertEqual(market.blotter._live_orders, [])
+        self.assertEqual(market.blotter._live_orders, {})
 
     def test_process_betdaq_current_order_pending(self):
         mock_order = mock.Mock(
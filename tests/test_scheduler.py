@@ -0,0 +1,67 @@
+import time
+import threading
+import unittest
+from unittest import mock
+
+from flumine.execution.scheduler import Scheduler
+
+
+class SchedulerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.scheduler = Scheduler(name="test")
+
+    def tearDown(self) -> None:
+        self.scheduler.shutdown()
+
+    def test_init(self):
+        self.assertEqual(self.scheduler.name, "test")
+        self.assertEqual(self.scheduler.scheduled, 0)
+        self.assertEqual(self.scheduler.executed, 0)
+        self.assertIsNone(self.scheduler._thread)
+        self.assertTrue(self.scheduler._running)
+        self.assertEqual(len(self.scheduler), 0)
+
+    def test_schedule(self):
+        event = threading.Event()
+        self.scheduler.schedule(0.01, event.set)
+        self.assertEqual(self.scheduler.scheduled, 1)
+        self.assertTrue(self.scheduler._thread.daemon)
+        self.assertEqual(self.scheduler._thread.name, "test")
+        self.assertTrue(event.wait(1))
+
+    def test_schedule_order(self):
+        results = []
+        self.scheduler.schedule(0.03, results.append, 3)
+        self.scheduler.schedule(0.01, results.append, 1)
+        self.scheduler.schedule(0.02, results.append, 2)
+        self.scheduler.schedule(0.02, results.append, 2.5)
+        self.assertEqual(len(self.scheduler), 4)
+        self.scheduler.shutdown()
+        self.assertEqual(results, [1, 2, 2.5, 3])
+        self.assertEqual(self.scheduler.executed, 4)
+        self.assertEqual(len(self.scheduler), 0)
+
+    def test_schedule_due(self):
+        results = []
+        start = time.monotonic()
+        self.scheduler.schedule(0.05, lambda: results.append(time.monotonic()))
+        self.scheduler.shutdown()
+        self.assertGreaterEqual(results[0] - start, 0.05)
+
+    def test_schedule_error(self):
+        mock_func = mock.Mock(side_effect=ValueError())
+        self.scheduler.schedule(0, mock_func)
+        self.scheduler.schedule(0, mock_func)
+        self.scheduler.shutdown()
+        self.assertEqual(mock_func.call_count, 2)
+        self.assertEqual(self.scheduler.executed, 2)
+
+    def test_schedule_shutdown(self):
+        self.scheduler.shutdown()
+        with self.assertRaises(RuntimeError):
+            self.scheduler.schedule(0, mock.Mock())
+
+    def test_shutdown_not_started(self):
+        self.scheduler.shutdown()
+        self.assertFalse(self.scheduler._running)
+        self.assertIsNone(self.scheduler._thread)
@@ -1,3 +1,4 @@
+import datetime
 import unittest
 from unittest import mock
 
@@ -12,6 +13,109 @@ class NewDateTimeTest(unittest.TestCase):
         self.assertEqual(x.utcnow(), 123)
 
 
+class MergeGeneratorsTest(unittest.TestCase):
+    def test_merge_generators(self):
+        gens = [iter([1, 4, 7]), iter([2, 5]), iter([]), iter([3, 6, 8, 9])]
+        self.assertEqual(
+            list(utils.merge_generators(gens, key=lambda x: x)),
+            [1, 2, 3, 4, 5, 6, 7, 8, 9],
+        )
+
+    def test_merge_generators_ties(self):
+        # matches stable sort / re-append ordering
+        gens = [
+            iter([(1, "a"), (1, "b"), (2, "c")]),
+            iter([(1, "d"), (2, "e")]),
+        ]
+        self.assertEqual(
+            [i[1] for i in utils.merge_generators(gens, key=lambda x: x[0])],
+            ["a", "d", "b", "e", "c"],
+        )
+
+    def test_merge_generators_lazy(self):
+        calls = []
+
+        def gen(name, values):
+            for v in values:
+                calls.append((name, v))
+                yield v
+
+        merged = utils.merge_generators(
+            [gen("a", [1, 3]), gen("b", [2])], key=lambda x: x
+        )
+        self.assertEqual(next(merged), 1)
+        self.assertEqual(calls, [("a", 1), ("b", 2)])
+        self.assertEqual(next(merged), 2)
+        self.assertEqual(calls, [("a", 1), ("b", 2), ("a", 3)])
+        self.assertEqual(list(merged), [3])
+
+
+class GetRunnerIndexTest(unittest.TestCase):
+    def test_get_runner_index(self):
+        mock_runner_one = mock.Mock(selection_id=123, handicap=0)
+        mock_runner_two = mock.Mock(selection_id=456, handicap=1.5)
+        mock_market_book = mock.Mock(runners=[mock_runner_one, mock_runner_two])
+        runner_index = utils.get_runner_index(mock_market_book)
+        self.assertEqual(
+            runner_index, {(123, 0): mock_runner_one, (456, 1.5): mock_runner_two}
+        )
+        # built once per MarketBook
+        mock_market_book.runners = []
+        self.assertIs(utils.get_runner_index(mock_market_book), runner_index)
+        self.assertEqual(utils.get_runner_index(mock.Mock(runners=[])), {})
+
+
+class PendingPackagesTest(unittest.TestCase):
+    def setUp(self):
+        self.pending = utils.PendingPackages()
+        self.now = datetime.datetime(2022, 1, 1)
+
+    def _create_package(self, market_id, delay, elapsed):
+        return mock.Mock(
+            market_id=market_id,
+            _time_created=self.now,
+            simulated_delay=delay,
+            elapsed_seconds=elapsed,
+        )
+
+    def test_append(self):
+        package = self._create_package("1.1", 0.1, 0)
+        self.pending.append(package)
+        self.assertEqual(len(self.pending), 1)
+        self.assertTrue(self.pending)
+        self.assertEqual(list(self.pending), [package])
+
+    def test_pop_due(self):
+        package_one = self._create_package("1.1", 1.2, 0.5)
+        package_two = self._create_package("1.1", 0.1, 0.5)
+        package_three = self._create_package("1.2", 0.1, 0.5)
+        for p in (package_one, package_two, package_three):
+            self.pending.append(p)
+        self.assertEqual(self.pending.pop_due("1.1"), [package_two])
+        self.assertEqual(self.pending.pop_due("1.1"), [])
+        self.assertEqual(self.pending.pop_due("1.3"), [])
+        self.assertEqual(len(self.pending), 2)
+        package_one.elapsed_seconds = 1.3
+        self.assertEqual(self.pending.pop_due("1.1"), [package_one])
+        self.assertEqual(list(self.pending), [package_three])
+
+    def test_pop_due_order(self):
+        # due packages are returned in the order added
+        place = self._create_package("1.1", 1.12, 2)
+        cancel = self._create_package("1.1", 0.17, 2)
+        self.pending.append(place)
+        self.pending.append(cancel)
+        self.assertEqual(self.pending.pop_due("1.1"), [place, cancel])
+        self.assertEqual(len(self.pending), 0)
+        self.assertFalse(self.pending)
+
+    def test_clear(self):
+        self.pending.append(self._create_package("1.1", 0.1, 0))
+        self.pending.clear()
+        self.assertEqual(len(self.pending), 0)
+        self.assertEqual(list(self.pending), [])
+
+
 class SimulatedDateTimeTest(unittest.TestCase):
     def setUp(self):
         self.s = utils.SimulatedDateTime()
@@ -787,6 +787,7 @@ class SimulatedOrderTest(unittest.TestCase):
             self.simulated._get_runner(mock_market_book),
             mock_runner,
         )
+        mock_market_book = mock.Mock()
         mock_runner = mock.Mock(selection_id=134, handicap=1)
         mock_market_book.runners = [mock_runner]
         self.assertIsNone(self.simulated._get_runner(mock_market_book))
@@ -1209,6 +1210,31 @@ class SimulatedOrderTest(unittest.TestCase):
         self.assertEqual(self.simulated.size_matched, 2.64)
         self.assertEqual(self.simulated.average_price_matched, 10.0)
 
+    def test__update_matched_wap(self):
+        # running totals match utils.wap over the full list
+        matched = []
+        for i, (price, size) in enumerate(
+            [(1.01, 2.64), (3.35, 0.01), (1000, 12.13), (5.6, 0.33), (1.47, 7.77)]
+        ):
+            matched.append([i, price, size])
+            self.simulated._update_matched([i, price, size])
+            self.assertEqual(
+                (self.simulated.size_matched, self.simulated.average_price_matched),
+                simulatedorder.wap(matched),
+            )
+
+    def test_matched(self):
+        self.simulated._update_matched([12345, 10.0, 2.64])
+        self.simulated.matched = [[12345, 5.0, 2], [12346, 3.0, 2]]
+        self.assertEqual(self.simulated._matched_value, 16.0)
+        self.assertEqual(self.simulated._matched_size, 4)
+        self.simulated._update_matched([12347, 2.0, 4])
+        self.assertEqual(self.simulated.size_matched, 8)
+        self.assertEqual(self.simulated.average_price_matched, 3.0)
+        self.simulated.matched = []
+        self.assertEqual(self.simulated._matched_value, 0)
+        self.assertEqual(self.simulated._matched_size, 0)
+
     def test_size_remaining(self):
         self.assertEqual(self.simulated.size_remaining, 2)
         self.simulated._update_matched([1234, 1, 1])
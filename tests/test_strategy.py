@@ -3,6 +3,7 @@ from unittest import mock
 
 from flumine.strategy import strategy
 from flumine.strategy.runnercontext import RunnerContext
+from flumine.latency import CallbackTiming
 
 
 class RunnerContextMock(RunnerContext):
@@ -42,15 +43,50 @@ class StrategiesTest(unittest.TestCase):
 
     def test_init(self):
         self.assertEqual(self.strategies._strategies, [])
+        self.assertEqual(self.strategies._stream_strategies, {})
 
     def test_call(self):
-        mock_strategy = mock.Mock()
+        mock_strategy = mock.Mock(stream_ids=[1])
         mock_clients = mock.Mock()
         mock_flumine = mock.Mock()
         self.strategies(mock_strategy, mock_clients, mock_flumine)
         self.assertEqual(self.strategies._strategies, [mock_strategy])
         mock_strategy.add.assert_called_with(mock_flumine)
         self.assertEqual(mock_strategy.clients, mock_clients)
+        self.assertEqual(self.strategies._stream_strategies, {1: [mock_strategy]})
+
+    def test_remove(self):
+        mock_strategy_one = mock.Mock(stream_ids=[1, 2])
+        mock_strategy_two = mock.Mock(stream_ids=[2])
+        self.strategies(mock_strategy_one, mock.Mock(), mock.Mock())
+        self.strategies(mock_strategy_two, mock.Mock(), mock.Mock())
+        self.strategies.remove(mock_strategy_one)
+        self.assertEqual(self.strategies._strategies, [mock_strategy_two])
+        self.assertEqual(self.strategies._stream_strategies, {2: [mock_strategy_two]})
+
+    def test_update_stream_strategies(self):
+        mock_strategy_one = mock.Mock(stream_ids=[1, 2])
+        mock_strategy_two = mock.Mock(stream_ids={2, 3})
+        self.strategies._strategies = [mock_strategy_one, mock_strategy_two]
+        self.strategies.update_stream_strategies()
+        self.assertEqual(
+            self.strategies._stream_strategies,
+            {
+                1: [mock_strategy_one],
+                2: [mock_strategy_one, mock_strategy_two],
+                3: [mock_strategy_two],
+            },
+        )
+        # stream added to an existing strategy
+        mock_strategy_two.stream_ids = {2, 3, 4}
+        self.strategies.update_stream_strategies()
+        self.assertEqual(self.strategies.stream_strategies(4), [mock_strategy_two])
+
+    def test_stream_strategies(self):
+        mock_strategy = mock.Mock(stream_ids=[1])
+        self.strategies(mock_strategy, mock.Mock(), mock.Mock())
+        self.assertEqual(self.strategies.stream_strategies(1), [mock_strategy])
+        self.assertEqual(self.strategies.stream_strategies(2), [])
 
     def test_start(self):
         mock_strategy = mock.Mock()
@@ -112,6 +148,7 @@ class BaseStrategyTest(unittest.TestCase):
         self.assertEqual(self.strategy.max_live_trade_count, 3)
         self.assertEqual(self.strategy.streams, [])
         self.assertEqual(self.strategy.historic_stream_ids, set())
+        self.assertEqual(self.strategy.callback_timing, {})
         self.assertEqual(self.strategy.name_hash, "a94a8fe5ccb19")
         self.assertFalse(self.strategy.multi_order_trades)
         self.assertEqual(strategy.STRATEGY_NAME_HASH_LENGTH, 13)
@@ -306,6 +343,15 @@ class BaseStrategyTest(unittest.TestCase):
             },
         )
 
+    def test_callback_timing_info(self):
+        self.assertEqual(self.strategy.callback_timing_info, {})
+        timing = CallbackTiming()
+        timing.record(0.1)
+        self.strategy.callback_timing["process_market_book"] = timing
+        self.assertEqual(
+            self.strategy.callback_timing_info, {"process_market_book": timing.info}
+        )
+
     def test_name(self):
         self.assertEqual(self.strategy.name, "test")
 
@@ -1,14 +1,33 @@
+import os
+import json
+import time
+import queue
+import shutil
+import tempfile
 import unittest
 import datetime
+import threading
+import functools
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
 from unittest import mock
 from unittest.mock import call
 
 from flumine.clients import ExchangeType
-from flumine.streams import streams, datastream, historicalstream, betdaqorderpolling
-from flumine.streams.basestream import BaseStream
+from flumine.streams import (
+    streams,
+    datastream,
+    historicalstream,
+    historicalindex,
+    historicalbinary,
+    historicalcatalogue,
+    filecache,
+    betdaqorderpolling,
+)
+from flumine.streams.basestream import BaseStream, OutputQueue
 from flumine.streams.simulatedorderstream import CurrentOrders
 from flumine.streams import orderstream
 from flumine.exceptions import ListenerError
+from flumine import config
 
 
 class StreamsTest(unittest.TestCase):
@@ -27,6 +46,7 @@ class StreamsTest(unittest.TestCase):
         mock_strategy = mock.Mock(streams=[], raw_data=False)
         self.streams(mock_strategy)
         mock_add_stream.assert_called_with(mock_strategy)
+        self.mock_flumine.strategies.update_stream_strategies.assert_called_with()
 
     @mock.patch("flumine.streams.streams.Streams.add_stream")
     def test_call_data_stream(self, mock_add_stream):
@@ -34,6 +54,25 @@ class StreamsTest(unittest.TestCase):
         self.streams(mock_strategy)
         mock_add_stream.assert_called_with(mock_strategy)
 
+    @mock.patch("flumine.streams.streams.get_local_path", return_value="/tmp/1.123")
+    @mock.patch("flumine.streams.streams.get_file_md")
+    @mock.patch("flumine.streams.streams.Streams.add_historical_stream")
+    def test_call_simulated_markets_file_cache(
+        self, mock_add_historical_stream, mock_get_file_md, mock_get_local_path
+    ):
+        self.mock_flumine.SIMULATED = True
+        mock_strategy = mock.Mock(
+            streams=[],
+            historic_stream_ids=set(),
+            market_filter={"markets": ["s3://b/1.123"]},
+        )
+        self.streams(mock_strategy)
+        mock_get_local_path.assert_called_with("s3://b/1.123")
+        mock_get_file_md.assert_called_with("/tmp/1.123")
+        mock_add_historical_stream.assert_called_with(
+            mock_strategy, "s3://b/1.123", mock_get_file_md(), False
+        )
+
     @mock.patch("flumine.streams.streams.get_file_md")
     @mock.patch("flumine.streams.streams.Streams.add_historical_stream")
     def test_call_simulated_markets(self, mock_add_historical_stream, mock_get_file_md):
@@ -120,6 +159,36 @@ class StreamsTest(unittest.TestCase):
             ]
         )
 
+    @mock.patch("flumine.streams.streams.get_file_md")
+    @mock.patch("flumine.streams.streams.Streams.add_historical_stream")
+    def test_call_simulated_catalogue(
+        self, mock_add_historical_stream, mock_get_file_md
+    ):
+        self.mock_flumine.SIMULATED = True
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            mock_strategy = mock.Mock(
+                streams=[],
+                historic_stream_ids=set(),
+                market_filter={
+                    "markets": [
+                        "tests/resources/1.197931751",
+                        "tests/resources/1.197931750",
+                        "tests/resources/1.200806927",
+                    ],
+                    "catalogue": os.path.join(tmp_dir, "catalogue.db"),
+                    "market_types": ["WIN", "PLACE"],
+                    "min_runners": 3,
+                },
+            )
+            self.streams(mock_strategy)
+        mock_get_file_md.assert_not_called()
+        self.assertEqual(mock_add_historical_stream.call_count, 2)
+        calls = mock_add_historical_stream.call_args_list
+        self.assertEqual(calls[0][0][1], "tests/resources/1.197931750")
+        self.assertEqual(calls[0][0][2].event_id, "31389771")
+        self.assertEqual(calls[1][0][1], "tests/resources/1.197931751")
+        self.assertEqual(len(mock_strategy.streams), 2)
+
     @mock.patch("flumine.streams.streams.Streams.add_historical_stream")
     def test_call_simulated_events(self, mock_add_historical_stream):
         self.mock_flumine.SIMULATED = True
@@ -484,6 +553,24 @@ class StreamsTest(unittest.TestCase):
         self.assertEqual(len(self.streams), 0)
 
 
+class TestOutputQueue(unittest.TestCase):
+    def setUp(self) -> None:
+        self.queue = OutputQueue()
+
+    def test_init(self):
+        self.assertIsNone(self.queue.time_put)
+
+    @mock.patch("flumine.streams.basestream.time.monotonic", side_effect=[1, 2])
+    def test_put_get(self, _):
+        self.queue.put("a")
+        self.queue.put("b")
+        self.assertEqual(self.queue.qsize(), 2)
+        self.assertEqual(self.queue.get(), "a")
+        self.assertEqual(self.queue.time_put, 1)
+        self.assertEqual(self.queue.get(), "b")
+        self.assertEqual(self.queue.time_put, 2)
+
+
 class TestBaseStream(unittest.TestCase):
     def setUp(self) -> None:
         self.mock_flumine = mock.Mock()
@@ -571,9 +658,63 @@ class TestMarketStream(unittest.TestCase):
 
     # def test_run(self):
     #     pass
-    #
-    # def test_handle_output(self):
-    #     pass
+
+    def test_handle_output(self):
+        self.stream._output_queue.put([mock.Mock()])
+        with mock.patch.object(self.stream, "is_alive", side_effect=[True, False]):
+            self.stream.handle_output()
+        self.mock_flumine.handler_queue.put.assert_called_once()
+        event = self.mock_flumine.handler_queue.put.call_args[0][0]
+        self.mock_flumine.latency.record.assert_called_with(
+            "stream", event._monotonic_created - self.stream._output_queue.time_put
+        )
+
+    def test_handle_output_timeout(self):
+        self.stream._listener = mock.Mock()
+        self.stream._output_queue = mock.Mock()
+        self.stream._output_queue.get.side_effect = queue.Empty
+        self.mock_flumine.markets.open_market_ids = ["1.1", "1.2"]
+        with mock.patch.object(self.stream, "is_alive", side_effect=[True, False]):
+            self.stream.handle_output()
+        self.stream._listener.snap.assert_called_with(market_ids=["1.1", "1.2"])
+        self.mock_flumine.handler_queue.put.assert_called_once()
+        self.mock_flumine.latency.record.assert_not_called()
+
+    def test_handle_output_timeout_changed_only(self):
+        config.changed_market_books_only = True
+        self.stream._listener = mock.Mock()
+        self.stream._output_queue = mock.Mock()
+        self.stream._output_queue.get.side_effect = queue.Empty
+        self.mock_flumine.markets.__iter__ = mock.Mock(
+            return_value=iter(
+                [
+                    mock.Mock(market_id="1.1", status="OPEN"),
+                    mock.Mock(
+                        market_id="1.2",
+                        status="OPEN",
+                        blotter=mock.Mock(has_live_orders=False),
+                    ),
+                    mock.Mock(market_id="1.3", status="CLOSED"),
+                ]
+            )
+        )
+        with mock.patch.object(self.stream, "is_alive", side_effect=[True, False]):
+            self.stream.handle_output()
+        self.stream._listener.snap.assert_called_with(market_ids=["1.1"])
+
+    def test_handle_output_timeout_changed_only_no_orders(self):
+        config.changed_market_books_only = True
+        self.stream._listener = mock.Mock()
+        self.stream._output_queue = mock.Mock()
+        self.stream._output_queue.get.side_effect = queue.Empty
+        self.mock_flumine.markets.__iter__ = mock.Mock(return_value=iter([]))
+        with mock.patch.object(self.stream, "is_alive", side_effect=[True, False]):
+            self.stream.handle_output()
+        self.stream._listener.snap.assert_not_called()
+        self.mock_flumine.handler_queue.put.assert_not_called()
+
+    def tearDown(self) -> None:
+        config.changed_market_books_only = False
 
 
 class TestDataStream(unittest.TestCase):
@@ -757,6 +898,18 @@ class TestHistoricalStream(unittest.TestCase):
     def test_handle_output(self):
         self.stream.handle_output()
 
+    @mock.patch("flumine.streams.historicalstream.FlumineBinaryGeneratorStream")
+    def test_create_generator_binary(self, mock_generator):
+        self.stream.market_filter = "1.123.flb"
+        generator = self.stream.create_generator()
+        mock_generator.assert_called_with(
+            file_path="1.123.flb",
+            listener=self.stream._listener,
+            operation="marketSubscription",
+            unique_id=self.stream.stream_id,
+        )
+        self.assertEqual(generator, mock_generator().get_generator())
+
     @mock.patch("flumine.streams.historicalstream.FlumineHistoricalGeneratorStream")
     def test_create_generator(self, mock_generator):
         generator = self.stream.create_generator()
@@ -772,6 +925,794 @@ class TestHistoricalStream(unittest.TestCase):
         self.assertEqual(generator, mock_generator().get_generator())
 
 
+class TestFileReader(unittest.TestCase):
+    def setUp(self) -> None:
+        self.reader = historicalstream.FileReader(
+            "tests/resources/BASIC-1.132153978", 2, 1024
+        )
+
+    def test_init(self):
+        self.assertEqual(self.reader.file_path, "tests/resources/BASIC-1.132153978")
+        self.assertEqual(self.reader.chunk_size, 1024)
+        self.assertEqual(self.reader._queue.maxsize, 2)
+        self.assertTrue(self.reader.daemon)
+
+    def test_iter(self):
+        self.reader.start()
+        lines = [line for chunk in self.reader for line in chunk]
+        with open("tests/resources/BASIC-1.132153978", "rb") as f:
+            self.assertEqual(lines, f.readlines())
+
+    def test_iter_gzip(self):
+        reader = historicalstream.FileReader(
+            "tests/resources/BASIC-1.132153978.gz", 2, 1024
+        )
+        reader.start()
+        # gzip file has \r\n line endings
+        lines = [line.rstrip() for chunk in reader for line in chunk]
+        with open("tests/resources/BASIC-1.132153978", "rb") as f:
+            self.assertEqual(lines, [line.rstrip() for line in f.readlines()])
+
+    def test_iter_offset(self):
+        with open("tests/resources/BASIC-1.132153978", "rb") as f:
+            expected = f.readlines()
+        reader = historicalstream.FileReader(
+            "tests/resources/BASIC-1.132153978",
+            2,
+            1024,
+            sum(len(line) for line in expected[:100]),
+        )
+        reader.start()
+        lines = [line for chunk in reader for line in chunk]
+        self.assertEqual(lines, expected[100:])
+
+    def test_iter_offset_multibyte(self):
+        # offset is in bytes not characters
+        expected = ['{"name": "\u00a3%s"}\n' % i for i in range(10)]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "1.123")
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.writelines(expected)
+            reader = historicalstream.FileReader(
+                file_path, 2, 1024, len(expected[0].encode("utf-8"))
+            )
+            reader.start()
+            lines = [line for chunk in reader for line in chunk]
+        self.assertEqual([line.decode("utf-8") for line in lines], expected[1:])
+
+    def test_iter_error(self):
+        reader = historicalstream.FileReader("tests/resources/MISSING", 2, 1024)
+        reader.start()
+        with self.assertRaises(FileNotFoundError):
+            list(reader)
+
+    def test_stop(self):
+        self.reader.start()
+        next(iter(self.reader))
+        self.reader.stop()
+        self.reader.join(1)
+        self.assertFalse(self.reader.is_alive())
+
+
+class TestFlumineHistoricalGeneratorStream(unittest.TestCase):
+    def setUp(self) -> None:
+        self.listener = historicalstream.HistoricListener(max_latency=None)
+        self.stream = historicalstream.FlumineHistoricalGeneratorStream(
+            file_path="tests/resources/BASIC-1.132153978",
+            listener=self.listener,
+            operation="marketSubscription",
+            unique_id=0,
+        )
+
+    def tearDown(self) -> None:
+        config.simulation_read_ahead = None
+        config.changed_market_books_only = False
+
+    def _create_event_file(self, tmp_dir: str) -> str:
+        # win/place markets muxed into a single event file
+        lines = []
+        for market in ("1.197931750", "1.197931751"):
+            with open(os.path.join("tests/resources", market)) as f:
+                lines.extend(f.readlines())
+        lines.sort(key=lambda l: json.loads(l)["pt"])
+        file_path = os.path.join(tmp_dir, "31389771")
+        with open(file_path, "w") as f:
+            f.writelines(lines)
+        return file_path
+
+    def test__read_loop_changed_only(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = self._create_event_file(tmp_dir)
+            all_market_books = list(
+                historicalstream.FlumineHistoricalGeneratorStream(
+                    file_path=file_path,
+                    listener=historicalstream.HistoricListener(max_latency=None),
+                    operation="marketSubscription",
+                    unique_id=0,
+                ).get_generator()()
+            )
+            config.changed_market_books_only = True
+            changed_market_books = list(
+                historicalstream.FlumineHistoricalGeneratorStream(
+                    file_path=file_path,
+                    listener=historicalstream.HistoricListener(max_latency=None),
+                    operation="marketSubscription",
+                    unique_id=0,
+                ).get_generator()()
+            )
+        self.assertEqual(len(all_market_books), len(changed_market_books))
+        self.assertGreater(
+            sum(len(m) for m in all_market_books),
+            sum(len(m) for m in changed_market_books),
+        )
+        for market_books in changed_market_books:
+            self.assertEqual(len(market_books), 1)
+        # last update for each market matches
+        for market_id in ("1.197931750", "1.197931751"):
+            self.assertEqual(
+                [
+                    mb.publish_time
+                    for mbs in all_market_books
+                    for mb in mbs
+                    if mb.market_id == market_id
+                ][-1],
+                [
+                    mb.publish_time
+                    for mbs in changed_market_books
+                    for mb in mbs
+                    if mb.market_id == market_id
+                ][-1],
+            )
+
+    def test__read_loop(self):
+        market_books = list(self.stream.get_generator()())
+        self.assertEqual(len(market_books), 480)
+        self.assertEqual(market_books[-1][0].status, "CLOSED")
+
+    def test__read_loop_read_ahead(self):
+        config.simulation_read_ahead = 2
+        market_books = list(self.stream.get_generator()())
+        self.assertEqual(len(market_books), 480)
+        self.assertEqual(market_books[-1][0].status, "CLOSED")
+
+    def test__read_lines(self):
+        with open("tests/resources/BASIC-1.132153978", "rb") as f:
+            self.assertEqual(list(self.stream._read_lines()), [f.readlines()])
+
+    def test__filter_segments(self):
+        chunks = iter([["a", "b", "c"], ["d", "e"], ["f", "g", "h"]])
+        segments = [["img1", 2, 3], [None, 3, 4], ["img2", 6, 8]]
+        self.assertEqual(
+            list(self.stream._filter_segments(chunks, 2, segments)),
+            [["img1"], ["a"], ["b"], ["img2"], ["e"], ["f"]],
+        )
+
+    @mock.patch("flumine.streams.historicalstream.FileReader")
+    def test__read_lines_read_ahead(self, mock_reader):
+        config.simulation_read_ahead = 2
+        mock_reader().__iter__.return_value = iter([["a", "b"], ["c"]])
+        self.assertEqual(list(self.stream._read_lines()), [["a", "b"], ["c"]])
+        mock_reader.assert_called_with(
+            "tests/resources/BASIC-1.132153978",
+            2,
+            config.simulation_read_chunk_size,
+            0,
+        )
+        mock_reader().start.assert_called_with()
+        mock_reader().stop.assert_called_with()
+
+
+class QuietHTTPRequestHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        return
+
+
+class TestFileCache(unittest.TestCase):
+    """Local http server used as a stand-in for remote storage."""
+
+    @classmethod
+    def setUpClass(cls):
+        handler = functools.partial(
+            QuietHTTPRequestHandler, directory="tests/resources"
+        )
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        cls.url = "http://127.0.0.1:%s/" % cls.server.server_address[1]
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, "cache")
+        self.file_cache = filecache.FileCache(self.cache_dir, 10 * 1024**2)
+
+    def test_is_remote(self):
+        self.assertTrue(filecache.is_remote("s3://bucket/1.123"))
+        self.assertTrue(filecache.is_remote("http://localhost/1.123"))
+        self.assertFalse(filecache.is_remote("tests/resources/1.197931750"))
+        self.assertFalse(filecache.is_remote("file:///tmp/1.123"))
+        self.assertFalse(filecache.is_remote("C:\\data\\1.123"))
+        self.assertFalse(filecache.is_remote(("s3://bucket/1.123",)))
+
+    def test_local_path(self):
+        path = self.file_cache.local_path("s3://bucket/BASIC-1.132153978.gz")
+        self.assertEqual(os.path.dirname(path), self.cache_dir)
+        self.assertTrue(path.endswith(".gz"))
+        self.assertEqual(
+            path, self.file_cache.local_path("s3://bucket/BASIC-1.132153978.gz")
+        )
+        self.assertNotEqual(
+            path, self.file_cache.local_path("s3://other/BASIC-1.132153978.gz")
+        )
+
+    def test_get(self):
+        url = self.url + "BASIC-1.132153978"
+        local_path = self.file_cache.get(url)
+        with open(local_path, "rb") as f, open(
+            "tests/resources/BASIC-1.132153978", "rb"
+        ) as g:
+            self.assertEqual(f.read(), g.read())
+        # cached (no download)
+        with mock.patch.object(self.file_cache, "_download") as mock_download:
+            self.assertEqual(self.file_cache.get(url), local_path)
+            mock_download.assert_not_called()
+
+    def test_get_compressed(self):
+        # stored as is, decompressed on read
+        local_path = self.file_cache.get(self.url + "BASIC-1.132153978.gz")
+        self.assertEqual(
+            os.path.getsize(local_path),
+            os.path.getsize("tests/resources/BASIC-1.132153978.gz"),
+        )
+
+    def test_get_error(self):
+        with self.assertRaises(Exception):
+            self.file_cache.get(self.url + "missing")
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_evict(self):
+        self.file_cache.max_size = os.path.getsize(
+            "tests/resources/BASIC-1.132153978"
+        ) + os.path.getsize("tests/resources/1.197931750")
+        first = self.file_cache.get(self.url + "BASIC-1.132153978")
+        second = self.file_cache.get(self.url + "1.197931750")
+        os.utime(first, (time.time() - 10, time.time() - 10))
+        os.utime(second, (time.time() - 5, time.time() - 5))
+        # access first so second is least recently used
+        self.file_cache.get(self.url + "BASIC-1.132153978")
+        third = self.file_cache.get(self.url + "1.197931751")
+        self.assertTrue(os.path.exists(first))
+        self.assertFalse(os.path.exists(second))
+        self.assertTrue(os.path.exists(third))
+        self.assertLessEqual(self.file_cache.size, self.file_cache.max_size)
+
+    def test_get_local_path(self):
+        url = self.url + "BASIC-1.132153978"
+        self.assertEqual(filecache.get_local_path(url), url)
+        config.simulation_file_cache = self.cache_dir
+        local_path = filecache.get_local_path(url)
+        self.assertEqual(local_path, self.file_cache.local_path(url))
+        self.assertTrue(os.path.exists(local_path))
+        self.assertEqual(
+            filecache.get_local_path("tests/resources/BASIC-1.132153978"),
+            "tests/resources/BASIC-1.132153978",
+        )
+
+    def test_generator_stream(self):
+        config.simulation_file_cache = self.cache_dir
+        url = self.url + "BASIC-1.132153978"
+        stream = historicalstream.FlumineHistoricalGeneratorStream(
+            file_path=url,
+            listener=historicalstream.HistoricListener(max_latency=None),
+            operation="marketSubscription",
+            unique_id=0,
+        )
+        market_books = list(stream.get_generator()())
+        self.assertEqual(len(market_books), 480)
+        self.assertTrue(os.path.exists(self.file_cache.local_path(url)))
+
+    def tearDown(self):
+        config.simulation_file_cache = None
+        shutil.rmtree(self.tmp_dir)
+
+
+class TestMarketFileCatalogue(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, "catalogue.db")
+        self.markets = [
+            "tests/resources/1.197931750",
+            "tests/resources/1.197931751",
+            "tests/resources/1.200806927",
+            "tests/resources/BASIC-1.132153978.gz",
+        ]
+        self.catalogue = historicalcatalogue.MarketFileCatalogue(self.db_path)
+
+    def test_update(self):
+        self.assertEqual(self.catalogue.update(self.markets), 4)
+        self.assertEqual(self.catalogue.update(self.markets), 0)
+        # persisted
+        self.catalogue.close()
+        self.catalogue = historicalcatalogue.MarketFileCatalogue(self.db_path)
+        self.assertEqual(self.catalogue.update(self.markets), 0)
+
+    def test_update_modified(self):
+        file_path = os.path.join(self.tmp_dir, "1.197931750")
+        shutil.copy("tests/resources/1.197931750", file_path)
+        self.assertEqual(self.catalogue.update([file_path]), 1)
+        with open(file_path, "a") as f:
+            f.write("\n")
+        self.assertEqual(self.catalogue.update([file_path]), 1)
+        self.assertEqual(self.catalogue.update([file_path]), 0)
+
+    @mock.patch(
+        "flumine.streams.historicalcatalogue.get_file_raw_md",
+        side_effect=ValueError,
+    )
+    def test_update_error(self, _):
+        self.assertEqual(self.catalogue.update(self.markets), 0)
+        self.assertEqual(self.catalogue.get(self.markets), {})
+
+    @mock.patch(
+        "flumine.streams.historicalcatalogue.get_local_path",
+        return_value="tests/resources/1.197931750",
+    )
+    def test_update_file_cache(self, mock_get_local_path):
+        self.assertEqual(self.catalogue.update(["s3://bucket/1.197931750"]), 1)
+        mock_get_local_path.assert_called_with("s3://bucket/1.197931750")
+        record = self.catalogue.get(["s3://bucket/1.197931750"])[
+            "s3://bucket/1.197931750"
+        ]
+        self.assertEqual(record.event_id, "31389771")
+
+    def test_get(self):
+        records = self.catalogue.get(self.markets)
+        self.assertEqual(list(records), sorted(self.markets))
+        record = records["tests/resources/1.197931750"]
+        self.assertEqual(record.event_id, "31389771")
+        self.assertEqual(record.event_type_id, "4339")
+        self.assertEqual(record.market_type, "WIN")
+        self.assertEqual(record.country_code, "GB")
+        self.assertEqual(record.venue, "Sheffield")
+        self.assertEqual(record.market_time, datetime.datetime(2022, 4, 19, 18, 26))
+        self.assertEqual(record.number_of_active_runners, 6)
+        md = record.market_definition
+        self.assertEqual(md.event_id, "31389771")
+        self.assertEqual(len(md.runners), 6)
+        # subset
+        self.assertEqual(
+            list(self.catalogue.get(self.markets[:1])), ["tests/resources/1.197931750"]
+        )
+
+    def test_filter(self):
+        self.assertEqual(
+            self.catalogue.filter(
+                self.markets,
+                {
+                    "venues": ["Sheffield"],
+                    "market_time_from": datetime.datetime(2022, 1, 1),
+                },
+            ),
+            [
+                "tests/resources/1.197931750",
+                "tests/resources/1.197931751",
+                "tests/resources/1.200806927",  # no venue
+            ],
+        )
+
+    def test_filter_market(self):
+        md = mock.Mock(
+            market_type="WIN",
+            country_code="GB",
+            event_type_id="7",
+            venue="Ascot",
+            market_time=datetime.datetime(2022, 1, 1, 12),
+            number_of_active_runners=8,
+        )
+        for market_filter, expected in [
+            ({}, None),
+            ({"market_types": ["WIN"], "country_codes": ["GB"]}, None),
+            ({"market_types": ["PLACE"]}, "market_types"),
+            ({"country_codes": ["IE"]}, "country_codes"),
+            ({"event_type_ids": ["4339"]}, "event_type_ids"),
+            ({"venues": ["York"]}, "venues"),
+            (
+                {"market_time_from": datetime.datetime(2022, 1, 2)},
+                "market_time_from",
+            ),
+            ({"market_time_to": datetime.datetime(2021, 1, 1)}, "market_time_to"),
+            ({"min_runners": 9}, "min_runners"),
+            ({"max_runners": 7}, "max_runners"),
+            ({"min_runners": 8, "max_runners": 8}, None),
+        ]:
+            with self.subTest(market_filter=market_filter):
+                self.assertEqual(
+                    historicalcatalogue.filter_market(md, market_filter), expected
+                )
+        self.assertIsNone(
+            historicalcatalogue.filter_market(None, {"market_types": ["WIN"]})
+        )
+
+    def tearDown(self):
+        self.catalogue.close()
+        shutil.rmtree(self.tmp_dir)
+
+
+class TestMarketFileIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.tmp_dir.name, "1.132153978")
+        shutil.copy("tests/resources/BASIC-1.132153978", self.file_path)
+        self.index = historicalindex.MarketFileIndex.build(
+            self.file_path, checkpoint_interval=100
+        )
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+        config.simulation_index = False
+        config.simulation_index_dir = None
+
+    def _market_books(self, **listener_kwargs) -> list:
+        listener = historicalstream.HistoricListener(
+            max_latency=None, **listener_kwargs
+        )
+        stream = historicalstream.FlumineHistoricalGeneratorStream(
+            file_path=self.file_path,
+            listener=listener,
+            operation="marketSubscription",
+            unique_id=0,
+        )
+        return [
+            (mb.publish_time_epoch, mb.status, mb.inplay, mb._data["runners"])
+            for market_books in stream.get_generator()()
+            for mb in market_books
+        ]
+
+    def test_build(self):
+        self.assertEqual(self.index.market_id, "1.132153978")
+        self.assertEqual(len(self.index.updates), 480)
+        self.assertEqual(
+            self.index.updates[0], [0, 1497351220318, "OPEN", False, 1497466500000]
+        )
+        self.assertEqual(self.index.checkpoints[0], [0, None])
+        # interval + inplay
+        self.assertEqual(
+            [c[0] for c in self.index.checkpoints], [0, 100, 200, 300, 400, 476]
+        )
+
+    def test_build_multiple_markets(self):
+        with open(self.file_path, "a") as f:
+            f.write('{"op":"mcm","pt":1497466555000,"mc":[{"id":"1.123"}]}\n')
+        self.assertIsNone(historicalindex.MarketFileIndex.build(self.file_path))
+
+    def test_create_image(self):
+        self.assertIsNone(historicalindex.MarketFileIndex.create_image(None))
+        image = json.loads(self.index.checkpoints[1][1])
+        self.assertEqual(image["pt"], self.index.updates[99][1])
+        self.assertTrue(image["mc"][0]["img"])
+        self.assertEqual(len(image["mc"][0]["rc"]), 14)
+
+    def test_active_lines(self):
+        listener = historicalstream.HistoricListener(inplay=True)
+        self.assertEqual(list(self.index.active_lines(listener)), [476, 477, 478, 479])
+        listener = historicalstream.HistoricListener()
+        self.assertEqual(len(list(self.index.active_lines(listener))), 480)
+
+    def test_get_segments(self):
+        listener = historicalstream.HistoricListener(inplay=True)
+        segments = self.index.get_segments(listener)
+        self.assertEqual(len(segments), 1)
+        self.assertEqual(segments[0][0], self.index.checkpoints[-1][1])
+        self.assertEqual(segments[0][1:], [476, 480])
+        listener = historicalstream.HistoricListener()
+        self.assertEqual(self.index.get_segments(listener), [[None, 0, 480]])
+
+    def test_save_load(self):
+        self.assertIsNone(historicalindex.MarketFileIndex.load(self.file_path))
+        self.index.save(self.file_path)
+        index = historicalindex.MarketFileIndex.load(self.file_path)
+        self.assertEqual(index.serialise, self.index.serialise)
+
+    def test_get(self):
+        index = historicalindex.MarketFileIndex.get(self.file_path)
+        self.assertEqual(index.market_id, "1.132153978")
+        self.assertTrue(os.path.exists(self.file_path + ".idx"))
+
+    @mock.patch(
+        "flumine.streams.historicalindex.MarketFileIndex.save",
+        side_effect=PermissionError,
+    )
+    def test_get_save_error(self, mock_save):
+        index = historicalindex.MarketFileIndex.get(self.file_path)
+        self.assertEqual(index.market_id, "1.132153978")
+        mock_save.assert_called_with(self.file_path)
+        self.assertFalse(os.path.exists(self.file_path + ".idx"))
+
+    def test_index_dir(self):
+        index_dir = os.path.join(self.tmp_dir.name, "index")
+        config.simulation_index_dir = index_dir
+        index_path = historicalindex.MarketFileIndex.index_path(self.file_path)
+        self.assertEqual(os.path.dirname(index_path), index_dir)
+        self.assertTrue(index_path.endswith(".idx"))
+        index = historicalindex.MarketFileIndex.get(self.file_path)
+        self.assertTrue(os.path.exists(index_path))
+        self.assertFalse(os.path.exists(self.file_path + ".idx"))
+        self.assertEqual(
+            historicalindex.MarketFileIndex.load(self.file_path).serialise,
+            index.serialise,
+        )
+
+    def test_simulation(self):
+        for listener_kwargs in (
+            {},
+            {"inplay": True},
+            {"inplay": False},
+            {"seconds_to_start": 600},
+            {"seconds_to_start": 3000, "inplay": False},
+            {"inplay": True, "max_inplay_seconds": 30},
+        ):
+            with self.subTest(listener_kwargs=listener_kwargs):
+                config.simulation_index = False
+                expected = self._market_books(**listener_kwargs)
+                config.simulation_index = True
+                self.assertEqual(self._market_books(**listener_kwargs), expected)
+
+    def test_simulation_multibyte(self):
+        # index offsets are bytes so must not be used to seek in text mode
+        with open(self.file_path, encoding="utf-8") as f:
+            data = f.read().replace("Hazy Manor", "Hazy Manör")
+        with open(self.file_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        self.index = historicalindex.MarketFileIndex.build(
+            self.file_path, checkpoint_interval=100
+        )
+        expected = self._market_books(inplay=True)
+        config.simulation_index = True
+        self.assertEqual(self._market_books(inplay=True), expected)
+        self.assertEqual(len(expected), 4)
+
+
+class TestHistoricalBinary(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.tmp_dir.name, "1.132153978")
+        with open("tests/resources/BASIC-1.132153978") as f:
+            self.lines = f.readlines()
+        # add depth ladders, strings and non 2dp values
+        self.lines.append(
+            '{"op":"mcm","pt":1497466555000,"mc":[{"id":"1.132153978","con":true,'
+            '"rc":[{"id":8362296,"spn":"Infinity","spf":"NaN","batb":[[0,2.5,10.1]],'
+            '"atb":[[2.5,10.123]],"trd":[]}]}]}\n'
+        )
+        with open(self.file_path, "w") as f:
+            f.writelines(self.lines)
+        self.binary_path = historicalbinary.convert(self.file_path)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_is_binary_file(self):
+        self.assertTrue(historicalbinary.is_binary_file("1.123.flb"))
+        self.assertFalse(historicalbinary.is_binary_file("1.123"))
+        self.assertFalse(historicalbinary.is_binary_file(("1.123.flb", "")))
+
+    def test_convert(self):
+        self.assertEqual(self.binary_path, self.file_path + ".flb")
+        with open(self.binary_path, "rb") as f:
+            self.assertEqual(f.read(8), historicalbinary.MAGIC)
+
+    def test_reader(self):
+        reader = historicalbinary.BinaryReader(self.binary_path)
+        self.assertEqual(reader.markets, ["1.132153978"])
+        self.assertEqual(len(reader.runners), 15)
+        self.assertEqual(reader.runners[0], (11695059, 0))
+        self.assertEqual(reader.strings, ["Infinity", "NaN"])
+        self.assertEqual(reader.updates, 481)
+        self.assertEqual(
+            reader.definitions["1.132153978"]["eventId"],
+            json.loads(self.lines[0])["mc"][0]["marketDefinition"]["eventId"],
+        )
+        updates = list(reader)
+        reader.close()
+        self.assertEqual(len(updates), 481)
+        for line, (publish_time, market_changes) in zip(self.lines, updates):
+            data = json.loads(line)
+            self.assertEqual(publish_time, data["pt"])
+            for raw, market_change in zip(data["mc"], market_changes):
+                self.assertEqual(market_change["id"], raw["id"])
+                self.assertNotIn("rc", market_change)
+                self.assertEqual(
+                    historicalbinary.RUNNER_CHANGES in market_change,
+                    bool(raw.get("rc")),
+                )
+                for key in ("img", "tv", "marketDefinition", "con"):
+                    self.assertEqual(market_change.get(key), raw.get(key))
+
+    def test_ladder_ops(self):
+        keys = []
+        ops = historicalbinary.BinaryWriter._ladder_ops(
+            keys,
+            historicalbinary.FIELD_CODES["atb"],
+            [[2, 1], [3, 1], [2.5, 1], [4, 0]],
+        )
+        self.assertEqual(
+            ops,
+            [
+                (historicalbinary.INSERT, 0, 2, 1),
+                (historicalbinary.INSERT, 0, 3, 1),
+                (historicalbinary.INSERT, 1, 2.5, 1),
+            ],
+        )
+        self.assertEqual(keys, [-3, -2.5, -2])
+        ops = historicalbinary.BinaryWriter._ladder_ops(
+            keys, historicalbinary.FIELD_CODES["atb"], [[2.5, 0], [2, 5]]
+        )
+        self.assertEqual(
+            ops,
+            [(historicalbinary.DELETE, 1, 0, 0), (historicalbinary.REPLACE, 1, 2, 5)],
+        )
+        keys = []
+        ops = historicalbinary.BinaryWriter._ladder_ops(
+            keys, historicalbinary.FIELD_CODES["batl"], [[1, 3.5, 2], [0, 3.4, 1]]
+        )
+        self.assertEqual(
+            ops,
+            [
+                (historicalbinary.INSERT, 0, 3.5, 2),
+                (historicalbinary.INSERT, 0, 3.4, 1),
+            ],
+        )
+        ops = historicalbinary.BinaryWriter._ladder_ops(
+            keys, historicalbinary.FIELD_CODES["trd"], []
+        )
+        self.assertEqual(ops, [(historicalbinary.CLEAR, 0, 0, 0)])
+        self.assertEqual(keys, [])
+
+    def test_get_file_md(self):
+        self.assertEqual(
+            historicalbinary.get_file_md(self.binary_path).event_id, "28270094"
+        )
+        self.assertEqual(
+            historicalbinary.get_file_raw_md((self.binary_path, "test"))["eventId"],
+            "28270094",
+        )
+        self.assertEqual(
+            historicalbinary.get_file_raw_md(self.file_path)["eventId"], "28270094"
+        )
+
+    def test_reader_error(self):
+        with self.assertRaises(ValueError):
+            historicalbinary.BinaryReader(self.file_path)
+
+    def _market_books(self, file_path, stream_class, **listener_kwargs):
+        listener = historicalstream.HistoricListener(
+            max_latency=None, **listener_kwargs
+        )
+        stream = stream_class(
+            file_path=file_path,
+            listener=listener,
+            operation="marketSubscription",
+            unique_id=0,
+        )
+        return [
+            mb if isinstance(mb, dict) else (mb.publish_time_epoch, mb._data)
+            for market_books in stream.get_generator()()
+            for mb in market_books
+        ]
+
+    def _assert_equal_replay(self, file_path, binary_path, **listener_kwargs):
+        json_books = self._market_books(
+            file_path,
+            historicalstream.FlumineHistoricalGeneratorStream,
+            **listener_kwargs,
+        )
+        binary_books = self._market_books(
+            binary_path,
+            historicalstream.FlumineBinaryGeneratorStream,
+            **listener_kwargs,
+        )
+        self.assertEqual(len(json_books), len(binary_books))
+        for json_book, binary_book in zip(json_books, binary_books):
+            # runner changes are not decoded
+            if isinstance(json_book, tuple):
+                json_book[1].pop("streaming_update", None)
+                binary_book[1].pop("streaming_update", None)
+            else:
+                json_book.pop("streaming_update", None)
+                binary_book.pop("streaming_update", None)
+            self.assertEqual(json_book, binary_book)
+        return json_books
+
+    def test_generator(self):
+        market_books = self._assert_equal_replay(self.file_path, self.binary_path)
+        self.assertEqual(len(market_books), 481)
+
+    def test_generator_resources(self):
+        listener_kwargs = (
+            {},
+            {"inplay": True},
+            {"inplay": False},
+            {"seconds_to_start": 600},
+            {"max_inplay_seconds": 30},
+            {"lightweight": True},
+            {"calculate_market_tv": True, "cumulative_runner_tv": True},
+        )
+        for file_name, kwargs_list in (
+            ("1.197931750", listener_kwargs),
+            ("1.197931751", listener_kwargs),
+            ("SELF-1.181223995", listener_kwargs[:1]),
+        ):
+            file_path = os.path.join("tests/resources", file_name)
+            binary_path = historicalbinary.convert(
+                file_path, os.path.join(self.tmp_dir.name, file_name + ".flb")
+            )
+            for kwargs in kwargs_list:
+                with self.subTest(file_name=file_name, **kwargs):
+                    self._assert_equal_replay(file_path, binary_path, **kwargs)
+
+
+class TestBinaryMarketBookCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache = historicalbinary.BinaryMarketBookCache(
+            "1.123", 12345, False, False, False
+        )
+
+    def test_add_new_runner(self):
+        runner = self.cache._add_new_runner(id=123, hc=0)
+        for attr in historicalbinary.LADDER_ATTRS:
+            self.assertIsInstance(getattr(runner, attr), historicalbinary._LadderCache)
+        self.assertEqual(self.cache.runner_dict, {(123, 0): runner})
+
+    def test_update_cache(self):
+        self.cache.update_cache({"id": "1.123", "tv": 12.5}, 12346, active=True)
+        self.assertEqual(self.cache.total_matched, 12.5)
+        self.assertEqual(self.cache.publish_time, 12346)
+        self.assertTrue(self.cache.active)
+
+    @mock.patch(
+        "flumine.streams.historicalbinary.BinaryMarketBookCache._process_runner_changes"
+    )
+    def test_update_cache_runner_changes(self, mock_process_runner_changes):
+        reader = mock.Mock()
+        self.cache.update_cache(
+            {"id": "1.123", historicalbinary.RUNNER_CHANGES: (reader, 1, 2)},
+            12346,
+            active=False,
+        )
+        mock_process_runner_changes.assert_called_with(reader, 1, 2, False)
+        self.assertFalse(self.cache.active)
+
+
+class TestLadderCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ladder = historicalbinary._LadderCache()
+
+    def test_update(self):
+        levels = self.ladder.serialised
+        self.ladder.update([(historicalbinary.INSERT, 0, 200, 1000)], 100, active=True)
+        self.assertEqual(self.ladder.serialised, [{"price": 2, "size": 10}])
+        self.assertEqual(levels, [])  # not mutated
+        self.assertTrue(self.ladder.order_book)
+        self.ladder.update([(historicalbinary.REPLACE, 0, 2, 5)], 1, active=False)
+        self.assertEqual(self.ladder.levels, [{"price": 2, "size": 5}])
+        self.assertEqual(self.ladder.serialised, [{"price": 2, "size": 10}])
+        self.ladder.refresh()
+        self.assertEqual(self.ladder.serialised, [{"price": 2, "size": 5}])
+        self.ladder.update([(historicalbinary.DELETE, 0, 0, 0)], 100, active=True)
+        self.assertEqual(self.ladder.serialised, [])
+        self.assertFalse(self.ladder.order_book)
+
+    def test_clear(self):
+        self.ladder.update([(historicalbinary.INSERT, 0, 200, 1000)], 100, active=True)
+        self.ladder.clear()
+        self.assertEqual(self.ladder.levels, [])
+        self.assertEqual(self.ladder.serialised, [])
+
+
 class TestFlumineMarketStream(unittest.TestCase):
     def setUp(self) -> None:
         self.listener = mock.Mock()
@@ -801,6 +1742,25 @@ class TestFlumineMarketStream(unittest.TestCase):
         )
         mock_cache().update_cache.assert_called_with(update[0], 12345, active=True)
 
+    @mock.patch("flumine.streams.historicalstream.MarketBookCache")
+    def test__create_cache(self, mock_cache):
+        self.assertEqual(
+            self.stream._create_cache("1.23", 12345), mock_cache.return_value
+        )
+        mock_cache.assert_called_with(
+            "1.23",
+            12345,
+            self.stream._lightweight,
+            self.stream._calculate_market_tv,
+            self.stream._cumulative_runner_tv,
+        )
+
+    def test__create_cache_binary(self):
+        stream = historicalstream.FlumineBinaryMarketStream(self.listener, 0)
+        self.assertIsInstance(
+            stream._create_cache("1.23", 12345), historicalbinary.BinaryMarketBookCache
+        )
+
     @mock.patch("flumine.streams.historicalstream.MarketBookCache")
     def test__process_inplay(self, mock_cache):
         self.stream._listener.inplay = True
@@ -809,7 +809,7 @@ class TestStrategyExposure(unittest.TestCase):
         mock_order.order_type.price_ladder_definition = "CLASSIC"
         mock_order.order_type.size = 12.0
         mock_order.order_type.price = 1.01
-        mock_market.blotter._live_orders = [mock_order]
+        mock_market.blotter._live_orders = {mock_order.id: mock_order}
         self.trading_control._validate(mock_order, OrderPackageType.PLACE)
         mock_on_error.assert_called_with(
             mock_order,
@@ -909,11 +909,11 @@ class TestStrategyExposure(unittest.TestCase):
         order1 = mock.Mock(
             market_id="market_id",
             lookup=(1, 2, 3),
-            selection_id=1234,
+            selection_id=2,
             side="BACK",
             average_price_matched=0.0,
             size_matched=0,
-            handicap=0,
+            handicap=3,
             status=OrderStatus.EXECUTABLE,
             complete=False,
             EXCHANGE=ExchangeType.BETFAIR,
@@ -925,7 +925,7 @@ class TestStrategyExposure(unittest.TestCase):
         order1.order_type.size = 9.0
         order1.size_remaining = 9.0
 
-        self.market.blotter._strategy_selection_orders = {(strategy, 2, 3): [order1]}
+        self.market.blotter["order1"] = order1
 
         # Show that the exposures aren't double counted when REPLACE is used
         self.trading_control._validate(order1, OrderPackageType.REPLACE)
@@ -292,6 +292,20 @@ class TransactionTest(unittest.TestCase):
         self.transaction._pending_replace = [(mock_order, None)]
         self.assertTrue(self.transaction._pending_orders)
 
+    def test_reset(self):
+        mock_order_place = mock.MagicMock()
+        mock_order_cancel = mock.MagicMock()
+        self.transaction._pending_place = [(mock_order_place, 123)]
+        self.transaction._pending_cancel = [(mock_order_cancel, None)]
+        self.transaction._pending_orders = True
+        self.transaction.reset()
+        mock_order_place.execution_complete.assert_called_with()
+        mock_order_cancel.executable.assert_called_with()
+        mock_order_cancel.execution_complete.assert_not_called()
+        self.assertEqual(self.transaction._pending_place, [])
+        self.assertEqual(self.transaction._pending_cancel, [])
+        self.assertFalse(self.transaction._pending_orders)
+
     @mock.patch("flumine.execution.transaction.Transaction._create_order_package")
     def test_execute(self, mock__create_order_package):
         self.transaction._pending_orders = True
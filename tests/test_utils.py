@@ -50,6 +50,11 @@ class UtilsTest(unittest.TestCase):
             "29761984",
         )
 
+    def test_get_file_raw_md(self):
+        md = utils.get_file_raw_md("tests/resources/1.197931750")
+        self.assertEqual(md["eventId"], "31389771")
+        self.assertEqual(md["venue"], "Sheffield")
+
     def test_chunks(self):
         self.assertEqual([i for i in utils.chunks([1, 2, 3], 1)], [[1], [2], [3]])
 
@@ -139,6 +144,33 @@ class UtilsTest(unittest.TestCase):
         with self.assertRaises(ValueError):
             utils.price_ticks_away(999, -1)
 
+    def test_price_ticks_away_ladder(self):
+        prices = utils.get_line_ladder(0.5, 9.5, 1.0)
+        self.assertEqual(utils.price_ticks_away(1.5, 1, prices), 2.5)
+        self.assertEqual(utils.price_ticks_away(0.5, -1, prices), 0.5)
+        self.assertEqual(utils.price_ticks_away(9.5, 1, prices), 9.5)
+
+    def test_price_ticks_away_list(self):
+        prices = [1.5, 2.5, 3.5]
+        self.assertEqual(utils.price_ticks_away(1.5, 1, prices), 2.5)
+        with self.assertRaises(ValueError):
+            utils.price_ticks_away(2, 1, prices)
+
+    def test_ladders(self):
+        self.assertEqual(utils.CLASSIC_LADDER.prices, tuple(utils.PRICES_FLOAT))
+        self.assertEqual(utils.BETDAQ_LADDER.prices, tuple(utils.BETDAQ_PRICES_FLOAT))
+        finest_ladder = utils.get_finest_ladder()
+        self.assertEqual(len(finest_ladder), 99900)
+        self.assertIs(utils.get_finest_ladder(), finest_ladder)
+        self.assertEqual(finest_ladder.nearest(1.505), 1.51)
+
+    def test_get_line_ladder(self):
+        line_ladder = utils.get_line_ladder(0.5, 9.5, 1.0)
+        self.assertEqual(
+            line_ladder.prices, tuple(utils.make_line_prices(0.5, 9.5, 1.0))
+        )
+        self.assertIs(utils.get_line_ladder(0.5, 9.5, 1.0), line_ladder)
+
     def test_price_ticks_away_betdaq(self):
         prices = utils.BETDAQ_PRICES_FLOAT
         self.assertEqual(utils.price_ticks_away(1.01, 1, prices), 1.02)
@@ -272,6 +304,7 @@ class UtilsTest(unittest.TestCase):
     @mock.patch("flumine.utils.config")
     def test_call_strategy_error_handling_raise(self, mock_config):
         mock_config.raise_errors = True
+        mock_config.strategy_timing = False
         mock_strategy_check = mock.MagicMock(side_effect=ValueError)
         mock_strategy_check.__name__ = "mock_strategy_check"
         mock_market = mock.Mock()
@@ -302,6 +335,7 @@ class UtilsTest(unittest.TestCase):
     @mock.patch("flumine.utils.config")
     def test_call_middleware_error_handling_raise(self, mock_config):
         mock_config.raise_errors = True
+        mock_config.strategy_timing = False
         mock_middlware = mock.MagicMock(side_effect=ValueError)
         mock_market = mock.Mock()
         with self.assertRaises(ValueError):
@@ -330,12 +364,59 @@ class UtilsTest(unittest.TestCase):
     @mock.patch("flumine.utils.config")
     def test_call_process_orders_error_handling_raise(self, mock_config):
         mock_config.raise_errors = True
+        mock_config.strategy_timing = False
         mock_strategy = mock.MagicMock()
         mock_strategy.process_orders.side_effect = ValueError
         mock_market = mock.Mock()
         with self.assertRaises(ValueError):
             utils.call_process_orders_error_handling(mock_strategy, mock_market, [])
 
+    @mock.patch("flumine.utils.record_strategy_timing")
+    def test_call_strategy_error_handling_timing(self, mock_record_strategy_timing):
+        mock_strategy = mock.Mock()
+        mock_strategy.check_market_book.__self__ = mock_strategy
+        mock_strategy.check_market_book.__name__ = "check_market_book"
+        mock_market = mock.Mock(market_id="1.23")
+        mock_market_book = mock.Mock()
+        with mock.patch("flumine.utils.config.strategy_timing", True):
+            utils.call_strategy_error_handling(
+                mock_strategy.check_market_book, mock_market, mock_market_book
+            )
+            utils.call_process_orders_error_handling(mock_strategy, mock_market, [])
+            utils.call_process_raw_data(mock_strategy, "clk", 123, {"id": "1.23"})
+        mock_record_strategy_timing.assert_has_calls(
+            [
+                mock.call(mock_strategy, "check_market_book", "1.23", mock.ANY),
+                mock.call(mock_strategy, "process_orders", "1.23", mock.ANY),
+                mock.call(mock_strategy, "process_raw_data", "1.23", mock.ANY),
+            ]
+        )
+
+    @mock.patch("flumine.utils.record_strategy_timing")
+    def test_call_strategy_error_handling_no_timing(self, mock_record_strategy_timing):
+        mock_strategy = mock.Mock()
+        utils.call_strategy_error_handling(
+            mock_strategy.check_market_book, mock.Mock(), mock.Mock()
+        )
+        mock_record_strategy_timing.assert_not_called()
+
+    @mock.patch("flumine.utils.logger")
+    @mock.patch("flumine.utils.time.perf_counter", return_value=10.5)
+    def test_record_strategy_timing(self, _, mock_logger):
+        mock_strategy = mock.Mock(callback_timing={})
+        utils.record_strategy_timing(mock_strategy, "process_market_book", "1.23", 10)
+        timing = mock_strategy.callback_timing["process_market_book"]
+        self.assertEqual(timing.calls, 1)
+        self.assertEqual(timing.total, 0.5)
+        self.assertEqual(timing.max, 0.5)
+        mock_logger.warning.assert_called_once()
+        utils.record_strategy_timing(
+            mock_strategy, "process_market_book", "1.23", 10.49
+        )
+        self.assertEqual(timing.calls, 2)
+        self.assertAlmostEqual(timing.total, 0.51)
+        mock_logger.warning.assert_called_once()
+
     def test_call_process_raw_data(self):
         mock_strategy = mock.Mock()
         clk = "test"
@@ -365,6 +446,7 @@ class UtilsTest(unittest.TestCase):
     @mock.patch("flumine.utils.config")
     def test_call_process_raw_data_error_handling_raise(self, mock_config):
         mock_config.raise_errors = True
+        mock_config.strategy_timing = False
         mock_strategy = mock.MagicMock()
         mock_strategy.process_raw_data.side_effect = ValueError
         clk = "test"
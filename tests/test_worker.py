@@ -31,6 +31,7 @@ class BackgroundWorkerTest(unittest.TestCase):
         self.assertEqual(self.worker.context, {1: 2})
         self.assertEqual(self.worker.name, "test")
         self.assertFalse(self.worker._running)
+        self.assertIsNone(self.worker.shutdown_function)
 
     def test_run_none(self):
         worker_ = worker.BackgroundWorker(
@@ -56,6 +57,16 @@ class BackgroundWorkerTest(unittest.TestCase):
         self.assertFalse(self.worker._running)
         self.assertFalse(self.worker.is_alive())
 
+    @mock.patch("flumine.worker.BackgroundWorker.join")
+    def test_shutdown_function(self, mock_join):
+        mock_shutdown_function = mock.Mock(side_effect=[None, ValueError])
+        self.worker.shutdown_function = mock_shutdown_function
+        self.worker.shutdown()
+        mock_join.assert_called_with(4)
+        mock_shutdown_function.assert_called_with({1: 2}, self.mock_flumine)
+        self.worker.shutdown()  # error logged
+        self.assertEqual(mock_shutdown_function.call_count, 2)
+
 
 class WorkersTest(unittest.TestCase):
     def setUp(self) -> None:
@@ -202,6 +213,55 @@ class WorkersTest(unittest.TestCase):
         )
         mock_flumine.log_control.assert_called_with(mock_events.BalanceEvent())
 
+    @mock.patch("flumine.worker.events")
+    def test_log_latency(self, mock_events):
+        mock_context = mock.Mock()
+        mock_flumine = mock.Mock()
+        mock_flumine.latency.info = {"stream": {"count": 1}}
+        worker.log_latency(mock_context, mock_flumine)
+        mock_events.LatencyEvent.assert_called_with({"stream": {"count": 1}})
+        mock_flumine.log_control.assert_called_with(mock_events.LatencyEvent())
+
+    @mock.patch("flumine.worker.events")
+    def test_log_latency_empty(self, mock_events):
+        mock_context = mock.Mock()
+        mock_flumine = mock.Mock()
+        mock_flumine.latency.info = {}
+        worker.log_latency(mock_context, mock_flumine)
+        mock_flumine.log_control.assert_not_called()
+
+    def test_refresh_execution_sessions(self):
+        mock_context = mock.Mock()
+        mock_execution = mock.Mock()
+        mock_flumine = mock.Mock(
+            clients=[
+                mock.Mock(execution=mock_execution),
+                mock.Mock(execution=mock_execution),
+            ]
+        )
+        worker.refresh_execution_sessions(mock_context, mock_flumine)
+        mock_execution.refresh_http_sessions.assert_called_once_with()
+
+    @mock.patch("flumine.worker.create_metrics_server")
+    def test_serve_metrics(self, mock_create_metrics_server):
+        mock_context = {}
+        mock_flumine = mock.Mock()
+        worker.serve_metrics(mock_context, mock_flumine, "127.0.0.1", 9101)
+        worker.serve_metrics(mock_context, mock_flumine, "127.0.0.1", 9101)
+        mock_create_metrics_server.assert_called_once_with(
+            mock_flumine, "127.0.0.1", 9101
+        )
+        self.assertEqual(mock_context["server"], mock_create_metrics_server())
+        self.assertEqual(mock_create_metrics_server().handle_request.call_count, 2)
+
+    def test_close_metrics(self):
+        mock_server = mock.Mock()
+        mock_context = {"server": mock_server}
+        worker.close_metrics(mock_context, mock.Mock())
+        mock_server.server_close.assert_called_with()
+        self.assertEqual(mock_context, {})
+        worker.close_metrics(mock_context, mock.Mock())
+
     @mock.patch("flumine.worker._get_cleared_market")
     @mock.patch("flumine.worker._get_cleared_orders")
     def test_poll_market_closure(